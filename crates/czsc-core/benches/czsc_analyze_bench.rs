@@ -73,12 +73,67 @@ fn bench_czsc_analyze(c: &mut Criterion) {
         );
     });
 
+    // 盘中快照：每根 K 线先推一次、再以同 dt 覆盖一次，覆盖走 last_ubi 延伸路径
+    const STREAM_N: usize = 20_000;
+    let stream_bars = generate_bars(STREAM_N);
+    group.bench_function(
+        format!("update_bar same-dt replay(bars={STREAM_N}, max_bi_num=50)"),
+        |b| {
+            b.iter_batched(
+                || stream_bars.clone(),
+                |input| {
+                    let mut iter = input.into_iter();
+                    let mut c = CZSC::new(vec![iter.next().unwrap()], 50, 6);
+                    for bar in iter {
+                        c.update_bar(bar.clone());
+                        c.update_bar(bar);
+                    }
+                    black_box(c)
+                },
+                BatchSize::LargeInput,
+            );
+        },
+    );
+
+    group.finish();
+}
+
+/// 长时间运行的增量场景：先用 `WARM` 根 K 线预热，再逐根推入 `FEED` 根。
+/// `max_bi_num` 越大，`bars_raw` 保留的历史越长，每次成笔后的前缀裁剪
+/// 若整体前移剩余元素，开销会随历史长度线性增长。
+fn bench_czsc_incremental(c: &mut Criterion) {
+    const WARM: usize = 50_000;
+    const FEED: usize = 20_000;
+    let bars = generate_bars(WARM + FEED);
+
+    let mut group = c.benchmark_group("czsc_incremental");
+    group.sample_size(10);
+
+    for max_bi_num in [50usize, 1_000] {
+        let warm = CZSC::new(bars[..WARM].to_vec(), max_bi_num, 6);
+        group.bench_function(
+            format!("update_bar(warm={WARM}, feed={FEED}, max_bi_num={max_bi_num})"),
+            |b| {
+                b.iter_batched(
+                    || (warm.clone(), bars[WARM..].to_vec()),
+                    |(mut c, feed)| {
+                        for bar in feed {
+                            c.update_bar(bar);
+                        }
+                        black_box(c)
+                    },
+                    BatchSize::LargeInput,
+                );
+            },
+        );
+    }
+
     group.finish();
 }
 
 criterion_group!(
     name = benches;
     config = Criterion::default();
-    targets = bench_czsc_analyze
+    targets = bench_czsc_analyze, bench_czsc_incremental
 );
 criterion_main!(benches);
@@ -0,0 +1,217 @@
+//! CZSC 内部 K 线序列的滑动窗口存储。
+//!
+//! `bars_raw` / `bars_ubi` 在每次成笔裁剪后都要丢弃前缀。直接对 `Vec` 做
+//! `drain(0..n)` 会把剩余全部元素前移一次；持续增量更新时几乎每根 K 线都会触发。
+//! [`BarBuffer`] 只移动起始偏移，待失效前缀占到底层存储一半以上时才整体压缩，
+//! 前缀丢弃因此摊还为 O(1)，同时通过 `Deref<Target = [T]>` 继续对外提供连续切片，
+//! 信号函数里 `c.bars_raw[i]`、`&c.bars_raw[a..b]`、`get_sub_elements(&c.bars_raw, ..)`
+//! 等写法无需改动。
+
+use std::fmt;
+use std::ops::{Deref, DerefMut};
+
+/// 失效前缀低于该长度时不压缩，避免短序列上频繁搬移。
+const COMPACT_MIN: usize = 64;
+
+/// 带起始偏移的连续序列：`buf[start..]` 为有效元素。
+pub struct BarBuffer<T> {
+    buf: Vec<T>,
+    start: usize,
+}
+
+impl<T> BarBuffer<T> {
+    pub fn new() -> Self {
+        Self {
+            buf: Vec::new(),
+            start: 0,
+        }
+    }
+
+    pub fn with_capacity(capacity: usize) -> Self {
+        Self {
+            buf: Vec::with_capacity(capacity),
+            start: 0,
+        }
+    }
+
+    #[inline]
+    pub fn as_slice(&self) -> &[T] {
+        &self.buf[self.start..]
+    }
+
+    #[inline]
+    pub fn as_mut_slice(&mut self) -> &mut [T] {
+        &mut self.buf[self.start..]
+    }
+
+    #[inline]
+    pub fn push(&mut self, value: T) {
+        self.buf.push(value);
+    }
+
+    #[inline]
+    pub fn pop(&mut self) -> Option<T> {
+        if self.buf.len() > self.start {
+            self.buf.pop()
+        } else {
+            None
+        }
+    }
+
+    /// 丢弃最前面的 `n` 个元素（超出长度时清空）。
+    ///
+    /// 仅移动起始偏移；失效前缀足够长且不少于有效元素时才压缩底层存储，
+    /// 保证每个元素至多被搬移常数次。
+    pub fn drain_front(&mut self, n: usize) {
+        let n = n.min(self.len());
+        if n == 0 {
+            return;
+        }
+        self.start += n;
+        if self.start == self.buf.len() {
+            self.buf.clear();
+            self.start = 0;
+        } else if self.start >= COMPACT_MIN && self.start >= self.buf.len() - self.start {
+            self.buf.drain(0..self.start);
+            self.start = 0;
+        }
+    }
+
+    /// 移出下标 `at`（相对有效区间）之后的全部元素。
+    pub fn drain_tail(&mut self, at: usize) -> std::vec::Drain<'_, T> {
+        assert!(at <= self.len(), "drain_tail 越界: {} > {}", at, self.len());
+        self.buf.drain(self.start + at..)
+    }
+
+    /// 转为仅包含有效元素的 `Vec`，不复制元素。
+    pub fn into_vec(mut self) -> Vec<T> {
+        if self.start > 0 {
+            self.buf.drain(0..self.start);
+        }
+        self.buf
+    }
+}
+
+impl<T> Default for BarBuffer<T> {
+    fn default() -> Self {
+        Self::new()
+    }
+}
+
+impl<T> From<Vec<T>> for BarBuffer<T> {
+    fn from(buf: Vec<T>) -> Self {
+        Self { buf, start: 0 }
+    }
+}
+
+impl<T> Deref for BarBuffer<T> {
+    type Target = [T];
+
+    #[inline]
+    fn deref(&self) -> &[T] {
+        self.as_slice()
+    }
+}
+
+impl<T> DerefMut for BarBuffer<T> {
+    #[inline]
+    fn deref_mut(&mut self) -> &mut [T] {
+        self.as_mut_slice()
+    }
+}
+
+impl<'a, T> IntoIterator for &'a BarBuffer<T> {
+    type Item = &'a T;
+    type IntoIter = std::slice::Iter<'a, T>;
+
+    fn into_iter(self) -> Self::IntoIter {
+        self.as_slice().iter()
+    }
+}
+
+impl<'a, T> IntoIterator for &'a mut BarBuffer<T> {
+    type Item = &'a mut T;
+    type IntoIter = std::slice::IterMut<'a, T>;
+
+    fn into_iter(self) -> Self::IntoIter {
+        self.as_mut_slice().iter_mut()
+    }
+}
+
+/// 克隆时只复制有效区间，丢弃失效前缀。
+impl<T: Clone> Clone for BarBuffer<T> {
+    fn clone(&self) -> Self {
+        Self::from(self.as_slice().to_vec())
+    }
+}
+
+impl<T: fmt::Debug> fmt::Debug for BarBuffer<T> {
+    fn fmt(&self, f: &mut fmt::Formatter<'_>) -> fmt::Result {
+        f.debug_list().entries(self.as_slice()).finish()
+    }
+}
+
+impl<T: PartialEq> PartialEq for BarBuffer<T> {
+    fn eq(&self, other: &Self) -> bool {
+        self.as_slice() == other.as_slice()
+    }
+}
+
+impl<T: serde::Serialize> serde::Serialize for BarBuffer<T> {
+    fn serialize<S: serde::Serializer>(&self, serializer: S) -> Result<S::Ok, S::Error> {
+        self.as_slice().serialize(serializer)
+    }
+}
+
+impl<'de, T: serde::Deserialize<'de>> serde::Deserialize<'de> for BarBuffer<T> {
+    fn deserialize<D: serde::Deserializer<'de>>(deserializer: D) -> Result<Self, D::Error> {
+        Vec::<T>::deserialize(deserializer).map(Self::from)
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn drain_front_keeps_contiguous_view() {
+        let mut b = BarBuffer::from((0..10).collect::<Vec<i32>>());
+        b.drain_front(3);
+        assert_eq!(&b[..], &[3, 4, 5, 6, 7, 8, 9]);
+        assert_eq!(b[0], 3);
+        b.push(10);
+        assert_eq!(b.last(), Some(&10));
+        assert_eq!(b.pop(), Some(10));
+        b.drain_front(100);
+        assert!(b.is_empty());
+        assert_eq!(b.pop(), None);
+    }
+
+    #[test]
+    fn compaction_preserves_elements() {
+        let mut b = BarBuffer::new();
+        let mut expect = std::collections::VecDeque::new();
+        for i in 0..10_000 {
+            b.push(i);
+            expect.push_back(i);
+            if i % 7 == 0 {
+                b.drain_front(5);
+                for _ in 0..5 {
+                    expect.pop_front();
+                }
+            }
+            assert!(b.buf.len() <= 2 * b.len().max(COMPACT_MIN) + 1);
+        }
+        assert!(b.iter().eq(expect.iter()));
+        assert_eq!(b.clone().into_vec(), expect.into_iter().collect::<Vec<_>>());
+    }
+
+    #[test]
+    fn drain_tail_is_relative_to_live_range() {
+        let mut b = BarBuffer::from(vec![1, 2, 3, 4, 5]);
+        b.drain_front(1);
+        let tail: Vec<i32> = b.drain_tail(2).collect();
+        assert_eq!(tail, vec![4, 5]);
+        assert_eq!(&b[..], &[2, 3]);
+    }
+}
@@ -8,6 +8,7 @@ use crate::objects::{
     fx::FX,
     mark::Mark,
 };
+use buffer::BarBuffer;
 use derive_builder::Builder;
 #[cfg(feature = "python")]
 use parking_lot::RwLock;
@@ -18,6 +19,7 @@ use std::io::Cursor;
 #[cfg(feature = "python")]
 use std::sync::Arc;
 use utils::{check_bi, check_fxs, remove_include};
+pub mod buffer;
 pub mod errors;
 pub mod utils;
 
@@ -45,9 +47,10 @@ pub struct CZSC {
     pub max_bi_num: usize,
     /// 笔的最小长度（去包含后的 K 线根数；默认 6，可由 CZSC_MIN_BI_LEN 覆盖）
     pub min_bi_len: usize,
-    /// 原始K线序列
-    pub bars_raw: Vec<RawBar>,
-    pub bars_ubi: Vec<NewBar>,
+    /// 原始K线序列（前缀裁剪只移动起始偏移，按切片访问）
+    pub bars_raw: BarBuffer<RawBar>,
+    /// 未完成笔的无包含K线序列
+    pub bars_ubi: BarBuffer<NewBar>,
     pub bi_list: Vec<BI>,
     pub symbol: Symbol,
     pub freq: Freq,
@@ -110,7 +113,12 @@ impl CZSC {
             }
         }
 
-        for bi in &mut self.bi_list {
+        // bi_list 按时间升序：某笔最后一根 bar 早于 last_ubi 时，它及更早的笔都不可能
+        // 含有 last_ubi 的镜像副本，倒序扫描到此即可停止，不必全量比较整个 bi_list。
+        for bi in self.bi_list.iter_mut().rev() {
+            if bi.bars.last().is_some_and(|nb| nb.dt < last_ubi.dt) {
+                break;
+            }
             for nb in &mut bi.bars {
                 patch_new_bar_if_same(nb, last_ubi, bar);
             }
@@ -128,8 +136,8 @@ impl CZSC {
         let mut c = Self {
             max_bi_num,
             min_bi_len,
-            bars_raw: Vec::with_capacity(bars_raw.len()), // 预分配容量
-            bars_ubi: Vec::with_capacity(bars_raw.len() / 2), // 预估容量
+            bars_raw: BarBuffer::with_capacity(bars_raw.len()), // 预分配容量
+            bars_ubi: BarBuffer::with_capacity(bars_raw.len() / 2), // 预估容量
             bi_list: Vec::with_capacity(max_bi_num.min(bars_raw.len() / 10)), // 预估笔数量
             symbol: bars_raw[0].symbol.clone(),
             freq: bars_raw[0].freq,
@@ -189,7 +197,8 @@ impl CZSC {
             *self.bars_raw.last_mut().unwrap() = bar.clone();
             let last_ubi = self.bars_ubi.pop().unwrap();
             self.sync_extended_last_ubi_in_bis(&last_ubi, &bar);
-            let mut last_bars = last_ubi.elements.to_vec();
+            // last_ubi 已经出栈，直接接管其 elements，避免再复制一份原始 K 线
+            let mut last_bars = last_ubi.elements;
             assert_eq!(
                 bar.dt,
                 last_bars.last().unwrap().dt,
@@ -203,9 +212,9 @@ impl CZSC {
         };
 
         // 去除包含关系
-        for bar in last_bars.iter() {
+        for bar in last_bars {
             if self.bars_ubi.len() < 2 {
-                self.bars_ubi.push(NewBar::new_from_raw(bar));
+                self.bars_ubi.push(NewBar::new_from_raw(&bar));
             } else {
                 let (has_include, k3) = {
                     // 安全获取两个相邻元素的引用
@@ -213,7 +222,7 @@ impl CZSC {
                     let (_, last_two) = self.bars_ubi.split_at_mut(idx);
                     let k1 = &last_two[0]; // 倒数第二个元素
                     let k2 = &last_two[1]; // 最后一个元素
-                    remove_include(k1, k2, bar.clone()).unwrap()
+                    remove_include(k1, k2, bar).unwrap()
                 };
                 if has_include {
                     *self.bars_ubi.last_mut().unwrap() = k3;
@@ -235,7 +244,7 @@ impl CZSC {
             let sdt = self.bi_list.first().unwrap().fx_a.elements[0].dt;
             // 对齐 Python: 取第一个 dt >= sdt 的位置（重复 dt 时必须取最左侧）
             let drain_to = self.bars_raw.partition_point(|bar| bar.dt < sdt);
-            self.bars_raw.drain(0..drain_to);
+            self.bars_raw.drain_front(drain_to);
         }
 
         // 如果有信号计算函数，则进行信号计算
@@ -263,18 +272,19 @@ impl CZSC {
                 })
                 .unwrap_or(first);
 
-            let bars_ubi = self
+            // bars_ubi 按 dt 升序，过滤 dt >= fx_a 起点等价于取后缀切片
+            let start = self
                 .bars_ubi
-                .iter()
-                .filter(|x| x.dt >= fx_a.elements[0].dt)
-                .collect::<Vec<_>>();
-
-            let (bi, bars_ubi_) = check_bi(&bars_ubi, self.min_bi_len);
+                .partition_point(|x| x.dt < fx_a.elements[0].dt);
+            let (bi, keep) = {
+                let (bi, bars_ubi_) = check_bi(&self.bars_ubi[start..], self.min_bi_len);
+                (bi, bars_ubi_.len())
+            };
             if let Some(bi) = bi {
                 self.bi_list.push(bi);
             }
 
-            self.bars_ubi = bars_ubi_.iter().map(|&bar| bar.clone()).collect::<Vec<_>>();
+            self.retain_ubi_tail(keep);
             return None;
         }
 
@@ -285,12 +295,15 @@ impl CZSC {
         //     self.bars_ubi.last().unwrap().dt,
         //     self.bars_ubi.len()
         // );
-        let (bi, bars_ubi_) = check_bi(&self.bars_ubi, self.min_bi_len);
+        let (bi, keep) = {
+            let (bi, bars_ubi_) = check_bi(&self.bars_ubi, self.min_bi_len);
+            (bi, bars_ubi_.len())
+        };
         if let Some(bi) = bi {
             self.bi_list.push(bi);
         }
 
-        self.bars_ubi = bars_ubi_.to_vec();
+        self.retain_ubi_tail(keep);
 
         // 后处理：如果当前笔被破坏，将当前笔的bars与bars_ubi进行合并，并丢弃
         let last_bi = self.bi_list.last().unwrap(); // 获取最后一个笔
@@ -302,23 +315,27 @@ impl CZSC {
                 || (last_bi.direction == Direction::Down
                     && bars_ubi.last().unwrap().low < last_bi.get_low()))
         {
-            // 当前笔被破坏，将当前笔的bars与bars_ubi进行合并
-            // 使用除了最后两根K线之外的所有K线
-            let merge_point = last_bi.bars[last_bi.bars.len() - 2].dt;
-
-            // 创建新的合并后的bars序列
-            self.bars_ubi = last_bi.bars[..last_bi.bars.len() - 2]
-                .iter()
-                .chain(bars_ubi.iter().filter(|x| x.dt >= merge_point))
-                .cloned()
-                .collect();
-
-            // 移除最后一个笔
-            self.bi_list.pop();
+            // 当前笔被破坏：移除最后一个笔，并接管它的 bars（除最后两根K线外），
+            // 再把 bars_ubi 中 dt >= 合并点的后缀移入，整个过程不复制 NewBar
+            let mut merged = self.bi_list.pop().unwrap().bars;
+            let merge_point = merged[merged.len() - 2].dt;
+            merged.truncate(merged.len() - 2);
+
+            let cut = self.bars_ubi.partition_point(|x| x.dt < merge_point);
+            merged.extend(self.bars_ubi.drain_tail(cut));
+            self.bars_ubi = BarBuffer::from(merged);
         }
         None
     }
 
+    /// 仅保留 bars_ubi 末尾 `keep` 根（check_bi 返回的剩余序列总是输入的后缀），
+    /// 只移动起始偏移而不是把后缀复制成新的 Vec。
+    #[inline]
+    fn retain_ubi_tail(&mut self, keep: usize) {
+        let drop_n = self.bars_ubi.len().saturating_sub(keep);
+        self.bars_ubi.drain_front(drop_n);
+    }
+
     /// 获取 bars_ubi 中的分型
     pub fn get_ubi_fxs(&self) -> Option<Vec<FX>> {
         if self.bars_ubi.is_empty() {
@@ -378,8 +395,8 @@ impl CZSC {
             low: low_bar.low,
             high_bar,
             low_bar,
-            bars: self.bars_ubi.to_owned(),
-            raw_bars: self.bars_raw.to_owned(),
+            bars: self.bars_ubi.to_vec(),
+            raw_bars: self.bars_raw.to_vec(),
             fxs: ubi_fxs,
             fx_a,
         })
@@ -392,12 +409,16 @@ impl CZSC {
 impl CZSC {
     #[new]
     #[pyo3(signature = (bars_raw, max_bi_num=0, min_bi_len=0))]
-    pub fn new_py(bars_raw: Vec<RawBar>, max_bi_num: usize, min_bi_len: usize) -> PyResult<Self> {
-        Ok(CZSC::new(
-            bars_raw,
-            resolve_max_bi_num(max_bi_num),
-            resolve_min_bi_len(min_bi_len),
-        ))
+    pub fn new_py(
+        py: Python<'_>,
+        bars_raw: Vec<RawBar>,
+        max_bi_num: usize,
+        min_bi_len: usize,
+    ) -> PyResult<Self> {
+        let max_bi_num = resolve_max_bi_num(max_bi_num);
+        let min_bi_len = resolve_min_bi_len(min_bi_len);
+        // 参数提取完成后即为纯 Rust 计算，释放 GIL 以便多线程并行构建
+        Ok(py.detach(move || CZSC::new(bars_raw, max_bi_num, min_bi_len)))
     }
 
     /// 直接从Arrow格式的DataFrame创建CZSC对象，避免中间转换
@@ -410,6 +431,7 @@ impl CZSC {
     #[staticmethod]
     #[pyo3(signature = (df_bytes, freq, max_bi_num=0, min_bi_len=0))]
     pub fn from_dataframe(
+        py: Python<'_>,
         df_bytes: pyo3::Bound<'_, pyo3::types::PyBytes>,
         freq: Freq,
         max_bi_num: usize,
@@ -444,19 +466,19 @@ impl CZSC {
             ));
         }
 
-        // 直接格式化为RawBar - 这是性能关键路径
-        let bars = format_standard_kline(df, freq).map_err(|e| {
-            PyErr::new::<pyo3::exceptions::PyValueError, _>(format!(
-                "Failed to format kline data: {e}"
-            ))
-        })?;
-
-        // 批量创建CZSC对象
-        Ok(CZSC::new(
-            bars,
-            resolve_max_bi_num(max_bi_num),
-            resolve_min_bi_len(min_bi_len),
-        ))
+        let max_bi_num = resolve_max_bi_num(max_bi_num);
+        let min_bi_len = resolve_min_bi_len(min_bi_len);
+        py.detach(move || {
+            // 直接格式化为RawBar - 这是性能关键路径
+            let bars = format_standard_kline(df, freq).map_err(|e| {
+                PyErr::new::<pyo3::exceptions::PyValueError, _>(format!(
+                    "Failed to format kline data: {e}"
+                ))
+            })?;
+
+            // 批量创建CZSC对象
+            Ok(CZSC::new(bars, max_bi_num, min_bi_len))
+        })
     }
 
     #[getter]
@@ -727,7 +749,7 @@ impl CZSC {
     /// Pickle 支持 —— `__reduce__` 返回 ``(CZSC, (fixed_point_bars, max_bi_num))``。
     ///
     /// `update_bar` 会丢弃 dt 小于当前 first-BI 起始时间的旧 bar
-    /// （参见上面的 `bars_raw.drain` 块），因此刚构造出来的 CZSC 的
+    /// （参见上面的 `bars_raw.drain_front` 块），因此刚构造出来的 CZSC 的
     /// `bars_raw` 可能仍然和「再分析一次后到达的不动点」不同。这里多
     /// 跑一次 `CZSC::new`，让其在序列化前收敛 —— 保证即使 CzscSignals
     /// 在 `kas[freq]` 里嵌套了 CZSC，`pickle.dumps(restored) ==
@@ -735,8 +757,13 @@ impl CZSC {
     /// `restored.__getstate__() == obj.__getstate__()` 断言依赖这一点）。
     fn __reduce__(&self, py: Python) -> PyResult<Py<PyAny>> {
         use pyo3::IntoPyObject;
-        let trimmed = CZSC::new(self.bars_raw.clone(), self.max_bi_num, self.min_bi_len);
-        let args = (trimmed.bars_raw, self.max_bi_num, self.min_bi_len).into_pyobject(py)?;
+        let trimmed = CZSC::new(self.bars_raw.to_vec(), self.max_bi_num, self.min_bi_len);
+        let args = (
+            trimmed.bars_raw.into_vec(),
+            self.max_bi_num,
+            self.min_bi_len,
+        )
+            .into_pyobject(py)?;
         let constructor = py.get_type::<Self>();
         let result = (constructor, args).into_pyobject(py)?;
         Ok(result.into())
@@ -1,7 +1,7 @@
 use super::errors::AnalyzeErorr;
 use crate::objects::bar::RawBarBuilder;
 use crate::objects::{
-    bar::{NewBar, NewBarBuilder, RawBar},
+    bar::{NewBar, NewBarBuilder, RawBar, Symbol},
     bi::{BI, BIBuilder},
     direction::Direction,
     freq::Freq,
@@ -13,7 +13,7 @@ use anyhow::Context;
 use chrono::DateTime;
 use chrono::Utc;
 use polars::frame::DataFrame;
-use polars::prelude::TimeUnit;
+use polars::prelude::{Column, DataType, NamedFrom, TimeUnit};
 
 /// K 线缺口信息。
 #[derive(Debug, Clone, PartialEq, serde::Serialize, serde::Deserialize)]
@@ -469,25 +469,40 @@ where
 /// ```
 ///
 pub fn format_standard_kline(df: DataFrame, freq: Freq) -> Result<Vec<RawBar>, AnalyzeErorr> {
-    // 获取各列的 Series 引用
+    // 获取各列的 Series 引用；数值列统一转为 f64（整型成交量等可直接传入）
     let symbol_col = df.column("symbol")?.str()?;
     let dt_col = df.column("dt")?.datetime()?;
-    let open_col = df.column("open")?.f64()?;
-    let close_col = df.column("close")?.f64()?;
-    let high_col = df.column("high")?.f64()?;
-    let low_col = df.column("low")?.f64()?;
-    let vol_col = df.column("vol")?.f64()?;
-    let amount_col = df.column("amount")?.f64()?;
+    let open = df.column("open")?.cast(&DataType::Float64)?;
+    let close = df.column("close")?.cast(&DataType::Float64)?;
+    let high = df.column("high")?.cast(&DataType::Float64)?;
+    let low = df.column("low")?.cast(&DataType::Float64)?;
+    let vol = df.column("vol")?.cast(&DataType::Float64)?;
+    let amount = df.column("amount")?.cast(&DataType::Float64)?;
 
     // 获取时间单位信息
     let time_unit = dt_col.time_unit();
 
     let len = df.height();
     let mut bars = Vec::with_capacity(len);
-    for i in 0..len {
-        // 时间戳数值
-        let ts = dt_col.phys.get(i).unwrap();
-        // 根据时间单位转换为纳秒
+    // 同一标的的连续行共享同一个 symbol Arc，避免每行各分配一份字符串
+    let mut cur_symbol: Option<Symbol> = None;
+    let rows = symbol_col
+        .iter()
+        .zip(dt_col.phys.iter())
+        .zip(open.f64()?.iter())
+        .zip(close.f64()?.iter())
+        .zip(high.f64()?.iter())
+        .zip(low.f64()?.iter())
+        .zip(vol.f64()?.iter())
+        .zip(amount.f64()?.iter());
+    for (i, (((((((sym, ts), open), close), high), low), vol), amount)) in rows.enumerate() {
+        let sym = sym.unwrap_or("");
+        if cur_symbol.as_deref() != Some(sym) {
+            cur_symbol = Some(Symbol::from(sym));
+        }
+        let symbol = cur_symbol.clone().unwrap_or_else(|| Symbol::from(""));
+        // 时间戳数值，根据时间单位转换为纳秒
+        let ts = ts.with_context(|| format!("第 {i} 行 dt 为空"))?;
         let ns = match time_unit {
             TimeUnit::Milliseconds => ts * 1_000_000,
             TimeUnit::Microseconds => ts * 1_000,
@@ -495,18 +510,19 @@ pub fn format_standard_kline(df: DataFrame, freq: Freq) -> Result<Vec<RawBar>, A
         };
         let dt_utc = DateTime::<Utc>::from_timestamp_nanos(ns);
 
-        // TODO 是否检查df有没有Nan?
+        let value =
+            |v: Option<f64>, name: &str| v.with_context(|| format!("第 {i} 行 {name} 为空"));
         let bar = RawBarBuilder::default()
-            .symbol(symbol_col.get(i).unwrap_or(""))
+            .symbol(symbol)
             .id(i as i32)
             .dt(dt_utc)
             .freq(freq)
-            .open(open_col.get(i).unwrap())
-            .close(close_col.get(i).unwrap())
-            .high(high_col.get(i).unwrap())
-            .low(low_col.get(i).unwrap())
-            .vol(vol_col.get(i).unwrap())
-            .amount(amount_col.get(i).unwrap())
+            .open(value(open, "open")?)
+            .close(value(close, "close")?)
+            .high(value(high, "high")?)
+            .low(value(low, "low")?)
+            .vol(value(vol, "vol")?)
+            .amount(value(amount, "amount")?)
             .build()
             .context("Failed to create raw bar")?;
 
@@ -515,3 +531,46 @@ pub fn format_standard_kline(df: DataFrame, freq: Freq) -> Result<Vec<RawBar>, A
 
     Ok(bars)
 }
+
+/// `format_standard_kline` 的逆操作：把 RawBar 序列按标准 8 列布局
+/// （symbol / dt / open / close / high / low / vol / amount）组装为 DataFrame。
+///
+/// dt 列为无时区的 `Datetime(ns)`，数值列为 `f64`，可直接经 Arrow 交给 pandas。
+pub fn raw_bars_to_df(bars: &[RawBar]) -> Result<DataFrame, AnalyzeErorr> {
+    let n = bars.len();
+    let mut symbol = Vec::with_capacity(n);
+    let mut dt = Vec::with_capacity(n);
+    let mut open = Vec::with_capacity(n);
+    let mut close = Vec::with_capacity(n);
+    let mut high = Vec::with_capacity(n);
+    let mut low = Vec::with_capacity(n);
+    let mut vol = Vec::with_capacity(n);
+    let mut amount = Vec::with_capacity(n);
+    for bar in bars {
+        symbol.push(&*bar.symbol);
+        dt.push(
+            bar.dt
+                .timestamp_nanos_opt()
+                .with_context(|| format!("dt 超出纳秒时间戳范围: {}", bar.dt))?,
+        );
+        open.push(bar.open);
+        close.push(bar.close);
+        high.push(bar.high);
+        low.push(bar.low);
+        vol.push(bar.vol);
+        amount.push(bar.amount);
+    }
+
+    let dt = Column::new("dt".into(), dt).cast(&DataType::Datetime(TimeUnit::Nanoseconds, None))?;
+    let df = DataFrame::new(vec![
+        Column::new("symbol".into(), symbol),
+        dt,
+        Column::new("open".into(), open),
+        Column::new("close".into(), close),
+        Column::new("high".into(), high),
+        Column::new("low".into(), low),
+        Column::new("vol".into(), vol),
+        Column::new("amount".into(), amount),
+    ])?;
+    Ok(df)
+}
@@ -1,7 +1,7 @@
 #[cfg(feature = "python")]
 use std::str::FromStr;
 
-use strum_macros::{AsRefStr, Display, EnumIter, EnumString};
+use strum_macros::{AsRefStr, Display, EnumCount, EnumIter, EnumString};
 
 #[cfg(feature = "python")]
 use pyo3_stub_gen::derive::{gen_stub_pyclass_enum, gen_stub_pymethods};
@@ -28,6 +28,7 @@ use pyo3::{IntoPyObject, Py};
     Clone,
     Copy,
     PartialEq,
+    EnumCount,
     EnumIter,
     EnumString,
     AsRefStr,
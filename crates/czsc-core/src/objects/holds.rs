@@ -0,0 +1,341 @@
+//! 持仓快照（holds）的游程编码存储。
+//!
+//! `Position` 原先每根 bar 向 `holds` 追加一条 `HoldRecord`（dt / pos / price / n1b），
+//! 长周期、多仓位回放时内存随 bar 数 × 仓位数线性增长。这里拆成两部分：
+//!
+//! - [`PriceTape`]：逐 bar 的 `(dt, price)`。引擎级共享时由执行器每根 bar 写入一次，
+//!   所有仓位只记录下标；独立使用的 `Position` 持有私有价格带。
+//! - [`HoldStore`]：仓位的持仓游程（连续下标、同一持仓方向为一段），只在仓位变化或
+//!   出现断档时新增一段，内存随交易次数而非 bar 数增长。
+//!
+//! `n1b` 不再存储，展开时按相邻两条持仓记录的价格现算，口径与逐条记录时一致。
+
+use std::sync::{Arc, RwLock, RwLockReadGuard, RwLockWriteGuard};
+
+use chrono::{DateTime, FixedOffset};
+
+use super::position::{HoldColumns, HoldRecord, Pos};
+
+/// 逐 bar 的 `(dt, price)` 序列，按时间递增追加。
+#[derive(Debug, Default, Clone)]
+pub struct PriceTape {
+    dt: Vec<DateTime<FixedOffset>>,
+    price: Vec<f64>,
+}
+
+/// 多个仓位共享的价格带。
+pub type SharedPriceTape = Arc<RwLock<PriceTape>>;
+
+impl PriceTape {
+    /// 新建一条可在仓位间共享的价格带。
+    pub fn shared() -> SharedPriceTape {
+        Arc::new(RwLock::new(PriceTape::default()))
+    }
+
+    /// 向共享价格带追加一根 bar（执行器在更新各仓位前调用）。
+    pub fn push_shared(tape: &SharedPriceTape, dt: DateTime<FixedOffset>, price: f64) {
+        write(tape).push(dt, price);
+    }
+
+    /// 追加一根 bar；与最后一根时间、价格都相同的 bar 不重复写入。
+    pub fn push(&mut self, dt: DateTime<FixedOffset>, price: f64) {
+        if self.dt.last() == Some(&dt) && self.price.last() == Some(&price) {
+            return;
+        }
+        self.dt.push(dt);
+        self.price.push(price);
+    }
+
+    pub fn len(&self) -> usize {
+        self.dt.len()
+    }
+
+    pub fn is_empty(&self) -> bool {
+        self.dt.is_empty()
+    }
+
+    /// 查找 `(dt, price)` 所在下标：先比对最后一根，再二分。
+    fn find(&self, dt: DateTime<FixedOffset>, price: f64) -> Option<usize> {
+        let idx = match self.dt.last() {
+            Some(last) if *last == dt => self.dt.len() - 1,
+            _ => self.dt.binary_search(&dt).ok()?,
+        };
+        (self.price[idx] == price).then_some(idx)
+    }
+}
+
+fn read(tape: &RwLock<PriceTape>) -> RwLockReadGuard<'_, PriceTape> {
+    tape.read().unwrap_or_else(|e| e.into_inner())
+}
+
+fn write(tape: &RwLock<PriceTape>) -> RwLockWriteGuard<'_, PriceTape> {
+    tape.write().unwrap_or_else(|e| e.into_inner())
+}
+
+/// 价格带上下标连续、持仓方向相同的一段持仓。
+#[derive(Debug, Clone, Copy)]
+struct HoldRun {
+    start: u32,
+    len: u32,
+    pos: Pos,
+}
+
+/// 仓位的持仓快照存储：价格带 + 持仓游程。
+#[derive(Debug)]
+pub struct HoldStore {
+    tape: SharedPriceTape,
+    /// 价格带由外部（执行器）写入；否则由本仓位私有并自行写入
+    shared: bool,
+    runs: Vec<HoldRun>,
+    count: usize,
+}
+
+impl Default for HoldStore {
+    fn default() -> Self {
+        Self {
+            tape: PriceTape::shared(),
+            shared: false,
+            runs: Vec::new(),
+            count: 0,
+        }
+    }
+}
+
+impl Clone for HoldStore {
+    /// 私有价格带深拷贝，避免两个仓位向同一条价格带写入；共享价格带只拷贝句柄。
+    fn clone(&self) -> Self {
+        let tape = if self.shared {
+            Arc::clone(&self.tape)
+        } else {
+            Arc::new(RwLock::new(read(&self.tape).clone()))
+        };
+        Self {
+            tape,
+            shared: self.shared,
+            runs: self.runs.clone(),
+            count: self.count,
+        }
+    }
+}
+
+impl HoldStore {
+    /// 由逐条记录构建（热启动快照恢复用），使用私有价格带。
+    pub fn from_records(records: Vec<HoldRecord>) -> Self {
+        let mut store = Self::default();
+        for r in records {
+            store.record(r.dt, r.price, r.pos);
+        }
+        store
+    }
+
+    /// 挂到执行器共享的价格带上；仅在尚无持仓记录时生效，返回是否挂载成功。
+    pub fn attach(&mut self, tape: &SharedPriceTape) -> bool {
+        if self.count > 0 {
+            return Arc::ptr_eq(&self.tape, tape);
+        }
+        self.tape = Arc::clone(tape);
+        self.shared = true;
+        true
+    }
+
+    /// 持仓记录条数（等于仓位经历的 bar 数）
+    pub fn len(&self) -> usize {
+        self.count
+    }
+
+    pub fn is_empty(&self) -> bool {
+        self.count == 0
+    }
+
+    /// 记录当前 bar 的持仓。
+    ///
+    /// 共享价格带要求执行器已写入本根 bar；找不到时退回私有价格带，保证结果正确。
+    pub fn record(&mut self, dt: DateTime<FixedOffset>, price: f64, pos: Pos) {
+        let idx = if self.shared {
+            match read(&self.tape).find(dt, price) {
+                Some(idx) => idx,
+                None => {
+                    self.detach();
+                    return self.record(dt, price, pos);
+                }
+            }
+        } else {
+            let mut tape = write(&self.tape);
+            tape.push(dt, price);
+            tape.len() - 1
+        } as u32;
+
+        match self.runs.last_mut() {
+            Some(run) if run.pos == pos && run.start + run.len == idx => run.len += 1,
+            _ => self.runs.push(HoldRun {
+                start: idx,
+                len: 1,
+                pos,
+            }),
+        }
+        self.count += 1;
+    }
+
+    /// 把已记录的持仓复制到私有价格带，之后自行写入。
+    fn detach(&mut self) {
+        let mut own = PriceTape::default();
+        let mut runs = Vec::with_capacity(self.runs.len());
+        {
+            let tape = read(&self.tape);
+            for run in &self.runs {
+                let start = own.len() as u32;
+                for i in run.start..run.start + run.len {
+                    own.dt.push(tape.dt[i as usize]);
+                    own.price.push(tape.price[i as usize]);
+                }
+                runs.push(HoldRun { start, ..*run });
+            }
+        }
+        self.tape = Arc::new(RwLock::new(own));
+        self.shared = false;
+        self.runs = runs;
+    }
+
+    /// 按时间顺序展开每条持仓记录 `(dt, pos, price, n1b)`，不构造中间 Vec。
+    pub fn for_each(&self, mut f: impl FnMut(DateTime<FixedOffset>, Pos, f64, Option<f64>)) {
+        let tape = read(&self.tape);
+        let mut prev: Option<(DateTime<FixedOffset>, Pos, f64)> = None;
+        for run in &self.runs {
+            for i in run.start..run.start + run.len {
+                let (dt, price) = (tape.dt[i as usize], tape.price[i as usize]);
+                if let Some((pdt, ppos, pprice)) = prev {
+                    let n1b = (pprice > 0.0).then(|| (price / pprice - 1.0) * 10000.0);
+                    f(pdt, ppos, pprice, n1b);
+                }
+                prev = Some((dt, run.pos, price));
+            }
+        }
+        if let Some((dt, pos, price)) = prev {
+            f(dt, pos, price, None);
+        }
+    }
+
+    /// 展开为逐条记录（热启动快照导出用）。
+    pub fn to_records(&self) -> Vec<HoldRecord> {
+        let mut records = Vec::with_capacity(self.count);
+        self.for_each(|dt, pos, price, n1b| {
+            records.push(HoldRecord {
+                dt,
+                pos,
+                price,
+                n1b,
+            })
+        });
+        records
+    }
+
+    /// 展开为列式数据，供构造 holds DataFrame。
+    pub fn to_columns(&self) -> HoldColumns {
+        let mut cols = HoldColumns::default();
+        cols.dt.reserve(self.count);
+        cols.pos.reserve(self.count);
+        cols.price.reserve(self.count);
+        cols.n1b.reserve(self.count);
+        self.for_each(|dt, pos, price, n1b| {
+            cols.dt.push(dt.naive_local());
+            cols.pos.push(pos.to_f64() as i32);
+            cols.price.push(price);
+            cols.n1b.push(n1b);
+        });
+        cols
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use chrono::TimeZone;
+
+    fn dt(i: i64) -> DateTime<FixedOffset> {
+        FixedOffset::east_opt(8 * 3600)
+            .unwrap()
+            .timestamp_opt(1_700_000_000 + i * 60, 0)
+            .unwrap()
+    }
+
+    /// 逐条记录的旧口径：每条新记录回填上一条的 n1b
+    fn naive_records(bars: &[(i64, f64, Pos)]) -> Vec<HoldRecord> {
+        let mut out: Vec<HoldRecord> = Vec::new();
+        for &(i, price, pos) in bars {
+            if let Some(last) = out.last_mut()
+                && last.price > 0.0
+            {
+                last.n1b = Some((price / last.price - 1.0) * 10000.0);
+            }
+            out.push(HoldRecord {
+                dt: dt(i),
+                pos,
+                price,
+                n1b: None,
+            });
+        }
+        out
+    }
+
+    fn assert_same(a: &[HoldRecord], b: &[HoldRecord]) {
+        assert_eq!(a.len(), b.len());
+        for (x, y) in a.iter().zip(b) {
+            assert_eq!((x.dt, x.pos, x.price, x.n1b), (y.dt, y.pos, y.price, y.n1b));
+        }
+    }
+
+    #[test]
+    fn test_own_tape_matches_naive_records() {
+        let bars: Vec<(i64, f64, Pos)> = (0..50)
+            .map(|i| {
+                let pos = match i / 7 % 3 {
+                    0 => Pos::Flat,
+                    1 => Pos::Long,
+                    _ => Pos::Short,
+                };
+                (i, 10.0 + (i % 5) as f64, pos)
+            })
+            .collect();
+        let mut store = HoldStore::default();
+        for &(i, price, pos) in &bars {
+            store.record(dt(i), price, pos);
+        }
+        assert_eq!(store.len(), 50);
+        assert!(store.runs.len() < 10);
+        assert_same(&store.to_records(), &naive_records(&bars));
+        assert_same(
+            &HoldStore::from_records(store.to_records()).to_records(),
+            &store.to_records(),
+        );
+    }
+
+    #[test]
+    fn test_shared_tape_with_gaps_and_detach() {
+        let tape = PriceTape::shared();
+        let mut a = HoldStore::default();
+        let mut b = HoldStore::default();
+        assert!(a.attach(&tape) && b.attach(&tape));
+
+        let mut seen_b = Vec::new();
+        for i in 0..20 {
+            let price = 10.0 + i as f64;
+            PriceTape::push_shared(&tape, dt(i), price);
+            a.record(dt(i), price, Pos::Long);
+            // b 跳过部分 bar，游程在断档处断开
+            if i % 6 != 3 {
+                b.record(dt(i), price, Pos::Flat);
+                seen_b.push((i, price, Pos::Flat));
+            }
+        }
+        assert_eq!(a.runs.len(), 1);
+        assert_eq!(b.len(), seen_b.len());
+        assert_same(&b.to_records(), &naive_records(&seen_b));
+
+        // 价格带中不存在的 bar：退回私有价格带，历史记录保持不变
+        b.record(dt(100), 99.0, Pos::Short);
+        seen_b.push((100, 99.0, Pos::Short));
+        assert!(!b.shared);
+        assert_same(&b.to_records(), &naive_records(&seen_b));
+        assert_eq!(read(&tape).len(), 20);
+    }
+}
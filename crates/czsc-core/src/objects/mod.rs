@@ -11,6 +11,7 @@ pub mod event;
 pub mod fake_bi;
 pub mod freq;
 pub mod fx;
+pub mod holds;
 pub mod mark;
 pub mod market;
 pub mod operate;
@@ -14,9 +14,11 @@ use std::fs;
 use std::path::{Path, PathBuf};
 use std::rc::Rc;
 use std::str::FromStr;
+use std::sync::atomic::{AtomicU64, Ordering};
 use std::time::Instant;
 
 use super::event::Event;
+use super::holds::{HoldStore, SharedPriceTape};
 use super::operate::Operate;
 use super::signal::{ANY, Signal};
 
@@ -116,9 +118,16 @@ pub struct PositionUpdateProfile {
 
 const ANY_CODE: i32 = -1;
 const UNKNOWN_CODE: i32 = 0;
+/// 共享符号表中不存在的取值编码：运行期取值永远不会编码成它，对应子句恒不匹配。
+const NEVER_CODE: i32 = i32::MIN;
+/// 共享符号表中不存在的 key：信号帧里没有该下标，对应子句恒不匹配。
+const MISSING_KEY_ID: usize = usize::MAX;
 
-#[derive(Debug, Clone, Copy)]
-struct EncodedSignalValue {
+static NEXT_SIGNAL_TABLE_UID: AtomicU64 = AtomicU64::new(1);
+
+/// 编码后的信号取值：v1/v2/v3 为符号表内的取值编码，`score` 为原始分数。
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+pub struct EncodedSignalValue {
     v1_code: i32,
     v2_code: i32,
     v3_code: i32,
@@ -131,7 +140,7 @@ struct CachedEncodedSignalValue {
     encoded: EncodedSignalValue,
 }
 
-#[derive(Debug, Clone, Copy)]
+#[derive(Debug, Clone, Copy, PartialEq, Eq, Hash)]
 struct EncodedSignalClause {
     key_id: usize,
     v1_code: i32,
@@ -147,16 +156,29 @@ struct CompiledEventMatcher {
     signals_not: Vec<EncodedSignalClause>,
 }
 
+/// 信号符号表：把事件引用到的信号 key 映射为稠密下标，把 v1/v2/v3 取值映射为整数编码。
+///
+/// 每个 Position 的字符串匹配路径各自持有一份私有符号表；执行引擎编译计划时
+/// 用 [`SignalSymbolTable::from_positions`] 为全部仓位构建一份共享符号表，信号
+/// 按 `(key_id, EncodedSignalValue)` 写入 [`SignalFrame`]，再由
+/// [`Position::update_profiled_with_signal_frame`] 按下标直接匹配，不再逐 bar 拼接、哈希字符串。
 #[derive(Debug, Clone, Default)]
-struct PositionEventMatcher {
+pub struct SignalSymbolTable {
+    uid: u64,
     keys: Vec<String>,
     key_to_id: HashMap<String, usize>,
     value_to_code: HashMap<String, i32>,
-    events: Vec<CompiledEventMatcher>,
 }
 
-impl PositionEventMatcher {
-    fn key_id(&mut self, key: String) -> usize {
+/// 编译事件子句时解析 key / 取值编码的方式：私有符号表边编译边登记，
+/// 共享符号表只读查询。
+trait ClauseResolver {
+    fn resolve_key(&mut self, key: String) -> usize;
+    fn resolve_value(&mut self, v: &str) -> i32;
+}
+
+impl ClauseResolver for SignalSymbolTable {
+    fn resolve_key(&mut self, key: String) -> usize {
         if let Some(id) = self.key_to_id.get(key.as_str()) {
             return *id;
         }
@@ -166,7 +188,7 @@ impl PositionEventMatcher {
         id
     }
 
-    fn value_code(&mut self, v: &str) -> i32 {
+    fn resolve_value(&mut self, v: &str) -> i32 {
         if v == ANY {
             return ANY_CODE;
         }
@@ -177,6 +199,61 @@ impl PositionEventMatcher {
         self.value_to_code.insert(v.to_string(), code);
         code
     }
+}
+
+struct FrozenSymbolTable<'a>(&'a SignalSymbolTable);
+
+impl ClauseResolver for FrozenSymbolTable<'_> {
+    fn resolve_key(&mut self, key: String) -> usize {
+        self.0.key_id(&key).unwrap_or(MISSING_KEY_ID)
+    }
+
+    fn resolve_value(&mut self, v: &str) -> i32 {
+        if v == ANY {
+            return ANY_CODE;
+        }
+        self.0.value_to_code.get(v).copied().unwrap_or(NEVER_CODE)
+    }
+}
+
+impl SignalSymbolTable {
+    /// 汇总一组仓位全部事件引用到的信号 key 与取值，构建共享符号表。
+    pub fn from_positions<'a>(positions: impl IntoIterator<Item = &'a Position>) -> Self {
+        let mut table = Self {
+            uid: NEXT_SIGNAL_TABLE_UID.fetch_add(1, Ordering::Relaxed),
+            ..Self::default()
+        };
+        for position in positions {
+            compile_events(position, &mut table);
+        }
+        table
+    }
+
+    /// 符号表内 key 的数量，即信号帧的宽度。
+    pub fn len(&self) -> usize {
+        self.keys.len()
+    }
+
+    pub fn is_empty(&self) -> bool {
+        self.keys.is_empty()
+    }
+
+    /// 按 key_id 顺序排列的信号 key。
+    pub fn keys(&self) -> &[String] {
+        &self.keys
+    }
+
+    pub fn key_id(&self, key: &str) -> Option<usize> {
+        self.key_to_id.get(key).copied()
+    }
+
+    /// 创建与本符号表等宽的空信号帧。
+    pub fn new_frame(&self) -> SignalFrame {
+        SignalFrame {
+            table_uid: self.uid,
+            values: vec![None; self.keys.len()],
+        }
+    }
 
     fn parse_v123_score(v: &str) -> Option<(&str, &str, &str, i32)> {
         let mut it = v.splitn(4, '_');
@@ -187,50 +264,176 @@ impl PositionEventMatcher {
         Some((v1, v2, v3, score))
     }
 
-    fn compile_signal_clause(&mut self, signal: &Signal) -> Option<EncodedSignalClause> {
-        let key_id = self.key_id(signal.key());
-        let value = signal.value();
-        let (v1, v2, v3, score) = Self::parse_v123_score(value.as_str())?;
-        Some(EncodedSignalClause {
-            key_id,
-            v1_code: self.value_code(v1),
-            v2_code: self.value_code(v2),
-            v3_code: self.value_code(v3),
-            min_score: score,
-        })
+    #[inline]
+    fn encode_parts(&self, v1: &str, v2: &str, v3: &str, score: i32) -> EncodedSignalValue {
+        let code = |v: &str| self.value_to_code.get(v).copied().unwrap_or(UNKNOWN_CODE);
+        EncodedSignalValue {
+            v1_code: code(v1),
+            v2_code: code(v2),
+            v3_code: code(v3),
+            score,
+        }
     }
 
-    fn compile_from_position(position: &Position) -> Self {
-        let mut matcher = Self::default();
-        matcher
-            .events
-            .reserve(position.opens.len() + position.exits.len());
-        for e in position.opens.iter().chain(position.exits.iter()) {
-            let mut all = Vec::with_capacity(e.signals_all.len());
-            let mut any = Vec::with_capacity(e.signals_any.len());
-            let mut not = Vec::with_capacity(e.signals_not.len());
-            for s in &e.signals_all {
-                if let Some(c) = matcher.compile_signal_clause(s) {
-                    all.push(c);
-                }
-            }
-            for s in &e.signals_any {
-                if let Some(c) = matcher.compile_signal_clause(s) {
-                    any.push(c);
-                }
-            }
-            for s in &e.signals_not {
-                if let Some(c) = matcher.compile_signal_clause(s) {
-                    not.push(c);
-                }
+    /// 编码 `v1_v2_v3_score` 形式的原始取值；格式不合法时返回 `None`（视同缺失）。
+    fn encode_raw_value(&self, raw: &str) -> Option<EncodedSignalValue> {
+        let (v1, v2, v3, score) = Self::parse_v123_score(raw)?;
+        Some(self.encode_parts(v1, v2, v3, score))
+    }
+
+    /// 把一个信号编码为 `(key_id, 取值)`；key 不在符号表中时返回 `None`。
+    ///
+    /// `key_buf` 为调用方复用的 key 拼接缓冲区。取值编码与字符串路径
+    /// （`sig.value()` 再按 `_` 切分）逐位一致，格式不合法时取值为 `None`。
+    pub fn encode_signal(
+        &self,
+        sig: &Signal,
+        key_buf: &mut String,
+    ) -> Option<(usize, Option<EncodedSignalValue>)> {
+        sig.write_key(key_buf);
+        let key_id = self.key_id(key_buf)?;
+        let (v1, v2, v3, score) = sig.value_parts();
+        let encoded = if v1.contains('_') || v2.contains('_') || v3.contains('_') {
+            // 取值自身含下划线时按字符串路径的切分口径处理
+            self.encode_raw_value(&sig.value())
+        } else {
+            Some(self.encode_parts(v1, v2, v3, score))
+        };
+        Some((key_id, encoded))
+    }
+}
+
+/// 逐 bar 的稠密信号帧，下标为 [`SignalSymbolTable`] 中的 key_id。
+#[derive(Debug, Clone, Default)]
+pub struct SignalFrame {
+    table_uid: u64,
+    values: Vec<Option<EncodedSignalValue>>,
+}
+
+impl SignalFrame {
+    /// 清空本 bar 的全部信号取值，保留容量。
+    pub fn clear(&mut self) {
+        self.values.fill(None);
+    }
+
+    #[inline]
+    pub fn set(&mut self, key_id: usize, value: Option<EncodedSignalValue>) {
+        if let Some(slot) = self.values.get_mut(key_id) {
+            *slot = value;
+        }
+    }
+
+    #[inline]
+    pub fn get(&self, key_id: usize) -> Option<EncodedSignalValue> {
+        self.values.get(key_id).copied().flatten()
+    }
+
+    /// 编码并写入一个信号，返回该信号 key 是否在符号表中。
+    pub fn insert_signal(
+        &mut self,
+        table: &SignalSymbolTable,
+        sig: &Signal,
+        key_buf: &mut String,
+    ) -> bool {
+        match table.encode_signal(sig, key_buf) {
+            Some((key_id, value)) => {
+                self.set(key_id, value);
+                true
             }
-            matcher.events.push(CompiledEventMatcher {
-                signals_all: all,
-                signals_any: any,
-                signals_not: not,
-            });
+            None => false,
+        }
+    }
+}
+
+fn compile_signal_clause<R: ClauseResolver>(
+    resolver: &mut R,
+    signal: &Signal,
+) -> Option<EncodedSignalClause> {
+    let key_id = resolver.resolve_key(signal.key());
+    let value = signal.value();
+    let (v1, v2, v3, score) = SignalSymbolTable::parse_v123_score(value.as_str())?;
+    Some(EncodedSignalClause {
+        key_id,
+        v1_code: resolver.resolve_value(v1),
+        v2_code: resolver.resolve_value(v2),
+        v3_code: resolver.resolve_value(v3),
+        min_score: score,
+    })
+}
+
+/// 按固定顺序 opens + exits 编译全部事件子句。
+fn compile_events<R: ClauseResolver>(
+    position: &Position,
+    resolver: &mut R,
+) -> Vec<CompiledEventMatcher> {
+    let mut events = Vec::with_capacity(position.opens.len() + position.exits.len());
+    for e in position.opens.iter().chain(position.exits.iter()) {
+        let mut compile = |signals: &[Signal]| {
+            signals
+                .iter()
+                .filter_map(|s| compile_signal_clause(resolver, s))
+                .collect::<Vec<_>>()
+        };
+        let signals_all = compile(&e.signals_all);
+        let signals_any = compile(&e.signals_any);
+        let signals_not = compile(&e.signals_not);
+        events.push(CompiledEventMatcher {
+            signals_all,
+            signals_any,
+            signals_not,
+        });
+    }
+    events
+}
+
+#[inline]
+fn value_match(value: EncodedSignalValue, c: EncodedSignalClause) -> bool {
+    value.score >= c.min_score
+        && (c.v1_code == ANY_CODE || c.v1_code == value.v1_code)
+        && (c.v2_code == ANY_CODE || c.v2_code == value.v2_code)
+        && (c.v3_code == ANY_CODE || c.v3_code == value.v3_code)
+}
+
+#[inline]
+fn clause_match(values: &[Option<EncodedSignalValue>], c: EncodedSignalClause) -> bool {
+    values
+        .get(c.key_id)
+        .and_then(|v| *v)
+        .is_some_and(|value| value_match(value, c))
+}
+
+/// 返回第一个命中的事件下标（opens 在前、exits 在后）。
+fn find_first_event(
+    events: &[CompiledEventMatcher],
+    values: &[Option<EncodedSignalValue>],
+) -> Option<usize> {
+    for (idx, evt) in events.iter().enumerate() {
+        if evt.signals_not.iter().any(|c| clause_match(values, *c)) {
+            continue;
+        }
+        if evt.signals_all.iter().any(|c| !clause_match(values, *c)) {
+            continue;
+        }
+        if !evt.signals_any.is_empty() && !evt.signals_any.iter().any(|c| clause_match(values, *c))
+        {
+            continue;
         }
-        matcher
+        return Some(idx);
+    }
+    None
+}
+
+#[derive(Debug, Clone, Default)]
+struct PositionEventMatcher {
+    table: SignalSymbolTable,
+    events: Vec<CompiledEventMatcher>,
+}
+
+impl PositionEventMatcher {
+    fn compile_from_position(position: &Position) -> Self {
+        let mut table = SignalSymbolTable::default();
+        let events = compile_events(position, &mut table);
+        Self { table, events }
     }
 
     #[inline]
@@ -243,7 +446,7 @@ impl PositionEventMatcher {
         for v in values.iter_mut() {
             *v = None;
         }
-        for (key_id, key) in self.keys.iter().enumerate() {
+        for (key_id, key) in self.table.keys.iter().enumerate() {
             if let Some(raw) = signal_map.get(key.as_str()) {
                 if let Some(Some(cached)) = cache.get(key_id)
                     && cached.raw == *raw
@@ -252,16 +455,7 @@ impl PositionEventMatcher {
                     continue;
                 }
 
-                if let Some((v1, v2, v3, score)) = Self::parse_v123_score(raw) {
-                    let v1_code = self.value_to_code.get(v1).copied().unwrap_or(UNKNOWN_CODE);
-                    let v2_code = self.value_to_code.get(v2).copied().unwrap_or(UNKNOWN_CODE);
-                    let v3_code = self.value_to_code.get(v3).copied().unwrap_or(UNKNOWN_CODE);
-                    let encoded = EncodedSignalValue {
-                        v1_code,
-                        v2_code,
-                        v3_code,
-                        score,
-                    };
+                if let Some(encoded) = self.table.encode_raw_value(raw) {
                     values[key_id] = Some(encoded);
                     if let Some(slot) = cache.get_mut(key_id) {
                         *slot = Some(CachedEncodedSignalValue {
@@ -276,18 +470,6 @@ impl PositionEventMatcher {
         }
     }
 
-    #[inline]
-    fn clause_match(values: &[Option<EncodedSignalValue>], c: EncodedSignalClause) -> bool {
-        if let Some(value) = values.get(c.key_id).and_then(|v| *v) {
-            value.score >= c.min_score
-                && (c.v1_code == ANY_CODE || c.v1_code == value.v1_code)
-                && (c.v2_code == ANY_CODE || c.v2_code == value.v2_code)
-                && (c.v3_code == ANY_CODE || c.v3_code == value.v3_code)
-        } else {
-            false
-        }
-    }
-
     fn find_first_match(
         &self,
         signal_map: &HashMap<String, String>,
@@ -295,32 +477,198 @@ impl PositionEventMatcher {
         cache: &mut [Option<CachedEncodedSignalValue>],
     ) -> Option<usize> {
         self.encode_runtime_values_inplace(signal_map, values, cache);
-        for (idx, evt) in self.events.iter().enumerate() {
-            if evt
-                .signals_not
-                .iter()
-                .any(|c| Self::clause_match(values, *c))
-            {
-                continue;
-            }
-            if evt
-                .signals_all
-                .iter()
-                .any(|c| !Self::clause_match(values, *c))
-            {
-                continue;
+        find_first_event(&self.events, values)
+    }
+}
+
+/// 针对某张共享符号表编译的事件匹配器，子句下标直接指向 [`SignalFrame`]。
+#[derive(Debug, Clone)]
+struct FrameEventMatcher {
+    table_uid: u64,
+    events: Vec<CompiledEventMatcher>,
+}
+
+#[inline]
+fn bit_get(bits: &[u64], i: u32) -> bool {
+    bits[(i >> 6) as usize] & (1u64 << (i & 63)) != 0
+}
+
+#[inline]
+fn bit_set(bits: &mut [u64], i: u32) {
+    bits[(i >> 6) as usize] |= 1u64 << (i & 63);
+}
+
+/// 去重后的事件：子句以 [`SharedEventMatcher`] 内的子句编号表示。
+#[derive(Debug, Clone, PartialEq, Eq, Hash)]
+struct SharedEvent {
+    all: Vec<u32>,
+    any: Vec<u32>,
+    not: Vec<u32>,
+}
+
+impl SharedEvent {
+    #[inline]
+    fn is_match(&self, clause_hits: &[u64]) -> bool {
+        !self.not.iter().any(|&c| bit_get(clause_hits, c))
+            && self.all.iter().all(|&c| bit_get(clause_hits, c))
+            && (self.any.is_empty() || self.any.iter().any(|&c| bit_get(clause_hits, c)))
+    }
+}
+
+/// 一根 bar 上 [`SharedEventMatcher::evaluate`] 的求值结果：子句与事件命中位图。
+#[derive(Debug, Clone, Default)]
+pub struct EventHits {
+    clauses: Vec<u64>,
+    events: Vec<u64>,
+    any_event: bool,
+}
+
+/// 执行计划级的共享事件匹配器。
+///
+/// 全部仓位的 `signals_all / any / not` 子句按共享符号表编码后去重编号，相同的事件
+/// 也只保留一份。每根 bar 先按信号帧逐 key 求值一次子句命中位图，再求值各去重事件，
+/// 各仓位只需按自身事件编号查位图；本 bar 无事件命中时直接跳过。事件匹配成本随
+/// 去重后的子句数增长，而不是随仓位数线性增长。
+#[derive(Debug, Clone, Default)]
+pub struct SharedEventMatcher {
+    table_uid: u64,
+    /// 去重子句，按 key_id 排序，编号即下标
+    clauses: Vec<EncodedSignalClause>,
+    /// `(key_id, start, end)`：同一 key 的子句在 `clauses` 中的区间
+    key_groups: Vec<(usize, u32, u32)>,
+    events: Vec<SharedEvent>,
+    /// 各仓位按 opens + exits 顺序的事件编号
+    positions: Vec<Vec<u32>>,
+}
+
+impl SharedEventMatcher {
+    /// 基于共享符号表编译一组仓位的事件，仓位下标与 `positions` 顺序一致。
+    pub fn compile<'a>(
+        table: &SignalSymbolTable,
+        positions: impl IntoIterator<Item = &'a Position>,
+    ) -> Self {
+        let compiled: Vec<Vec<CompiledEventMatcher>> = positions
+            .into_iter()
+            .map(|p| compile_events(p, &mut FrozenSymbolTable(table)))
+            .collect();
+
+        let mut clauses: Vec<EncodedSignalClause> = compiled
+            .iter()
+            .flatten()
+            .flat_map(|e| {
+                e.signals_all
+                    .iter()
+                    .chain(&e.signals_any)
+                    .chain(&e.signals_not)
+            })
+            .copied()
+            .collect::<HashSet<_>>()
+            .into_iter()
+            .collect();
+        clauses.sort_by_key(|c| (c.key_id, c.v1_code, c.v2_code, c.v3_code, c.min_score));
+        let clause_ids: HashMap<EncodedSignalClause, u32> = clauses
+            .iter()
+            .enumerate()
+            .map(|(i, c)| (*c, i as u32))
+            .collect();
+
+        let mut key_groups: Vec<(usize, u32, u32)> = Vec::new();
+        for (i, c) in clauses.iter().enumerate() {
+            match key_groups.last_mut() {
+                Some(g) if g.0 == c.key_id => g.2 = i as u32 + 1,
+                _ if c.key_id == MISSING_KEY_ID => {}
+                _ => key_groups.push((c.key_id, i as u32, i as u32 + 1)),
             }
-            if !evt.signals_any.is_empty()
-                && !evt
-                    .signals_any
+        }
+
+        let ids = |cs: &[EncodedSignalClause]| {
+            let mut v: Vec<u32> = cs.iter().map(|c| clause_ids[c]).collect();
+            v.sort_unstable();
+            v.dedup();
+            v
+        };
+        let mut events: Vec<SharedEvent> = Vec::new();
+        let mut event_ids: HashMap<SharedEvent, u32> = HashMap::new();
+        let positions = compiled
+            .iter()
+            .map(|pos_events| {
+                pos_events
                     .iter()
-                    .any(|c| Self::clause_match(values, *c))
-            {
+                    .map(|e| {
+                        let evt = SharedEvent {
+                            all: ids(&e.signals_all),
+                            any: ids(&e.signals_any),
+                            not: ids(&e.signals_not),
+                        };
+                        *event_ids.entry(evt.clone()).or_insert_with(|| {
+                            events.push(evt);
+                            events.len() as u32 - 1
+                        })
+                    })
+                    .collect()
+            })
+            .collect();
+
+        Self {
+            table_uid: table.uid,
+            clauses,
+            key_groups,
+            events,
+            positions,
+        }
+    }
+
+    /// 仓位数量。
+    pub fn position_count(&self) -> usize {
+        self.positions.len()
+    }
+
+    /// `slot` 号仓位的事件数量（opens + exits）。
+    pub fn event_count(&self, slot: usize) -> usize {
+        self.positions.get(slot).map_or(0, Vec::len)
+    }
+
+    /// 去重后的子句数与事件数。
+    pub fn unique_counts(&self) -> (usize, usize) {
+        (self.clauses.len(), self.events.len())
+    }
+
+    /// 对本 bar 的信号帧求值全部子句与事件，结果写入 `hits`（复用其缓冲区）。
+    pub fn evaluate(&self, frame: &SignalFrame, hits: &mut EventHits) {
+        debug_assert_eq!(frame.table_uid, self.table_uid, "信号帧与符号表不匹配");
+        hits.clauses.clear();
+        hits.clauses.resize(self.clauses.len().div_ceil(64), 0);
+        hits.events.clear();
+        hits.events.resize(self.events.len().div_ceil(64), 0);
+        hits.any_event = false;
+
+        for &(key_id, start, end) in &self.key_groups {
+            let Some(value) = frame.get(key_id) else {
                 continue;
+            };
+            for id in start..end {
+                if value_match(value, self.clauses[id as usize]) {
+                    bit_set(&mut hits.clauses, id);
+                }
+            }
+        }
+        for (id, evt) in self.events.iter().enumerate() {
+            if evt.is_match(&hits.clauses) {
+                bit_set(&mut hits.events, id as u32);
+                hits.any_event = true;
             }
-            return Some(idx);
         }
-        None
+    }
+
+    /// `slot` 号仓位第一个命中的事件下标（opens 在前、exits 在后）。
+    #[inline]
+    pub fn first_match(&self, slot: usize, hits: &EventHits) -> Option<usize> {
+        if !hits.any_event {
+            return None;
+        }
+        self.positions[slot]
+            .iter()
+            .position(|&id| bit_get(&hits.events, id))
     }
 }
 
@@ -462,7 +810,7 @@ pub struct Position {
     #[serde(skip)]
     pub operates: Vec<OperateRecord>,
     #[serde(skip)]
-    holds: Vec<HoldRecord>,
+    holds: HoldStore,
     /// -1 空, 0 空仓, 1 多
     #[serde(skip)]
     pos: Pos,
@@ -474,6 +822,8 @@ pub struct Position {
     event_match_values: Vec<Option<EncodedSignalValue>>,
     #[serde(skip)]
     event_match_cache: Vec<Option<CachedEncodedSignalValue>>,
+    #[serde(skip)]
+    frame_matcher: Option<FrameEventMatcher>,
 }
 
 /// Position 运行时决策状态的独立快照通道。
@@ -508,6 +858,7 @@ impl Position {
         self.event_matcher = None;
         self.event_match_values.clear();
         self.event_match_cache.clear();
+        self.frame_matcher = None;
     }
 
     /// 规范化运行时字段，确保事件名称、匹配缓存与 Python 基线一致。
@@ -525,6 +876,23 @@ impl Position {
         self.pos_changed
     }
 
+    /// 按时间顺序遍历逐 bar 持仓记录 `(dt, pos, price, n1b)`，不构造 DataFrame
+    pub fn for_each_hold(&self, f: impl FnMut(DateTime<FixedOffset>, Pos, f64, Option<f64>)) {
+        self.holds.for_each(f);
+    }
+
+    /// 逐 bar 持仓记录条数
+    pub fn hold_count(&self) -> usize {
+        self.holds.len()
+    }
+
+    /// 挂到执行器共享的逐 bar 价格带上，之后只记录持仓变化点。
+    ///
+    /// 调用方须在每根 bar 更新仓位前先写入价格带；仅在尚无持仓记录时生效。
+    pub fn attach_price_tape(&mut self, tape: &SharedPriceTape) -> bool {
+        self.holds.attach(tape)
+    }
+
     /// 导出运行时决策状态（热启动快照用，独立于配置序列化通道）。
     pub fn export_runtime_state(&self) -> PositionRuntimeState {
         PositionRuntimeState {
@@ -533,13 +901,13 @@ impl Position {
             temp_state: self.temp_state.clone(),
             last_event: self.last_event.clone(),
             operates: self.operates.clone(),
-            holds: self.holds.clone(),
+            holds: self.holds.to_records(),
         }
     }
 
     /// 导入运行时决策状态（热启动 restore 用）。
     ///
-    /// 仅覆盖运行时字段；`event_matcher` 与匹配缓存清空，后续首次 update
+    /// 仅覆盖运行时字段；`event_matcher` / `frame_matcher` 与匹配缓存清空，后续首次 update
     /// 时由 `ensure_event_matcher` 基于 opens/exits 懒重建，与连续喂 bar 路径一致。
     pub fn import_runtime_state(&mut self, state: PositionRuntimeState) {
         self.pos = state.pos;
@@ -547,10 +915,11 @@ impl Position {
         self.temp_state = state.temp_state;
         self.last_event = state.last_event;
         self.operates = state.operates;
-        self.holds = state.holds;
+        self.holds = HoldStore::from_records(state.holds);
         self.event_matcher = None;
         self.event_match_values.clear();
         self.event_match_cache.clear();
+        self.frame_matcher = None;
     }
 
     fn normalize_event_hash_names(&mut self) {
@@ -562,8 +931,8 @@ impl Position {
     fn ensure_event_matcher(&mut self) {
         if self.event_matcher.is_none() {
             let matcher = PositionEventMatcher::compile_from_position(self);
-            self.event_match_values = vec![None; matcher.keys.len()];
-            self.event_match_cache = vec![None; matcher.keys.len()];
+            self.event_match_values = vec![None; matcher.table.len()];
+            self.event_match_cache = vec![None; matcher.table.len()];
             self.event_matcher = Some(matcher);
         }
     }
@@ -692,29 +1061,9 @@ impl Position {
         last_signals: Option<Rc<RefCell<HashSet<Signal>>>>,
         signal_map: Option<&HashMap<String, String>>,
     ) -> PositionUpdateProfile {
-        if let Some(ref temp_state) = self.temp_state {
-            if temp_state.end_dt >= last_bar.dt {
-                warn!(
-                    "请检查信号传入：最新信号时间: {} 在上次信号时间 {} 之前",
-                    last_bar.dt, temp_state.end_dt
-                );
-                return PositionUpdateProfile::default();
-            }
-        } else {
-            // 初始化
-            self.temp_state = Some(TempState {
-                end_dt: last_bar.dt,
-                last_lo_dt: None,
-                last_so_dt: None,
-            });
+        if !self.begin_update(&last_bar) {
+            return PositionUpdateProfile::default();
         }
-        let dt = last_bar.dt.fixed_offset();
-        let price = last_bar.price;
-        let bar_id = last_bar.id;
-
-        self.pos_changed = false;
-        let mut op = Operate::HO;
-        let mut op_desc: Option<String> = None;
 
         let t_event = Instant::now();
         let owned_signal_map;
@@ -735,13 +1084,119 @@ impl Position {
         };
         // 事件匹配: 固定顺序 opens + exits（与 Python self.events = self.opens + self.exits 对齐）
         self.ensure_event_matcher();
-        if let Some(matcher) = self.event_matcher.as_ref()
-            && let Some(event_idx) = matcher.find_first_match(
+        let matched = match self.event_matcher.as_ref() {
+            Some(matcher) => matcher.find_first_match(
                 signal_map,
                 &mut self.event_match_values,
                 &mut self.event_match_cache,
-            )
+            ),
+            None => None,
+        };
+        let event_match_ns = t_event.elapsed().as_nanos();
+
+        self.apply_matched_event(last_bar, matched, event_match_ns)
+    }
+
+    /// 用共享符号表编码的信号帧更新持仓，语义与 [`Self::update_profiled_with_signal_map`] 一致。
+    ///
+    /// `frame` 必须由同一张 `table` 创建；首次调用（或符号表变更）时按该符号表
+    /// 编译本仓位的事件子句，之后每根 bar 只做按下标的整数比较。
+    pub fn update_profiled_with_signal_frame(
+        &mut self,
+        last_bar: LiteBar,
+        table: &SignalSymbolTable,
+        frame: &SignalFrame,
+    ) -> PositionUpdateProfile {
+        if !self.begin_update(&last_bar) {
+            return PositionUpdateProfile::default();
+        }
+        debug_assert_eq!(frame.table_uid, table.uid, "信号帧与符号表不匹配");
+
+        let t_event = Instant::now();
+        if self
+            .frame_matcher
+            .as_ref()
+            .is_none_or(|m| m.table_uid != table.uid)
         {
+            let events = compile_events(self, &mut FrozenSymbolTable(table));
+            self.frame_matcher = Some(FrameEventMatcher {
+                table_uid: table.uid,
+                events,
+            });
+        }
+        let matched = self
+            .frame_matcher
+            .as_ref()
+            .and_then(|m| find_first_event(&m.events, &frame.values));
+        let event_match_ns = t_event.elapsed().as_nanos();
+
+        self.apply_matched_event(last_bar, matched, event_match_ns)
+    }
+
+    /// 用计划级 [`SharedEventMatcher`] 本 bar 的求值结果更新持仓，语义与
+    /// [`Self::update_profiled_with_signal_frame`] 一致。
+    ///
+    /// `slot` 为本仓位在匹配器中的下标，`hits` 须由 [`SharedEventMatcher::evaluate`]
+    /// 在本 bar 的信号帧上求得；共享求值的耗时由调用方计入 profile。
+    pub fn update_profiled_with_event_hits(
+        &mut self,
+        last_bar: LiteBar,
+        matcher: &SharedEventMatcher,
+        slot: usize,
+        hits: &EventHits,
+    ) -> PositionUpdateProfile {
+        if !self.begin_update(&last_bar) {
+            return PositionUpdateProfile::default();
+        }
+        debug_assert_eq!(
+            matcher.event_count(slot),
+            self.opens.len() + self.exits.len(),
+            "仓位与共享事件匹配器不匹配"
+        );
+
+        let t_event = Instant::now();
+        let matched = matcher.first_match(slot, hits);
+        let event_match_ns = t_event.elapsed().as_nanos();
+
+        self.apply_matched_event(last_bar, matched, event_match_ns)
+    }
+
+    /// 校验信号时间单调并在首次调用时初始化 `temp_state`；时间倒退时返回 `false`，本次更新应忽略。
+    fn begin_update(&mut self, last_bar: &LiteBar) -> bool {
+        if let Some(ref temp_state) = self.temp_state {
+            if temp_state.end_dt >= last_bar.dt {
+                warn!(
+                    "请检查信号传入：最新信号时间: {} 在上次信号时间 {} 之前",
+                    last_bar.dt, temp_state.end_dt
+                );
+                return false;
+            }
+        } else {
+            // 初始化
+            self.temp_state = Some(TempState {
+                end_dt: last_bar.dt,
+                last_lo_dt: None,
+                last_so_dt: None,
+            });
+        }
+        self.pos_changed = false;
+        true
+    }
+
+    /// 按事件匹配结果推进开平仓状态机、风控出场与持仓快照。
+    fn apply_matched_event(
+        &mut self,
+        last_bar: LiteBar,
+        matched: Option<usize>,
+        event_match_ns: u128,
+    ) -> PositionUpdateProfile {
+        let dt = last_bar.dt.fixed_offset();
+        let price = last_bar.price;
+        let bar_id = last_bar.id;
+
+        let mut op = Operate::HO;
+        let mut op_desc: Option<String> = None;
+        if let Some(event_idx) = matched {
             let e = if event_idx < self.opens.len() {
                 &self.opens[event_idx]
             } else {
@@ -750,7 +1205,6 @@ impl Position {
             op = e.operate;
             op_desc = Some(e.name.to_string());
         }
-        let event_match_ns = t_event.elapsed().as_nanos();
 
         let t_fsm = Instant::now();
         // 更新 temp_state.end_dt 为当前信号时间
@@ -907,19 +1361,8 @@ impl Position {
 
         let t_holds = Instant::now();
         // Python L1072: self.holds.append({"dt": self.end_dt, "pos": self.pos, "price": price})
-        if let Some(last_hold) = self.holds.last_mut()
-            && last_hold.price > 0.0
-        {
-            let n1b_value = (price / last_hold.price - 1.0) * 10000.0;
-            last_hold.n1b = Some(n1b_value);
-        }
-
-        self.holds.push(HoldRecord {
-            dt,
-            pos: self.pos,
-            price,
-            n1b: None,
-        });
+        // 游程编码存储，n1b 在展开时按相邻记录计算
+        self.holds.record(dt, price, self.pos);
         let holds_ns = t_holds.elapsed().as_nanos();
 
         PositionUpdateProfile {
@@ -930,7 +1373,8 @@ impl Position {
         }
     }
 
-    pub fn pairs(&self) -> anyhow::Result<DataFrame> {
+    /// 按开平仓配对的交易记录（列式），[`Position::pairs`] 在此基础上构造 DataFrame。
+    pub fn trade_pairs(&self) -> TradePairsColumns<'_> {
         let mut trade_pairs = TradePairsColumns::default();
         for (op1, op2) in self.operates.iter().zip(self.operates.iter().skip(1)) {
             if op1.op != Operate::LO && op1.op != Operate::SO {
@@ -984,7 +1428,11 @@ impl Position {
                 yield_profit_ratio.map(|r| (r * 10000.0 * 100.0).round() / 100.0);
             trade_pairs.yield_profit_ratio.push(yield_profit_ratio_bp);
         }
+        trade_pairs
+    }
 
+    pub fn pairs(&self) -> anyhow::Result<DataFrame> {
+        let trade_pairs = self.trade_pairs();
         let df = df![
             "标的代码" => trade_pairs.symbol,
             "策略标记" => trade_pairs.strategy_mark,
@@ -1004,10 +1452,9 @@ impl Position {
     }
 
     pub fn holds(&self) -> anyhow::Result<DataFrame> {
-        let holds = self.holds.clone();
-        let holds = HoldColumns::from_records(holds);
-
-        let df = holds
+        let df = self
+            .holds
+            .to_columns()
             .into_df()?
             .lazy()
             .with_columns([
@@ -1210,12 +1657,13 @@ impl PyPosition {
             temp_state: None,
             pos_changed: false,
             operates: Vec::new(),
-            holds: Vec::new(),
+            holds: HoldStore::default(),
             pos: Pos::Flat,
             last_event: None,
             event_matcher: None,
             event_match_values: Vec::new(),
             event_match_cache: Vec::new(),
+            frame_matcher: None,
         };
         let mut inner = inner;
         inner.init_runtime_fields();
@@ -1591,7 +2039,7 @@ impl PyPosition {
         Python::attach(|py| {
             let list = pyo3::types::PyList::empty(py);
 
-            for hold_record in &self.inner.holds {
+            for hold_record in self.inner.holds.to_records() {
                 let record = pyo3::types::PyDict::new(py);
 
                 // 转换时间戳为 Python datetime 兼容格式
@@ -2081,12 +2529,13 @@ impl PyPosition {
                 temp_state: None,
                 pos_changed: false,
                 operates: Vec::new(),
-                holds: Vec::new(),
+                holds: HoldStore::default(),
                 pos: Pos::Flat,
                 last_event: None,
                 event_matcher: None,
                 event_match_values: Vec::new(),
                 event_match_cache: Vec::new(),
+                frame_matcher: None,
             };
             let mut inner = inner;
             inner.init_runtime_fields();
@@ -130,6 +130,33 @@ impl<'a> SignalRef<'a> {
         format!("{}_{}_{}_{}", self.v1, self.v2, self.v3, self.score)
     }
 
+    /// 把信号 key 写入复用缓冲区，结果与 [`Self::key`] 一致但不分配新字符串。
+    pub fn write_key(&self, buf: &mut String) {
+        buf.clear();
+        let mut first = true;
+        for k in [&self.k1, &self.k2, &self.k3] {
+            if k.as_ref() != ANY {
+                if !first {
+                    buf.push('_');
+                }
+                buf.push_str(k);
+                first = false;
+            }
+        }
+    }
+
+    /// 把信号 value 写入复用缓冲区，结果与 [`Self::value`] 一致但不分配新字符串。
+    pub fn write_value(&self, buf: &mut String) {
+        use std::fmt::Write;
+        buf.clear();
+        let _ = write!(buf, "{}_{}_{}_{}", self.v1, self.v2, self.v3, self.score);
+    }
+
+    /// 信号取值的各组成部分 `(v1, v2, v3, score)`，免去 [`Self::value`] 的格式化开销。
+    pub fn value_parts(&self) -> (&str, &str, &str, i32) {
+        (&self.v1, &self.v2, &self.v3, self.score)
+    }
+
     /// 按照Python逻辑实现信号匹配
     pub fn is_match(&self, signal_dict: &std::collections::HashMap<String, String>) -> bool {
         let key = self.key();
@@ -25,8 +25,11 @@ use crate::objects::position::{PyLiteBar, PyPos, PyPosition};
 use crate::objects::signal::{PyParsedSignalDoc, PySignal, parse_signal_doc_py};
 use crate::objects::zs::ZS;
 use crate::utils::common::create_naive_pandas_timestamp;
+use polars::prelude::{IpcReader, SerReader};
+use pyo3::exceptions::PyValueError;
 use pyo3::types::{PyDict, PyDictMethods};
 use pyo3_stub_gen::derive::gen_stub_pyfunction;
+use std::io::Cursor;
 
 /// 对 `analyze::utils::check_fx` 的 Python 友好的薄 wrapper。
 #[gen_stub_pyfunction]
@@ -80,6 +83,19 @@ fn format_standard_kline_py(bars: Vec<RawBar>) -> Vec<RawBar> {
     bars
 }
 
+/// 从 Arrow IPC 字节流批量构造 RawBar 列表，是 Python 端 `format_standard_kline` 的快路径。
+/// 列约定与 `CZSC.from_dataframe` 一致；同一标的的 bar 共享一个 symbol，id 按行号递增。
+#[gen_stub_pyfunction]
+#[pyfunction]
+#[pyo3(name = "format_standard_kline_bytes")]
+fn format_standard_kline_bytes_py(df_bytes: &[u8], freq: Freq) -> PyResult<Vec<RawBar>> {
+    let df = IpcReader::new(Cursor::new(df_bytes))
+        .finish()
+        .map_err(|e| PyValueError::new_err(format!("Arrow bytes 转 DataFrame 失败: {e}")))?;
+    analyze_utils::format_standard_kline(df, freq)
+        .map_err(|e| PyValueError::new_err(format!("K线标准化格式错误: {e}")))
+}
+
 /// 将分型序列转换为虚拟笔；非法的非交替分型返回 ValueError。
 #[gen_stub_pyfunction]
 #[pyfunction]
@@ -189,6 +205,7 @@ pub fn register(_py: Python<'_>, m: &Bound<'_, PyModule>) -> PyResult<()> {
     m.add_function(wrap_pyfunction!(check_bi_py, m)?)?;
     m.add_function(wrap_pyfunction!(remove_include_py, m)?)?;
     m.add_function(wrap_pyfunction!(format_standard_kline_py, m)?)?;
+    m.add_function(wrap_pyfunction!(format_standard_kline_bytes_py, m)?)?;
     m.add_function(wrap_pyfunction!(create_fake_bis_py, m)?)?;
     m.add_function(wrap_pyfunction!(get_zs_seq_py, m)?)?;
     m.add_function(wrap_pyfunction!(is_symmetry_zs_py, m)?)?;
@@ -155,3 +155,37 @@ fn format_standard_kline_builds_raw_bars_from_dataframe() {
     assert_eq!(&*bars[0].symbol, "000001");
     assert_eq!(bars[0].freq, Freq::F30);
 }
+
+#[test]
+fn format_standard_kline_shares_symbol_and_casts_integer_columns() {
+    use polars::prelude::*;
+
+    let df = df! {
+        "symbol" => ["000001", "000001", "000002"],
+        "dt"     => [1_700_000_000_000i64, 1_700_001_800_000, 1_700_003_600_000],
+        "open"   => [10.0_f64, 10.5, 11.0],
+        "close"  => [10.5_f64, 11.0, 10.8],
+        "high"   => [11.0_f64, 11.5, 11.2],
+        "low"    => [9.5_f64, 10.0, 10.5],
+        "vol"    => [100i64, 200, 150],
+        "amount" => [1000i64, 2000, 1500],
+    }
+    .unwrap()
+    .lazy()
+    .with_column(
+        col("dt")
+            .cast(DataType::Datetime(TimeUnit::Milliseconds, None))
+            .alias("dt"),
+    )
+    .collect()
+    .unwrap();
+
+    let bars: Vec<RawBar> = format_standard_kline(df, Freq::F30).unwrap();
+    assert_eq!(bars.len(), 3);
+    // 同一标的的连续行共享同一个 symbol 分配
+    assert!(Arc::ptr_eq(&bars[0].symbol, &bars[1].symbol));
+    assert_eq!(&*bars[2].symbol, "000002");
+    assert_eq!(bars[1].vol, 200.0);
+    assert_eq!(bars[2].amount, 1500.0);
+    assert_eq!(bars.iter().map(|b| b.id).collect::<Vec<_>>(), vec![0, 1, 2]);
+}
@@ -186,3 +186,22 @@ fn min_bi_len_affects_bi_count() {
         );
     }
 }
+
+/// 同 dt 的 K 线重复推送（盘中快照）走“弹出 last_ubi 并接管其 elements”的路径，
+/// 对完全相同的重放，最终的 bars_ubi / bi_list 必须与一次性批量构造完全一致。
+#[test]
+fn replaying_same_dt_bars_matches_batch_construction() {
+    let bars = seeded_bars(7, 400);
+    let batch = CZSC::new(bars.clone(), 50, 6);
+
+    let mut stream = CZSC::new(bars[..1].to_vec(), 50, 6);
+    for bar in &bars[1..] {
+        stream.update_bar(bar.clone());
+        stream.update_bar(bar.clone());
+    }
+
+    assert!(!batch.bi_list.is_empty());
+    assert_eq!(stream.bars_raw, batch.bars_raw);
+    assert_eq!(stream.bars_ubi, batch.bars_ubi);
+    assert_eq!(stream.bi_list, batch.bi_list);
+}
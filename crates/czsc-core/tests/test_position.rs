@@ -2,7 +2,15 @@
 //! get_pos / get_pos_changed defaults, normalises event hashes via
 //! normalize_runtime_fields, and Pos enum's f64 round-trip works.
 
-use czsc_core::objects::position::{Pos, Position};
+use std::collections::HashMap;
+use std::str::FromStr;
+
+use chrono::TimeZone;
+use czsc_core::objects::event::Event;
+use czsc_core::objects::position::{
+    EventHits, LiteBar, Pos, Position, SharedEventMatcher, SignalSymbolTable,
+};
+use czsc_core::objects::signal::Signal;
 
 #[test]
 fn pos_default_is_flat() {
@@ -60,3 +68,161 @@ fn position_get_pos_starts_flat() {
     assert_eq!(p.get_pos(), Pos::Flat);
     assert!(!p.get_pos_changed());
 }
+
+fn signal_event(operate: czsc_core::objects::operate::Operate, signal: &str) -> Event {
+    Event {
+        operate,
+        signals_all: vec![Signal::from_str(signal).unwrap()],
+        signals_any: vec![],
+        signals_not: vec![],
+        name: String::new(),
+        sha256: String::new(),
+    }
+}
+
+fn event_position() -> Position {
+    use czsc_core::objects::operate::Operate;
+    let mut p: Position = serde_json::from_str(POSITION_JSON).unwrap();
+    p.opens = vec![signal_event(Operate::LO, "30分钟_D1_前高_看多_强_任意_60")];
+    p.exits = vec![signal_event(Operate::LE, "30分钟_D1_前高_看空_任意_任意_0")];
+    p.timeout = 1000;
+    p.stop_loss = 10_000.0;
+    p.normalize_runtime_fields();
+    p
+}
+
+#[test]
+fn signal_frame_matching_agrees_with_signal_map() {
+    let values = [
+        "看多_强_其他_50",
+        "看多_强_其他_70",
+        "其他_其他_其他_0",
+        "看空_弱_其他_0",
+        "看多_强_x_y_80",
+        "看多_强_其他_90",
+    ];
+    let mut by_map = event_position();
+    let mut by_frame = event_position();
+    let table = SignalSymbolTable::from_positions([&by_frame]);
+    let mut frame = table.new_frame();
+    let mut key_buf = String::new();
+    let base = chrono::FixedOffset::east_opt(8 * 3600)
+        .unwrap()
+        .with_ymd_and_hms(2024, 1, 2, 9, 30, 0)
+        .unwrap();
+
+    for (i, value) in values.iter().enumerate() {
+        let bar = LiteBar {
+            id: i as i32,
+            dt: base + chrono::Duration::days(i as i64),
+            price: 10.0 + i as f64,
+        };
+        let sig = Signal::from_str(&format!("30分钟_D1_前高_{value}")).ok();
+        let mut signal_map = HashMap::new();
+        frame.clear();
+        if let Some(sig) = &sig {
+            signal_map.insert(sig.key(), sig.value());
+            assert!(frame.insert_signal(&table, sig, &mut key_buf));
+        }
+        by_map.update_profiled_with_signal_map(bar, None, Some(&signal_map));
+        by_frame.update_profiled_with_signal_frame(bar, &table, &frame);
+        assert_eq!(by_map.get_pos(), by_frame.get_pos(), "bar {i}");
+    }
+
+    let ops = |p: &Position| {
+        p.operates
+            .iter()
+            .map(|o| (o.bar_id, o.op))
+            .collect::<Vec<_>>()
+    };
+    assert_eq!(ops(&by_map), ops(&by_frame));
+    assert_eq!(ops(&by_frame).len(), 3);
+}
+
+#[test]
+fn signal_table_ignores_keys_not_referenced_by_events() {
+    let p = event_position();
+    let table = SignalSymbolTable::from_positions([&p]);
+    assert_eq!(table.keys(), ["30分钟_D1_前高".to_string()]);
+    let mut frame = table.new_frame();
+    let mut key_buf = String::new();
+    let other = Signal::from_str("日线_D1_趋势_看多_强_任意_0").unwrap();
+    assert!(!frame.insert_signal(&table, &other, &mut key_buf));
+    assert_eq!(frame.get(0), None);
+}
+
+#[test]
+fn shared_event_matcher_agrees_with_signal_frame() {
+    use czsc_core::objects::operate::Operate;
+    let sig = |s: &str| Signal::from_str(s).unwrap();
+    let mut guarded = event_position();
+    guarded.name = "guarded".to_string();
+    guarded.opens[0].signals_not = vec![sig("日线_D1_趋势_看空_任意_任意_0")];
+    let mut any_open = event_position();
+    any_open.name = "any_open".to_string();
+    any_open.opens = vec![Event {
+        operate: Operate::SO,
+        signals_all: vec![],
+        signals_any: vec![
+            sig("30分钟_D1_前高_看空_任意_任意_0"),
+            sig("日线_D1_趋势_看空_强_任意_0"),
+        ],
+        signals_not: vec![],
+        name: String::new(),
+        sha256: String::new(),
+    }];
+    any_open.exits = vec![signal_event(Operate::SE, "30分钟_D1_前高_看多_任意_任意_0")];
+    any_open.normalize_runtime_fields();
+    let positions = vec![event_position(), guarded, any_open, event_position()];
+
+    let table = SignalSymbolTable::from_positions(&positions);
+    let matcher = SharedEventMatcher::compile(&table, &positions);
+    assert_eq!(matcher.position_count(), 4);
+    // 两个 event_position 的事件完全相同，只编译一份
+    assert_eq!(matcher.unique_counts(), (5, 5));
+
+    let mut by_frame = positions.clone();
+    let mut by_hits = positions;
+    let mut frame = table.new_frame();
+    let mut hits = EventHits::default();
+    let mut key_buf = String::new();
+    let base = chrono::FixedOffset::east_opt(8 * 3600)
+        .unwrap()
+        .with_ymd_and_hms(2024, 1, 2, 9, 30, 0)
+        .unwrap();
+    let bars = [
+        ("看多_强_其他_70", "看多_强_其他_0"),
+        ("看多_强_其他_70", "看空_强_其他_0"),
+        ("看空_弱_其他_0", "看多_强_其他_0"),
+        ("看多_强_其他_90", "看空_弱_其他_0"),
+        ("其他_其他_其他_0", "看空_强_其他_0"),
+        ("看多_弱_其他_0", "其他_其他_其他_0"),
+    ];
+    for (i, (v30, vd)) in bars.iter().enumerate() {
+        let bar = LiteBar {
+            id: i as i32,
+            dt: base + chrono::Duration::days(i as i64),
+            price: 10.0 + i as f64,
+        };
+        frame.clear();
+        frame.insert_signal(&table, &sig(&format!("30分钟_D1_前高_{v30}")), &mut key_buf);
+        frame.insert_signal(&table, &sig(&format!("日线_D1_趋势_{vd}")), &mut key_buf);
+        matcher.evaluate(&frame, &mut hits);
+        for (slot, (a, b)) in by_frame.iter_mut().zip(by_hits.iter_mut()).enumerate() {
+            a.update_profiled_with_signal_frame(bar, &table, &frame);
+            b.update_profiled_with_event_hits(bar, &matcher, slot, &hits);
+            assert_eq!(a.get_pos(), b.get_pos(), "bar {i} slot {slot}");
+        }
+    }
+
+    let ops = |p: &Position| {
+        p.operates
+            .iter()
+            .map(|o| (o.bar_id, o.op))
+            .collect::<Vec<_>>()
+    };
+    for (a, b) in by_frame.iter().zip(&by_hits) {
+        assert_eq!(ops(a), ops(b));
+    }
+    assert!(by_hits.iter().any(|p| !p.operates.is_empty()));
+}
@@ -49,6 +49,7 @@ fn _native(py: Python<'_>, m: &Bound<'_, PyModule>) -> PyResult<()> {
     m.add_function(wrap_pyfunction!(trader::api::run_backtest, m)?)?;
     m.add_function(wrap_pyfunction!(trader::api::run_optimize, m)?)?;
     m.add_function(wrap_pyfunction!(trader::research::run_research, m)?)?;
+    m.add_function(wrap_pyfunction!(trader::research::run_research_batch, m)?)?;
     m.add_function(wrap_pyfunction!(trader::research::run_replay, m)?)?;
     m.add_function(wrap_pyfunction!(trader::research::run_optimize_batch, m)?)?;
     m.add_function(wrap_pyfunction!(
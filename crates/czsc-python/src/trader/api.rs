@@ -3,7 +3,7 @@ use pyo3::prelude::*;
 use pyo3::types::{PyBytes, PyDict, PyList};
 use rust_xlsxwriter::Workbook;
 use serde_json::{Value, json};
-use std::collections::{BTreeSet, HashMap, HashSet};
+use std::collections::{HashMap, HashSet};
 use std::fs;
 use std::path::{Path, PathBuf};
 
@@ -14,7 +14,11 @@ use czsc_core::objects::bar::RawBar;
 use czsc_core::objects::freq::Freq;
 use czsc_core::objects::position::{Position, PyPosition};
 use czsc_signals::registry::list_all_signals as list_all_registered_signals;
+use czsc_trader::bar_source::{BarSource, DirBarSource};
 use czsc_trader::engine_v2::{ExecutionPlan, ExecutionPlanInput, UnifiedExecEngine};
+use czsc_trader::optim_output::{
+    DEFAULT_PARTITIONS, OptimOutput, OutputKind, PartitionedOutput, PerFileOutput, read_partitioned,
+};
 use czsc_trader::optimize::{
     get_exit_optim_positions, get_open_optim_positions, symbols_optim_parallel,
 };
@@ -30,28 +34,9 @@ fn write_df_parquet(path: &Path, mut df: DataFrame) -> PyResult<()> {
     Ok(())
 }
 
-pub(crate) fn build_signals_dataframe(rows: &[HashMap<String, String>]) -> PyResult<DataFrame> {
-    let mut keys: BTreeSet<String> = BTreeSet::new();
-    for r in rows {
-        keys.extend(r.keys().cloned());
-    }
-    if !keys.contains("cache") {
-        keys.insert("cache".to_string());
-    }
-
-    let mut cols: Vec<Column> = Vec::new();
-    for k in keys {
-        let vals: Vec<Option<String>> = if k == "cache" {
-            rows.iter().map(|_| Some("{}".to_string())).collect()
-        } else {
-            rows.iter().map(|r| r.get(&k).cloned()).collect()
-        };
-        cols.push(Series::new(k.as_str().into(), vals).into_column());
-    }
-    DataFrame::new(cols)
-        .map_err(|e| PyRuntimeError::new_err(format!("构建 signals DataFrame 失败: {e}")))
-}
-
+/// 对齐 Python 基线：`sdt` 当根 bar 未进入右侧输出时，在信号表头部补一行该 bar 的基础字段。
+///
+/// `df` 为 [`czsc_trader::engine_v2::SignalColumns`] 产出的强类型信号表。
 fn align_signals_python_baseline(
     mut df: DataFrame,
     cutoff: Option<DateTime<Utc>>,
@@ -72,39 +57,43 @@ fn align_signals_python_baseline(
         return Ok(df);
     }
 
-    let cutoff_dt = cutoff_bar.dt.to_rfc3339();
-    let dt_col = df
+    let cutoff_ns = cutoff_bar.dt.timestamp_nanos_opt().unwrap_or_default();
+    let dt_ns = df
         .column("dt")
+        .and_then(|c| c.cast(&DataType::Int64))
         .map_err(|e| PyRuntimeError::new_err(format!("读取 signals.dt 失败: {e}")))?;
-    let has_cutoff = dt_col
-        .str()
+    let has_cutoff = dt_ns
+        .i64()
         .map_err(|e| PyRuntimeError::new_err(format!("signals.dt 类型错误: {e}")))?
         .into_iter()
-        .any(|x| x == Some(cutoff_dt.as_str()));
+        .any(|x| x == Some(cutoff_ns));
     if has_cutoff {
         return Ok(df);
     }
 
+    let err = |name: &str, e: PolarsError| {
+        PyRuntimeError::new_err(format!("补齐 signals 列 {name} 失败: {e}"))
+    };
     let mut head = df.slice(0, 1);
-    let base_cols: Vec<(&str, String)> = vec![
-        ("symbol", cutoff_bar.symbol.to_string()),
-        ("id", cutoff_bar.id.to_string()),
-        ("dt", cutoff_dt),
-        ("freq", cutoff_bar.freq.to_string()),
-        ("open", cutoff_bar.open.to_string()),
-        ("close", cutoff_bar.close.to_string()),
-        ("high", cutoff_bar.high.to_string()),
-        ("low", cutoff_bar.low.to_string()),
-        ("vol", cutoff_bar.vol.to_string()),
-        ("amount", cutoff_bar.amount.to_string()),
-        ("cache", "{}".to_string()),
+    let base_cols = [
+        Column::new("symbol".into(), [cutoff_bar.symbol.to_string()]),
+        Column::new("id".into(), [cutoff_bar.id as i64]),
+        Column::new("dt".into(), [cutoff_ns])
+            .cast(&DataType::Datetime(TimeUnit::Nanoseconds, None))
+            .map_err(|e| err("dt", e))?,
+        Column::new("freq".into(), [cutoff_bar.freq.to_string()]),
+        Column::new("open".into(), [cutoff_bar.open]),
+        Column::new("close".into(), [cutoff_bar.close]),
+        Column::new("high".into(), [cutoff_bar.high]),
+        Column::new("low".into(), [cutoff_bar.low]),
+        Column::new("vol".into(), [cutoff_bar.vol]),
+        Column::new("amount".into(), [cutoff_bar.amount]),
+        Column::new("cache".into(), ["{}"]),
     ];
-    for (name, value) in base_cols {
-        if head.column(name).is_ok() {
-            head.with_column(Series::new(name.into(), &[Some(value.as_str())]))
-                .map_err(|e| {
-                    PyRuntimeError::new_err(format!("补齐 signals 列 {name} 失败: {e}"))
-                })?;
+    for column in base_cols {
+        let name = column.name().to_string();
+        if head.column(&name).is_ok() {
+            head.with_column(column).map_err(|e| err(&name, e))?;
         }
     }
     head.vstack_mut(&df)
@@ -112,51 +101,6 @@ fn align_signals_python_baseline(
     Ok(head)
 }
 
-pub(crate) fn normalize_signals_dtypes(mut df: DataFrame) -> PyResult<DataFrame> {
-    if df.column("dt").is_ok() {
-        df = df
-            .lazy()
-            .with_column(
-                col("dt")
-                    .str()
-                    .to_datetime(
-                        Some(TimeUnit::Nanoseconds),
-                        None,
-                        StrptimeOptions {
-                            format: Some("%Y-%m-%dT%H:%M:%S%.f%z".into()),
-                            strict: false,
-                            exact: false,
-                            cache: true,
-                        },
-                        lit("raise"),
-                    )
-                    .dt()
-                    .replace_time_zone(None, lit("raise"), NonExistent::Raise),
-            )
-            .collect()
-            .map_err(|e| PyRuntimeError::new_err(format!("signals 列 dt 类型转换失败: {e}")))?;
-    }
-    let casts = [
-        ("id", DataType::Int64),
-        ("open", DataType::Float64),
-        ("close", DataType::Float64),
-        ("high", DataType::Float64),
-        ("low", DataType::Float64),
-        ("vol", DataType::Float64),
-        ("amount", DataType::Float64),
-    ];
-    for (name, dtype) in casts {
-        if df.column(name).is_ok() {
-            let casted = df.column(name).and_then(|s| s.cast(&dtype)).map_err(|e| {
-                PyRuntimeError::new_err(format!("signals 列 {name} 类型转换失败: {e}"))
-            })?;
-            df.with_column(casted)
-                .map_err(|e| PyRuntimeError::new_err(format!("signals 写回列 {name} 失败: {e}")))?;
-        }
-    }
-    Ok(df)
-}
-
 fn combine_pairs_holds_for_backtest(positions: &[Position]) -> PyResult<(DataFrame, DataFrame)> {
     let mut all_pairs = Vec::new();
     let mut all_holds = Vec::new();
@@ -266,22 +210,6 @@ fn combine_pairs_holds_for_backtest(positions: &[Position]) -> PyResult<(DataFra
     Ok((pairs_df, holds_df))
 }
 
-/// 内部从 parquet 文件读取 bars
-fn read_bars_from_file(path: &Path, base_freq: Freq) -> PyResult<Vec<RawBar>> {
-    let file = fs::File::open(path).map_err(|e| {
-        PyValueError::new_err(format!("读取 bars 文件失败 {}: {e}", path.display()))
-    })?;
-    let df = ParquetReader::new(file)
-        .finish()
-        .map_err(|e| PyValueError::new_err(format!("解析 parquet 失败 {}: {e}", path.display())))?;
-    format_standard_kline(df, base_freq).map_err(|e| {
-        PyValueError::new_err(format!(
-            "标准化 K 线失败 {} (freq={base_freq}): {e}",
-            path.display()
-        ))
-    })
-}
-
 fn parse_sdt_utc(s: &str) -> Option<DateTime<Utc>> {
     if s.is_empty() {
         return None;
@@ -625,235 +553,333 @@ fn position_to_opt_dump_repr(p: &Position) -> String {
     )
 }
 
-fn collect_optimize_report_rows(
-    positions: &[Position],
+/// 优化结果落盘布局，对应配置 `output_layout`。
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+enum OutputLayout {
+    Files,
+    Partitioned,
+    Aggregate,
+}
+
+/// 聚合模式下默认补写逐 bar 明细的候选数量
+const AGGREGATE_TOP_K: usize = 10;
+
+/// 读取单个候选仓位在全部标的上的 pairs / holds。
+///
+/// 分区布局只打开该仓位所在的分区文件并按仓位名下推过滤；旧布局逐标的读取小文件。
+fn read_position_outputs(
+    pos: &Position,
     symbols: &[String],
     poss_dir: &Path,
-) -> PyResult<Vec<Value>> {
-    let mut rows: Vec<Value> = Vec::new();
-
-    for pos in positions {
-        let mut pair_lfs = Vec::new();
-        let mut hold_lfs = Vec::new();
+    partitioned: bool,
+) -> PyResult<(Vec<LazyFrame>, Vec<LazyFrame>)> {
+    let mut pair_lfs = Vec::new();
+    let mut hold_lfs = Vec::new();
+
+    if partitioned {
+        let read = |kind| {
+            read_partitioned(poss_dir, kind, &pos.name, DEFAULT_PARTITIONS).map_err(|e| {
+                PyRuntimeError::new_err(format!("读取分区结果失败 {}: {e:#}", pos.name))
+            })
+        };
+        pair_lfs.extend(read(OutputKind::Pairs)?.map(|df| df.lazy()));
+        hold_lfs.extend(read(OutputKind::Holds)?.map(|df| df.lazy()));
+        return Ok((pair_lfs, hold_lfs));
+    }
 
-        for sym in symbols {
-            let sym_dir = poss_dir.join(sym);
-            let pairs_path = sym_dir.join(format!("{}.pairs.parquet", pos.name));
-            let holds_path = sym_dir.join(format!("{}.holds.parquet", pos.name));
+    for sym in symbols {
+        let sym_dir = poss_dir.join(sym);
+        let pairs_path = sym_dir.join(format!("{}.pairs.parquet", pos.name));
+        let holds_path = sym_dir.join(format!("{}.holds.parquet", pos.name));
 
-            if let Some(df) = read_parquet_if_exists(&pairs_path)? {
-                pair_lfs.push(df.lazy());
-            }
-            if let Some(df) = read_parquet_if_exists(&holds_path)? {
-                hold_lfs.push(df.lazy());
-            }
+        if let Some(df) = read_parquet_if_exists(&pairs_path)? {
+            pair_lfs.push(df.lazy());
         }
-
-        if pair_lfs.is_empty() || hold_lfs.is_empty() {
-            continue;
+        if let Some(df) = read_parquet_if_exists(&holds_path)? {
+            hold_lfs.push(df.lazy());
         }
+    }
+    Ok((pair_lfs, hold_lfs))
+}
 
-        let pairs = concat(pair_lfs, UnionArgs::default())
-            .and_then(|lf| lf.collect())
-            .map_err(|e| PyRuntimeError::new_err(format!("合并 pairs 失败: {e}")))?;
-        let holds = concat(hold_lfs, UnionArgs::default())
-            .and_then(|lf| lf.collect())
-            .map_err(|e| PyRuntimeError::new_err(format!("合并 holds 失败: {e}")))?;
+/// 单个候选仓位生成报表行所需的汇总输入。
+struct ReportInputs {
+    profits: Vec<f64>,
+    hold_days: Vec<f64>,
+    hold_bars: Vec<f64>,
+    open_day_profit: HashMap<String, Vec<f64>>,
+    start_time: Option<String>,
+    end_time: Option<String>,
+    symbol_count: i64,
+    total_trades: i64,
+    cross: f64,
+    cross1: f64,
+}
 
-        if pairs.height() == 0 || holds.height() == 0 {
-            continue;
-        }
-        if holds.column("dt").is_err()
-            || holds.column("n1b").is_err()
-            || holds.column("pos").is_err()
-        {
-            continue;
-        }
+/// 由各标的 pairs / holds 文件合并后计算报表输入；数据不足时返回 None。
+fn report_inputs_from_frames(
+    pair_lfs: Vec<LazyFrame>,
+    hold_lfs: Vec<LazyFrame>,
+) -> PyResult<Option<ReportInputs>> {
+    if pair_lfs.is_empty() || hold_lfs.is_empty() {
+        return Ok(None);
+    }
 
-        let cross_df = holds
-            .lazy()
-            .group_by([col("dt")])
-            .agg([
-                ((col("n1b").cast(DataType::Float64) * col("pos").cast(DataType::Float64)).sum()
-                    / (col("pos").neq(lit(0)).cast(DataType::Float64).sum() + lit(1.0)))
-                .alias("cross_ret"),
-                (col("n1b").cast(DataType::Float64) * col("pos").cast(DataType::Float64))
-                    .mean()
-                    .alias("cross1_ret"),
-            ])
-            .select([
-                col("cross_ret").sum().alias("截面等权收益"),
-                col("cross1_ret").sum().alias("截面品种等权"),
-            ])
-            .collect()
-            .map_err(|e| PyRuntimeError::new_err(format!("计算截面统计失败: {e}")))?;
+    let pairs = concat(pair_lfs, UnionArgs::default())
+        .and_then(|lf| lf.collect())
+        .map_err(|e| PyRuntimeError::new_err(format!("合并 pairs 失败: {e}")))?;
+    let holds = concat(hold_lfs, UnionArgs::default())
+        .and_then(|lf| lf.collect())
+        .map_err(|e| PyRuntimeError::new_err(format!("合并 holds 失败: {e}")))?;
 
-        let cross = df_first_f64(&cross_df, "截面等权收益").unwrap_or(0.0);
-        let cross1 = df_first_f64(&cross_df, "截面品种等权").unwrap_or(0.0);
-        let total_trades = pairs.height() as i64;
+    if pairs.height() == 0 || holds.height() == 0 {
+        return Ok(None);
+    }
+    if holds.column("dt").is_err() || holds.column("n1b").is_err() || holds.column("pos").is_err() {
+        return Ok(None);
+    }
 
-        let pairs_enhanced = pairs
-            .lazy()
-            .with_columns([
-                col("开仓时间").dt().strftime("%Y-%m-%d").alias("开仓日"),
-                col("开仓时间")
-                    .dt()
-                    .strftime("%Y-%m-%d %H:%M:%S")
-                    .alias("开仓时间文本"),
-                col("平仓时间")
-                    .dt()
-                    .strftime("%Y-%m-%d %H:%M:%S")
-                    .alias("平仓时间文本"),
-            ])
-            .collect()
-            .map_err(|e| PyRuntimeError::new_err(format!("增强 pairs 字段失败: {e}")))?;
-
-        let profit_casted = pairs_enhanced
-            .column("盈亏比例")
-            .and_then(|s| s.cast(&DataType::Float64))
-            .map_err(|e| PyRuntimeError::new_err(format!("读取盈亏比例失败: {e}")))?;
-        let profit_ca = profit_casted
-            .f64()
-            .map_err(|e| PyRuntimeError::new_err(format!("盈亏比例类型错误: {e}")))?;
-        let profits: Vec<f64> = profit_ca.into_iter().flatten().collect();
-        if profits.is_empty() {
-            continue;
-        }
+    let cross_df = holds
+        .lazy()
+        .group_by([col("dt")])
+        .agg([
+            ((col("n1b").cast(DataType::Float64) * col("pos").cast(DataType::Float64)).sum()
+                / (col("pos").neq(lit(0)).cast(DataType::Float64).sum() + lit(1.0)))
+            .alias("cross_ret"),
+            (col("n1b").cast(DataType::Float64) * col("pos").cast(DataType::Float64))
+                .mean()
+                .alias("cross1_ret"),
+        ])
+        .select([
+            col("cross_ret").sum().alias("截面等权收益"),
+            col("cross1_ret").sum().alias("截面品种等权"),
+        ])
+        .collect()
+        .map_err(|e| PyRuntimeError::new_err(format!("计算截面统计失败: {e}")))?;
+
+    let cross = df_first_f64(&cross_df, "截面等权收益").unwrap_or(0.0);
+    let cross1 = df_first_f64(&cross_df, "截面品种等权").unwrap_or(0.0);
+    let total_trades = pairs.height() as i64;
+
+    let pairs_enhanced = pairs
+        .lazy()
+        .with_columns([
+            col("开仓时间").dt().strftime("%Y-%m-%d").alias("开仓日"),
+            col("开仓时间")
+                .dt()
+                .strftime("%Y-%m-%d %H:%M:%S")
+                .alias("开仓时间文本"),
+            col("平仓时间")
+                .dt()
+                .strftime("%Y-%m-%d %H:%M:%S")
+                .alias("平仓时间文本"),
+        ])
+        .collect()
+        .map_err(|e| PyRuntimeError::new_err(format!("增强 pairs 字段失败: {e}")))?;
+
+    let profit_casted = pairs_enhanced
+        .column("盈亏比例")
+        .and_then(|s| s.cast(&DataType::Float64))
+        .map_err(|e| PyRuntimeError::new_err(format!("读取盈亏比例失败: {e}")))?;
+    let profit_ca = profit_casted
+        .f64()
+        .map_err(|e| PyRuntimeError::new_err(format!("盈亏比例类型错误: {e}")))?;
+    let profits: Vec<f64> = profit_ca.into_iter().flatten().collect();
+    if profits.is_empty() {
+        return Ok(None);
+    }
 
-        let hold_days_casted = pairs_enhanced
-            .column("持仓天数")
-            .and_then(|s| s.cast(&DataType::Float64))
-            .map_err(|e| PyRuntimeError::new_err(format!("读取持仓天数失败: {e}")))?;
-        let hold_days_ca = hold_days_casted
-            .f64()
-            .map_err(|e| PyRuntimeError::new_err(format!("持仓天数类型错误: {e}")))?;
-        let hold_days: Vec<f64> = hold_days_ca.into_iter().flatten().collect();
-
-        let hold_bars_casted = pairs_enhanced
-            .column("持仓K线数")
-            .and_then(|s| s.cast(&DataType::Float64))
-            .map_err(|e| PyRuntimeError::new_err(format!("读取持仓K线数失败: {e}")))?;
-        let hold_bars_ca = hold_bars_casted
-            .f64()
-            .map_err(|e| PyRuntimeError::new_err(format!("持仓K线数类型错误: {e}")))?;
-        let hold_bars: Vec<f64> = hold_bars_ca.into_iter().flatten().collect();
-
-        let start_time = pairs_enhanced
-            .column("开仓时间文本")
-            .ok()
-            .and_then(|s| s.str().ok())
-            .and_then(|ca| ca.into_iter().flatten().map(|x| x.to_string()).min());
-        let end_time = pairs_enhanced
-            .column("平仓时间文本")
-            .ok()
-            .and_then(|s| s.str().ok())
-            .and_then(|ca| ca.into_iter().flatten().map(|x| x.to_string()).max());
-
-        let symbol_count = pairs_enhanced
-            .column("标的代码")
-            .ok()
-            .and_then(|s| s.str().ok())
-            .map(|ca| {
-                let mut ss = HashSet::new();
-                for x in ca.into_iter().flatten() {
-                    ss.insert(x.to_string());
-                }
-                ss.len() as i64
-            })
-            .unwrap_or(0);
-
-        let mut open_day_profit: HashMap<String, Vec<f64>> = HashMap::new();
-        let open_day_ca = pairs_enhanced
-            .column("开仓日")
-            .and_then(|s| s.str())
-            .map_err(|e| PyRuntimeError::new_err(format!("读取开仓日失败: {e}")))?;
-        for i in 0..pairs_enhanced.height() {
-            if let (Some(day), Some(p)) = (open_day_ca.get(i), profit_ca.get(i)) {
-                open_day_profit.entry(day.to_string()).or_default().push(p);
+    let hold_days_casted = pairs_enhanced
+        .column("持仓天数")
+        .and_then(|s| s.cast(&DataType::Float64))
+        .map_err(|e| PyRuntimeError::new_err(format!("读取持仓天数失败: {e}")))?;
+    let hold_days_ca = hold_days_casted
+        .f64()
+        .map_err(|e| PyRuntimeError::new_err(format!("持仓天数类型错误: {e}")))?;
+    let hold_days: Vec<f64> = hold_days_ca.into_iter().flatten().collect();
+
+    let hold_bars_casted = pairs_enhanced
+        .column("持仓K线数")
+        .and_then(|s| s.cast(&DataType::Float64))
+        .map_err(|e| PyRuntimeError::new_err(format!("读取持仓K线数失败: {e}")))?;
+    let hold_bars_ca = hold_bars_casted
+        .f64()
+        .map_err(|e| PyRuntimeError::new_err(format!("持仓K线数类型错误: {e}")))?;
+    let hold_bars: Vec<f64> = hold_bars_ca.into_iter().flatten().collect();
+
+    let start_time = pairs_enhanced
+        .column("开仓时间文本")
+        .ok()
+        .and_then(|s| s.str().ok())
+        .and_then(|ca| ca.into_iter().flatten().map(|x| x.to_string()).min());
+    let end_time = pairs_enhanced
+        .column("平仓时间文本")
+        .ok()
+        .and_then(|s| s.str().ok())
+        .and_then(|ca| ca.into_iter().flatten().map(|x| x.to_string()).max());
+
+    let symbol_count = pairs_enhanced
+        .column("标的代码")
+        .ok()
+        .and_then(|s| s.str().ok())
+        .map(|ca| {
+            let mut ss = HashSet::new();
+            for x in ca.into_iter().flatten() {
+                ss.insert(x.to_string());
             }
+            ss.len() as i64
+        })
+        .unwrap_or(0);
+
+    let mut open_day_profit: HashMap<String, Vec<f64>> = HashMap::new();
+    let open_day_ca = pairs_enhanced
+        .column("开仓日")
+        .and_then(|s| s.str())
+        .map_err(|e| PyRuntimeError::new_err(format!("读取开仓日失败: {e}")))?;
+    for i in 0..pairs_enhanced.height() {
+        if let (Some(day), Some(p)) = (open_day_ca.get(i), profit_ca.get(i)) {
+            open_day_profit.entry(day.to_string()).or_default().push(p);
         }
-        let open_day_be = if open_day_profit.is_empty() {
-            0.0
-        } else {
-            let x = open_day_profit
-                .values()
-                .map(|v| cal_break_even_point(v))
-                .sum::<f64>()
-                / open_day_profit.len() as f64;
-            round_to(x, 4)
-        };
+    }
 
-        let avg_profit = round_to(mean(&profits), 4);
-        let std_profit = round_to(sample_std(&profits), 4);
-        let max_profit = round_to(
-            profits
-                .iter()
-                .copied()
-                .fold(f64::NEG_INFINITY, |a, b| if a > b { a } else { b }),
-            4,
-        );
-        let min_profit = round_to(
-            profits
-                .iter()
-                .copied()
-                .fold(f64::INFINITY, |a, b| if a < b { a } else { b }),
-            4,
-        );
-        let win_n = profits.iter().filter(|x| **x > 0.0).count() as f64;
-        let total_n = profits.len() as f64;
-        let win_pct = round_to(win_n / total_n, 4);
-
-        let gain_vals: Vec<f64> = profits.iter().copied().filter(|x| *x > 0.0).collect();
-        let loss_vals: Vec<f64> = profits.iter().copied().filter(|x| *x <= 0.0).collect();
-        let gain_mean = mean(&gain_vals);
-        let loss_mean = mean(&loss_vals);
-        let gain_sum: f64 = gain_vals.iter().sum();
-        let loss_sum: f64 = loss_vals.iter().sum();
-        let single_gain_loss_rate = {
-            let raw = gain_mean / (loss_mean.abs() + 1e-8);
-            py_cap_max(round_to(raw, 2), 5.0)
-        };
-        let total_gain_loss_rate = {
-            let raw = gain_sum / (loss_sum.abs() + 1e-8);
-            py_cap_max(round_to(raw, 2), 5.0)
-        };
-        let trade_score = round_to(total_gain_loss_rate * win_pct, 4);
-        let edge = round_to(single_gain_loss_rate * win_pct - (1.0 - win_pct), 4);
-        let break_even = round_to(cal_break_even_point(&profits), 4);
-        let avg_hold_days = round_to(mean(&hold_days), 2);
-        let avg_hold_bars = round_to(mean(&hold_bars), 2);
-        let per_natural_day = round_to(avg_profit / avg_hold_days, 2);
-        let per_bar = round_to(avg_profit / avg_hold_bars, 2);
-
-        let pos_dump = position_to_opt_dump_repr(pos);
-
-        rows.push(json!({
-            "开始时间": start_time,
-            "结束时间": end_time,
-            "交易标的数量": symbol_count,
-            "总体交易次数": total_trades,
-            "平均持仓天数": avg_hold_days,
-            "平均持仓K线数": avg_hold_bars,
-            "平均单笔收益": avg_profit,
-            "单笔收益标准差": std_profit,
-            "最大单笔收益": max_profit,
-            "最小单笔收益": min_profit,
-            "交易胜率": win_pct,
-            "单笔盈亏比": single_gain_loss_rate,
-            "累计盈亏比": total_gain_loss_rate,
-            "交易得分": trade_score,
-            "赢面": edge,
-            "盈亏平衡点": break_even,
-            "开仓日盈亏平衡点": open_day_be,
-            "每自然日收益": per_natural_day,
-            "每根K线收益": per_bar,
-            "截面等权收益": cross,
-            "截面品种等权": cross1,
-            "pos_name": pos.name,
-            "pos_dump": pos_dump,
-        }));
+    Ok(Some(ReportInputs {
+        profits,
+        hold_days,
+        hold_bars,
+        open_day_profit,
+        start_time,
+        end_time,
+        symbol_count,
+        total_trades,
+        cross,
+        cross1,
+    }))
+}
+
+/// 由聚合模式累加的统计量得到报表输入，口径与 [`report_inputs_from_frames`] 一致。
+fn report_inputs_from_aggregate(agg: &PositionAggregate) -> Option<ReportInputs> {
+    if agg.trades == 0 || agg.hold_rows == 0 || agg.profits.is_empty() {
+        return None;
     }
+    let fmt = |dt: NaiveDateTime| dt.format("%Y-%m-%d %H:%M:%S").to_string();
+    let (cross, cross1) = agg.cross_returns();
+    Some(ReportInputs {
+        profits: agg.profits.clone(),
+        hold_days: agg.hold_days.clone(),
+        hold_bars: agg.hold_bars.clone(),
+        open_day_profit: agg
+            .open_day_profit
+            .iter()
+            .map(|(day, v)| (day.format("%Y-%m-%d").to_string(), v.clone()))
+            .collect(),
+        start_time: agg.first_open.map(fmt),
+        end_time: agg.last_close.map(fmt),
+        symbol_count: agg.symbols.len() as i64,
+        total_trades: agg.trades as i64,
+        cross,
+        cross1,
+    })
+}
 
+/// 由报表输入计算单行指标。
+fn report_row(pos: &Position, inputs: ReportInputs) -> Value {
+    let ReportInputs {
+        profits,
+        hold_days,
+        hold_bars,
+        open_day_profit,
+        start_time,
+        end_time,
+        symbol_count,
+        total_trades,
+        cross,
+        cross1,
+    } = inputs;
+
+    let open_day_be = if open_day_profit.is_empty() {
+        0.0
+    } else {
+        let x = open_day_profit
+            .values()
+            .map(|v| cal_break_even_point(v))
+            .sum::<f64>()
+            / open_day_profit.len() as f64;
+        round_to(x, 4)
+    };
+
+    let avg_profit = round_to(mean(&profits), 4);
+    let std_profit = round_to(sample_std(&profits), 4);
+    let max_profit = round_to(
+        profits
+            .iter()
+            .copied()
+            .fold(f64::NEG_INFINITY, |a, b| if a > b { a } else { b }),
+        4,
+    );
+    let min_profit = round_to(
+        profits
+            .iter()
+            .copied()
+            .fold(f64::INFINITY, |a, b| if a < b { a } else { b }),
+        4,
+    );
+    let win_n = profits.iter().filter(|x| **x > 0.0).count() as f64;
+    let total_n = profits.len() as f64;
+    let win_pct = round_to(win_n / total_n, 4);
+
+    let gain_vals: Vec<f64> = profits.iter().copied().filter(|x| *x > 0.0).collect();
+    let loss_vals: Vec<f64> = profits.iter().copied().filter(|x| *x <= 0.0).collect();
+    let gain_mean = mean(&gain_vals);
+    let loss_mean = mean(&loss_vals);
+    let gain_sum: f64 = gain_vals.iter().sum();
+    let loss_sum: f64 = loss_vals.iter().sum();
+    let single_gain_loss_rate = {
+        let raw = gain_mean / (loss_mean.abs() + 1e-8);
+        py_cap_max(round_to(raw, 2), 5.0)
+    };
+    let total_gain_loss_rate = {
+        let raw = gain_sum / (loss_sum.abs() + 1e-8);
+        py_cap_max(round_to(raw, 2), 5.0)
+    };
+    let trade_score = round_to(total_gain_loss_rate * win_pct, 4);
+    let edge = round_to(single_gain_loss_rate * win_pct - (1.0 - win_pct), 4);
+    let break_even = round_to(cal_break_even_point(&profits), 4);
+    let avg_hold_days = round_to(mean(&hold_days), 2);
+    let avg_hold_bars = round_to(mean(&hold_bars), 2);
+    let per_natural_day = round_to(avg_profit / avg_hold_days, 2);
+    let per_bar = round_to(avg_profit / avg_hold_bars, 2);
+
+    let pos_dump = position_to_opt_dump_repr(pos);
+
+    json!({
+        "开始时间": start_time,
+        "结束时间": end_time,
+        "交易标的数量": symbol_count,
+        "总体交易次数": total_trades,
+        "平均持仓天数": avg_hold_days,
+        "平均持仓K线数": avg_hold_bars,
+        "平均单笔收益": avg_profit,
+        "单笔收益标准差": std_profit,
+        "最大单笔收益": max_profit,
+        "最小单笔收益": min_profit,
+        "交易胜率": win_pct,
+        "单笔盈亏比": single_gain_loss_rate,
+        "累计盈亏比": total_gain_loss_rate,
+        "交易得分": trade_score,
+        "赢面": edge,
+        "盈亏平衡点": break_even,
+        "开仓日盈亏平衡点": open_day_be,
+        "每自然日收益": per_natural_day,
+        "每根K线收益": per_bar,
+        "截面等权收益": cross,
+        "截面品种等权": cross1,
+        "pos_name": pos.name,
+        "pos_dump": pos_dump,
+    })
+}
+
+/// 报表行按截面等权收益降序排列。
+fn sort_report_rows(rows: &mut [Value]) {
     rows.sort_by(|a, b| {
         let av = a
             .get("截面等权收益")
@@ -865,10 +891,41 @@ fn collect_optimize_report_rows(
             .unwrap_or(f64::NEG_INFINITY);
         bv.partial_cmp(&av).unwrap_or(std::cmp::Ordering::Equal)
     });
+}
 
+fn collect_optimize_report_rows(
+    positions: &[Position],
+    symbols: &[String],
+    poss_dir: &Path,
+    partitioned: bool,
+) -> PyResult<Vec<Value>> {
+    let mut rows: Vec<Value> = Vec::new();
+    for pos in positions {
+        let (pair_lfs, hold_lfs) = read_position_outputs(pos, symbols, poss_dir, partitioned)?;
+        if let Some(inputs) = report_inputs_from_frames(pair_lfs, hold_lfs)? {
+            rows.push(report_row(pos, inputs));
+        }
+    }
+    sort_report_rows(&mut rows);
     Ok(rows)
 }
 
+/// 聚合模式的报表：直接使用跑批期间累加的统计量，不读取任何结果文件。
+fn collect_aggregate_report_rows(
+    positions: &[Position],
+    aggregates: &HashMap<String, PositionAggregate>,
+) -> Vec<Value> {
+    let mut rows: Vec<Value> = positions
+        .iter()
+        .filter_map(|pos| {
+            let inputs = report_inputs_from_aggregate(aggregates.get(&pos.name)?)?;
+            Some(report_row(pos, inputs))
+        })
+        .collect();
+    sort_report_rows(&mut rows);
+    rows
+}
+
 fn write_optimize_report_xlsx(rows: &[Value], out_path: &Path) -> PyResult<()> {
     let mut workbook = Workbook::new();
     let worksheet = workbook.add_worksheet();
@@ -953,8 +1010,16 @@ fn write_optimize_report_xlsx(rows: &[Value], out_path: &Path) -> PyResult<()> {
 /// 运行批量优化任务。
 ///
 /// Python 侧通常不会直接构造 Rust `ExecutionPlan`，而是先准备：
-/// - `bars_dir`: 每个 symbol 一个 parquet 文件的目录，文件名形如 `{symbol}.parquet`
-/// - `config_path`: 优化任务 JSON 配置文件，包含 `optim_type / symbols / files_position`
+/// - `bars_dir`: 每个 symbol 一个 K 线文件的目录，文件名形如 `{symbol}.parquet`，
+///   也可以是 `{symbol}.arrow` / `{symbol}.feather`（Arrow IPC，内存映射读取）
+/// - `config_path`: 优化任务 JSON 配置文件，包含 `optim_type / symbols / files_position`；
+///   可选 `bars_mode`：`"lazy"`（默认，worker 内按标的读取、跑完即释放，峰值内存
+///   随线程数而非股票池规模增长）或 `"preload"`（先读入全部标的）；可选 `output_layout`：
+///   `"files"`（默认，`poss/{symbol}/{position}.pairs|holds.parquet`）或 `"partitioned"`
+///   （`poss/pairs|holds/part-XXX.parquet`，按仓位名哈希分区，带 `position` 列）或
+///   `"aggregate"`（跑批中只累加报表统计量，写 `poss/summary.parquet`，仅为报表排名前
+///   `top_k`（默认 10）的候选补跑并按 files 布局写出明细）
+/// - 任务目录下除 xlsx 报表外还会写出同序的 `report.json`（报表行列表）
 /// - `res_path`: 输出根目录，函数内部会按 task hash 创建子目录
 ///
 /// 返回值是简短的文本摘要，包含任务目录和报表路径；详细产物会落到磁盘。
@@ -962,6 +1027,17 @@ fn write_optimize_report_xlsx(rows: &[Value], out_path: &Path) -> PyResult<()> {
 #[pyo3(text_signature = "(bars_dir, config_path, res_path, n_threads=1)")]
 #[pyo3(signature = (bars_dir, config_path, res_path, n_threads=1))]
 pub fn run_optimize(
+    py: Python<'_>,
+    bars_dir: &str,
+    config_path: &str,
+    res_path: &str,
+    n_threads: usize,
+) -> PyResult<String> {
+    py.detach(|| run_optimize_detached(bars_dir, config_path, res_path, n_threads))
+}
+
+/// `run_optimize` 的纯 Rust 部分，在释放 GIL 的状态下执行。
+pub(crate) fn run_optimize_detached(
     bars_dir: &str,
     config_path: &str,
     res_path: &str,
@@ -1052,33 +1128,93 @@ pub fn run_optimize(
     })?;
     write_positions_json(&positions, &positions_dir)?;
 
-    let mut bars_map = HashMap::new();
-    for sym in &symbols {
-        let file_path = Path::new(bars_dir).join(format!("{}.parquet", sym));
-        if file_path.exists() {
-            let bars = read_bars_from_file(&file_path, base_freq)?;
-            bars_map.insert(sym.clone(), bars);
-        }
-    }
-
     let sdt_cutoff = config["sdt"]
         .as_str()
         .and_then(parse_sdt_utc)
         .and_then(|dt| FixedOffset::east_opt(0).map(|tz| dt.with_timezone(&tz)));
 
-    symbols_optim_parallel(
-        symbols.clone(),
-        bars_map,
-        positions.clone(),
-        &poss_dir,
-        base_freq_str,
-        market,
-        bg_max_count,
-        sdt_cutoff,
-        n_threads,
-    );
+    // lazy：按标的在 worker 内读取，跑完即释放；preload：先读入全部标的再开跑
+    let source = DirBarSource::new(bars_dir, base_freq);
+    let preloaded;
+    let bars: &dyn BarSource = match config["bars_mode"].as_str().unwrap_or("lazy") {
+        "lazy" => &source,
+        "preload" => {
+            preloaded = source
+                .load_all(&symbols)
+                .map_err(|e| PyValueError::new_err(format!("读取 K 线失败: {e:#}")))?;
+            &preloaded
+        }
+        other => {
+            return Err(PyValueError::new_err(format!(
+                "bars_mode 只支持 lazy / preload，收到: {other}"
+            )));
+        }
+    };
+
+    // files：每个标的、每个候选各写一对小文件；partitioned：按仓位名哈希写入少量分区文件；
+    // aggregate：只累加报表统计量，仅为排名前 top_k 的候选补写逐 bar 明细
+    let layout = match config["output_layout"].as_str().unwrap_or("files") {
+        "files" => OutputLayout::Files,
+        "partitioned" => OutputLayout::Partitioned,
+        "aggregate" => OutputLayout::Aggregate,
+        other => {
+            return Err(PyValueError::new_err(format!(
+                "output_layout 只支持 files / partitioned / aggregate，收到: {other}"
+            )));
+        }
+    };
+    let top_k = config["top_k"]
+        .as_u64()
+        .map_or(AGGREGATE_TOP_K, |k| k as usize);
+    let dir_err = |e: anyhow::Error| {
+        PyValueError::new_err(format!("创建结果目录失败 {}: {e:#}", poss_dir.display()))
+    };
+    let run = |positions: Vec<Position>, output: &dyn OptimOutput| {
+        symbols_optim_parallel(
+            symbols.clone(),
+            bars,
+            positions,
+            output,
+            base_freq_str,
+            market,
+            bg_max_count,
+            sdt_cutoff,
+            n_threads,
+        )
+        .map_err(|e| PyValueError::new_err(format!("跑批失败: {e:#}")))
+    };
+
+    let report_rows = match layout {
+        OutputLayout::Files => {
+            run(positions.clone(), &PerFileOutput::new(&poss_dir))?;
+            collect_optimize_report_rows(&positions, &symbols, &poss_dir, false)?
+        }
+        OutputLayout::Partitioned => {
+            let output = PartitionedOutput::new(&poss_dir, DEFAULT_PARTITIONS).map_err(dir_err)?;
+            run(positions.clone(), &output)?;
+            collect_optimize_report_rows(&positions, &symbols, &poss_dir, true)?
+        }
+        OutputLayout::Aggregate => {
+            let output = AggregateOutput::new(&poss_dir, &positions).map_err(dir_err)?;
+            run(positions.clone(), &output)?;
+            let rows = collect_aggregate_report_rows(&positions, &output.into_aggregates());
+            let top: HashSet<&str> = rows
+                .iter()
+                .take(top_k)
+                .filter_map(|r| r["pos_name"].as_str())
+                .collect();
+            let top_positions: Vec<Position> = positions
+                .iter()
+                .filter(|p| top.contains(p.name.as_str()))
+                .cloned()
+                .collect();
+            if !top_positions.is_empty() {
+                run(top_positions, &PerFileOutput::new(&poss_dir))?;
+            }
+            rows
+        }
+    };
 
-    let report_rows = collect_optimize_report_rows(&positions, &symbols, &poss_dir)?;
     let report_prefix = if optim_type == "open" {
         "入场优化"
     } else {
@@ -1088,6 +1224,13 @@ pub fn run_optimize(
     if !report_rows.is_empty() {
         write_optimize_report_xlsx(&report_rows, &report_path)?;
     }
+    // 机器可读的报表（与 xlsx 同序），供 Python 侧逐轮筛选候选
+    let report_json = task_dir.join("report.json");
+    let content = serde_json::to_string(&report_rows)
+        .map_err(|e| PyRuntimeError::new_err(format!("序列化报表失败: {e}")))?;
+    fs::write(&report_json, content).map_err(|e| {
+        PyRuntimeError::new_err(format!("写入报表失败 {}: {e}", report_json.display()))
+    })?;
 
     Ok(format!(
         "跑批完成: task_dir={}, report={}",
@@ -1121,6 +1264,12 @@ pub fn run_backtest(
     res_path: &str,
     opts: &str,
 ) -> PyResult<String> {
+    let raw_data = bars_bytes.as_bytes();
+    py.detach(|| run_backtest_detached(raw_data, config_path, res_path))
+}
+
+/// `run_backtest` 的纯 Rust 部分，在释放 GIL 的状态下执行。
+fn run_backtest_detached(raw_data: &[u8], config_path: &str, res_path: &str) -> PyResult<String> {
     // 1. 加载配置
     let config_content = fs::read_to_string(config_path)
         .map_err(|e| PyValueError::new_err(format!("读取 config 错误: {e}")))?;
@@ -1134,7 +1283,6 @@ pub fn run_backtest(
         .map_err(|_| PyValueError::new_err("解析 base_freq 失败"))?;
 
     // 2. 解析 DataFrame 拿到 bars
-    let raw_data = bars_bytes.as_bytes();
     let df = pyarrow_to_df(raw_data)
         .map_err(|e| PyValueError::new_err(format!("Arrow bytes 转 DataFrame 失败: {e}")))?;
 
@@ -1186,9 +1334,12 @@ pub fn run_backtest(
         .map_err(|e| PyValueError::new_err(format!("ExecutionPlan 编译失败: {e}")))?;
     let cutoff = plan.sdt.as_deref().and_then(parse_sdt_utc);
     let cutoff_bar = cutoff.and_then(|c| bars.iter().find(|b| b.dt == c).cloned());
-    let output = UnifiedExecEngine::run(&plan, bars, None, true, false)
+    let mut output = UnifiedExecEngine::run(&plan, bars, None, true, false)
         .map_err(|e| PyValueError::new_err(format!("UnifiedExecEngine 执行失败: {e}")))?;
-    let rows = output.signal_rows;
+    let mut signals_df = output
+        .signals
+        .take_frame()
+        .map_err(|e| PyRuntimeError::new_err(format!("构建 signals DataFrame 失败: {e}")))?;
     let positions = output.positions;
 
     // 5. 执行结果统计
@@ -1209,7 +1360,6 @@ pub fn run_backtest(
         fs::create_dir_all(res_dir).map_err(|e| PyValueError::new_err(e.to_string()))?;
     }
 
-    let mut signals_df = build_signals_dataframe(&rows)?;
     signals_df = align_signals_python_baseline(signals_df, cutoff, cutoff_bar.as_ref())?;
     if signals_df.column("dt").is_ok() {
         signals_df = signals_df
@@ -1218,7 +1368,6 @@ pub fn run_backtest(
             .collect()
             .map_err(|e| PyRuntimeError::new_err(format!("signals 排序失败: {e}")))?;
     }
-    signals_df = normalize_signals_dtypes(signals_df)?;
     let (pairs_df, holds_df) = combine_pairs_holds_for_backtest(&positions)?;
 
     write_df_parquet(&res_dir.join("signals.parquet"), signals_df)?;
@@ -1247,6 +1396,17 @@ pub fn generate_signals(
     config_path: &str,
     out_path: &str,
     sdt: &str,
+) -> PyResult<()> {
+    let raw_data = bars_bytes.as_bytes();
+    py.detach(|| generate_signals_detached(raw_data, config_path, out_path, sdt))
+}
+
+/// `generate_signals` 的纯 Rust 部分，在释放 GIL 的状态下执行。
+fn generate_signals_detached(
+    raw_data: &[u8],
+    config_path: &str,
+    out_path: &str,
+    sdt: &str,
 ) -> PyResult<()> {
     // 1) 读取配置
     let config_content = fs::read_to_string(config_path)
@@ -1269,7 +1429,6 @@ pub fn generate_signals(
     };
 
     // 2) Arrow bytes 转换为 bars
-    let raw_data = bars_bytes.as_bytes();
     let df = pyarrow_to_df(raw_data)
         .map_err(|e| PyValueError::new_err(format!("Arrow bytes 转 DataFrame 失败: {e}")))?;
     let bars = format_standard_kline(df, base_freq)
@@ -1321,13 +1480,14 @@ pub fn generate_signals(
     })
     .map_err(|e| PyValueError::new_err(format!("ExecutionPlan 编译失败: {e}")))?;
     let sdt_override = if sdt.is_empty() { None } else { Some(sdt) };
-    let output = UnifiedExecEngine::run(&plan, bars, sdt_override, true, false)
+    let mut output = UnifiedExecEngine::run(&plan, bars, sdt_override, true, false)
         .map_err(|e| PyRuntimeError::new_err(format!("UnifiedExecEngine 执行失败: {e}")))?;
-    let rows = output.signal_rows;
 
-    // 4) 行转列，写 parquet
-    let mut out_df = build_signals_dataframe(&rows)?;
-    out_df = normalize_signals_dtypes(out_df)?;
+    // 4) 列式信号明细，写 parquet
+    let mut out_df = output
+        .signals
+        .take_frame()
+        .map_err(|e| PyRuntimeError::new_err(format!("构建 signals DataFrame 失败: {e}")))?;
 
     let out = Path::new(out_path);
     let file_path = if out.extension().is_some() {
@@ -247,12 +247,13 @@ impl PyCzscSignals {
     ///
     /// BarGenerator 现在会对 NaN OHLCV / freq mismatch 等硬错返回 Err，
     /// 这里 propagate 成 Python ValueError，避免吞 Err 让信号链路用 stale 状态。
-    fn update_signals(&mut self, bar: &RawBar) -> PyResult<()> {
-        self.inner
-            .update_signals(bar, &self.signals_config)
-            .map_err(|e| {
+    fn update_signals(&mut self, py: Python, bar: &RawBar) -> PyResult<()> {
+        let (inner, configs) = (&mut self.inner, &self.signals_config);
+        py.detach(|| {
+            inner.update_signals(bar, configs).map_err(|e| {
                 pyo3::exceptions::PyValueError::new_err(format!("update_signals 失败: {e}"))
             })
+        })
     }
 
     /// 获取当前信号字典（同 s 属性）
@@ -215,22 +215,28 @@ impl PyCzscTrader {
     ///
     /// BarGenerator 现在会对 NaN OHLCV / freq mismatch 等硬错返回 Err，
     /// 这里 propagate 成 Python ValueError 避免吞 Err 让信号 / 仓位用 stale 状态。
-    fn update(&mut self, bar: &RawBar) -> PyResult<()> {
-        self.inner
-            .update(bar, &self.signals_config)
-            .map_err(|e| pyo3::exceptions::PyValueError::new_err(format!("update 失败: {e}")))
+    fn update(&mut self, py: Python, bar: &RawBar) -> PyResult<()> {
+        let (inner, configs) = (&mut self.inner, &self.signals_config);
+        py.detach(|| {
+            inner
+                .update(bar, configs)
+                .map_err(|e| PyValueError::new_err(format!("update 失败: {e}")))
+        })
     }
 
     /// 更新信号和仓位（同 update）
-    fn on_bar(&mut self, bar: &RawBar) -> PyResult<()> {
-        self.inner
-            .update(bar, &self.signals_config)
-            .map_err(|e| pyo3::exceptions::PyValueError::new_err(format!("on_bar 失败: {e}")))
+    fn on_bar(&mut self, py: Python, bar: &RawBar) -> PyResult<()> {
+        let (inner, configs) = (&mut self.inner, &self.signals_config);
+        py.detach(|| {
+            inner
+                .update(bar, configs)
+                .map_err(|e| PyValueError::new_err(format!("on_bar 失败: {e}")))
+        })
     }
 
     /// 基于信号字典更新仓位
     fn on_sig(&mut self, _py: Python, sig: &Bound<PyDict>) -> PyResult<()> {
-        // 解析 sig dict 的 key-value 对，设置到 inner.signals.s 和 signal_map
+        // 解析 sig dict 的 key-value 对，经 replace_signal_dict 设置到 inner.signals.s 和 signal_map
         let mut s_map = HashMap::new();
         for (k, v) in sig.iter() {
             let key: String = k.extract()?;
@@ -271,8 +277,7 @@ impl PyCzscTrader {
         let dt = parse_dt_from_pyobj(&dt_obj)?;
 
         // 设置信号
-        self.inner.signals.s = s_map.clone();
-        self.inner.signals.signal_map = s_map;
+        self.inner.signals.replace_signal_dict(s_map);
 
         // 构建 LiteBar
         let lite_bar = LiteBar {
@@ -343,13 +348,13 @@ impl PyCzscTrader {
     /// 仅更新信号（不更新仓位）。
     ///
     /// 同 update：BarGenerator 硬错 propagate 成 Python ValueError。
-    fn update_signals(&mut self, bar: &RawBar) -> PyResult<()> {
-        self.inner
-            .signals
-            .update_signals(bar, &self.signals_config)
-            .map_err(|e| {
-                pyo3::exceptions::PyValueError::new_err(format!("update_signals 失败: {e}"))
-            })
+    fn update_signals(&mut self, py: Python, bar: &RawBar) -> PyResult<()> {
+        let (signals, configs) = (&mut self.inner.signals, &self.signals_config);
+        py.detach(|| {
+            signals
+                .update_signals(bar, configs)
+                .map_err(|e| PyValueError::new_err(format!("update_signals 失败: {e}")))
+        })
     }
 
     /// 导出完整状态快照为 bytes（热启动用，零重放）。
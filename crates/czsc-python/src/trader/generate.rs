@@ -1,13 +1,16 @@
 use super::czsc_signals::parse_signals_config;
+use crate::utils::df_convert::df_to_pyarrow;
 use czsc_core::objects::bar::RawBar;
 use czsc_core::objects::freq::Freq;
 use czsc_core::objects::market::Market;
 use czsc_trader::czsc_signals::CzscSignals;
-use czsc_trader::sig_parse::get_signals_freqs;
+use czsc_trader::sig_parse::{SignalConfig, get_signals_freqs};
 use czsc_utils::bar_generator::BarGenerator;
-use pyo3::exceptions::PyValueError;
+use polars::prelude::*;
+use pyo3::exceptions::{PyRuntimeError, PyValueError};
 use pyo3::prelude::*;
-use pyo3::types::{PyDict, PyList};
+use pyo3::types::{PyBytes, PyDict, PyList};
+use std::collections::{BTreeMap, HashMap};
 use std::str::FromStr;
 
 /// 批量生成 CZSC 信号
@@ -18,8 +21,12 @@ use std::str::FromStr;
 ///   sdt: 信号开始计算日期，格式 "YYYYMMDD" 或 "YYYY-MM-DD"
 ///   init_n: 预热 K 线数量
 ///   df: 是否返回 DataFrame（默认 False 返回 list[dict]）
+///   arrow: 为 True 时返回 Arrow IPC 字节流（优先于 `df`）：列序固定为
+///     symbol / dt / freq / id / open / close / high / low / vol / amount + 按名称排序的信号列，
+///     dt 为无时区 datetime，OHLCV 为 float64，信号取值为字典编码的字符串列
 #[pyfunction]
-#[pyo3(signature = (bars, signals_config, sdt="20170101", init_n=500, df=false))]
+#[pyo3(signature = (bars, signals_config, sdt="20170101", init_n=500, df=false, arrow=false))]
+#[allow(clippy::too_many_arguments)]
 pub fn generate_czsc_signals(
     py: Python,
     bars: Vec<RawBar>,
@@ -27,6 +34,7 @@ pub fn generate_czsc_signals(
     sdt: &str,
     init_n: usize,
     df: bool,
+    arrow: bool,
 ) -> PyResult<Py<PyAny>> {
     if bars.is_empty() {
         return Err(PyValueError::new_err("bars 不能为空"));
@@ -34,8 +42,49 @@ pub fn generate_czsc_signals(
 
     let configs = parse_signals_config(signals_config)?;
 
+    // 参数提取完成后全部为纯 Rust 计算，释放 GIL；只有结果转换需要持有 GIL
+    let output = py.detach(|| generate_detached(&bars, &configs, sdt, init_n, arrow))?;
+    let rows = match output {
+        GenerateOutput::Arrow(bytes) => return Ok(PyBytes::new(py, &bytes).into_any().unbind()),
+        GenerateOutput::Rows(rows) => rows,
+    };
+
+    let mut records: Vec<Py<PyAny>> = Vec::with_capacity(rows.len());
+    for row in &rows {
+        let dict = PyDict::new(py);
+        for (k, v) in row {
+            dict.set_item(k, v)?;
+        }
+        records.push(dict.into_any().unbind());
+    }
+
+    if df {
+        // 返回 DataFrame
+        let pandas = py.import("pandas")?;
+        let df_obj = pandas.call_method1("DataFrame", (records,))?;
+        Ok(df_obj.into_any().unbind())
+    } else {
+        let list = PyList::new(py, &records)?;
+        Ok(list.into_any().unbind())
+    }
+}
+
+/// `generate_czsc_signals` 的计算结果：逐 bar 信号字典或列式 Arrow bytes。
+enum GenerateOutput {
+    Rows(Vec<HashMap<String, String>>),
+    Arrow(Vec<u8>),
+}
+
+/// `generate_czsc_signals` 的纯 Rust 部分，在释放 GIL 的状态下执行。
+fn generate_detached(
+    bars: &[RawBar],
+    configs: &[SignalConfig],
+    sdt: &str,
+    init_n: usize,
+    arrow: bool,
+) -> PyResult<GenerateOutput> {
     // 提取所有信号需要的周期
-    let freq_strs = get_signals_freqs(&configs);
+    let freq_strs = get_signals_freqs(configs);
     let freqs: Vec<Freq> = freq_strs
         .iter()
         .filter_map(|s| Freq::from_str(s).ok())
@@ -81,30 +130,165 @@ pub fn generate_czsc_signals(
 
     // prime_signals 用最后一根预热 bar
     if let Some(last_warmup) = bars_left.last() {
-        signals.prime_signals(last_warmup, &configs);
+        signals.prime_signals(last_warmup, configs);
+    }
+
+    // 列式输出：逐 bar 直接写入强类型列，不创建任何 Python 对象
+    if arrow {
+        let mut builder = SignalColumnsBuilder::with_capacity(bars_right.len());
+        for bar in bars_right {
+            signals.update_signals(bar, configs).map_err(|e| {
+                PyValueError::new_err(format!("update_signals 失败 (dt={}): {e}", bar.dt))
+            })?;
+            builder.push(bar, &signals.s);
+        }
+        let mut out = builder.finish(&bars[0].symbol)?;
+        let bytes = df_to_pyarrow(&mut out)
+            .map_err(|e| PyRuntimeError::new_err(format!("signals Arrow 编码失败: {e}")))?;
+        return Ok(GenerateOutput::Arrow(bytes));
     }
 
     // 计算信号
-    let mut records: Vec<Py<PyAny>> = Vec::with_capacity(bars_right.len());
+    let mut rows: Vec<HashMap<String, String>> = Vec::with_capacity(bars_right.len());
     for bar in bars_right {
-        signals.update_signals(bar, &configs).map_err(|e| {
+        signals.update_signals(bar, configs).map_err(|e| {
             PyValueError::new_err(format!("update_signals 失败 (dt={}): {e}", bar.dt))
         })?;
-        let dict = PyDict::new(py);
-        for (k, v) in &signals.s {
-            dict.set_item(k, v)?;
+        rows.push(signals.s.clone());
+    }
+    Ok(GenerateOutput::Rows(rows))
+}
+
+/// `signals.s` 中由 bar 本身提供的基础字段；列式输出时改用 bar 上的强类型值。
+const BASE_FIELDS: [&str; 10] = [
+    "symbol", "dt", "freq", "id", "open", "close", "high", "low", "vol", "amount",
+];
+
+/// 单个信号列：按出现顺序为取值分配编码，行内只存编码。
+#[derive(Default)]
+struct DictColumn {
+    index: HashMap<String, u32>,
+    values: Vec<String>,
+    codes: Vec<Option<u32>>,
+}
+
+impl DictColumn {
+    fn push(&mut self, value: &str) {
+        let code = match self.index.get(value) {
+            Some(&code) => code,
+            None => {
+                let code = self.values.len() as u32;
+                self.index.insert(value.to_string(), code);
+                self.values.push(value.to_string());
+                code
+            }
+        };
+        self.codes.push(Some(code));
+    }
+
+    fn into_column(self, name: &str) -> PolarsResult<Column> {
+        let values = self.values;
+        let ca: StringChunked = self
+            .codes
+            .iter()
+            .map(|c| c.map(|i| values[i as usize].as_str()))
+            .collect();
+        ca.into_series()
+            .with_name(name.into())
+            .cast(&DataType::from_categories(Categories::global()))
+            .map(Column::from)
+    }
+}
+
+/// 按列累积 `generate_czsc_signals` 的结果：基础字段为强类型列，信号列字典编码。
+struct SignalColumnsBuilder {
+    dt: Vec<i64>,
+    freq: Vec<String>,
+    id: Vec<i64>,
+    open: Vec<f64>,
+    close: Vec<f64>,
+    high: Vec<f64>,
+    low: Vec<f64>,
+    vol: Vec<f64>,
+    amount: Vec<f64>,
+    signals: BTreeMap<String, DictColumn>,
+    rows: usize,
+}
+
+impl SignalColumnsBuilder {
+    fn with_capacity(n: usize) -> Self {
+        Self {
+            dt: Vec::with_capacity(n),
+            freq: Vec::with_capacity(n),
+            id: Vec::with_capacity(n),
+            open: Vec::with_capacity(n),
+            close: Vec::with_capacity(n),
+            high: Vec::with_capacity(n),
+            low: Vec::with_capacity(n),
+            vol: Vec::with_capacity(n),
+            amount: Vec::with_capacity(n),
+            signals: BTreeMap::new(),
+            rows: 0,
         }
-        records.push(dict.into_any().unbind());
     }
 
-    if df {
-        // 返回 DataFrame
-        let pandas = py.import("pandas")?;
-        let df_obj = pandas.call_method1("DataFrame", (records,))?;
-        Ok(df_obj.into_any().unbind())
-    } else {
-        let list = PyList::new(py, &records)?;
-        Ok(list.into_any().unbind())
+    fn push(&mut self, bar: &RawBar, s: &HashMap<String, String>) {
+        self.dt
+            .push(bar.dt.timestamp_nanos_opt().unwrap_or_default());
+        self.freq.push(bar.freq.to_string());
+        self.id.push(bar.id as i64);
+        self.open.push(bar.open);
+        self.close.push(bar.close);
+        self.high.push(bar.high);
+        self.low.push(bar.low);
+        self.vol.push(bar.vol);
+        self.amount.push(bar.amount);
+
+        let row = self.rows;
+        for (k, v) in s {
+            if BASE_FIELDS.contains(&k.as_str()) {
+                continue;
+            }
+            let col = match self.signals.get_mut(k.as_str()) {
+                Some(col) => col,
+                None => self.signals.entry(k.clone()).or_insert_with(|| DictColumn {
+                    codes: vec![None; row],
+                    ..Default::default()
+                }),
+            };
+            col.push(v);
+        }
+        self.rows += 1;
+        // 本行未出现的信号列补空
+        for col in self.signals.values_mut() {
+            if col.codes.len() < self.rows {
+                col.codes.push(None);
+            }
+        }
+    }
+
+    fn finish(self, symbol: &str) -> PyResult<DataFrame> {
+        let err = |e: PolarsError| PyRuntimeError::new_err(format!("构建 signals 列失败: {e}"));
+        let n = self.rows;
+        let mut cols: Vec<Column> = Vec::with_capacity(BASE_FIELDS.len() + self.signals.len());
+        cols.push(Column::new("symbol".into(), vec![symbol; n]));
+        cols.push(
+            Column::new("dt".into(), self.dt)
+                .cast(&DataType::Datetime(TimeUnit::Nanoseconds, None))
+                .map_err(err)?,
+        );
+        cols.push(Column::new("freq".into(), self.freq));
+        cols.push(Column::new("id".into(), self.id));
+        cols.push(Column::new("open".into(), self.open));
+        cols.push(Column::new("close".into(), self.close));
+        cols.push(Column::new("high".into(), self.high));
+        cols.push(Column::new("low".into(), self.low));
+        cols.push(Column::new("vol".into(), self.vol));
+        cols.push(Column::new("amount".into(), self.amount));
+        for (name, col) in self.signals {
+            cols.push(col.into_column(&name).map_err(err)?);
+        }
+        DataFrame::new(cols).map_err(err)
     }
 }
 
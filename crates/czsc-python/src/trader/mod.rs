@@ -1,6 +1,6 @@
 //! czsc-trader 公共对象（CzscTrader / CzscSignals）的 PyO3 包装层、
 //! `generate_czsc_signals` 自由函数，以及 research/optimize 编排入口
-//! (`run_research`、`run_replay`、`run_optimize_batch`、
+//! (`run_research`、`run_research_batch`、`run_replay`、`run_optimize_batch`、
 //! `build_*_optim_positions`)。
 //!
 //! 对齐 `rs_czsc/python/src/trader/`。rs-czsc 中的 `weight_backtest`
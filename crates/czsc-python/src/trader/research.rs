@@ -1,12 +1,16 @@
-use crate::trader::api::{build_signals_dataframe, normalize_signals_dtypes, run_optimize};
+use crate::trader::api::run_optimize_detached;
 use crate::utils::df_convert::{df_to_pyarrow, pyarrow_to_df};
 #[cfg(test)]
 use chrono::{DateTime, NaiveDate, NaiveDateTime, Utc};
 use czsc_core::analyze::utils::format_standard_kline;
+use czsc_core::objects::bar::{RawBar, Symbol};
 use czsc_core::objects::freq::Freq;
 use czsc_core::objects::position::Position;
 use czsc_signals::registry::{SIGNAL_REGISTRY, TRADER_SIGNAL_REGISTRY};
-use czsc_trader::engine_v2::{ExecutionPlan, ExecutionPlanInput, UnifiedExecEngine};
+use czsc_trader::engine_v2::scheduler::{SymbolBars, run_symbols_shared};
+use czsc_trader::engine_v2::{
+    ExecutionPlan, ExecutionPlanInput, RunOptions, RunOutput, SignalSpill, UnifiedExecEngine,
+};
 use czsc_trader::optimize::{get_exit_optim_positions, get_open_optim_positions};
 use czsc_trader::sig_parse::SignalConfig;
 use polars::prelude::*;
@@ -15,13 +19,17 @@ use pyo3::prelude::*;
 use pyo3::types::{PyBytes, PyDict};
 use serde::Deserialize;
 use serde_json::Value;
-use std::collections::HashMap;
+use std::collections::BTreeMap;
 use std::fs;
 use std::path::{Path, PathBuf};
+use std::sync::atomic::{AtomicU64, Ordering};
+use std::time::Instant;
 
 #[derive(Debug, Clone, Deserialize)]
 struct StrategyConfig {
     pub name: Option<String>,
+    /// `run_research_batch` 中可省略，按 bars 中的各标的代码执行
+    #[serde(default)]
     pub symbol: String,
     pub base_freq: String,
     #[allow(dead_code)]
@@ -39,6 +47,49 @@ struct StrategyConfig {
 #[derive(Debug, Deserialize, Default)]
 struct RunOpts {
     pub emit_signals: Option<bool>,
+    /// `run_replay` 落盘时每累积多少根 bar 把信号明细写入 signals.parquet；
+    /// 设置后返回结果中的 `signals_arrow` 为空，信号明细只在文件中
+    pub signals_flush_bars: Option<usize>,
+    /// 剖析模式：`"core"` 记录粗粒度分段耗时，`"signals"` 另记逐信号函数耗时
+    pub profile: Option<String>,
+}
+
+impl RunOpts {
+    fn parse(opts_json: Option<&str>) -> PyResult<Self> {
+        let opts = opts_json
+            .map(|s| {
+                serde_json::from_str::<RunOpts>(s)
+                    .map_err(|e| PyValueError::new_err(format!("opts_json 解析失败: {e}")))
+            })
+            .transpose()?
+            .unwrap_or_default();
+        if opts.signals_flush_bars == Some(0) {
+            return Err(PyValueError::new_err(
+                "opts.signals_flush_bars 必须为正整数",
+            ));
+        }
+        opts.profile_mode()?;
+        Ok(opts)
+    }
+
+    /// 返回 `(粗粒度剖析, 逐信号函数剖析)` 两个开关。
+    ///
+    /// 未设置 `profile` 时粗粒度剖析仍可由环境变量 `RS_CZSC_PROFILE_CORE=1` 开启。
+    fn profile_mode(&self) -> PyResult<(bool, bool)> {
+        match self.profile.as_deref() {
+            None => {
+                let core = std::env::var("RS_CZSC_PROFILE_CORE")
+                    .map(|v| v == "1" || v.eq_ignore_ascii_case("true"))
+                    .unwrap_or(false);
+                Ok((core, false))
+            }
+            Some("core") => Ok((true, false)),
+            Some("signals") => Ok((true, true)),
+            Some(other) => Err(PyValueError::new_err(format!(
+                "opts.profile 取值无效: {other}，可选 core / signals"
+            ))),
+        }
+    }
 }
 
 #[cfg(test)]
@@ -180,16 +231,6 @@ fn write_df_parquet(path: &Path, mut df: DataFrame) -> PyResult<()> {
     Ok(())
 }
 
-type ResearchCoreResult = (
-    StrategyConfig,
-    usize,
-    Vec<HashMap<String, String>>,
-    DataFrame,
-    DataFrame,
-    i64,
-    Option<CoreLoopProfile>,
-);
-
 #[derive(Debug, Clone, Copy, Default)]
 struct CoreLoopProfile {
     bars: usize,
@@ -231,12 +272,11 @@ fn position_to_py_dump(p: &Position) -> Value {
     })
 }
 
-fn run_research_core(
+/// 解析策略与 K 线、编译执行计划，返回待执行的计划与 bars。
+fn prepare_research(
     bars_raw: &[u8],
     strategy_json: &str,
-    sdt_override: Option<&str>,
-    emit_signals: bool,
-) -> PyResult<ResearchCoreResult> {
+) -> PyResult<(StrategyConfig, ExecutionPlan, Vec<RawBar>)> {
     let cfg: StrategyConfig = serde_json::from_str(strategy_json)
         .map_err(|e| PyValueError::new_err(format!("strategy json 解析失败: {e}")))?;
     validate_strategy(&cfg)?;
@@ -254,6 +294,11 @@ fn run_research_core(
         return Err(PyValueError::new_err("bars 为空，无法执行回测"));
     }
 
+    let plan = compile_plan(&cfg)?;
+    Ok((cfg, plan, bars))
+}
+
+fn compile_plan(cfg: &StrategyConfig) -> PyResult<ExecutionPlan> {
     let plan_input = ExecutionPlanInput {
         symbol: cfg.symbol.clone(),
         base_freq: cfg.base_freq.clone(),
@@ -264,18 +309,31 @@ fn run_research_core(
         sdt: cfg.sdt.clone(),
         include_sdt_bar: cfg.include_sdt_bar,
     };
-    let plan = ExecutionPlan::compile(plan_input)
-        .map_err(|e| PyValueError::new_err(format!("ExecutionPlan 编译失败: {e}")))?;
+    ExecutionPlan::compile(plan_input)
+        .map_err(|e| PyValueError::new_err(format!("ExecutionPlan 编译失败: {e}")))
+}
 
-    let enable_profile = std::env::var("RS_CZSC_PROFILE_CORE")
-        .map(|v| v == "1" || v.eq_ignore_ascii_case("true"))
-        .unwrap_or(false);
-    let output = UnifiedExecEngine::run(&plan, bars, sdt_override, emit_signals, enable_profile)
-        .map_err(|e| PyRuntimeError::new_err(format!("UnifiedExecEngine 执行失败: {e}")))?;
+/// 单标的执行结果转成的 signals / pairs / holds 三张表及统计信息。
+struct ResearchFrames {
+    bars_count: usize,
+    signals_count: usize,
+    signals_df: DataFrame,
+    /// 信号明细已在执行过程中分批写入该文件，`signals_df` 为空
+    signals_spilled: Option<PathBuf>,
+    pairs_df: DataFrame,
+    holds_df: DataFrame,
+    elapsed_ms: i64,
+    profile: Option<CoreLoopProfile>,
+    /// 逐信号函数剖析表（`opts.profile = "signals"`）
+    signal_profile: Option<DataFrame>,
+}
+
+fn research_frames(mut output: RunOutput) -> PyResult<ResearchFrames> {
     let (pairs_df, holds_df) = combine_pairs_holds(&output.positions)?;
-    let elapsed_ms = output.elapsed_ms;
-    let rows = output.signal_rows;
-    let bars_count = output.bars_count;
+    let signals_df = output
+        .signals
+        .take_frame()
+        .map_err(|e| PyRuntimeError::new_err(format!("构建 signals DataFrame 失败: {e}")))?;
     let profile = output.profile.map(|p| CoreLoopProfile {
         bars: p.bars,
         signals_update_ns: p.signals_update_ns,
@@ -286,43 +344,192 @@ fn run_research_core(
         pos_risk_ns: p.pos_risk_ns,
         pos_holds_ns: p.pos_holds_ns,
     });
-
-    Ok((
-        cfg, bars_count, rows, pairs_df, holds_df, elapsed_ms, profile,
-    ))
+    let signal_profile = output
+        .signal_profile
+        .as_ref()
+        .map(|p| p.to_frame())
+        .transpose()
+        .map_err(|e| PyRuntimeError::new_err(format!("构建信号剖析表失败: {e}")))?;
+
+    Ok(ResearchFrames {
+        bars_count: output.bars_count,
+        signals_count: output.signals.total_rows(),
+        signals_df,
+        signals_spilled: None,
+        pairs_df,
+        holds_df,
+        elapsed_ms: output.elapsed_ms,
+        profile,
+        signal_profile,
+    })
 }
 
-#[allow(clippy::too_many_arguments)]
-fn build_result_dict(
-    py: Python<'_>,
-    cfg: &StrategyConfig,
+/// 研究入口中不依赖 GIL 的全部产物：执行结果统计与已编码的 Arrow bytes。
+struct ResearchPayload {
+    symbol: String,
+    strategy_name: String,
+    base_freq: String,
+    positions: usize,
     bars_count: usize,
-    rows: &[HashMap<String, String>],
-    signals_df: &DataFrame,
-    pairs_df: &DataFrame,
-    holds_df: &DataFrame,
+    signals_count: usize,
+    signals_arrow: Vec<u8>,
+    pairs_arrow: Vec<u8>,
+    holds_arrow: Vec<u8>,
     elapsed_ms: i64,
     profile: Option<CoreLoopProfile>,
-    extra_paths: Option<(&str, &str, &str)>,
-) -> PyResult<Py<PyDict>> {
-    let mut signals_df_mut = signals_df.clone();
-    let mut pairs_df_mut = pairs_df.clone();
-    let mut holds_df_mut = holds_df.clone();
+    /// 逐信号函数剖析表的 Arrow bytes
+    profile_arrow: Option<Vec<u8>>,
+    /// `run_replay` 落盘时的 signals / pairs / holds 文件路径
+    extra_paths: Option<(String, String, String)>,
+}
 
-    let signals_arrow = df_to_pyarrow(&mut signals_df_mut)
-        .map_err(|e| PyRuntimeError::new_err(format!("signals Arrow 编码失败: {e}")))?;
-    let pairs_arrow = df_to_pyarrow(&mut pairs_df_mut)
-        .map_err(|e| PyRuntimeError::new_err(format!("pairs Arrow 编码失败: {e}")))?;
-    let holds_arrow = df_to_pyarrow(&mut holds_df_mut)
-        .map_err(|e| PyRuntimeError::new_err(format!("holds Arrow 编码失败: {e}")))?;
+impl ResearchPayload {
+    /// 将三张表编码为 Arrow bytes；`res_path` 非空时先落盘为 parquet。
+    fn encode(
+        cfg: &StrategyConfig,
+        symbol: &str,
+        frames: ResearchFrames,
+        res_path: Option<&str>,
+    ) -> PyResult<Self> {
+        let ResearchFrames {
+            bars_count,
+            signals_count,
+            mut signals_df,
+            signals_spilled,
+            mut pairs_df,
+            mut holds_df,
+            elapsed_ms,
+            profile,
+            signal_profile,
+        } = frames;
+
+        let mut extra_paths: Option<(String, String, String)> = None;
+        if let Some(base) = res_path {
+            let base_path = Path::new(base);
+            if !base_path.exists() {
+                fs::create_dir_all(base_path)
+                    .map_err(|e| PyValueError::new_err(format!("创建结果目录失败: {e}")))?;
+            }
+
+            let signals_path = base_path.join("signals.parquet");
+            let pairs_path = base_path.join("pairs.parquet");
+            let holds_path = base_path.join("holds.parquet");
+
+            if signals_spilled.as_deref() != Some(signals_path.as_path()) {
+                write_df_parquet(&signals_path, signals_df.clone())?;
+            }
+            write_df_parquet(&pairs_path, pairs_df.clone())?;
+            write_df_parquet(&holds_path, holds_df.clone())?;
+
+            extra_paths = Some((
+                signals_path.to_string_lossy().to_string(),
+                pairs_path.to_string_lossy().to_string(),
+                holds_path.to_string_lossy().to_string(),
+            ));
+        }
+
+        let signals_arrow = if signals_spilled.is_some() {
+            Vec::new()
+        } else {
+            df_to_pyarrow(&mut signals_df)
+                .map_err(|e| PyRuntimeError::new_err(format!("signals Arrow 编码失败: {e}")))?
+        };
+        let pairs_arrow = df_to_pyarrow(&mut pairs_df)
+            .map_err(|e| PyRuntimeError::new_err(format!("pairs Arrow 编码失败: {e}")))?;
+        let holds_arrow = df_to_pyarrow(&mut holds_df)
+            .map_err(|e| PyRuntimeError::new_err(format!("holds Arrow 编码失败: {e}")))?;
+        let profile_arrow = signal_profile
+            .map(|mut df| df_to_pyarrow(&mut df))
+            .transpose()
+            .map_err(|e| PyRuntimeError::new_err(format!("信号剖析表 Arrow 编码失败: {e}")))?;
+
+        Ok(Self {
+            symbol: symbol.to_string(),
+            strategy_name: cfg.name.clone().unwrap_or_default(),
+            base_freq: cfg.base_freq.clone(),
+            positions: cfg.positions.len(),
+            bars_count,
+            signals_count,
+            signals_arrow,
+            pairs_arrow,
+            holds_arrow,
+            elapsed_ms,
+            profile,
+            profile_arrow,
+            extra_paths,
+        })
+    }
+}
+
+/// 执行研究主流程并完成行转列、可选落盘与 Arrow 编码。
+///
+/// 全程只处理 Rust 数据，调用方应在 `py.detach` 中执行，
+/// 使 Python 多线程并发调用 `run_research` / `run_replay` 时可以真正并行。
+///
+/// `opts.signals_flush_bars` 与 `res_path` 同时给出时，信号明细在执行过程中每累积
+/// `signals_flush_bars` 根 bar 就写入 `res_path/signals.parquet`，不在内存中整表保留。
+fn run_research_payload(
+    bars_raw: &[u8],
+    strategy_json: &str,
+    sdt: Option<&str>,
+    res_path: Option<&str>,
+    opts: &RunOpts,
+) -> PyResult<ResearchPayload> {
+    let (cfg, plan, bars) = prepare_research(bars_raw, strategy_json)?;
+    let (enable_profile, profile_signals) = opts.profile_mode()?;
+    let emit_signals = opts.emit_signals.unwrap_or(true);
+
+    let spill_path = match (res_path, opts.signals_flush_bars) {
+        (Some(base), Some(_)) if emit_signals => {
+            let base_path = Path::new(base);
+            fs::create_dir_all(base_path)
+                .map_err(|e| PyValueError::new_err(format!("创建结果目录失败: {e}")))?;
+            Some(base_path.join("signals.parquet"))
+        }
+        _ => None,
+    };
+    let run_opts = RunOptions {
+        emit_signals,
+        enable_profile,
+        profile_signals,
+        spill: spill_path
+            .as_deref()
+            .zip(opts.signals_flush_bars)
+            .map(|(path, n)| SignalSpill::new(path, n)),
+    };
+    let output = UnifiedExecEngine::run_with(&plan, bars, sdt, run_opts)
+        .map_err(|e| PyRuntimeError::new_err(format!("UnifiedExecEngine 执行失败: {e}")))?;
+    let frames = ResearchFrames {
+        signals_spilled: spill_path,
+        ..research_frames(output)?
+    };
+    ResearchPayload::encode(&cfg, &cfg.symbol, frames, res_path)
+}
+
+fn build_result_dict(py: Python<'_>, payload: ResearchPayload) -> PyResult<Py<PyDict>> {
+    let ResearchPayload {
+        symbol,
+        strategy_name,
+        base_freq,
+        positions,
+        bars_count,
+        signals_count,
+        signals_arrow,
+        pairs_arrow,
+        holds_arrow,
+        elapsed_ms,
+        profile,
+        profile_arrow,
+        extra_paths,
+    } = payload;
 
     let meta = PyDict::new(py);
-    meta.set_item("symbol", cfg.symbol.clone())?;
-    meta.set_item("strategy_name", cfg.name.clone().unwrap_or_default())?;
-    meta.set_item("base_freq", cfg.base_freq.clone())?;
+    meta.set_item("symbol", symbol)?;
+    meta.set_item("strategy_name", strategy_name)?;
+    meta.set_item("base_freq", base_freq)?;
     meta.set_item("bars_count", bars_count)?;
-    meta.set_item("signals_count", rows.len())?;
-    meta.set_item("positions", cfg.positions.len())?;
+    meta.set_item("signals_count", signals_count)?;
+    meta.set_item("positions", positions)?;
     meta.set_item("elapsed_ms", elapsed_ms)?;
     meta.set_item("warning_count", 0)?;
     if let Some(p) = profile {
@@ -372,6 +579,9 @@ fn build_result_dict(
     out.set_item("signals_arrow", PyBytes::new(py, &signals_arrow))?;
     out.set_item("pairs_arrow", PyBytes::new(py, &pairs_arrow))?;
     out.set_item("holds_arrow", PyBytes::new(py, &holds_arrow))?;
+    if let Some(bytes) = profile_arrow {
+        out.set_item("profile_arrow", PyBytes::new(py, &bytes))?;
+    }
 
     if let Some((sp, pp, hp)) = extra_paths {
         out.set_item("signals_path", sp)?;
@@ -404,31 +614,10 @@ pub fn run_research(
     sdt: Option<&str>,
     opts_json: Option<&str>,
 ) -> PyResult<Py<PyDict>> {
-    let opts = opts_json
-        .map(|s| {
-            serde_json::from_str::<RunOpts>(s)
-                .map_err(|e| PyValueError::new_err(format!("opts_json 解析失败: {e}")))
-        })
-        .transpose()?
-        .unwrap_or_default();
-    let emit_signals = opts.emit_signals.unwrap_or(true);
-
-    let (cfg, bars_count, rows, pairs_df, holds_df, elapsed_ms, profile) =
-        run_research_core(bars_bytes.as_bytes(), strategy_json, sdt, emit_signals)?;
-    let signals_df = normalize_signals_dtypes(build_signals_dataframe(&rows)?)?;
-
-    build_result_dict(
-        py,
-        &cfg,
-        bars_count,
-        &rows,
-        &signals_df,
-        &pairs_df,
-        &holds_df,
-        elapsed_ms,
-        profile,
-        None,
-    )
+    let opts = RunOpts::parse(opts_json)?;
+    let bars_raw = bars_bytes.as_bytes();
+    let payload = py.detach(|| run_research_payload(bars_raw, strategy_json, sdt, None, &opts))?;
+    build_result_dict(py, payload)
 }
 
 /// 回放入口，在 `run_research` 基础上可选把产物落盘为 parquet。
@@ -449,58 +638,226 @@ pub fn run_replay(
     sdt: Option<&str>,
     opts_json: Option<&str>,
 ) -> PyResult<Py<PyDict>> {
-    let opts = opts_json
-        .map(|s| {
-            serde_json::from_str::<RunOpts>(s)
-                .map_err(|e| PyValueError::new_err(format!("opts_json 解析失败: {e}")))
-        })
-        .transpose()?
-        .unwrap_or_default();
-    let emit_signals = opts.emit_signals.unwrap_or(true);
+    let opts = RunOpts::parse(opts_json)?;
+    let bars_raw = bars_bytes.as_bytes();
+    let payload =
+        py.detach(|| run_research_payload(bars_raw, strategy_json, sdt, res_path, &opts))?;
+    build_result_dict(py, payload)
+}
 
-    let (cfg, bars_count, rows, pairs_df, holds_df, elapsed_ms, profile) =
-        run_research_core(bars_bytes.as_bytes(), strategy_json, sdt, emit_signals)?;
-    let signals_df = normalize_signals_dtypes(build_signals_dataframe(&rows)?)?;
+/// `run_research_batch` 的执行结果。
+enum BatchOutcome {
+    /// 逐标的结果，按 `symbol` 排序
+    PerSymbol(Vec<(String, PyResult<ResearchPayload>)>),
+    /// 全部成功标的拼接后的单份结果
+    Concat {
+        payload: ResearchPayload,
+        symbols: Vec<String>,
+        errors: Vec<(String, PyErr)>,
+    },
+}
 
-    let mut extra_paths: Option<(String, String, String)> = None;
-    if let Some(base) = res_path {
-        let base_path = Path::new(base);
-        if !base_path.exists() {
-            fs::create_dir_all(base_path)
-                .map_err(|e| PyValueError::new_err(format!("创建结果目录失败: {e}")))?;
-        }
+/// 按 `symbol` 列拆分多标的 K 线；各标的内部按 dt 排序并重新编号 id。
+fn split_bars_by_symbol(bars: Vec<RawBar>) -> Vec<SymbolBars> {
+    let mut groups: BTreeMap<Symbol, Vec<RawBar>> = BTreeMap::new();
+    for bar in bars {
+        groups.entry(bar.symbol.clone()).or_default().push(bar);
+    }
+    groups
+        .into_iter()
+        .map(|(symbol, mut bars)| {
+            bars.sort_by_key(|b| b.dt);
+            for (i, bar) in bars.iter_mut().enumerate() {
+                bar.id = i as i32;
+            }
+            SymbolBars {
+                symbol: symbol.to_string(),
+                bars,
+            }
+        })
+        .collect()
+}
+
+/// 纵向拼接多标的的同构表，跳过空表。
+fn vstack_frames(dfs: Vec<DataFrame>, what: &str) -> PyResult<DataFrame> {
+    let lfs: Vec<LazyFrame> = dfs
+        .into_iter()
+        .filter(|df| df.height() > 0)
+        .map(|df| df.lazy())
+        .collect();
+    if lfs.is_empty() {
+        return Ok(DataFrame::default());
+    }
+    concat(lfs, UnionArgs::default())
+        .and_then(|lf| lf.collect())
+        .map_err(|e| PyRuntimeError::new_err(format!("合并 {what} 失败: {e}")))
+}
 
-        let signals_path = base_path.join("signals.parquet");
-        let pairs_path = base_path.join("pairs.parquet");
-        let holds_path = base_path.join("holds.parquet");
+fn run_research_batch_detached(
+    bars_raw: &[u8],
+    strategy_json: &str,
+    sdt: Option<&str>,
+    emit_signals: bool,
+    n_threads: usize,
+    concat_output: bool,
+) -> PyResult<BatchOutcome> {
+    let mut cfg: StrategyConfig = serde_json::from_str(strategy_json)
+        .map_err(|e| PyValueError::new_err(format!("strategy json 解析失败: {e}")))?;
 
-        write_df_parquet(&signals_path, signals_df.clone())?;
-        write_df_parquet(&pairs_path, pairs_df.clone())?;
-        write_df_parquet(&holds_path, holds_df.clone())?;
+    let df = pyarrow_to_df(bars_raw)
+        .map_err(|e| PyValueError::new_err(format!("Arrow bytes 转 DataFrame 失败: {e}")))?;
+    if df.column("symbol").is_err() {
+        return Err(PyValueError::new_err("bars 缺少 symbol 列，无法按标的拆分"));
+    }
+    let base_freq = cfg
+        .base_freq
+        .parse::<Freq>()
+        .map_err(|_| PyValueError::new_err("strategy.base_freq 解析失败"))?;
+    let bars = format_standard_kline(df, base_freq)
+        .map_err(|e| PyValueError::new_err(format!("K线标准化格式错误: {e}")))?;
+    let tasks = split_bars_by_symbol(bars);
+    if tasks.is_empty() {
+        return Err(PyValueError::new_err("bars 为空，无法执行回测"));
+    }
 
-        extra_paths = Some((
-            signals_path.to_string_lossy().to_string(),
-            pairs_path.to_string_lossy().to_string(),
-            holds_path.to_string_lossy().to_string(),
-        ));
+    // 执行计划与标的无关，只编译一次；symbol 仅用于通过校验
+    if cfg.symbol.trim().is_empty() {
+        cfg.symbol = tasks[0].symbol.clone();
+    }
+    validate_strategy(&cfg)?;
+    let plan = compile_plan(&cfg)?;
+
+    let engine_err =
+        |e: String| PyRuntimeError::new_err(format!("UnifiedExecEngine 执行失败: {e}"));
+
+    if !concat_output {
+        let results = run_symbols_shared(
+            &plan,
+            tasks,
+            sdt,
+            emit_signals,
+            n_threads,
+            |symbol, output| {
+                let frames = research_frames(output.map_err(engine_err)?)?;
+                ResearchPayload::encode(&cfg, symbol, frames, None)
+            },
+        );
+        return Ok(BatchOutcome::PerSymbol(results));
     }
 
-    let extra_refs = extra_paths
-        .as_ref()
-        .map(|(a, b, c)| (a.as_str(), b.as_str(), c.as_str()));
+    let t0 = Instant::now();
+    let results = run_symbols_shared(&plan, tasks, sdt, emit_signals, n_threads, |_, output| {
+        research_frames(output.map_err(engine_err)?)
+    });
 
-    build_result_dict(
-        py,
-        &cfg,
+    let mut symbols = Vec::with_capacity(results.len());
+    let mut errors = Vec::new();
+    let (mut bars_count, mut signals_count) = (0, 0);
+    let (mut signals, mut pairs, mut holds) = (Vec::new(), Vec::new(), Vec::new());
+    for (symbol, res) in results {
+        match res {
+            Ok(frames) => {
+                bars_count += frames.bars_count;
+                signals_count += frames.signals_count;
+                signals.push(frames.signals_df);
+                pairs.push(frames.pairs_df);
+                holds.push(frames.holds_df);
+                symbols.push(symbol);
+            }
+            Err(e) => errors.push((symbol, e)),
+        }
+    }
+    let frames = ResearchFrames {
         bars_count,
-        &rows,
-        &signals_df,
-        &pairs_df,
-        &holds_df,
-        elapsed_ms,
-        profile,
-        extra_refs,
-    )
+        signals_count,
+        signals_df: vstack_frames(signals, "signals")?,
+        signals_spilled: None,
+        pairs_df: vstack_frames(pairs, "pairs")?,
+        holds_df: vstack_frames(holds, "holds")?,
+        elapsed_ms: t0.elapsed().as_millis() as i64,
+        profile: None,
+        signal_profile: None,
+    };
+    let payload = ResearchPayload::encode(&cfg, "", frames, None)?;
+    Ok(BatchOutcome::Concat {
+        payload,
+        symbols,
+        errors,
+    })
+}
+
+/// 多标的批量研究入口：同一策略只编译一次执行计划，各标的在 Rust 线程池中并行执行。
+///
+/// 参数约定：
+/// - `bars_bytes`: 含 `symbol` 列的多标的 K 线 Arrow bytes，各标的内部无需预先排序
+/// - `strategy_json`: 与 `run_research` 相同；`symbol` 可省略，仓位按各标的代码输出
+/// - `n_threads`: rayon 线程数，`0` 表示使用全局线程池
+/// - `concat`: 为 True 时把全部成功标的的 `signals / pairs / holds` 纵向拼接为一份结果
+///
+/// 返回 `dict`：
+/// - `results`: `{symbol: 与 run_research 同构的结果 dict}`（`concat=False`）
+/// - `result`: 拼接后的单个结果 dict，`meta.symbols` 为成功标的列表（`concat=True`）
+/// - `errors`: `{symbol: 错误信息}`，单个标的失败不影响其余标的
+#[pyfunction]
+#[pyo3(
+    text_signature = "(bars_bytes, strategy_json, sdt=None, opts_json=None, n_threads=0, concat=False)"
+)]
+#[pyo3(signature = (bars_bytes, strategy_json, sdt=None, opts_json=None, n_threads=0, concat=false))]
+pub fn run_research_batch(
+    py: Python<'_>,
+    bars_bytes: &Bound<PyBytes>,
+    strategy_json: &str,
+    sdt: Option<&str>,
+    opts_json: Option<&str>,
+    n_threads: usize,
+    concat: bool,
+) -> PyResult<Py<PyDict>> {
+    let opts = RunOpts::parse(opts_json)?;
+    let emit_signals = opts.emit_signals.unwrap_or(true);
+
+    let bars_raw = bars_bytes.as_bytes();
+    let outcome = py.detach(|| {
+        run_research_batch_detached(
+            bars_raw,
+            strategy_json,
+            sdt,
+            emit_signals,
+            n_threads,
+            concat,
+        )
+    })?;
+
+    let out = PyDict::new(py);
+    let errors = PyDict::new(py);
+    match outcome {
+        BatchOutcome::PerSymbol(results) => {
+            let per_symbol = PyDict::new(py);
+            for (symbol, res) in results {
+                match res {
+                    Ok(payload) => per_symbol.set_item(&symbol, build_result_dict(py, payload)?)?,
+                    Err(e) => errors.set_item(&symbol, e.to_string())?,
+                }
+            }
+            out.set_item("results", per_symbol)?;
+        }
+        BatchOutcome::Concat {
+            payload,
+            symbols,
+            errors: errs,
+        } => {
+            let result = build_result_dict(py, payload)?;
+            if let Some(meta) = result.bind(py).get_item("meta")? {
+                meta.set_item("symbol", py.None())?;
+                meta.set_item("symbols", symbols)?;
+            }
+            for (symbol, e) in errs {
+                errors.set_item(&symbol, e.to_string())?;
+            }
+            out.set_item("result", result)?;
+        }
+    }
+    out.set_item("errors", errors)?;
+    Ok(out.unbind())
 }
 
 /// 优化批量入口，接受 JSON 字符串形式的优化配置。
@@ -515,26 +872,44 @@ pub fn run_replay(
 #[pyo3(text_signature = "(bars_dir, optimize_config_json, res_path, n_threads=1)")]
 #[pyo3(signature = (bars_dir, optimize_config_json, res_path, n_threads=1))]
 pub fn run_optimize_batch(
+    py: Python<'_>,
     bars_dir: &str,
     optimize_config_json: &str,
     res_path: &str,
     n_threads: usize,
 ) -> PyResult<String> {
+    py.detach(|| run_optimize_batch_detached(bars_dir, optimize_config_json, res_path, n_threads))
+}
+
+/// `run_optimize_batch` 的纯 Rust 部分，在释放 GIL 的状态下执行。
+///
+/// 释放 GIL 后同一进程内可能有多个线程同时跑批，临时配置文件名因此带上
+/// 进程号与调用序号，用完即删，避免互相覆盖。
+fn run_optimize_batch_detached(
+    bars_dir: &str,
+    optimize_config_json: &str,
+    res_path: &str,
+    n_threads: usize,
+) -> PyResult<String> {
+    static CALL_SEQ: AtomicU64 = AtomicU64::new(0);
+
     let parsed: Value = serde_json::from_str(optimize_config_json)
         .map_err(|e| PyValueError::new_err(format!("optimize 配置 JSON 解析失败: {e}")))?;
 
-    let temp_path = std::env::temp_dir().join("rs_czsc_optimize_config.json");
+    let temp_path = std::env::temp_dir().join(format!(
+        "rs_czsc_optimize_config_{}_{}.json",
+        std::process::id(),
+        CALL_SEQ.fetch_add(1, Ordering::Relaxed)
+    ));
     fs::write(&temp_path, parsed.to_string())
         .map_err(|e| PyValueError::new_err(format!("写入临时优化配置失败: {e}")))?;
 
-    run_optimize(
-        bars_dir,
-        temp_path
-            .to_str()
-            .ok_or_else(|| PyValueError::new_err("临时配置路径无效"))?,
-        res_path,
-        n_threads,
-    )
+    let result = temp_path
+        .to_str()
+        .ok_or_else(|| PyValueError::new_err("临时配置路径无效"))
+        .and_then(|config_path| run_optimize_detached(bars_dir, config_path, res_path, n_threads));
+    let _ = fs::remove_file(&temp_path);
+    result
 }
 
 /// 仅构建开仓优化候选策略，不运行回测。
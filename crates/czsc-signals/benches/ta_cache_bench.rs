@@ -0,0 +1,84 @@
+//! TA 缓存增量更新性能基准。
+//!
+//! 验收目标：历史长度从 1k 增长到 50k 时，单根 K 线的 `update_*_cache`
+//! 耗时基本持平（只与尾窗大小相关），不随 `bars_raw` 长度线性增长。
+//!
+//! 每次迭代用同 dt 的新 close 替换最后一根 K 线，再刷新 MA / MACD / ATR 缓存，
+//! 对应实盘流式更新中未完成 bar 的稳态路径。
+//!
+//! 触发：cargo bench -p czsc-signals --bench ta_cache_bench
+
+use std::hint::black_box;
+use std::sync::Arc;
+
+use chrono::{TimeZone, Utc};
+use criterion::{BenchmarkId, Criterion, criterion_group, criterion_main};
+use czsc_core::analyze::CZSC;
+use czsc_core::objects::bar::{RawBar, RawBarBuilder};
+use czsc_core::objects::freq::Freq;
+use czsc_signals::types::TaCache;
+use czsc_signals::utils::ta::{update_atr_cache, update_ma_cache, update_macd_cache};
+
+fn make_bar(symbol: &Arc<str>, i: usize, close: f64) -> RawBar {
+    let dt = Utc.timestamp_opt(1704067200 + i as i64 * 1800, 0).unwrap();
+    RawBarBuilder::default()
+        .symbol(symbol.clone())
+        .id(i as i32)
+        .dt(dt)
+        .freq(Freq::F30)
+        .open(close)
+        .close(close)
+        .high(close + 0.6)
+        .low(close - 0.6)
+        .vol(1_000_000.0)
+        .amount(close * 1_000_000.0)
+        .build()
+        .expect("RawBar 构造失败")
+}
+
+fn synthetic_close(i: usize) -> f64 {
+    100.0 + (i as f64 * 0.001).sin() * 30.0 + (i as f64 * 0.07).sin() * 4.0
+}
+
+fn refresh_caches(czsc: &CZSC, cache: &mut TaCache) {
+    update_ma_cache(czsc, "SMA#20", "SMA", 20, cache);
+    update_macd_cache(czsc, "MACD12#26#9", 12, 26, 9, cache);
+    update_atr_cache(czsc, "ATR#14", 14, cache);
+}
+
+fn bench_ta_cache_incremental(c: &mut Criterion) {
+    let symbol: Arc<str> = Arc::from("000001.SH");
+    let mut group = c.benchmark_group("ta_cache_incremental");
+    group.sample_size(50);
+
+    for history in [1_000usize, 10_000, 50_000] {
+        let bars: Vec<RawBar> = (0..history)
+            .map(|i| make_bar(&symbol, i, synthetic_close(i)))
+            .collect();
+        // max_bi_num 取大值，避免截断让历史长度失真
+        let mut czsc = CZSC::new(bars, 1_000_000, 6);
+        let mut cache = TaCache::default();
+        refresh_caches(&czsc, &mut cache);
+
+        let last = history - 1;
+        let mut tick = 0usize;
+        group.bench_with_input(BenchmarkId::from_parameter(history), &history, |b, _| {
+            b.iter(|| {
+                tick += 1;
+                let close = synthetic_close(last) + (tick % 7) as f64 * 0.01;
+                czsc.update_bar(make_bar(&symbol, last, close));
+                refresh_caches(black_box(&czsc), &mut cache);
+                black_box(cache.last_len)
+            });
+        });
+    }
+
+    group.finish();
+}
+
+criterion_group!(
+    name = benches;
+    config = Criterion::default();
+    targets = bench_ta_cache_incremental
+);
+criterion_main!(benches);
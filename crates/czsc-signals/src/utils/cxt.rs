@@ -178,7 +178,7 @@ pub fn rebuild_ubi(c: &CZSC) -> Option<UBI> {
         low: low_bar.low,
         high_bar,
         low_bar,
-        bars: c.bars_ubi.clone(),
+        bars: c.bars_ubi.to_vec(),
         raw_bars,
         fxs: ubi_fxs.clone(),
         fx_a: ubi_fxs.first().unwrap().clone(),
@@ -1,7 +1,7 @@
 use crate::types::{BollSeries, KdjSeries, MacdSeries, TaCache};
 use czsc_core::analyze::CZSC;
 use czsc_core::objects::bar::RawBar;
-use std::collections::HashMap;
+use std::collections::{HashMap, HashSet};
 
 #[derive(Debug, Clone, Copy)]
 pub enum MacdField {
@@ -389,6 +389,107 @@ pub fn calc_cci(high: &[f64], low: &[f64], close: &[f64], timeperiod: usize) ->
     out
 }
 
+/// 判断 id 序列是否逐个 +1 严格递增（BarGenerator 产出的 K 线 id 逐根 +1）。
+///
+/// 只看首尾与长度无法排除重复或乱序的 id（如 `[1, 1, 3]`），因此逐对检查；
+/// 一次整数比较扫描，远低于按 id 建 HashMap 重排的开销。
+#[inline]
+fn ids_dense(ids: impl IntoIterator<Item = i32>) -> bool {
+    let mut ids = ids.into_iter();
+    let Some(mut prev) = ids.next() else {
+        return false;
+    };
+    ids.all(|id| {
+        let ok = prev.checked_add(1) == Some(id);
+        prev = id;
+        ok
+    })
+}
+
+/// 判断缓存 id 序列是否包含 `id`；待查 id 通常在尾部，从后往前找。
+#[inline]
+fn cache_contains_id(ids: &[i32], id: i32) -> bool {
+    ids.iter().rev().any(|&x| x == id)
+}
+
+/// 增量更新前提：缓存 id 非空，且包含当前倒数第二根 bar 的 id。
+fn penultimate_cached(ids: Option<&Vec<i32>>, bars_raw: &[RawBar]) -> bool {
+    let now_len = bars_raw.len();
+    match ids {
+        Some(ids) if now_len >= 2 && !ids.is_empty() => {
+            cache_contains_id(ids, bars_raw[now_len - 2].id)
+        }
+        _ => false,
+    }
+}
+
+/// 快速路径：缓存 id 与 `bars_raw` id 都逐个 +1 递增时，按 id 偏移原地对齐。
+///
+/// CZSC 只会从头部截断 `bars_raw`、在尾部追加或替换最后一根，因此对齐只需裁掉
+/// 已被截断的前缀、为新增 bar 追加 NaN 占位，不再逐根建 HashMap 重排。
+/// 返回第一根新增 bar 的下标；不满足前提时不做任何修改并返回 `None`。
+fn align_cache_dense(
+    ids: &mut Vec<i32>,
+    cols: &mut [&mut Vec<f64>],
+    bars_raw: &[RawBar],
+) -> Option<usize> {
+    let (&e_first, &e_last) = (ids.first()?, ids.last()?);
+    let first = bars_raw.first()?.id;
+    let last = bars_raw.last()?.id;
+    if !ids_dense(ids.iter().copied()) || !ids_dense(bars_raw.iter().map(|b| b.id)) {
+        return None;
+    }
+    if cols.iter().any(|col| col.len() != ids.len()) {
+        return None;
+    }
+    if first < e_first || last < e_last || i64::from(first) > i64::from(e_last) + 1 {
+        return None;
+    }
+
+    let drop = (first - e_first) as usize;
+    if drop > 0 {
+        ids.drain(..drop);
+        for col in cols.iter_mut() {
+            col.drain(..drop);
+        }
+    }
+    let first_new = ids.len();
+    let appended = (last - e_last) as usize;
+    ids.extend(e_last + 1..=last);
+    for col in cols.iter_mut() {
+        col.resize(first_new + appended, f64::NAN);
+    }
+    debug_assert_eq!(ids.len(), bars_raw.len());
+    Some(first_new)
+}
+
+/// 兜底路径：按 id 建映射重排缓存列，未命中的 bar 填 NaN（同 id 以最后一次出现为准）。
+fn align_cache_by_id_map(ids: &mut Vec<i32>, cols: &mut [&mut Vec<f64>], bars_raw: &[RawBar]) {
+    let mut old_idx: HashMap<i32, usize> = HashMap::with_capacity(ids.len());
+    for (i, id) in ids.iter().enumerate() {
+        old_idx.insert(*id, i);
+    }
+    for col in cols.iter_mut() {
+        let realigned: Vec<f64> = bars_raw
+            .iter()
+            .map(|b| old_idx.get(&b.id).map_or(f64::NAN, |&i| col[i]))
+            .collect();
+        **col = realigned;
+    }
+    *ids = bars_raw.iter().map(|b| b.id).collect();
+}
+
+/// 把缓存列按 bar id 对齐到当前 `bars_raw`：优先走连续 id 的原地快速路径，否则回退到按 id 重排。
+fn align_cache_to_bars(ids: &mut Vec<i32>, cols: &mut [&mut Vec<f64>], bars_raw: &[RawBar]) {
+    if align_cache_dense(ids, cols, bars_raw).is_none() {
+        align_cache_by_id_map(ids, cols, bars_raw);
+    }
+}
+
+fn bar_ids_of(czsc: &CZSC) -> Vec<i32> {
+    czsc.bars_raw.iter().map(|b| b.id).collect()
+}
+
 /// 更新 MA 缓存
 pub fn update_ma_cache(
     czsc: &CZSC,
@@ -401,49 +502,35 @@ pub fn update_ma_cache(
     if now_len == 0 {
         return;
     }
-    let ma_type_u = ma_type.to_uppercase();
-    let bar_ids: Vec<i32> = czsc.bars_raw.iter().map(|b| b.id).collect();
 
-    let mut need_init = !cache.series.contains_key(cache_key) || now_len < timeperiod + 15;
-    if !need_init {
-        if let Some(existing_ids) = cache.series_ids.get(cache_key) {
-            if now_len < 2 || existing_ids.is_empty() {
-                need_init = true;
-            } else {
-                let penultimate_id = bar_ids[now_len - 2];
-                need_init = !existing_ids.contains(&penultimate_id);
-            }
+    let need_init = !cache.series.contains_key(cache_key)
+        || now_len < timeperiod + 15
+        || !penultimate_cached(cache.series_ids.get(cache_key), &czsc.bars_raw);
+
+    let calc = |close: &[f64]| {
+        if ma_type.eq_ignore_ascii_case("EMA") {
+            calc_ema_cache_style(close, timeperiod)
+        } else if ma_type.eq_ignore_ascii_case("WMA") {
+            calc_wma_cache_style(close, timeperiod)
         } else {
-            need_init = true;
+            calc_sma_cache_style(close, timeperiod)
         }
-    }
-
-    let calc = |close: &[f64]| match ma_type_u.as_str() {
-        "SMA" => calc_sma_cache_style(close, timeperiod),
-        "EMA" => calc_ema_cache_style(close, timeperiod),
-        "WMA" => calc_wma_cache_style(close, timeperiod),
-        _ => calc_sma_cache_style(close, timeperiod),
     };
 
     if need_init {
         let close: Vec<f64> = czsc.bars_raw.iter().map(|b| b.close).collect();
         let res = calc(&close);
         cache.series.insert(cache_key.to_string(), res);
-        cache.series_ids.insert(cache_key.to_string(), bar_ids);
+        cache
+            .series_ids
+            .insert(cache_key.to_string(), bar_ids_of(czsc));
         cache.last_len = now_len;
         return;
     }
 
-    let existing = cache.series.get(cache_key).unwrap();
-    let existing_ids = cache.series_ids.get(cache_key).unwrap();
-    let mut old_map: HashMap<i32, f64> = HashMap::with_capacity(existing_ids.len());
-    for (i, id) in existing_ids.iter().enumerate() {
-        old_map.insert(*id, existing[i]);
-    }
-    let mut res = Vec::with_capacity(now_len);
-    for id in &bar_ids {
-        res.push(*old_map.get(id).unwrap_or(&f64::NAN));
-    }
+    let res = cache.series.get_mut(cache_key).unwrap();
+    let ids = cache.series_ids.get_mut(cache_key).unwrap();
+    align_cache_to_bars(ids, &mut [&mut *res], &czsc.bars_raw);
 
     let window_size = (timeperiod + 10).min(now_len);
     let window_start = now_len - window_size;
@@ -458,8 +545,6 @@ pub fn update_ma_cache(
         res[dst_idx] = partial[src_idx];
     }
 
-    cache.series.insert(cache_key.to_string(), res);
-    cache.series_ids.insert(cache_key.to_string(), bar_ids);
     cache.last_len = now_len;
 }
 
@@ -475,49 +560,35 @@ pub fn update_vol_ma_cache(
     if now_len == 0 {
         return;
     }
-    let ma_type_u = ma_type.to_uppercase();
-    let bar_ids: Vec<i32> = czsc.bars_raw.iter().map(|b| b.id).collect();
 
-    let mut need_init = !cache.series.contains_key(cache_key) || now_len < timeperiod + 15;
-    if !need_init {
-        if let Some(existing_ids) = cache.series_ids.get(cache_key) {
-            if now_len < 2 || existing_ids.is_empty() {
-                need_init = true;
-            } else {
-                let penultimate_id = bar_ids[now_len - 2];
-                need_init = !existing_ids.contains(&penultimate_id);
-            }
+    let need_init = !cache.series.contains_key(cache_key)
+        || now_len < timeperiod + 15
+        || !penultimate_cached(cache.series_ids.get(cache_key), &czsc.bars_raw);
+
+    let calc = |vol: &[f64]| {
+        if ma_type.eq_ignore_ascii_case("EMA") {
+            calc_ema(vol, timeperiod)
+        } else if ma_type.eq_ignore_ascii_case("WMA") {
+            calc_wma(vol, timeperiod)
         } else {
-            need_init = true;
+            calc_sma(vol, timeperiod)
         }
-    }
-
-    let calc = |vol: &[f64]| match ma_type_u.as_str() {
-        "SMA" => calc_sma(vol, timeperiod),
-        "EMA" => calc_ema(vol, timeperiod),
-        "WMA" => calc_wma(vol, timeperiod),
-        _ => calc_sma(vol, timeperiod),
     };
 
     if need_init {
         let vol: Vec<f64> = czsc.bars_raw.iter().map(|b| b.vol).collect();
         let res = calc(&vol);
         cache.series.insert(cache_key.to_string(), res);
-        cache.series_ids.insert(cache_key.to_string(), bar_ids);
+        cache
+            .series_ids
+            .insert(cache_key.to_string(), bar_ids_of(czsc));
         cache.last_len = now_len;
         return;
     }
 
-    let existing = cache.series.get(cache_key).unwrap();
-    let existing_ids = cache.series_ids.get(cache_key).unwrap();
-    let mut old_map: HashMap<i32, f64> = HashMap::with_capacity(existing_ids.len());
-    for (i, id) in existing_ids.iter().enumerate() {
-        old_map.insert(*id, existing[i]);
-    }
-    let mut res = Vec::with_capacity(now_len);
-    for id in &bar_ids {
-        res.push(*old_map.get(id).unwrap_or(&f64::NAN));
-    }
+    let res = cache.series.get_mut(cache_key).unwrap();
+    let ids = cache.series_ids.get_mut(cache_key).unwrap();
+    align_cache_to_bars(ids, &mut [&mut *res], &czsc.bars_raw);
 
     let window_size = (timeperiod + 10).min(now_len);
     let window_start = now_len - window_size;
@@ -532,8 +603,6 @@ pub fn update_vol_ma_cache(
         res[dst_idx] = partial[src_idx];
     }
 
-    cache.series.insert(cache_key.to_string(), res);
-    cache.series_ids.insert(cache_key.to_string(), bar_ids);
     cache.last_len = now_len;
 }
 
@@ -550,51 +619,27 @@ pub fn update_macd_cache(
     if now_len == 0 {
         return;
     }
-    let bar_ids: Vec<i32> = czsc.bars_raw.iter().map(|b| b.id).collect();
     let min_count = m + long + 168;
 
-    let mut need_init = !cache.macd.contains_key(cache_key) || now_len < min_count + 15;
-    if !need_init {
-        if let Some(existing) = cache.macd.get(cache_key) {
-            if now_len < 2 || existing.ids.is_empty() {
-                need_init = true;
-            } else {
-                let penultimate_id = bar_ids[now_len - 2];
-                need_init = !existing.ids.contains(&penultimate_id);
-            }
-        } else {
-            need_init = true;
-        }
-    }
+    let need_init = now_len < min_count + 15
+        || !penultimate_cached(cache.macd.get(cache_key).map(|s| &s.ids), &czsc.bars_raw);
 
     if need_init {
         let close: Vec<f64> = czsc.bars_raw.iter().map(|b| b.close).collect();
         let mut res = calc_macd_cache_style(&close, short, long, m);
-        res.ids = bar_ids;
+        res.ids = bar_ids_of(czsc);
         cache.macd.insert(cache_key.to_string(), res);
         cache.last_len = now_len;
         return;
     }
 
-    let existing = cache.macd.get(cache_key).unwrap();
-    let mut old_map: HashMap<i32, (f64, f64, f64)> = HashMap::with_capacity(existing.ids.len());
-    for (i, id) in existing.ids.iter().enumerate() {
-        old_map.insert(*id, (existing.dif[i], existing.dea[i], existing.macd[i]));
-    }
-    let mut dif = Vec::with_capacity(now_len);
-    let mut dea = Vec::with_capacity(now_len);
-    let mut macd = Vec::with_capacity(now_len);
-    for id in &bar_ids {
-        if let Some((d1, d2, d3)) = old_map.get(id) {
-            dif.push(*d1);
-            dea.push(*d2);
-            macd.push(*d3);
-        } else {
-            dif.push(f64::NAN);
-            dea.push(f64::NAN);
-            macd.push(f64::NAN);
-        }
-    }
+    let MacdSeries {
+        ids,
+        dif,
+        dea,
+        macd,
+    } = cache.macd.get_mut(cache_key).unwrap();
+    align_cache_to_bars(ids, &mut [&mut *dif, &mut *dea, &mut *macd], &czsc.bars_raw);
 
     let window_size = (min_count + 10).min(now_len);
     let window_start = now_len - window_size;
@@ -612,15 +657,6 @@ pub fn update_macd_cache(
         macd[dst_idx] = partial.macd[src_idx];
     }
 
-    cache.macd.insert(
-        cache_key.to_string(),
-        MacdSeries {
-            ids: bar_ids,
-            dif,
-            dea,
-            macd,
-        },
-    );
     cache.last_len = now_len;
 }
 
@@ -648,7 +684,6 @@ pub fn update_boll_cache(
     if now_len == 0 {
         return;
     }
-    let bar_ids: Vec<i32> = czsc.bars_raw.iter().map(|b| b.id).collect();
 
     let calc_full = |close: &[f64]| {
         let n = close.len();
@@ -671,52 +706,28 @@ pub fn update_boll_cache(
         BollSeries { upper, mid, lower }
     };
 
-    let mut need_init = !cache.boll.contains_key(cache_key)
-        || !cache.boll_ids.contains_key(cache_key)
-        || now_len < timeperiod + 15;
-    if !need_init {
-        if let Some(existing_ids) = cache.boll_ids.get(cache_key) {
-            if now_len < 2 || existing_ids.is_empty() {
-                need_init = true;
-            } else {
-                let penultimate_id = bar_ids[now_len - 2];
-                need_init = !existing_ids.contains(&penultimate_id);
-            }
-        } else {
-            need_init = true;
-        }
-    }
+    let need_init = !cache.boll.contains_key(cache_key)
+        || now_len < timeperiod + 15
+        || !penultimate_cached(cache.boll_ids.get(cache_key), &czsc.bars_raw);
 
     if need_init {
         let close: Vec<f64> = czsc.bars_raw.iter().map(|b| b.close).collect();
         let res = calc_full(&close);
         cache.boll.insert(cache_key.to_string(), res);
-        cache.boll_ids.insert(cache_key.to_string(), bar_ids);
+        cache
+            .boll_ids
+            .insert(cache_key.to_string(), bar_ids_of(czsc));
         cache.last_len = now_len;
         return;
     }
 
-    let existing = cache.boll.get(cache_key).unwrap();
-    let existing_ids = cache.boll_ids.get(cache_key).unwrap();
-    let mut old_map: HashMap<i32, (f64, f64, f64)> = HashMap::with_capacity(existing_ids.len());
-    for (i, id) in existing_ids.iter().enumerate() {
-        old_map.insert(*id, (existing.upper[i], existing.mid[i], existing.lower[i]));
-    }
-
-    let mut upper = Vec::with_capacity(now_len);
-    let mut mid = Vec::with_capacity(now_len);
-    let mut lower = Vec::with_capacity(now_len);
-    for id in &bar_ids {
-        if let Some((u, m, l)) = old_map.get(id) {
-            upper.push(*u);
-            mid.push(*m);
-            lower.push(*l);
-        } else {
-            upper.push(f64::NAN);
-            mid.push(f64::NAN);
-            lower.push(f64::NAN);
-        }
-    }
+    let BollSeries { upper, mid, lower } = cache.boll.get_mut(cache_key).unwrap();
+    let ids = cache.boll_ids.get_mut(cache_key).unwrap();
+    align_cache_to_bars(
+        ids,
+        &mut [&mut *upper, &mut *mid, &mut *lower],
+        &czsc.bars_raw,
+    );
 
     // 对齐 Python update_boll_cache：增量阶段重算尾窗并覆盖最近 5 根。
     let window_size = (timeperiod + 10).min(now_len);
@@ -734,10 +745,6 @@ pub fn update_boll_cache(
         lower[dst_idx] = partial.lower[src_idx];
     }
 
-    cache
-        .boll
-        .insert(cache_key.to_string(), BollSeries { upper, mid, lower });
-    cache.boll_ids.insert(cache_key.to_string(), bar_ids);
     cache.last_len = now_len;
 }
 
@@ -747,21 +754,10 @@ pub fn update_atr_cache(czsc: &CZSC, cache_key: &str, timeperiod: usize, cache:
     if now_len == 0 {
         return;
     }
-    let bar_ids: Vec<i32> = czsc.bars_raw.iter().map(|b| b.id).collect();
 
-    let mut need_init = !cache.series.contains_key(cache_key) || now_len < timeperiod + 15;
-    if !need_init {
-        if let Some(existing_ids) = cache.series_ids.get(cache_key) {
-            if now_len < 2 || existing_ids.is_empty() {
-                need_init = true;
-            } else {
-                let penultimate_id = bar_ids[now_len - 2];
-                need_init = !existing_ids.contains(&penultimate_id);
-            }
-        } else {
-            need_init = true;
-        }
-    }
+    let need_init = !cache.series.contains_key(cache_key)
+        || now_len < timeperiod + 15
+        || !penultimate_cached(cache.series_ids.get(cache_key), &czsc.bars_raw);
 
     let calc_full = |h: &[f64], l: &[f64], c: &[f64]| calc_atr(h, l, c, timeperiod);
 
@@ -771,21 +767,16 @@ pub fn update_atr_cache(czsc: &CZSC, cache_key: &str, timeperiod: usize, cache:
         let close: Vec<f64> = czsc.bars_raw.iter().map(|b| b.close).collect();
         let res = calc_full(&high, &low, &close);
         cache.series.insert(cache_key.to_string(), res);
-        cache.series_ids.insert(cache_key.to_string(), bar_ids);
+        cache
+            .series_ids
+            .insert(cache_key.to_string(), bar_ids_of(czsc));
         cache.last_len = now_len;
         return;
     }
 
-    let existing = cache.series.get(cache_key).unwrap();
-    let existing_ids = cache.series_ids.get(cache_key).unwrap();
-    let mut old_map: HashMap<i32, f64> = HashMap::with_capacity(existing_ids.len());
-    for (i, id) in existing_ids.iter().enumerate() {
-        old_map.insert(*id, existing[i]);
-    }
-    let mut res = Vec::with_capacity(now_len);
-    for id in &bar_ids {
-        res.push(*old_map.get(id).unwrap_or(&f64::NAN));
-    }
+    let res = cache.series.get_mut(cache_key).unwrap();
+    let ids = cache.series_ids.get_mut(cache_key).unwrap();
+    align_cache_to_bars(ids, &mut [&mut *res], &czsc.bars_raw);
 
     // 对齐 Python update_atr_cache: 增量阶段回看 timeperiod+80 窗口
     let window_size = (timeperiod + 80).min(now_len);
@@ -817,8 +808,6 @@ pub fn update_atr_cache(czsc: &CZSC, cache_key: &str, timeperiod: usize, cache:
     let last_src = window_size - 1;
     res[last_dst] = partial[last_src];
 
-    cache.series.insert(cache_key.to_string(), res);
-    cache.series_ids.insert(cache_key.to_string(), bar_ids);
     cache.last_len = now_len;
 }
 
@@ -828,21 +817,10 @@ pub fn update_cci_cache(czsc: &CZSC, cache_key: &str, timeperiod: usize, cache:
     if now_len == 0 {
         return;
     }
-    let bar_ids: Vec<i32> = czsc.bars_raw.iter().map(|b| b.id).collect();
 
-    let mut need_init = !cache.series.contains_key(cache_key) || now_len < timeperiod + 15;
-    if !need_init {
-        if let Some(existing_ids) = cache.series_ids.get(cache_key) {
-            if now_len < 2 || existing_ids.is_empty() {
-                need_init = true;
-            } else {
-                let penultimate_id = bar_ids[now_len - 2];
-                need_init = !existing_ids.contains(&penultimate_id);
-            }
-        } else {
-            need_init = true;
-        }
-    }
+    let need_init = !cache.series.contains_key(cache_key)
+        || now_len < timeperiod + 15
+        || !penultimate_cached(cache.series_ids.get(cache_key), &czsc.bars_raw);
 
     let calc_full = |h: &[f64], l: &[f64], c: &[f64]| calc_cci(h, l, c, timeperiod);
     if need_init {
@@ -851,21 +829,16 @@ pub fn update_cci_cache(czsc: &CZSC, cache_key: &str, timeperiod: usize, cache:
         let close: Vec<f64> = czsc.bars_raw.iter().map(|b| b.close).collect();
         let res = calc_full(&high, &low, &close);
         cache.series.insert(cache_key.to_string(), res);
-        cache.series_ids.insert(cache_key.to_string(), bar_ids);
+        cache
+            .series_ids
+            .insert(cache_key.to_string(), bar_ids_of(czsc));
         cache.last_len = now_len;
         return;
     }
 
-    let existing = cache.series.get(cache_key).unwrap();
-    let existing_ids = cache.series_ids.get(cache_key).unwrap();
-    let mut old_map: HashMap<i32, f64> = HashMap::with_capacity(existing_ids.len());
-    for (i, id) in existing_ids.iter().enumerate() {
-        old_map.insert(*id, existing[i]);
-    }
-    let mut res = Vec::with_capacity(now_len);
-    for id in &bar_ids {
-        res.push(*old_map.get(id).unwrap_or(&f64::NAN));
-    }
+    let res = cache.series.get_mut(cache_key).unwrap();
+    let ids = cache.series_ids.get_mut(cache_key).unwrap();
+    align_cache_to_bars(ids, &mut [&mut *res], &czsc.bars_raw);
 
     // 对齐 Python update_cci_cache: 增量阶段回看 timeperiod + 10
     let window_size = (timeperiod + 10).min(now_len);
@@ -897,8 +870,6 @@ pub fn update_cci_cache(czsc: &CZSC, cache_key: &str, timeperiod: usize, cache:
     let last_src = window_size - 1;
     res[last_dst] = partial[last_src];
 
-    cache.series.insert(cache_key.to_string(), res);
-    cache.series_ids.insert(cache_key.to_string(), bar_ids);
     cache.last_len = now_len;
 }
 
@@ -915,22 +886,10 @@ pub fn update_kdj_cache(
     if now_len == 0 || fastk_period == 0 || slowk_period == 0 || slowd_period == 0 {
         return;
     }
-    let bar_ids: Vec<i32> = czsc.bars_raw.iter().map(|b| b.id).collect();
     let min_count = fastk_period + slowk_period;
 
-    let mut need_init = !cache.kdj.contains_key(cache_key) || now_len < min_count + 15;
-    if !need_init {
-        if let Some(existing) = cache.kdj.get(cache_key) {
-            if now_len < 2 || existing.ids.is_empty() {
-                need_init = true;
-            } else {
-                let penultimate_id = bar_ids[now_len - 2];
-                need_init = !existing.ids.contains(&penultimate_id);
-            }
-        } else {
-            need_init = true;
-        }
-    }
+    let need_init = now_len < min_count + 15
+        || !penultimate_cached(cache.kdj.get(cache_key).map(|s| &s.ids), &czsc.bars_raw);
 
     if need_init {
         let high: Vec<f64> = czsc.bars_raw.iter().map(|b| b.high).collect();
@@ -952,7 +911,7 @@ pub fn update_kdj_cache(
         cache.kdj.insert(
             cache_key.to_string(),
             KdjSeries {
-                ids: bar_ids,
+                ids: bar_ids_of(czsc),
                 k,
                 d,
                 j,
@@ -963,26 +922,8 @@ pub fn update_kdj_cache(
     }
 
     // 增量更新：先按 id 对齐旧缓存，再覆盖最近 5 根
-    let existing = cache.kdj.get(cache_key).unwrap();
-    let mut old_map: HashMap<i32, (f64, f64, f64)> = HashMap::with_capacity(existing.ids.len());
-    for (i, id) in existing.ids.iter().enumerate() {
-        old_map.insert(*id, (existing.k[i], existing.d[i], existing.j[i]));
-    }
-
-    let mut k = Vec::with_capacity(now_len);
-    let mut d = Vec::with_capacity(now_len);
-    let mut j = Vec::with_capacity(now_len);
-    for id in &bar_ids {
-        if let Some((k0, d0, j0)) = old_map.get(id) {
-            k.push(*k0);
-            d.push(*d0);
-            j.push(*j0);
-        } else {
-            k.push(f64::NAN);
-            d.push(f64::NAN);
-            j.push(f64::NAN);
-        }
-    }
+    let KdjSeries { ids, k, d, j } = cache.kdj.get_mut(cache_key).unwrap();
+    align_cache_to_bars(ids, &mut [&mut *k, &mut *d, &mut *j], &czsc.bars_raw);
 
     let window_size = (min_count + 10).min(now_len);
     let window_start = now_len - window_size;
@@ -1014,15 +955,6 @@ pub fn update_kdj_cache(
         j[dst_idx] = 3.0 * k[dst_idx] - 2.0 * d[dst_idx];
     }
 
-    cache.kdj.insert(
-        cache_key.to_string(),
-        KdjSeries {
-            ids: bar_ids,
-            k,
-            d,
-            j,
-        },
-    );
     cache.last_len = now_len;
 }
 
@@ -1032,42 +964,28 @@ pub fn update_rsi_cache(czsc: &CZSC, cache_key: &str, timeperiod: usize, cache:
     if now_len == 0 {
         return;
     }
-    let bar_ids: Vec<i32> = czsc.bars_raw.iter().map(|b| b.id).collect();
 
     // 对齐 Python update_rsi_cache 的初始化/增量口径。
     // Rust 流式场景下同一高周期 bar 会在多次 update 中复用同一 id，
     // 这里不能因“最后一根 id 已存在”直接返回，否则 RSI 末值会被冻结。
     // 因此每次都重算窗口尾部，确保未完成 bar 的 RSI 随 close 更新。
-    if !cache.series.contains_key(cache_key) || !cache.series_ids.contains_key(cache_key) {
-        let close: Vec<f64> = czsc.bars_raw.iter().map(|b| b.close).collect();
-        let rsi_res = calc_rsi(&close, timeperiod);
-        cache.series.insert(cache_key.to_string(), rsi_res);
-        cache.series_ids.insert(cache_key.to_string(), bar_ids);
-        cache.last_len = now_len;
-        return;
-    }
-
-    let existing = cache.series.get(cache_key).unwrap();
-    let existing_ids = cache.series_ids.get(cache_key).unwrap();
-    let mut old_map: HashMap<i32, f64> = HashMap::with_capacity(existing_ids.len());
-    for (i, id) in existing_ids.iter().enumerate() {
-        old_map.insert(*id, existing[i]);
-    }
-    let use_full =
-        now_len < timeperiod + 15 || now_len < 2 || !old_map.contains_key(&bar_ids[now_len - 2]);
+    let use_full = !cache.series.contains_key(cache_key)
+        || now_len < timeperiod + 15
+        || !penultimate_cached(cache.series_ids.get(cache_key), &czsc.bars_raw);
     if use_full {
         let close: Vec<f64> = czsc.bars_raw.iter().map(|b| b.close).collect();
         let rsi_res = calc_rsi(&close, timeperiod);
         cache.series.insert(cache_key.to_string(), rsi_res);
-        cache.series_ids.insert(cache_key.to_string(), bar_ids);
+        cache
+            .series_ids
+            .insert(cache_key.to_string(), bar_ids_of(czsc));
         cache.last_len = now_len;
         return;
     }
 
-    let mut rsi_res = Vec::with_capacity(now_len);
-    for id in &bar_ids {
-        rsi_res.push(*old_map.get(id).unwrap_or(&f64::NAN));
-    }
+    let rsi_res = cache.series.get_mut(cache_key).unwrap();
+    let ids = cache.series_ids.get_mut(cache_key).unwrap();
+    align_cache_to_bars(ids, &mut [&mut *rsi_res], &czsc.bars_raw);
 
     let window_size = (timeperiod + 10).min(now_len);
     let window_start = now_len - window_size;
@@ -1082,8 +1000,6 @@ pub fn update_rsi_cache(czsc: &CZSC, cache_key: &str, timeperiod: usize, cache:
         rsi_res[dst_idx] = partial[src_idx];
     }
 
-    cache.series.insert(cache_key.to_string(), rsi_res);
-    cache.series_ids.insert(cache_key.to_string(), bar_ids);
     cache.last_len = now_len;
 }
 
@@ -1093,7 +1009,6 @@ pub fn update_sar_cache(czsc: &CZSC, cache_key: &str, cache: &mut TaCache) {
     if now_len == 0 {
         return;
     }
-    let bar_ids: Vec<i32> = czsc.bars_raw.iter().map(|b| b.id).collect();
     let calc_full = |h: &[f64], l: &[f64]| calc_sar(h, l, 0.02, 0.2);
 
     if !cache.series.contains_key(cache_key) || !cache.series_ids.contains_key(cache_key) {
@@ -1101,19 +1016,15 @@ pub fn update_sar_cache(czsc: &CZSC, cache_key: &str, cache: &mut TaCache) {
         let low: Vec<f64> = czsc.bars_raw.iter().map(|b| b.low).collect();
         let res = calc_full(&high, &low);
         cache.series.insert(cache_key.to_string(), res);
-        cache.series_ids.insert(cache_key.to_string(), bar_ids);
+        cache
+            .series_ids
+            .insert(cache_key.to_string(), bar_ids_of(czsc));
         cache.last_len = now_len;
         return;
     }
 
-    let existing = cache.series.get(cache_key).unwrap();
-    let existing_ids = cache.series_ids.get(cache_key).unwrap();
-    let mut old_map: HashMap<i32, f64> = HashMap::with_capacity(existing_ids.len());
-    for (i, id) in existing_ids.iter().enumerate() {
-        old_map.insert(*id, existing[i]);
-    }
-
-    let use_full = now_len < 50 || now_len < 2 || !old_map.contains_key(&bar_ids[now_len - 2]);
+    let use_full =
+        now_len < 50 || !penultimate_cached(cache.series_ids.get(cache_key), &czsc.bars_raw);
     let (window_start, window_size) = if use_full {
         (0usize, now_len)
     } else {
@@ -1131,15 +1042,28 @@ pub fn update_sar_cache(czsc: &CZSC, cache_key: &str, cache: &mut TaCache) {
         .collect();
     let partial = calc_full(&high, &low);
 
-    let mut res = Vec::with_capacity(now_len);
-    for id in &bar_ids {
-        res.push(*old_map.get(id).unwrap_or(&f64::NAN));
-    }
+    let res = cache.series.get_mut(cache_key).unwrap();
+    let ids = cache.series_ids.get_mut(cache_key).unwrap();
+    // 只补齐此前未写入过的 bar：连续 id 下它们恰好是对齐后追加的尾部，
+    // 否则按 id 集合逐根判断。
+    let dense = align_cache_dense(ids, &mut [&mut *res], &czsc.bars_raw);
+    let is_new: Vec<bool> = match dense {
+        Some(first_new) => (window_start..now_len)
+            .map(|dst| dst >= first_new)
+            .collect(),
+        None => {
+            let old_ids: HashSet<i32> = ids.iter().copied().collect();
+            align_cache_by_id_map(ids, &mut [&mut *res], &czsc.bars_raw);
+            czsc.bars_raw[window_start..]
+                .iter()
+                .map(|b| !old_ids.contains(&b.id))
+                .collect()
+        }
+    };
 
     for (i, partial_i) in partial.iter().enumerate().take(window_size) {
-        let dst = window_start + i;
-        if !old_map.contains_key(&bar_ids[dst]) {
-            res[dst] = *partial_i;
+        if is_new[i] {
+            res[window_start + i] = *partial_i;
         }
     }
     // 与 ATR/RSI 的流式处理一致：无论 id 是否已存在，都刷新最后一根。
@@ -1148,8 +1072,6 @@ pub fn update_sar_cache(czsc: &CZSC, cache_key: &str, cache: &mut TaCache) {
     let last_src = window_size - 1;
     res[last_dst] = partial[last_src];
 
-    cache.series.insert(cache_key.to_string(), res);
-    cache.series_ids.insert(cache_key.to_string(), bar_ids);
     cache.last_len = now_len;
 }
 
@@ -1392,9 +1314,38 @@ fn calc_stoch(
 #[cfg(test)]
 mod tests {
     use super::{
-        calc_ema, calc_macd, calc_macd_cache_style, calc_macd_py_style, calc_rsi, calc_sma,
-        calc_stoch, calc_wma,
+        align_cache_by_id_map, align_cache_dense, align_cache_to_bars, cache_contains_id, calc_ema,
+        calc_macd, calc_macd_cache_style, calc_macd_py_style, calc_rsi, calc_sma, calc_stoch,
+        calc_wma, update_ma_cache,
     };
+    use crate::types::TaCache;
+    use chrono::{TimeZone, Utc};
+    use czsc_core::analyze::CZSC;
+    use czsc_core::objects::bar::{RawBar, RawBarBuilder};
+    use czsc_core::objects::freq::Freq;
+    use std::sync::Arc;
+
+    fn make_bars(ids: &[i32]) -> Vec<RawBar> {
+        let symbol: Arc<str> = Arc::from("000001.SH");
+        ids.iter()
+            .map(|&id| {
+                let close = 100.0 + (id as f64 * 0.3).sin() * 5.0;
+                RawBarBuilder::default()
+                    .symbol(symbol.clone())
+                    .id(id)
+                    .dt(Utc.timestamp_opt(1704067200 + id as i64 * 1800, 0).unwrap())
+                    .freq(Freq::F30)
+                    .open(close)
+                    .close(close)
+                    .high(close + 0.5)
+                    .low(close - 0.5)
+                    .vol(1000.0)
+                    .amount(close * 1000.0)
+                    .build()
+                    .unwrap()
+            })
+            .collect()
+    }
 
     #[test]
     fn test_calc_sma_matches_python_expanding_mean_before_window() {
@@ -1659,4 +1610,80 @@ mod tests {
             }
         }
     }
+
+    #[test]
+    fn test_align_cache_dense_matches_id_map_realign() {
+        let old_ids: Vec<i32> = (10..20).collect();
+        let old_vals: Vec<f64> = old_ids.iter().map(|&x| x as f64).collect();
+        // 头部截断 3 根、尾部追加 2 根
+        let bars = make_bars(&(13..22).collect::<Vec<_>>());
+
+        let (mut ids_a, mut vals_a) = (old_ids.clone(), old_vals.clone());
+        let first_new = align_cache_dense(&mut ids_a, &mut [&mut vals_a], &bars);
+        let (mut ids_b, mut vals_b) = (old_ids, old_vals);
+        align_cache_by_id_map(&mut ids_b, &mut [&mut vals_b], &bars);
+
+        assert_eq!(first_new, Some(7));
+        assert_eq!(ids_a, ids_b);
+        assert_eq!(vals_a[..7], vals_b[..7]);
+        assert!(vals_a[7..].iter().all(|x| x.is_nan()));
+        assert!(vals_b[7..].iter().all(|x| x.is_nan()));
+    }
+
+    #[test]
+    fn test_align_cache_dense_rejects_non_contiguous_ids() {
+        let mut ids = vec![1, 3, 5];
+        let mut vals = vec![1.0, 3.0, 5.0];
+        let bars = make_bars(&[3, 5, 7]);
+        assert_eq!(align_cache_dense(&mut ids, &mut [&mut vals], &bars), None);
+        assert_eq!(ids, vec![1, 3, 5]);
+
+        align_cache_by_id_map(&mut ids, &mut [&mut vals], &bars);
+        assert_eq!(ids, vec![3, 5, 7]);
+        assert_eq!(vals[..2], [3.0, 5.0]);
+        assert!(vals[2].is_nan());
+    }
+
+    #[test]
+    fn test_align_cache_dense_rejects_duplicate_or_unordered_ids() {
+        // 首尾跨度与长度吻合，但 id 重复 / 乱序，不能按偏移对齐
+        for bar_ids in [vec![11, 11, 13], vec![10, 12, 11, 13]] {
+            let mut ids: Vec<i32> = (10..14).collect();
+            let mut vals: Vec<f64> = ids.iter().map(|&x| x as f64).collect();
+            let bars = make_bars(&bar_ids);
+            assert_eq!(align_cache_dense(&mut ids, &mut [&mut vals], &bars), None);
+            assert_eq!(ids, (10..14).collect::<Vec<_>>());
+
+            align_cache_to_bars(&mut ids, &mut [&mut vals], &bars);
+            assert_eq!(ids, bar_ids);
+            let expect: Vec<f64> = bar_ids.iter().map(|&x| x as f64).collect();
+            assert_eq!(vals, expect);
+        }
+
+        let mut ids = vec![1, 1, 3];
+        let mut vals = vec![1.0, 1.0, 3.0];
+        let bars = make_bars(&[1, 2, 3]);
+        assert_eq!(align_cache_dense(&mut ids, &mut [&mut vals], &bars), None);
+        assert!(!cache_contains_id(&ids, 2));
+    }
+
+    #[test]
+    fn test_update_ma_cache_streaming_stays_aligned_with_bars_raw() {
+        let bars = make_bars(&(0..400).collect::<Vec<_>>());
+        let mut czsc = CZSC::new(bars[..60].to_vec(), 50, 6);
+        let mut cache = TaCache::default();
+        for bar in &bars[60..] {
+            czsc.update_bar(bar.clone());
+            update_ma_cache(&czsc, "SMA#5", "SMA", 5, &mut cache);
+            let ids = &cache.series_ids["SMA#5"];
+            let series = &cache.series["SMA#5"];
+            assert_eq!(ids.len(), czsc.bars_raw.len());
+            assert_eq!(series.len(), czsc.bars_raw.len());
+            assert_eq!(ids.first(), czsc.bars_raw.first().map(|b| &b.id));
+            assert_eq!(ids.last(), czsc.bars_raw.last().map(|b| &b.id));
+            let closes: Vec<f64> = czsc.bars_raw.iter().map(|b| b.close).collect();
+            let expect = closes[closes.len() - 5..].iter().sum::<f64>() / 5.0;
+            assert!((series[series.len() - 1] - expect).abs() < 1e-9);
+        }
+    }
 }
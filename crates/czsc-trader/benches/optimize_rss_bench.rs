@@ -0,0 +1,147 @@
+//! 优化跑批两种 K 线加载模式的峰值内存（RSS）对比。
+//!
+//! 父进程在临时目录生成 `N_SYMBOLS` 个标的的 parquet 文件，再分别以
+//! `preload`（先读入全部标的）与 `lazy`（worker 内按标的读取、跑完即释放）
+//! 两种模式各起一个子进程跑 `symbols_optim_parallel`，子进程结束前读取
+//! `/proc/self/status` 的 `VmHWM` 作为峰值 RSS。preload 的峰值随股票池规模
+//! 增长，lazy 的峰值只与线程数相关。非 Linux 平台只报告耗时。
+//!
+//! 触发：cargo bench -p czsc-trader --bench optimize_rss_bench
+
+use std::collections::HashMap;
+use std::path::Path;
+use std::process::Command;
+use std::time::Instant;
+
+use chrono::{Duration, TimeZone, Utc};
+use czsc_core::objects::freq::Freq;
+use czsc_core::objects::position::Position;
+use czsc_trader::bar_source::{BarSource, DirBarSource};
+use czsc_trader::optim_output::PerFileOutput;
+use czsc_trader::optimize::symbols_optim_parallel;
+use polars::prelude::*;
+
+const N_SYMBOLS: usize = 200;
+const N_BARS: usize = 20_000;
+const N_THREADS: usize = 4;
+
+fn write_symbol_file(dir: &Path, symbol: &str, phase: f64) {
+    let t0 = Utc.with_ymd_and_hms(2010, 1, 4, 0, 0, 0).unwrap();
+    let mid: Vec<f64> = (0..N_BARS)
+        .map(|i| {
+            let x = i as f64;
+            100.0 + 10.0 * (x / 37.0 + phase).sin() + 3.0 * (x / 7.0).cos()
+        })
+        .collect();
+    let dt: Vec<i64> = (0..N_BARS)
+        .map(|i| (t0 + Duration::minutes(30 * i as i64)).timestamp_millis())
+        .collect();
+    let mut df = df!(
+        "symbol" => vec![symbol; N_BARS],
+        "dt" => dt,
+        "open" => mid.iter().map(|m| m - 0.5).collect::<Vec<_>>(),
+        "close" => mid.iter().map(|m| m + 0.5).collect::<Vec<_>>(),
+        "high" => mid.iter().map(|m| m + 1.0).collect::<Vec<_>>(),
+        "low" => mid.iter().map(|m| m - 1.0).collect::<Vec<_>>(),
+        "vol" => vec![1000.0; N_BARS],
+        "amount" => vec![100_000.0; N_BARS],
+    )
+    .expect("构造 K 线失败")
+    .lazy()
+    .with_column(col("dt").cast(DataType::Datetime(TimeUnit::Milliseconds, None)))
+    .collect()
+    .expect("转换 dt 失败");
+    let file = std::fs::File::create(dir.join(format!("{symbol}.parquet"))).expect("创建文件失败");
+    ParquetWriter::new(file)
+        .finish(&mut df)
+        .expect("写入 parquet 失败");
+}
+
+fn positions() -> Vec<Position> {
+    let pos: Position = serde_json::from_value(serde_json::json!({
+        "name": "表里多头",
+        "symbol": "PLACEHOLDER",
+        "opens": [{"operate": "开多", "signals_all": ["30分钟_D1_表里关系V230101_向上_任意_任意_0"]}],
+        "exits": [{"operate": "平多", "signals_all": ["30分钟_D1_表里关系V230101_向下_任意_任意_0"]}],
+        "interval": 0,
+        "timeout": 20,
+        "stop_loss": 300.0,
+        "T0": false
+    }))
+    .expect("构造 Position 失败");
+    vec![pos]
+}
+
+/// 当前进程的峰值 RSS（KB），仅 Linux 可用。
+fn peak_rss_kb() -> Option<u64> {
+    let status = std::fs::read_to_string("/proc/self/status").ok()?;
+    status
+        .lines()
+        .find_map(|line| line.strip_prefix("VmHWM:"))
+        .and_then(|v| v.trim().trim_end_matches("kB").trim().parse().ok())
+}
+
+/// 子进程：按指定模式跑一轮优化并打印峰值 RSS。
+fn run_child(mode: &str, bars_dir: &Path, out_dir: &Path) {
+    let symbols: Vec<String> = (0..N_SYMBOLS).map(|i| format!("S{i:04}")).collect();
+    let source = DirBarSource::new(bars_dir, Freq::F30);
+    let preloaded: HashMap<_, _>;
+    let bars: &dyn BarSource = if mode == "preload" {
+        preloaded = source.load_all(&symbols).expect("预加载 K 线失败");
+        &preloaded
+    } else {
+        &source
+    };
+
+    let t0 = Instant::now();
+    symbols_optim_parallel(
+        symbols,
+        bars,
+        positions(),
+        &PerFileOutput::new(out_dir),
+        "30分钟",
+        None,
+        None,
+        None,
+        N_THREADS,
+    )
+    .expect("跑批失败");
+    let elapsed = t0.elapsed().as_secs_f64();
+    let rss = peak_rss_kb().map_or("n/a".to_string(), |kb| kb.to_string());
+    println!("{mode} elapsed_s={elapsed:.2} peak_rss_kb={rss}");
+}
+
+fn main() {
+    let args: Vec<String> = std::env::args().collect();
+    if let Some(i) = args.iter().position(|a| a == "--child") {
+        run_child(
+            &args[i + 1],
+            Path::new(&args[i + 2]),
+            Path::new(&args[i + 3]),
+        );
+        return;
+    }
+
+    let tmp = tempfile::tempdir().expect("创建临时目录失败");
+    let bars_dir = tmp.path().join("bars");
+    std::fs::create_dir_all(&bars_dir).unwrap();
+    for i in 0..N_SYMBOLS {
+        write_symbol_file(&bars_dir, &format!("S{i:04}"), i as f64 * 0.1);
+    }
+    println!("{N_SYMBOLS} symbols × {N_BARS} bars, n_threads={N_THREADS}");
+
+    let exe = std::env::current_exe().expect("定位基准可执行文件失败");
+    for mode in ["preload", "lazy"] {
+        let out_dir = tmp.path().join(format!("out_{mode}"));
+        std::fs::create_dir_all(&out_dir).unwrap();
+        let output = Command::new(&exe)
+            .arg("--child")
+            .arg(mode)
+            .arg(&bars_dir)
+            .arg(&out_dir)
+            .output()
+            .expect("启动子进程失败");
+        assert!(output.status.success(), "{mode} 子进程失败: {output:?}");
+        print!("{}", String::from_utf8_lossy(&output.stdout));
+    }
+}
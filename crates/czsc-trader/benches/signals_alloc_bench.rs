@@ -0,0 +1,159 @@
+//! CzscSignals 稳态逐 bar 循环的堆分配计数基准。
+//!
+//! 用计数型全局分配器包裹系统分配器，统计预热结束后每根 bar 的堆分配次数：
+//! - 重复推送末根 bar（行情重连、同一根 bar 多次推送）：各周期指纹不变，信号全部
+//!   走缓存，`CzscSignals` 自身的簿记（周期门控、基础字段、信号字典）必须零分配，
+//!   否则以非零退出码失败；
+//! - 推送新 bar：BarGenerator 合成、CZSC 增量更新与信号函数返回的 `Vec<Signal>`
+//!   本身会分配，只打印每根 bar 的平均分配次数与耗时，供回归对比。
+//!
+//! 触发：cargo bench -p czsc-trader --bench signals_alloc_bench
+
+use std::alloc::{GlobalAlloc, Layout, System};
+use std::collections::HashMap;
+use std::hint::black_box;
+use std::sync::atomic::{AtomicUsize, Ordering};
+use std::time::Instant;
+
+use chrono::{Duration, NaiveDate, TimeZone, Utc};
+use czsc_core::objects::bar::{RawBar, RawBarBuilder};
+use czsc_core::objects::{freq::Freq, market::Market};
+use czsc_trader::czsc_signals::CzscSignals;
+use czsc_trader::sig_parse::SignalConfig;
+use czsc_utils::bar_generator::BarGenerator;
+
+struct CountingAlloc;
+
+static ALLOCS: AtomicUsize = AtomicUsize::new(0);
+
+unsafe impl GlobalAlloc for CountingAlloc {
+    unsafe fn alloc(&self, layout: Layout) -> *mut u8 {
+        ALLOCS.fetch_add(1, Ordering::Relaxed);
+        unsafe { System.alloc(layout) }
+    }
+
+    unsafe fn alloc_zeroed(&self, layout: Layout) -> *mut u8 {
+        ALLOCS.fetch_add(1, Ordering::Relaxed);
+        unsafe { System.alloc_zeroed(layout) }
+    }
+
+    unsafe fn realloc(&self, ptr: *mut u8, layout: Layout, new_size: usize) -> *mut u8 {
+        ALLOCS.fetch_add(1, Ordering::Relaxed);
+        unsafe { System.realloc(ptr, layout, new_size) }
+    }
+
+    unsafe fn dealloc(&self, ptr: *mut u8, layout: Layout) {
+        unsafe { System.dealloc(ptr, layout) }
+    }
+}
+
+#[global_allocator]
+static GLOBAL: CountingAlloc = CountingAlloc;
+
+const WARMUP_BARS: usize = 2_000;
+const MEASURE_BARS: usize = 4_000;
+
+/// A 股 30 分钟 K 线的结束时刻
+const SLOTS: [(u32, u32); 8] = [
+    (10, 0),
+    (10, 30),
+    (11, 0),
+    (11, 30),
+    (13, 30),
+    (14, 0),
+    (14, 30),
+    (15, 0),
+];
+
+fn generate_bars(count: usize) -> Vec<RawBar> {
+    let day0 = NaiveDate::from_ymd_opt(2018, 1, 2).unwrap();
+    (0..count)
+        .map(|i| {
+            let (h, m) = SLOTS[i % SLOTS.len()];
+            let day = day0 + Duration::days((i / SLOTS.len()) as i64);
+            let x = i as f64;
+            let close = 100.0 + (x * 0.001).sin() * 30.0 + (x * 0.07).sin() * 4.0;
+            let open = close - (x * 0.07).sin() * 2.0;
+            RawBarBuilder::default()
+                .symbol("000001.SZ".to_string())
+                .id(i as i32)
+                .dt(Utc.from_utc_datetime(&day.and_hms_opt(h, m, 0).unwrap()))
+                .freq(Freq::F30)
+                .open(open)
+                .close(close)
+                .high(close.max(open) + 0.6)
+                .low(close.min(open) - 0.6)
+                .vol(1_000_000.0)
+                .amount(close * 1_000_000.0)
+                .build()
+                .expect("RawBar 构造失败")
+        })
+        .collect()
+}
+
+fn signals_config() -> Vec<SignalConfig> {
+    ["30分钟", "60分钟", "日线"]
+        .iter()
+        .map(|freq| SignalConfig {
+            name: "cxt_bi_status_V230101".to_string(),
+            freq: Some(freq.to_string()),
+            params: HashMap::new(),
+        })
+        .collect()
+}
+
+fn main() {
+    let cfg = signals_config();
+    let bars = generate_bars(WARMUP_BARS + MEASURE_BARS);
+    let (warm, rest) = bars.split_at(WARMUP_BARS);
+
+    let bg = BarGenerator::new(Freq::F30, vec![Freq::F60, Freq::D], 2000, Market::Default)
+        .expect("BarGenerator 构造失败");
+    let mut signals = CzscSignals::new("000001.SZ".to_string(), bg);
+    for bar in warm {
+        signals.warmup_bar(bar).expect("warmup 失败");
+    }
+    signals.prime_signals(warm.last().unwrap(), &cfg);
+
+    // 新 bar：整条链路的分配次数（含 CZSC 与信号函数），仅作记录
+    let before = ALLOCS.load(Ordering::Relaxed);
+    let t0 = Instant::now();
+    for bar in rest {
+        signals
+            .update_signals(bar, &cfg)
+            .expect("update_signals 失败");
+    }
+    let elapsed = t0.elapsed();
+    let allocs = ALLOCS.load(Ordering::Relaxed) - before;
+    println!(
+        "new bars:       {MEASURE_BARS} bars, {:.1} allocs/bar, {:.2} µs/bar",
+        allocs as f64 / MEASURE_BARS as f64,
+        elapsed.as_secs_f64() * 1e6 / MEASURE_BARS as f64
+    );
+
+    // 重复推送末根 bar：第一次让各级缓冲区长到稳态容量，之后逐根计数
+    let last = rest.last().unwrap();
+    signals
+        .update_signals(last, &cfg)
+        .expect("update_signals 失败");
+    let mut worst = 0;
+    let t0 = Instant::now();
+    for _ in 0..MEASURE_BARS {
+        let before = ALLOCS.load(Ordering::Relaxed);
+        signals
+            .update_signals(black_box(last), &cfg)
+            .expect("update_signals 失败");
+        worst = worst.max(ALLOCS.load(Ordering::Relaxed) - before);
+    }
+    let elapsed = t0.elapsed();
+    println!(
+        "repeated bar:   {MEASURE_BARS} bars, max {worst} allocs/bar, {:.2} µs/bar",
+        elapsed.as_secs_f64() * 1e6 / MEASURE_BARS as f64
+    );
+    black_box(signals.s.len());
+
+    assert_eq!(
+        worst, 0,
+        "稳态逐 bar 循环出现堆分配：单根 bar 最多 {worst} 次"
+    );
+}
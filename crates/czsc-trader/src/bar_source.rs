@@ -0,0 +1,164 @@
+//! 优化跑批的 K 线来源。
+//!
+//! 跑批原先先把全部标的的 K 线读进 `HashMap<String, Vec<RawBar>>` 再开跑，
+//! 峰值内存随股票池规模线性增长。[`BarSource`] 把"取某个标的的 K 线"抽象出来：
+//! 内存字典直接借出切片；[`DirBarSource`] 则在 worker 内按需读取单个标的的文件，
+//! 该标的跑完即释放，峰值内存只与并发线程数相关。
+
+use anyhow::{Context, Result};
+use czsc_core::analyze::utils::format_standard_kline;
+use czsc_core::objects::bar::RawBar;
+use czsc_core::objects::freq::Freq;
+use polars::prelude::*;
+use std::borrow::Cow;
+use std::collections::HashMap;
+use std::fs;
+use std::path::{Path, PathBuf};
+
+/// 构造 `RawBar` 需要的列；读文件时只投影这些列。
+pub const BAR_COLUMNS: [&str; 8] = [
+    "symbol", "dt", "open", "close", "high", "low", "vol", "amount",
+];
+
+/// 按标的提供 K 线。实现需可跨 rayon worker 共享。
+pub trait BarSource: Sync {
+    /// 读取单个标的的 K 线；标的不存在时返回 `Ok(None)`。
+    fn load(&self, symbol: &str) -> Result<Option<Cow<'_, [RawBar]>>>;
+}
+
+impl<S: BarSource + ?Sized> BarSource for &S {
+    fn load(&self, symbol: &str) -> Result<Option<Cow<'_, [RawBar]>>> {
+        (**self).load(symbol)
+    }
+}
+
+impl BarSource for HashMap<String, Vec<RawBar>> {
+    fn load(&self, symbol: &str) -> Result<Option<Cow<'_, [RawBar]>>> {
+        Ok(self.get(symbol).map(|bars| Cow::Borrowed(bars.as_slice())))
+    }
+}
+
+/// 每个标的一个文件的 K 线目录，按需读取。
+///
+/// 查找顺序为 `{symbol}.arrow` / `{symbol}.feather`（Arrow IPC，内存映射读取）、
+/// `{symbol}.parquet`；只读取 [`BAR_COLUMNS`] 中的列。
+pub struct DirBarSource {
+    dir: PathBuf,
+    freq: Freq,
+}
+
+impl DirBarSource {
+    pub fn new(dir: impl Into<PathBuf>, freq: Freq) -> Self {
+        Self {
+            dir: dir.into(),
+            freq,
+        }
+    }
+
+    /// 标的对应的 K 线文件路径，不存在时返回 None。
+    pub fn path_of(&self, symbol: &str) -> Option<PathBuf> {
+        ["arrow", "feather", "parquet"]
+            .iter()
+            .map(|ext| self.dir.join(format!("{symbol}.{ext}")))
+            .find(|p| p.is_file())
+    }
+
+    /// 一次性读取全部标的（预加载模式），缺文件的标的跳过。
+    pub fn load_all(&self, symbols: &[String]) -> Result<HashMap<String, Vec<RawBar>>> {
+        let mut bars_map = HashMap::with_capacity(symbols.len());
+        for sym in symbols {
+            if let Some(bars) = self.load(sym)? {
+                bars_map.insert(sym.clone(), bars.into_owned());
+            }
+        }
+        Ok(bars_map)
+    }
+}
+
+impl BarSource for DirBarSource {
+    fn load(&self, symbol: &str) -> Result<Option<Cow<'_, [RawBar]>>> {
+        let Some(path) = self.path_of(symbol) else {
+            return Ok(None);
+        };
+        let df = read_bar_frame(&path)?;
+        let bars = format_standard_kline(df, self.freq)
+            .with_context(|| format!("标准化 K 线失败 {} (freq={})", path.display(), self.freq))?;
+        Ok(Some(Cow::Owned(bars)))
+    }
+}
+
+fn read_bar_frame(path: &Path) -> Result<DataFrame> {
+    let columns = Some(BAR_COLUMNS.iter().map(|c| c.to_string()).collect());
+    let file =
+        fs::File::open(path).with_context(|| format!("读取 bars 文件失败 {}", path.display()))?;
+    let is_ipc = path
+        .extension()
+        .is_some_and(|ext| ext == "arrow" || ext == "feather");
+    let df = if is_ipc {
+        IpcReader::new(file)
+            .with_columns(columns)
+            .memory_mapped(Some(path.to_path_buf()))
+            .finish()
+    } else {
+        ParquetReader::new(file).with_columns(columns).finish()
+    };
+    df.with_context(|| format!("解析 K 线文件失败 {}", path.display()))
+}
+
+#[cfg(test)]
+mod tests {
+    use super::{BarSource, DirBarSource};
+    use polars::prelude::*;
+
+    fn bars_frame(symbol: &str, n: usize) -> DataFrame {
+        let base = 1_704_067_200_000i64;
+        let close: Vec<f64> = (0..n).map(|i| 10.0 + i as f64 * 0.1).collect();
+        let mut df = df!(
+            "symbol" => vec![symbol; n],
+            "dt" => (0..n).map(|i| base + i as i64 * 86_400_000).collect::<Vec<_>>(),
+            "open" => close.clone(),
+            "close" => close.clone(),
+            "high" => close.iter().map(|x| x + 0.5).collect::<Vec<_>>(),
+            "low" => close.iter().map(|x| x - 0.5).collect::<Vec<_>>(),
+            "vol" => vec![1000.0; n],
+            "amount" => close.iter().map(|x| x * 1000.0).collect::<Vec<_>>(),
+            "extra" => vec![0i32; n],
+        )
+        .unwrap();
+        let dt = df
+            .column("dt")
+            .unwrap()
+            .cast(&DataType::Datetime(TimeUnit::Milliseconds, None))
+            .unwrap();
+        df.with_column(dt).unwrap();
+        df
+    }
+
+    #[test]
+    fn dir_source_reads_parquet_and_ipc_lazily() {
+        let dir = tempfile::tempdir().unwrap();
+        let mut a = bars_frame("AAA", 30);
+        let mut b = bars_frame("BBB", 20);
+        ParquetWriter::new(std::fs::File::create(dir.path().join("AAA.parquet")).unwrap())
+            .finish(&mut a)
+            .unwrap();
+        IpcWriter::new(std::fs::File::create(dir.path().join("BBB.feather")).unwrap())
+            .finish(&mut b)
+            .unwrap();
+
+        let source = DirBarSource::new(dir.path(), czsc_core::objects::freq::Freq::D);
+        let aaa = source.load("AAA").unwrap().expect("AAA 应存在");
+        assert_eq!(aaa.len(), 30);
+        assert_eq!(&*aaa[0].symbol, "AAA");
+        let bbb = source.load("BBB").unwrap().expect("BBB 应存在");
+        assert_eq!(bbb.len(), 20);
+        assert!((bbb[19].close - 11.9).abs() < 1e-9);
+        assert!(source.load("CCC").unwrap().is_none());
+
+        let eager = source
+            .load_all(&["AAA".to_string(), "CCC".to_string()])
+            .unwrap();
+        assert_eq!(eager.len(), 1);
+        assert_eq!(eager.load("AAA").unwrap().unwrap().len(), 30);
+    }
+}
@@ -1,14 +1,131 @@
 use crate::engine_v2::catalog::SignalCategory;
 use crate::engine_v2::compiler::CompiledSignalPlanV2;
 use crate::sig_parse::SignalConfig;
+use crate::signal_profile::{SignalProfile, SignalProfileKind};
+use chrono::{DateTime, Datelike, Timelike, Utc};
 use czsc_core::analyze::{CZSC, resolve_max_bi_num, resolve_min_bi_len};
 use czsc_core::objects::bar::RawBar;
+use czsc_core::objects::freq::Freq;
+use czsc_core::objects::position::{EncodedSignalValue, SignalFrame, SignalSymbolTable};
 use czsc_core::objects::signal::Signal;
 use czsc_signals::registry;
 use czsc_signals::types::TaCache;
 use czsc_utils::bar_generator::BarGenerator;
 use czsc_utils::errors::UtilsError;
+use serde::{Deserialize, Deserializer, Serialize, Serializer};
 use std::collections::{BTreeMap, HashMap, HashSet};
+use std::fmt::{Display, Write};
+use std::str::FromStr;
+use std::sync::Arc;
+use std::time::Instant;
+use strum::{EnumCount, IntoEnumIterator};
+
+/// 按符号表编码后的单个信号：`(key_id, 取值)`。
+type EncodedSignal = (usize, Option<EncodedSignalValue>);
+
+/// 周期位集：第 `freq as usize` 位表示该周期末根 bar 本轮有变化。
+type FreqMask = u32;
+
+const _: () = assert!(Freq::COUNT <= FreqMask::BITS as usize);
+
+#[inline]
+fn freq_bit(freq: Freq) -> FreqMask {
+    1 << freq as u32
+}
+
+/// 以 `Freq` 判别值为下标的稠密表，替代逐 bar 以 `freq.to_string()` 为键的 HashMap。
+///
+/// 序列化形态仍是 `{周期字符串: 值}` 映射，与旧版快照字段保持兼容。
+#[derive(Clone)]
+struct FreqTable<T>([Option<T>; Freq::COUNT]);
+
+impl<T> FreqTable<T> {
+    fn new() -> Self {
+        Self(std::array::from_fn(|_| None))
+    }
+
+    #[inline]
+    fn get(&self, freq: Freq) -> Option<&T> {
+        self.0[freq as usize].as_ref()
+    }
+
+    #[inline]
+    fn slot(&mut self, freq: Freq) -> &mut Option<T> {
+        &mut self.0[freq as usize]
+    }
+
+    fn clear(&mut self) {
+        self.0.iter_mut().for_each(|x| *x = None);
+    }
+}
+
+impl<T: Serialize> Serialize for FreqTable<T> {
+    fn serialize<S: Serializer>(&self, serializer: S) -> Result<S::Ok, S::Error> {
+        serializer.collect_map(
+            Freq::iter()
+                .zip(self.0.iter())
+                .filter_map(|(freq, v)| v.as_ref().map(|v| (freq.to_string(), v))),
+        )
+    }
+}
+
+impl<'de, T: Deserialize<'de>> Deserialize<'de> for FreqTable<T> {
+    fn deserialize<D: Deserializer<'de>>(deserializer: D) -> Result<Self, D::Error> {
+        let raw = HashMap::<String, T>::deserialize(deserializer)?;
+        let mut table = Self::new();
+        for (k, v) in raw {
+            let freq = Freq::from_str(&k)
+                .map_err(|_| serde::de::Error::custom(format!("未知周期: {k}")))?;
+            *table.slot(freq) = Some(v);
+        }
+        Ok(table)
+    }
+}
+
+/// 原地改写字典中 `key` 的取值：键已存在时复用原字符串缓冲区，否则插入新键。
+fn set_field(map: &mut HashMap<String, String>, key: &str, write: impl FnOnce(&mut String)) {
+    if let Some(v) = map.get_mut(key) {
+        v.clear();
+        write(v);
+    } else {
+        let mut v = String::new();
+        write(&mut v);
+        map.insert(key.to_string(), v);
+    }
+}
+
+fn set_display(map: &mut HashMap<String, String>, key: &str, value: impl Display) {
+    set_field(map, key, |v| {
+        let _ = write!(v, "{value}");
+    });
+}
+
+/// 按 `DateTime::to_rfc3339` 的格式（`AutoSi` 秒精度、`+00:00` 偏移）写入 UTC 时间，不分配。
+fn write_rfc3339(buf: &mut String, dt: &DateTime<Utc>) {
+    let nanos = dt.nanosecond();
+    if nanos >= 1_000_000_000 || !(0..=9999).contains(&dt.year()) {
+        // 闰秒与四位数以外的年份极少见，直接交给 chrono
+        buf.push_str(&dt.to_rfc3339());
+        return;
+    }
+    let _ = write!(
+        buf,
+        "{:04}-{:02}-{:02}T{:02}:{:02}:{:02}",
+        dt.year(),
+        dt.month(),
+        dt.day(),
+        dt.hour(),
+        dt.minute(),
+        dt.second()
+    );
+    let _ = match nanos {
+        0 => Ok(()),
+        n if n % 1_000_000 == 0 => write!(buf, ".{:03}", n / 1_000_000),
+        n if n % 1_000 == 0 => write!(buf, ".{:06}", n / 1_000),
+        n => write!(buf, ".{n:09}"),
+    };
+    buf.push_str("+00:00");
+}
 
 #[derive(Clone)]
 enum CompiledKlineSignalOp {
@@ -22,10 +139,69 @@ enum CompiledKlineSignalOp {
     },
 }
 
+/// 编译后的 K 线信号 op 及其 `(信号函数名, 参数 JSON)` 标签。
+type KlineOpEntry = (CompiledKlineSignalOp, (String, String));
+
 #[derive(Clone)]
 struct CompiledKlineFreqGroup {
-    freq: String,
+    freq: Freq,
     ops: Vec<CompiledKlineSignalOp>,
+    /// 与 `ops` 一一对应的 `(信号函数名, 参数 JSON)`，用于信号剖析
+    labels: Vec<(String, String)>,
+}
+
+/// 信号剖析状态：剖析结果与各 op / 周期在其中的下标。
+#[derive(Clone)]
+struct KlineProfiler {
+    profile: SignalProfile,
+    /// 与 `compiled_kline_groups` 一一对应：`(周期条目, 首个 op 条目)`
+    groups: Vec<(usize, usize)>,
+    /// 各周期 CZSC 增量更新条目，首次更新时登记
+    czsc: FreqTable<usize>,
+}
+
+impl KlineProfiler {
+    fn new(groups: &[CompiledKlineFreqGroup]) -> Self {
+        let mut profile = SignalProfile::default();
+        let groups = groups
+            .iter()
+            .map(|g| {
+                let freq: &str = g.freq.as_ref();
+                let group_slot = profile.register(SignalProfileKind::Freq, "", freq, "");
+                let first_op = group_slot + 1;
+                for (name, params) in &g.labels {
+                    profile.register(SignalProfileKind::Kline, name, freq, params);
+                }
+                (group_slot, first_op)
+            })
+            .collect();
+        Self {
+            profile,
+            groups,
+            czsc: FreqTable::new(),
+        }
+    }
+
+    fn record_czsc(&mut self, freq: Freq, ns: u64) {
+        let slot = match self.czsc.get(freq) {
+            Some(&slot) => slot,
+            None => {
+                let slot = self
+                    .profile
+                    .register(SignalProfileKind::Czsc, "", freq.as_ref(), "");
+                *self.czsc.slot(freq) = Some(slot);
+                slot
+            }
+        };
+        self.profile.record(slot, ns);
+    }
+}
+
+/// 信号参数的 JSON 文本（键有序），作为剖析条目的参数标签。
+fn params_label(params: &impl Serialize) -> String {
+    serde_json::to_value(params)
+        .map(|v| v.to_string())
+        .unwrap_or_default()
 }
 
 #[derive(Clone, Copy, Debug, PartialEq, Eq, serde::Serialize, serde::Deserialize)]
@@ -79,6 +255,17 @@ pub struct CzscSignals {
     /// Position 事件匹配使用的信号字典：key -> value
     pub signal_map: HashMap<String, String>,
 
+    /// 按执行计划符号表编码的当前 bar 信号帧（装载符号表后才有内容）
+    #[serde(skip)]
+    pub signal_frame: SignalFrame,
+    #[serde(skip)]
+    signal_table: Option<Arc<SignalSymbolTable>>,
+    /// 只维护 `signal_frame`，跳过 `s` / `signal_map` / `sigs` 字符串字典
+    #[serde(skip)]
+    frame_only: bool,
+    #[serde(skip)]
+    key_buf: String,
+
     /// 预编译后的 K 线信号执行计划（含函数指针，不入快照；restore 后由
     /// `ensure_compiled_kline_ops` 从 `signals_config` 重建）
     #[serde(skip)]
@@ -94,8 +281,29 @@ pub struct CzscSignals {
     maintain_all_kas: bool,
 
     /// 按 freq 门控信号执行：末根 bar 未变化时复用上次结果
-    last_freq_fingerprints: HashMap<String, BarFingerprint>,
-    cached_freq_signals: HashMap<String, Vec<Signal>>,
+    last_freq_fingerprints: FreqTable<BarFingerprint>,
+    cached_freq_signals: FreqTable<Vec<Signal>>,
+    #[serde(skip, default = "FreqTable::new")]
+    cached_freq_codes: FreqTable<Vec<EncodedSignal>>,
+
+    /// `s` / `signal_map` / `sigs` 与各周期缓存一致时为 true：未变化周期的信号
+    /// 原样留在字典里，逐 bar 只改写基础字段与变化周期的信号。
+    #[serde(skip)]
+    dicts_synced: bool,
+    /// 上次同步后三个字典的长度，用于发现外部直接改写
+    #[serde(skip)]
+    dict_lens: (usize, usize, usize),
+    /// 本根 bar 经 `insert_signal` 写入过计划外信号，下一根 bar 需整体重建字典
+    #[serde(skip)]
+    has_extra_signals: bool,
+    /// 变化周期重算信号时复用的暂存缓冲区
+    #[serde(skip)]
+    sig_buf: Vec<Signal>,
+    #[serde(skip)]
+    stale_key_buf: String,
+    /// 开启信号剖析后逐 op 记录耗时，见 [`CzscSignals::enable_signal_profile`]
+    #[serde(skip)]
+    profiler: Option<Box<KlineProfiler>>,
 }
 
 impl CzscSignals {
@@ -121,14 +329,25 @@ impl CzscSignals {
             s: HashMap::new(),
             sigs: HashSet::new(),
             signal_map: HashMap::new(),
+            signal_frame: SignalFrame::default(),
+            signal_table: None,
+            frame_only: false,
+            key_buf: String::new(),
             compiled_kline_groups: Vec::new(),
             use_plan_compiled: false,
             compiled_cfg_ptr: 0,
             compiled_cfg_len: 0,
             required_kas_freqs: HashSet::new(),
             maintain_all_kas: false,
-            last_freq_fingerprints: HashMap::new(),
-            cached_freq_signals: HashMap::new(),
+            last_freq_fingerprints: FreqTable::new(),
+            cached_freq_signals: FreqTable::new(),
+            cached_freq_codes: FreqTable::new(),
+            dicts_synced: false,
+            dict_lens: (0, 0, 0),
+            has_extra_signals: false,
+            sig_buf: Vec::new(),
+            stale_key_buf: String::new(),
+            profiler: None,
         }
     }
 
@@ -142,7 +361,7 @@ impl CzscSignals {
             return;
         }
 
-        let mut grouped: HashMap<String, Vec<CompiledKlineSignalOp>> = HashMap::new();
+        let mut grouped: BTreeMap<Freq, Vec<KlineOpEntry>> = BTreeMap::new();
         self.required_kas_freqs.clear();
         self.maintain_all_kas = false;
         for config in signals_config {
@@ -171,20 +390,15 @@ impl CzscSignals {
                         params: config.params.clone(),
                     }
                 };
-                grouped.entry(freq.clone()).or_default().push(op);
+                // 无法解析的周期不会出现在 kas 中，信号本就无从计算
+                if let Ok(f) = Freq::from_str(freq) {
+                    let label = (config.name.clone(), params_label(&config.params));
+                    grouped.entry(f).or_default().push((op, label));
+                }
                 self.required_kas_freqs.insert(freq.clone());
             }
         }
-        let mut freqs: Vec<String> = grouped.keys().cloned().collect();
-        freqs.sort();
-        self.compiled_kline_groups.clear();
-        self.compiled_kline_groups.reserve(freqs.len());
-        for freq in freqs {
-            if let Some(ops) = grouped.remove(&freq) {
-                self.compiled_kline_groups
-                    .push(CompiledKlineFreqGroup { freq, ops });
-            }
-        }
+        self.set_kline_groups(grouped);
         self.compiled_cfg_ptr = ptr;
         self.compiled_cfg_len = len;
     }
@@ -194,7 +408,7 @@ impl CzscSignals {
     /// 该接口会切换到 plan 驱动模式，后续 `update_signals` 不再尝试按
     /// `signals_config` 进行运行期编译。
     pub fn load_compiled_signal_plan(&mut self, plan: &CompiledSignalPlanV2) -> Result<(), String> {
-        let mut grouped: HashMap<String, Vec<CompiledKlineSignalOp>> = HashMap::new();
+        let mut grouped: BTreeMap<Freq, Vec<KlineOpEntry>> = BTreeMap::new();
         self.required_kas_freqs.clear();
         self.maintain_all_kas = false;
 
@@ -233,27 +447,85 @@ impl CzscSignals {
                         .map_err(|e| format!("信号参数解析失败 {}: {e}", op.name))?,
                 }
             };
-            grouped.entry(freq.clone()).or_default().push(sig_op);
-            self.required_kas_freqs.insert(freq.clone());
-        }
-
-        let mut freqs: Vec<String> = grouped.keys().cloned().collect();
-        freqs.sort();
-        self.compiled_kline_groups.clear();
-        self.compiled_kline_groups.reserve(freqs.len());
-        for freq in freqs {
-            if let Some(ops) = grouped.remove(&freq) {
-                self.compiled_kline_groups
-                    .push(CompiledKlineFreqGroup { freq, ops });
+            if let Ok(f) = Freq::from_str(freq) {
+                let label = (op.name.clone(), params_label(&op.params));
+                grouped.entry(f).or_default().push((sig_op, label));
             }
+            self.required_kas_freqs.insert(freq.clone());
         }
 
+        self.set_kline_groups(grouped);
         self.use_plan_compiled = true;
         self.compiled_cfg_ptr = 0;
         self.compiled_cfg_len = 0;
         Ok(())
     }
 
+    /// 替换 K 线信号分组；分组变化后旧周期的信号可能残留在字典里，下一根 bar 整体重建。
+    fn set_kline_groups(&mut self, grouped: BTreeMap<Freq, Vec<KlineOpEntry>>) {
+        self.compiled_kline_groups = grouped
+            .into_iter()
+            .map(|(freq, entries)| {
+                let (ops, labels) = entries.into_iter().unzip();
+                CompiledKlineFreqGroup { freq, ops, labels }
+            })
+            .collect();
+        self.dicts_synced = false;
+        if self.profiler.is_some() {
+            self.enable_signal_profile();
+        }
+    }
+
+    /// 开启信号剖析：此后每次信号计算逐 op、逐周期记录耗时。
+    ///
+    /// 已开启时重新登记并清空已有统计；应在装载信号计划、完成预热之后调用，
+    /// 使 warmup / prime 不计入剖析结果。
+    pub fn enable_signal_profile(&mut self) {
+        self.profiler = Some(Box::new(KlineProfiler::new(&self.compiled_kline_groups)));
+    }
+
+    /// 取出信号剖析结果并关闭剖析；未开启时返回 `None`。
+    pub fn take_signal_profile(&mut self) -> Option<SignalProfile> {
+        self.profiler.take().map(|p| p.profile)
+    }
+
+    /// 装载执行计划的信号符号表，之后每根 bar 的信号同时按下标写入 `signal_frame`。
+    ///
+    /// `frame_only = true` 时不再维护 `s` / `signal_map` / `sigs` 字符串字典，
+    /// Position 直接用 `signal_frame` 做事件匹配；需要导出信号明细时传 `false`。
+    pub fn load_signal_table(&mut self, table: Arc<SignalSymbolTable>, frame_only: bool) {
+        self.signal_frame = table.new_frame();
+        self.signal_table = Some(table);
+        self.frame_only = frame_only;
+        self.cached_freq_signals.clear();
+        self.cached_freq_codes.clear();
+        self.dicts_synced = false;
+    }
+
+    /// 写入一个信号（trader 级信号等计划外来源），同步维护字符串字典与信号帧。
+    pub fn insert_signal(&mut self, sig: Signal) {
+        if let Some(table) = self.signal_table.as_deref() {
+            self.signal_frame
+                .insert_signal(table, &sig, &mut self.key_buf);
+        }
+        if !self.frame_only {
+            let (k, v) = (sig.key(), sig.value());
+            self.s.insert(k.clone(), v.clone());
+            self.signal_map.insert(k, v);
+            self.sigs.insert(sig);
+            self.has_extra_signals = true;
+        }
+    }
+
+    /// 整体替换信号字典（`CzscTrader.on_sig` 等由外部直接给出信号的场景）。
+    ///
+    /// 下一次 `update_signals` 会丢弃这里写入的内容并按各周期缓存重建字典。
+    pub fn replace_signal_dict(&mut self, s: HashMap<String, String>) {
+        self.signal_map = s.clone();
+        self.s = s;
+        self.dicts_synced = false;
+    }
+
     /// 执行主更新流程
     pub fn update_signals(
         &mut self,
@@ -266,7 +538,7 @@ impl CzscSignals {
         let changed_freqs = self.advance_kas(bar, true)?;
 
         self.reset_signal_state(bar);
-        self.compute_kline_signals(Some(&changed_freqs));
+        self.compute_kline_signals(Some(changed_freqs));
         Ok(())
     }
 
@@ -284,58 +556,160 @@ impl CzscSignals {
         self.compute_kline_signals(None);
     }
 
+    /// 清空信号帧并写入当前 bar 的基础字段。
+    ///
+    /// 字典已同步时只原地改写基础字段的取值缓冲区，未变化周期的信号原样保留；
+    /// 否则（首根 bar、外部改写、计划外信号写入之后）先清空三个字典再整体重建。
     fn reset_signal_state(&mut self, bar: &RawBar) {
-        self.s.clear();
-        self.sigs.clear();
-        self.signal_map.clear();
-        self.s.insert("symbol".to_string(), self.symbol.clone());
-        self.s.insert("dt".to_string(), bar.dt.to_rfc3339());
-        self.s.insert("id".to_string(), bar.id.to_string());
-        self.s.insert("freq".to_string(), bar.freq.to_string());
-        self.s.insert("open".to_string(), bar.open.to_string());
-        self.s.insert("close".to_string(), bar.close.to_string());
-        self.s.insert("high".to_string(), bar.high.to_string());
-        self.s.insert("low".to_string(), bar.low.to_string());
-        self.s.insert("vol".to_string(), bar.vol.to_string());
-        self.s.insert("amount".to_string(), bar.amount.to_string());
-    }
-
-    fn compute_kline_signals(&mut self, changed_freqs: Option<&HashSet<String>>) {
-        for group in &self.compiled_kline_groups {
-            if let Some(changed_freqs) = changed_freqs
-                && !changed_freqs.contains(group.freq.as_str())
-                && let Some(cached_sigs) = self.cached_freq_signals.get(group.freq.as_str())
+        self.signal_frame.clear();
+        if self.frame_only {
+            return;
+        }
+        let lens = (self.s.len(), self.signal_map.len(), self.sigs.len());
+        if self.has_extra_signals || lens != self.dict_lens {
+            self.dicts_synced = false;
+        }
+        self.has_extra_signals = false;
+        if !self.dicts_synced {
+            self.s.clear();
+            self.sigs.clear();
+            self.signal_map.clear();
+        }
+
+        let s = &mut self.s;
+        set_field(s, "symbol", |v| v.push_str(&self.symbol));
+        set_field(s, "dt", |v| write_rfc3339(v, &bar.dt));
+        set_display(s, "id", bar.id);
+        set_field(s, "freq", |v| v.push_str(bar.freq.as_ref()));
+        set_display(s, "open", bar.open);
+        set_display(s, "close", bar.close);
+        set_display(s, "high", bar.high);
+        set_display(s, "low", bar.low);
+        set_display(s, "vol", bar.vol);
+        set_display(s, "amount", bar.amount);
+    }
+
+    fn compute_kline_signals(&mut self, changed_freqs: Option<FreqMask>) {
+        let table = self.signal_table.as_deref();
+        let frame_only = self.frame_only;
+        let rebuild = !self.dicts_synced;
+        let mut profiler = self.profiler.as_deref_mut();
+        for (gi, group) in self.compiled_kline_groups.iter().enumerate() {
+            let freq = group.freq;
+            if let Some(mask) = changed_freqs
+                && mask & freq_bit(freq) == 0
             {
-                for sig in cached_sigs {
-                    let (k, v) = (sig.key(), sig.value());
-                    self.s.insert(k.clone(), v.clone());
-                    self.signal_map.insert(k, v);
-                    self.sigs.insert(sig.clone());
+                let cached_codes = self.cached_freq_codes.get(freq);
+                let cached_sigs = self.cached_freq_signals.get(freq);
+                let has_cache = if frame_only {
+                    cached_codes.is_some()
+                } else {
+                    cached_sigs.is_some() && (table.is_none() || cached_codes.is_some())
+                };
+                if has_cache {
+                    for &(key_id, value) in cached_codes.into_iter().flatten() {
+                        self.signal_frame.set(key_id, value);
+                    }
+                    // 字典已同步时该周期上一根 bar 的信号仍在字典中，无需重写
+                    if !frame_only && rebuild {
+                        for sig in cached_sigs.into_iter().flatten() {
+                            let (k, v) = (sig.key(), sig.value());
+                            self.s.insert(k.clone(), v.clone());
+                            self.signal_map.insert(k, v);
+                            self.sigs.insert(sig.clone());
+                        }
+                    }
+                    continue;
                 }
-                continue;
             }
 
-            if let Some(czsc) = self.kas.get(group.freq.as_str()) {
-                let cache = self.ta_cache.entry(group.freq.clone()).or_default();
-                let mut freq_sigs = Vec::new();
-                for op in &group.ops {
-                    let sigs_res = match op {
-                        CompiledKlineSignalOp::Fast { exec, params } => (exec)(czsc, params, cache),
-                        CompiledKlineSignalOp::Dynamic { func, params } => {
-                            (func)(czsc, params, cache)
+            let freq_str: &str = freq.as_ref();
+            let Some(czsc) = self.kas.get(freq_str) else {
+                continue;
+            };
+            if !self.ta_cache.contains_key(freq_str) {
+                self.ta_cache
+                    .insert(freq_str.to_string(), TaCache::default());
+            }
+            let Some(cache) = self.ta_cache.get_mut(freq_str) else {
+                continue;
+            };
+            let mut freq_codes = if table.is_some() {
+                let codes = self.cached_freq_codes.slot(freq).get_or_insert_default();
+                codes.clear();
+                Some(codes)
+            } else {
+                None
+            };
+            let new_sigs = &mut self.sig_buf;
+            new_sigs.clear();
+            let t_group = profiler.is_some().then(Instant::now);
+            for (oi, op) in group.ops.iter().enumerate() {
+                let t_op = profiler.is_some().then(Instant::now);
+                let sigs_res = match op {
+                    CompiledKlineSignalOp::Fast { exec, params } => (exec)(czsc, params, cache),
+                    CompiledKlineSignalOp::Dynamic { func, params } => (func)(czsc, params, cache),
+                };
+                if let (Some(p), Some(t)) = (profiler.as_deref_mut(), t_op) {
+                    p.profile
+                        .record(p.groups[gi].1 + oi, t.elapsed().as_nanos() as u64);
+                }
+                for sig in sigs_res {
+                    if let Some(table) = table
+                        && let Some((key_id, value)) = table.encode_signal(&sig, &mut self.key_buf)
+                    {
+                        self.signal_frame.set(key_id, value);
+                        if let Some(codes) = &mut freq_codes {
+                            codes.push((key_id, value));
                         }
-                    };
-                    for sig in sigs_res {
-                        let (k, v) = (sig.key(), sig.value());
-                        self.s.insert(k.clone(), v.clone());
-                        self.signal_map.insert(k, v);
-                        self.sigs.insert(sig.clone());
-                        freq_sigs.push(sig);
+                    }
+                    if !frame_only {
+                        new_sigs.push(sig);
                     }
                 }
-                self.cached_freq_signals
-                    .insert(group.freq.clone(), freq_sigs);
             }
+            if let (Some(p), Some(t)) = (profiler.as_deref_mut(), t_group) {
+                p.profile
+                    .record(p.groups[gi].0, t.elapsed().as_nanos() as u64);
+            }
+            if frame_only {
+                continue;
+            }
+
+            let old_sigs = self.cached_freq_signals.slot(freq).get_or_insert_default();
+            if !rebuild {
+                // 撤下该周期上一根 bar 的信号：取值变化的移出 sigs，本轮不再产出的 key 移出字典
+                for old in old_sigs.iter() {
+                    if !new_sigs.contains(old) {
+                        self.sigs.remove(old);
+                    }
+                    old.write_key(&mut self.key_buf);
+                    let still_emitted = new_sigs.iter().any(|sig| {
+                        sig.write_key(&mut self.stale_key_buf);
+                        self.stale_key_buf == self.key_buf
+                    });
+                    if !still_emitted {
+                        self.s.remove(self.key_buf.as_str());
+                        self.signal_map.remove(self.key_buf.as_str());
+                    }
+                }
+            }
+            for sig in new_sigs.iter() {
+                sig.write_key(&mut self.key_buf);
+                set_field(&mut self.s, &self.key_buf, |v| sig.write_value(v));
+                set_field(&mut self.signal_map, &self.key_buf, |v| sig.write_value(v));
+                if !self.sigs.contains(sig) {
+                    self.sigs.insert(sig.clone());
+                }
+            }
+            // 新结果换入缓存，旧缓存的 Vec 留作下一次重算的暂存缓冲区
+            std::mem::swap(old_sigs, new_sigs);
+            new_sigs.clear();
+        }
+
+        if !frame_only {
+            self.dicts_synced = true;
+            self.dict_lens = (self.s.len(), self.signal_map.len(), self.sigs.len());
         }
     }
 
@@ -355,6 +729,8 @@ impl CzscSignals {
         self.kas.clear();
         self.last_freq_fingerprints.clear();
         self.cached_freq_signals.clear();
+        self.cached_freq_codes.clear();
+        self.dicts_synced = false;
 
         for (freq, bars_lock) in &self.bg.freq_bars {
             let bars = bars_lock.read();
@@ -367,51 +743,211 @@ impl CzscSignals {
         }
     }
 
+    /// 推进 BG 并同步各周期 CZSC，返回末根 bar 有变化的周期位集。
     fn advance_kas(
         &mut self,
         bar: &RawBar,
         update_fingerprint: bool,
-    ) -> Result<HashSet<String>, UtilsError> {
+    ) -> Result<FreqMask, UtilsError> {
         self.bg.update_bar(bar)?;
 
-        let mut changed_freqs: HashSet<String> = HashSet::new();
-        for (freq, bars_lock) in &self.bg.freq_bars {
-            let freq_str = freq.to_string();
-            if !self.maintain_all_kas && !self.required_kas_freqs.contains(freq_str.as_str()) {
+        let mut changed_freqs: FreqMask = 0;
+        for (&freq, bars_lock) in &self.bg.freq_bars {
+            let freq_str: &str = freq.as_ref();
+            if !self.maintain_all_kas && !self.required_kas_freqs.contains(freq_str) {
                 continue;
             }
             let bars = bars_lock.read();
-            if bars.is_empty() {
+            let Some(last_bar) = bars.back() else {
                 continue;
-            }
+            };
 
-            let last_bar = bars.back().expect("bars not empty");
             let fingerprint = BarFingerprint::from_bar(last_bar);
             let is_changed = if update_fingerprint {
-                let changed = self
-                    .last_freq_fingerprints
-                    .get(&freq_str)
-                    .map(|prev| *prev != fingerprint)
-                    .unwrap_or(true);
-                self.last_freq_fingerprints
-                    .insert(freq_str.clone(), fingerprint);
+                let prev = self.last_freq_fingerprints.slot(freq);
+                let changed = *prev != Some(fingerprint);
+                *prev = Some(fingerprint);
                 changed
             } else {
                 true
             };
 
-            if !self.kas.contains_key(&freq_str) {
-                let bars_vec: Vec<RawBar> = bars.iter().cloned().collect();
-                let czsc = Self::new_czsc_from_bars(bars_vec);
-                self.kas.insert(freq_str.clone(), czsc);
-                changed_freqs.insert(freq_str);
-            } else if is_changed {
-                if let Some(czsc) = self.kas.get_mut(&freq_str) {
+            if let Some(czsc) = self.kas.get_mut(freq_str) {
+                if is_changed {
+                    let t_czsc = self.profiler.is_some().then(Instant::now);
                     czsc.update_bar(last_bar.clone());
+                    if let (Some(p), Some(t)) = (self.profiler.as_deref_mut(), t_czsc) {
+                        p.record_czsc(freq, t.elapsed().as_nanos() as u64);
+                    }
+                    changed_freqs |= freq_bit(freq);
                 }
-                changed_freqs.insert(freq_str);
+            } else {
+                let bars_vec: Vec<RawBar> = bars.iter().cloned().collect();
+                self.kas
+                    .insert(freq_str.to_string(), Self::new_czsc_from_bars(bars_vec));
+                changed_freqs |= freq_bit(freq);
             }
         }
         Ok(changed_freqs)
     }
 }
+
+#[cfg(test)]
+mod tests {
+    use super::{CzscSignals, write_rfc3339};
+    use crate::sig_parse::SignalConfig;
+    use crate::signal_profile::SignalProfileKind;
+    use chrono::{Duration, NaiveDate, TimeZone, Utc};
+    use czsc_core::objects::bar::{RawBar, RawBarBuilder};
+    use czsc_core::objects::{freq::Freq, market::Market};
+    use czsc_utils::bar_generator::BarGenerator;
+    use std::collections::HashMap;
+
+    /// A 股 30 分钟 K 线的结束时刻
+    const SLOTS: [(u32, u32); 8] = [
+        (10, 0),
+        (10, 30),
+        (11, 0),
+        (11, 30),
+        (13, 30),
+        (14, 0),
+        (14, 30),
+        (15, 0),
+    ];
+
+    fn make_bars(days: i64) -> Vec<RawBar> {
+        let day0 = NaiveDate::from_ymd_opt(2024, 1, 2).unwrap();
+        let mut bars = Vec::new();
+        for d in 0..days {
+            for &(h, m) in &SLOTS {
+                let i = bars.len();
+                let x = i as f64;
+                let close = 100.0 + (x * 0.11).sin() * 8.0 + (x * 0.013).sin() * 20.0;
+                let dt = (day0 + Duration::days(d)).and_hms_opt(h, m, 0).unwrap();
+                let bar = RawBarBuilder::default()
+                    .symbol("000001.SZ".to_string())
+                    .id(i as i32)
+                    .dt(Utc.from_utc_datetime(&dt))
+                    .freq(Freq::F30)
+                    .open(close - 0.3)
+                    .close(close)
+                    .high(close + 0.8)
+                    .low(close - 0.9)
+                    .vol(1000.0)
+                    .amount(1000.0 * close)
+                    .build()
+                    .unwrap();
+                bars.push(bar);
+            }
+        }
+        bars
+    }
+
+    #[test]
+    fn write_rfc3339_matches_chrono() {
+        let base = Utc.with_ymd_and_hms(2024, 1, 2, 9, 31, 0).unwrap();
+        for nanos in [0, 120_000_000, 123_456_000, 123_456_789, 5] {
+            let dt = base + Duration::nanoseconds(nanos);
+            let mut buf = String::new();
+            write_rfc3339(&mut buf, &dt);
+            assert_eq!(buf, dt.to_rfc3339());
+        }
+    }
+
+    #[test]
+    fn incremental_dicts_match_full_rebuild() {
+        let cfg: Vec<SignalConfig> = ["30分钟", "60分钟", "日线"]
+            .iter()
+            .map(|f| SignalConfig {
+                name: "cxt_bi_status_V230101".to_string(),
+                freq: Some(f.to_string()),
+                params: HashMap::new(),
+            })
+            .collect();
+        let bars = make_bars(80);
+        let (warm, rest) = bars.split_at(240);
+
+        let bg =
+            BarGenerator::new(Freq::F30, vec![Freq::F60, Freq::D], 2000, Market::Default).unwrap();
+        let mut signals = CzscSignals::new("000001.SZ".to_string(), bg);
+        for bar in warm {
+            signals.warmup_bar(bar).unwrap();
+        }
+        signals.prime_signals(warm.last().unwrap(), &cfg);
+
+        for (i, bar) in rest.iter().enumerate() {
+            // 参照组每根 bar 都清空字典整体重建，即改造前的语义
+            let mut reference = signals.clone();
+            reference.dicts_synced = false;
+            signals.update_signals(bar, &cfg).unwrap();
+            reference.update_signals(bar, &cfg).unwrap();
+
+            assert!(signals.s.len() > 10, "bar {i} 未产出信号");
+            assert_eq!(signals.s, reference.s, "bar {i}");
+            assert_eq!(signals.signal_map, reference.signal_map, "bar {i}");
+            assert_eq!(signals.sigs, reference.sigs, "bar {i}");
+
+            if i % 7 == 0 {
+                // 重复推送同一根 bar：各周期指纹不变，全部走缓存
+                signals.update_signals(bar, &cfg).unwrap();
+                assert_eq!(signals.s, reference.s, "bar {i} 重复推送");
+                assert_eq!(signals.sigs, reference.sigs, "bar {i} 重复推送");
+            }
+        }
+    }
+
+    #[test]
+    fn signal_profile_records_each_op() {
+        let cfg: Vec<SignalConfig> = ["30分钟", "日线"]
+            .iter()
+            .map(|f| SignalConfig {
+                name: "cxt_bi_status_V230101".to_string(),
+                freq: Some(f.to_string()),
+                params: HashMap::new(),
+            })
+            .collect();
+        let bars = make_bars(40);
+        let (warm, rest) = bars.split_at(160);
+
+        let bg = BarGenerator::new(Freq::F30, vec![Freq::D], 2000, Market::Default).unwrap();
+        let mut signals = CzscSignals::new("000001.SZ".to_string(), bg);
+        for bar in warm {
+            signals.warmup_bar(bar).unwrap();
+        }
+        signals.prime_signals(warm.last().unwrap(), &cfg);
+        assert!(signals.take_signal_profile().is_none());
+
+        signals.enable_signal_profile();
+        for bar in rest {
+            signals.update_signals(bar, &cfg).unwrap();
+        }
+        let profile = signals.take_signal_profile().unwrap();
+        let calls = |kind: SignalProfileKind, freq: &str| {
+            profile
+                .entries()
+                .iter()
+                .find(|e| e.kind == kind && e.freq == freq)
+                .map(|e| e.stats.calls())
+        };
+        for freq in ["30分钟", "日线"] {
+            // 基础周期每根 bar 都是新 K 线，日线末根 bar 随之更新，两个周期都逐 bar 重算
+            assert_eq!(
+                calls(SignalProfileKind::Kline, freq),
+                Some(rest.len() as u64)
+            );
+            assert_eq!(
+                calls(SignalProfileKind::Freq, freq),
+                Some(rest.len() as u64)
+            );
+            assert!(calls(SignalProfileKind::Czsc, freq).is_some_and(|n| n > 0));
+        }
+        let op = profile
+            .entries()
+            .iter()
+            .find(|e| e.kind == SignalProfileKind::Kline)
+            .unwrap();
+        assert_eq!(op.name, "cxt_bi_status_V230101");
+        assert_eq!(op.params, "{}");
+        assert!(op.stats.total_ns() > 0);
+    }
+}
@@ -8,8 +8,9 @@ use crate::engine_v2::compiler::event::compile_events;
 use crate::engine_v2::compiler::position::compile_positions;
 use crate::engine_v2::compiler::signal::{CompiledSignalPlan, compile_signals};
 use crate::sig_parse::SignalConfig;
-use czsc_core::objects::position::Position;
+use czsc_core::objects::position::{Position, SharedEventMatcher, SignalSymbolTable};
 use serde::{Deserialize, Serialize};
+use std::sync::Arc;
 
 #[derive(Debug, Clone, Deserialize, Serialize)]
 pub struct ExecutionPlanInput {
@@ -56,6 +57,10 @@ pub struct ExecutionPlan {
     pub signal_plan: CompiledSignalPlan,
     pub event_plan: event::CompiledEventPlan,
     pub position_plan: position::CompiledPositionPlan,
+    /// 全部仓位事件引用到的信号符号表；运行期信号按其下标写入 `SignalFrame`。
+    pub signal_table: Arc<SignalSymbolTable>,
+    /// 基于 `signal_table` 编译的全部仓位共享事件匹配器，仓位下标与 `positions` 一致。
+    pub event_matcher: Arc<SharedEventMatcher>,
 }
 
 pub(crate) use signal::CompiledSignalPlan as CompiledSignalPlanV2;
@@ -91,6 +96,8 @@ impl ExecutionPlan {
         let signal_plan = compile_signals(&signals_config, &catalog_signals)?;
         let event_plan = compile_events(&positions);
         let position_plan = compile_positions(&positions);
+        let signal_table = Arc::new(SignalSymbolTable::from_positions(&positions));
+        let event_matcher = Arc::new(SharedEventMatcher::compile(&signal_table, &positions));
 
         Ok(Self {
             symbol,
@@ -105,6 +112,8 @@ impl ExecutionPlan {
             signal_plan,
             event_plan,
             position_plan,
+            signal_table,
+            event_matcher,
         })
     }
 }
@@ -4,4 +4,7 @@ pub mod runtime;
 pub mod scheduler;
 
 pub use compiler::{ExecutionPlan, ExecutionPlanInput};
-pub use runtime::{CoreLoopProfileV2, RunOutput, UnifiedExecEngine};
+pub use runtime::{
+    CoreLoopProfileV2, RunOptions, RunOutput, SharedSignalStream, SignalColumns, SignalSpill,
+    UnifiedExecEngine,
+};
@@ -1,19 +1,23 @@
 use crate::czsc_signals::CzscSignals;
 use crate::engine_v2::catalog::SignalCategory;
 use crate::engine_v2::compiler::ExecutionPlan;
+use crate::engine_v2::runtime::signal_columns::{SignalColumns, SignalSpill};
+use crate::signal_profile::{SignalProfile, SignalProfileKind};
 use chrono::{DateTime, NaiveDate, NaiveDateTime, Utc};
 use czsc_core::analyze::CZSC;
 use czsc_core::objects::bar::RawBar;
 use czsc_core::objects::freq::Freq;
+use czsc_core::objects::holds::PriceTape;
 use czsc_core::objects::market::Market;
-use czsc_core::objects::position::{LiteBar, Position};
+use czsc_core::objects::position::{EventHits, LiteBar, Position};
+use czsc_core::objects::signal::Signal;
 use czsc_core::objects::state::TraderState;
 use czsc_signals::registry::TRADER_SIGNAL_REGISTRY;
 use czsc_signals::types::TraderSignalFn;
 use czsc_utils::bar_generator::BarGenerator;
 use czsc_utils::freq_data::infer_market_from_bars;
 use serde_json::Value;
-use std::collections::{HashMap, HashSet};
+use std::collections::{BTreeSet, HashMap, HashSet};
 use std::time::Instant;
 
 #[derive(Debug, Clone, Copy, Default)]
@@ -36,16 +40,33 @@ impl CoreLoopProfileV2 {
 
 pub struct RunOutput {
     pub bars_count: usize,
-    pub signal_rows: Vec<HashMap<String, String>>,
+    /// `emit_signals` 时的列式信号明细；落盘模式下已写出的行不在其中
+    pub signals: SignalColumns,
     pub positions: Vec<czsc_core::objects::position::Position>,
     pub elapsed_ms: i64,
     pub profile: Option<CoreLoopProfileV2>,
+    /// `profile_signals` 时逐信号函数的耗时剖析
+    pub signal_profile: Option<SignalProfile>,
+}
+
+/// [`UnifiedExecEngine::run_with`] 的执行选项。
+#[derive(Default)]
+pub struct RunOptions {
+    /// 产出逐 bar 信号明细（`RunOutput.signals`）
+    pub emit_signals: bool,
+    /// 记录 `CoreLoopProfileV2` 粗粒度分段耗时
+    pub enable_profile: bool,
+    /// 记录每个 K 线信号函数、周期、CZSC 更新与 trader 信号函数的耗时
+    pub profile_signals: bool,
+    /// 信号明细分批落盘，隐含 `emit_signals`
+    pub spill: Option<SignalSpill>,
 }
 
 pub struct UnifiedExecEngine;
 
 #[derive(Clone)]
 struct CompiledTraderSignalOp {
+    name: String,
     func: TraderSignalFn,
     params: HashMap<String, Value>,
 }
@@ -80,6 +101,7 @@ fn compile_trader_ops(plan: &ExecutionPlan) -> Result<Vec<CompiledTraderSignalOp
             && let Some(meta) = TRADER_SIGNAL_REGISTRY.get(op.name.as_str())
         {
             ops.push(CompiledTraderSignalOp {
+                name: op.name.clone(),
                 func: meta.func,
                 params: serde_json::from_value(op.params.clone())
                     .map_err(|e| format!("trader 信号参数解析失败 {}: {e}", op.name))?,
@@ -89,119 +111,273 @@ fn compile_trader_ops(plan: &ExecutionPlan) -> Result<Vec<CompiledTraderSignalOp
     Ok(ops)
 }
 
-impl UnifiedExecEngine {
-    pub fn run(
-        plan: &ExecutionPlan,
-        mut bars: Vec<RawBar>,
-        sdt_override: Option<&str>,
-        emit_signals: bool,
-        enable_profile: bool,
-    ) -> Result<RunOutput, String> {
-        let t0 = Instant::now();
-        if bars.is_empty() {
-            return Err("bars 为空，无法执行回测".to_string());
+/// 依次执行 trader 级信号函数，收集本 bar 的全部输出。
+///
+/// `profile` 的第 `i` 个条目对应 `ops[i]`，见 [`trader_ops_profile`]。
+fn run_trader_ops(
+    ops: &[CompiledTraderSignalOp],
+    state: &RuntimeTraderState<'_>,
+    mut profile: Option<&mut SignalProfile>,
+) -> Vec<Signal> {
+    let mut sigs = Vec::new();
+    for (i, op) in ops.iter().enumerate() {
+        let t_op = profile.is_some().then(Instant::now);
+        sigs.extend((op.func)(state, &op.params));
+        if let (Some(p), Some(t)) = (profile.as_deref_mut(), t_op) {
+            p.record(i, t.elapsed().as_nanos() as u64);
         }
+    }
+    sigs
+}
 
-        let base_freq = plan
-            .base_freq
-            .parse::<Freq>()
-            .map_err(|_| "strategy.base_freq 解析失败".to_string())?;
-
-        let requested_market = parse_market(plan.market.as_deref());
-        let market = infer_effective_market(&bars, base_freq, requested_market);
-        let freqs = collect_freqs(base_freq, &plan.signals_config)?;
-        let trader_ops = compile_trader_ops(plan)?;
-        // 对齐 Python 基线 `generate_czsc_signals(init_n=500)` 的左右分段逻辑：
-        // 1) bars_left = bars[dt < sdt]
-        // 2) 若 len(bars_left) <= init_n，则 bars_left=bars[:init_n], bars_right=bars[init_n:]
-        // 3) 否则 bars_right = bars[dt >= sdt]
-        // 当 bars_right 为空时，不执行回测主循环。
-        const INIT_N: usize = 500;
-        // 对齐 Python `CzscStrategyBase.init_bar_generator`：
-        // - 默认 sdt = "20200101"
-        // - bars_init 使用 `dt <= sdt`
-        // - 若 len(bars_init) > n(500): bars1=bars_init, bars2=dt > sdt
-        // - 否则 bars1=bars[:n], bars2=bars[n:]
-        let sdt_final = sdt_override
-            .map(|x| x.to_string())
-            .or_else(|| plan.sdt.clone())
-            .or_else(|| Some("20200101".to_string()));
-        let cutoff = sdt_final.as_deref().and_then(parse_sdt_utc);
-        let bars_len = bars.len();
-        let start_idx = if let Some(c) = cutoff {
-            let bars_init_count = if plan.include_sdt_bar {
-                bars.iter().take_while(|b| b.dt < c).count()
-            } else {
-                bars.iter().take_while(|b| b.dt <= c).count()
-            };
-            if !trader_ops.is_empty() {
-                // Trader 对照链路（benchmarks/generate_py_trader_signals_df）使用显式 warmup_n，
-                // 调用侧会将 sdt 设为 bars[warmup_n - 1].dt；这里按 sdt 精确预热，
-                // 避免被固定 INIT_N=500 覆盖导致状态路径错位。
-                bars_init_count.clamp(1, bars_len.saturating_sub(1))
-            } else if bars_init_count > INIT_N {
-                bars_init_count
-            } else {
-                bars_len.min(INIT_N)
-            }
+/// 按 `ops` 顺序登记 trader 信号剖析条目。
+fn trader_ops_profile(ops: &[CompiledTraderSignalOp]) -> SignalProfile {
+    let mut profile = SignalProfile::default();
+    for op in ops {
+        let params = serde_json::to_value(&op.params)
+            .map(|v| v.to_string())
+            .unwrap_or_default();
+        profile.register(SignalProfileKind::Trader, &op.name, "", &params);
+    }
+    profile
+}
+
+/// 预热完成、可进入右侧主循环的信号引擎状态。
+struct PreparedSignals {
+    signals: CzscSignals,
+    trader_ops: Vec<CompiledTraderSignalOp>,
+    start_idx: usize,
+}
+
+/// 按 `sdt` 拆分预热区 / 正式运行区，完成 BG 预热与首轮信号 prime。
+///
+/// `run` 与 `build_shared_signal_stream` 共用这段逻辑，保证两条链路的
+/// 左右分段、warmup 与 prime 语义完全一致。`frame_only` 见
+/// [`CzscSignals::load_signal_table`]。
+fn prepare_signals(
+    plan: &ExecutionPlan,
+    symbol: &str,
+    bars: &[RawBar],
+    sdt_override: Option<&str>,
+    frame_only: bool,
+) -> Result<PreparedSignals, String> {
+    if bars.is_empty() {
+        return Err("bars 为空，无法执行回测".to_string());
+    }
+
+    let base_freq = plan
+        .base_freq
+        .parse::<Freq>()
+        .map_err(|_| "strategy.base_freq 解析失败".to_string())?;
+
+    let requested_market = parse_market(plan.market.as_deref());
+    let market = infer_effective_market(bars, base_freq, requested_market);
+    let freqs = collect_freqs(base_freq, &plan.signals_config)?;
+    let trader_ops = compile_trader_ops(plan)?;
+    // 对齐 Python 基线 `generate_czsc_signals(init_n=500)` 的左右分段逻辑：
+    // 1) bars_left = bars[dt < sdt]
+    // 2) 若 len(bars_left) <= init_n，则 bars_left=bars[:init_n], bars_right=bars[init_n:]
+    // 3) 否则 bars_right = bars[dt >= sdt]
+    // 当 bars_right 为空时，不执行回测主循环。
+    const INIT_N: usize = 500;
+    // 对齐 Python `CzscStrategyBase.init_bar_generator`：
+    // - 默认 sdt = "20200101"
+    // - bars_init 使用 `dt <= sdt`
+    // - 若 len(bars_init) > n(500): bars1=bars_init, bars2=dt > sdt
+    // - 否则 bars1=bars[:n], bars2=bars[n:]
+    let sdt_final = sdt_override
+        .map(|x| x.to_string())
+        .or_else(|| plan.sdt.clone())
+        .or_else(|| Some("20200101".to_string()));
+    let cutoff = sdt_final.as_deref().and_then(parse_sdt_utc);
+    let bars_len = bars.len();
+    let start_idx = if let Some(c) = cutoff {
+        let bars_init_count = if plan.include_sdt_bar {
+            bars.iter().take_while(|b| b.dt < c).count()
         } else {
-            bars_len.min(INIT_N)
+            bars.iter().take_while(|b| b.dt <= c).count()
         };
+        if !trader_ops.is_empty() {
+            // Trader 对照链路（benchmarks/generate_py_trader_signals_df）使用显式 warmup_n，
+            // 调用侧会将 sdt 设为 bars[warmup_n - 1].dt；这里按 sdt 精确预热，
+            // 避免被固定 INIT_N=500 覆盖导致状态路径错位。
+            bars_init_count.clamp(1, bars_len.saturating_sub(1))
+        } else if bars_init_count > INIT_N {
+            bars_init_count
+        } else {
+            bars_len.min(INIT_N)
+        }
+    } else {
+        bars_len.min(INIT_N)
+    };
 
-        let bg = BarGenerator::new(base_freq, freqs, plan.bg_max_count, market)
-            .map_err(|e| format!("初始化 BarGenerator 失败: {e:?}"))?;
+    let bg = BarGenerator::new(base_freq, freqs, plan.bg_max_count, market)
+        .map_err(|e| format!("初始化 BarGenerator 失败: {e:?}"))?;
 
-        let mut signals = CzscSignals::new(plan.symbol.clone(), bg);
-        signals
-            .load_compiled_signal_plan(&plan.signal_plan)
-            .map_err(|e| format!("装载编译信号计划失败: {e}"))?;
-        let mut positions = plan.positions.clone();
+    let mut signals = CzscSignals::new(symbol.to_string(), bg);
+    signals
+        .load_compiled_signal_plan(&plan.signal_plan)
+        .map_err(|e| format!("装载编译信号计划失败: {e}"))?;
+    signals.load_signal_table(plan.signal_table.clone(), frame_only);
 
-        // 先用左侧 bars 初始化 BG / CZSC。
-        // warmup_bar 现在 propagate BarGenerator 的硬错（NaN OHLCV / freq mismatch / 非交易时间），
-        // 避免上游脏数据让 BG 进入 stale 状态后续算出"幻象"信号。
-        for bar in bars.iter().take(start_idx) {
-            signals
-                .warmup_bar(bar)
-                .map_err(|e| format!("warmup_bar 失败 (dt={}): {e}", bar.dt))?;
-        }
+    // 先用左侧 bars 初始化 BG / CZSC。
+    // warmup_bar 现在 propagate BarGenerator 的硬错（NaN OHLCV / freq mismatch / 非交易时间），
+    // 避免上游脏数据让 BG 进入 stale 状态后续算出"幻象"信号。
+    for bar in bars.iter().take(start_idx) {
+        signals
+            .warmup_bar(bar)
+            .map_err(|e| format!("warmup_bar 失败 (dt={}): {e}", bar.dt))?;
+    }
 
-        // 对齐 Python `CzscSignals(bg)`：warmup 完成后会立刻计算一次当前信号，
-        // 用于初始化 bar.cache / 指标缓存，但不会把这一时刻计入 bars_right 输出，
-        // 也不会推进 Position。
-        if start_idx > 0 {
-            let prime_bar = &bars[start_idx - 1];
-            signals.prime_signals(prime_bar, &plan.signals_config);
+    // 对齐 Python `CzscSignals(bg)`：warmup 完成后会立刻计算一次当前信号，
+    // 用于初始化 bar.cache / 指标缓存，但不会把这一时刻计入 bars_right 输出，
+    // 也不会推进 Position。
+    if start_idx > 0 {
+        let prime_bar = &bars[start_idx - 1];
+        signals.prime_signals(prime_bar, &plan.signals_config);
 
-            if !trader_ops.is_empty() {
-                let latest_price = signals
-                    .s
-                    .get("close")
-                    .and_then(|x| x.parse::<f64>().ok())
-                    .or(Some(prime_bar.close));
+        if !trader_ops.is_empty() {
+            let trader_sigs = {
                 let state = RuntimeTraderState {
-                    positions: &positions,
+                    positions: &plan.positions,
                     kas: &signals.kas,
-                    latest_price,
+                    latest_price: Some(prime_bar.close),
                 };
-                for op in &trader_ops {
-                    for sig in (op.func)(&state, &op.params) {
-                        let (k, v) = (sig.key(), sig.value());
-                        signals.s.insert(k.clone(), v.clone());
-                        signals.signal_map.insert(k, v);
-                        signals.sigs.insert(sig);
-                    }
-                }
+                run_trader_ops(&trader_ops, &state, None)
+            };
+            for sig in trader_sigs {
+                signals.insert_signal(sig);
+            }
+        }
+    }
+
+    Ok(PreparedSignals {
+        signals,
+        trader_ops,
+        start_idx,
+    })
+}
+
+impl UnifiedExecEngine {
+    pub fn run(
+        plan: &ExecutionPlan,
+        bars: Vec<RawBar>,
+        sdt_override: Option<&str>,
+        emit_signals: bool,
+        enable_profile: bool,
+    ) -> Result<RunOutput, String> {
+        let opts = RunOptions {
+            emit_signals,
+            enable_profile,
+            ..Default::default()
+        };
+        Self::run_impl(plan, &plan.symbol, false, bars, sdt_override, opts)
+    }
+
+    /// 与 [`Self::run`] 相同，但信号明细每累积 `spill` 设定的 bar 数就作为一个
+    /// record batch 写入其 parquet 文件，返回的 `RunOutput.signals` 不再持有这些行，
+    /// 信号明细的内存占用与历史长度无关。
+    pub fn run_spilling(
+        plan: &ExecutionPlan,
+        bars: Vec<RawBar>,
+        sdt_override: Option<&str>,
+        spill: SignalSpill,
+        enable_profile: bool,
+    ) -> Result<RunOutput, String> {
+        let opts = RunOptions {
+            enable_profile,
+            spill: Some(spill),
+            ..Default::default()
+        };
+        Self::run_impl(plan, &plan.symbol, false, bars, sdt_override, opts)
+    }
+
+    /// 按 [`RunOptions`] 执行 `plan`，可同时开启信号落盘与信号剖析。
+    pub fn run_with(
+        plan: &ExecutionPlan,
+        bars: Vec<RawBar>,
+        sdt_override: Option<&str>,
+        opts: RunOptions,
+    ) -> Result<RunOutput, String> {
+        Self::run_impl(plan, &plan.symbol, false, bars, sdt_override, opts)
+    }
+
+    /// 以 `symbol` 的身份执行已编译的 `plan`。
+    ///
+    /// 多标的批量场景下同一份执行计划只编译一次，按标的复用：信号的 `symbol`
+    /// 与各仓位的 `symbol`（决定 pairs `标的代码` / holds `symbol` 列）都改用
+    /// 传入的 `symbol`。
+    pub fn run_symbol(
+        plan: &ExecutionPlan,
+        symbol: &str,
+        bars: Vec<RawBar>,
+        sdt_override: Option<&str>,
+        emit_signals: bool,
+        enable_profile: bool,
+    ) -> Result<RunOutput, String> {
+        let opts = RunOptions {
+            emit_signals,
+            enable_profile,
+            ..Default::default()
+        };
+        Self::run_impl(plan, symbol, true, bars, sdt_override, opts)
+    }
+
+    fn run_impl(
+        plan: &ExecutionPlan,
+        symbol: &str,
+        retag_positions: bool,
+        mut bars: Vec<RawBar>,
+        sdt_override: Option<&str>,
+        opts: RunOptions,
+    ) -> Result<RunOutput, String> {
+        let t0 = Instant::now();
+        let RunOptions {
+            emit_signals,
+            enable_profile,
+            profile_signals,
+            mut spill,
+        } = opts;
+        let emit_signals = emit_signals || spill.is_some();
+        let PreparedSignals {
+            mut signals,
+            trader_ops,
+            start_idx,
+        } = prepare_signals(plan, symbol, &bars, sdt_override, !emit_signals)?;
+        // 预热与 prime 之后再开启，剖析结果只覆盖正式运行区
+        let mut trader_profile = profile_signals.then(|| {
+            signals.enable_signal_profile();
+            trader_ops_profile(&trader_ops)
+        });
+        let bars_len = bars.len();
+        let mut positions = plan.positions.clone();
+        if retag_positions {
+            for pos in &mut positions {
+                pos.symbol = symbol.to_string();
             }
         }
 
         let bars_count = bars_len.saturating_sub(start_idx);
-        let mut rows = if emit_signals {
-            Vec::with_capacity(bars_count)
-        } else {
-            Vec::new()
+        let capacity = match (&spill, emit_signals) {
+            (Some(sp), _) => sp.flush_bars().min(bars_count),
+            (None, true) => bars_count,
+            (None, false) => 0,
         };
+        let mut signal_columns = SignalColumns::new(symbol, capacity);
+        if spill.is_some() {
+            // 预热 + prime 后已产出的信号 key 预先登记，首批落盘的 schema 即包含这些列
+            signal_columns.declare(signals.s.keys().map(String::as_str));
+        }
         let mut profile = CoreLoopProfileV2::default();
+        // 逐 bar 价格只记一份，各仓位 holds 仅记录持仓变化点
+        let price_tape = PriceTape::shared();
+        for pos in &mut positions {
+            pos.attach_price_tape(&price_tape);
+        }
+        // 全部仓位共享一次事件求值，各仓位只查命中位图
+        let event_matcher = &plan.event_matcher;
+        debug_assert_eq!(event_matcher.position_count(), positions.len());
+        let mut event_hits = EventHits::default();
 
         for bar in bars.drain(start_idx..) {
             let t_signals = Instant::now();
@@ -212,23 +388,16 @@ impl UnifiedExecEngine {
 
             let t_trader_sig = Instant::now();
             if !trader_ops.is_empty() {
-                let latest_price = signals
-                    .s
-                    .get("close")
-                    .and_then(|x| x.parse::<f64>().ok())
-                    .or(Some(bar.close));
-                let state = RuntimeTraderState {
-                    positions: &positions,
-                    kas: &signals.kas,
-                    latest_price,
+                let trader_sigs = {
+                    let state = RuntimeTraderState {
+                        positions: &positions,
+                        kas: &signals.kas,
+                        latest_price: Some(bar.close),
+                    };
+                    run_trader_ops(&trader_ops, &state, trader_profile.as_mut())
                 };
-                for op in &trader_ops {
-                    for sig in (op.func)(&state, &op.params) {
-                        let (k, v) = (sig.key(), sig.value());
-                        signals.s.insert(k.clone(), v.clone());
-                        signals.signal_map.insert(k, v);
-                        signals.sigs.insert(sig);
-                    }
+                for sig in trader_sigs {
+                    signals.insert_signal(sig);
                 }
             }
             let trader_signals_ns = t_trader_sig.elapsed().as_nanos();
@@ -238,14 +407,18 @@ impl UnifiedExecEngine {
                 dt: bar.dt.into(),
                 price: bar.close,
             };
+            PriceTape::push_shared(&price_tape, lite_bar.dt, lite_bar.price);
             let t_pos = Instant::now();
             let mut pos_event_match_ns = 0u128;
             let mut pos_fsm_ns = 0u128;
             let mut pos_risk_ns = 0u128;
             let mut pos_holds_ns = 0u128;
-            for pos in &mut positions {
+            let t_event = Instant::now();
+            event_matcher.evaluate(&signals.signal_frame, &mut event_hits);
+            pos_event_match_ns += t_event.elapsed().as_nanos();
+            for (slot, pos) in positions.iter_mut().enumerate() {
                 let p =
-                    pos.update_profiled_with_signal_map(lite_bar, None, Some(&signals.signal_map));
+                    pos.update_profiled_with_event_hits(lite_bar, event_matcher, slot, &event_hits);
                 pos_event_match_ns += p.event_match_ns;
                 pos_fsm_ns += p.fsm_ns;
                 pos_risk_ns += p.risk_ns;
@@ -264,18 +437,187 @@ impl UnifiedExecEngine {
                 profile.pos_holds_ns += pos_holds_ns;
             }
             if emit_signals {
-                rows.push(signals.s.clone());
+                signal_columns.push(&bar, &signals.s);
+                if let Some(sp) = spill.as_mut() {
+                    sp.maybe_flush(&mut signal_columns)?;
+                }
             }
         }
+        if let Some(sp) = spill {
+            sp.finish(&mut signal_columns)?;
+        }
+        let signal_profile = trader_profile.map(|trader| {
+            let mut sp = signals.take_signal_profile().unwrap_or_default();
+            sp.append(trader);
+            sp
+        });
 
         Ok(RunOutput {
             bars_count,
-            signal_rows: rows,
+            signals: signal_columns,
             positions,
             elapsed_ms: t0.elapsed().as_millis() as i64,
             profile: enable_profile.then_some(profile),
+            signal_profile,
         })
     }
+
+    /// 一次预热 + 信号计算，产出可被多组 Position 复用的逐 bar 信号快照。
+    ///
+    /// 优化场景下候选仓位被切成多个 chunk，各 chunk 的 BarGenerator / CZSC /
+    /// 信号计算完全相同；先用本函数算一次共享信号流，再用
+    /// [`SharedSignalStream::replay_positions`] 驱动各 chunk 的 Position 状态机。
+    ///
+    /// 仅保留 `plan.positions` 事件引用到的信号 key。存在 trader 级信号时返回
+    /// `Err`：trader 信号会读取仓位状态，无法脱离 Position 预先计算。
+    pub fn build_shared_signal_stream(
+        plan: &ExecutionPlan,
+        bars: &[RawBar],
+        sdt_override: Option<&str>,
+    ) -> Result<SharedSignalStream, String> {
+        let PreparedSignals {
+            mut signals,
+            trader_ops,
+            start_idx,
+        } = prepare_signals(plan, &plan.symbol, bars, sdt_override, false)?;
+        if !trader_ops.is_empty() {
+            return Err("存在 trader 级信号，无法构建共享信号流".to_string());
+        }
+
+        let keys: Vec<String> = plan
+            .positions
+            .iter()
+            .flat_map(|p| p.all_events())
+            .flat_map(|e| e.all_signals())
+            .map(|s| s.key())
+            .collect::<BTreeSet<_>>()
+            .into_iter()
+            .collect();
+        let width = keys.len();
+        let bars_right = &bars[start_idx..];
+        let mut stream = SharedSignalStream {
+            dict: vec![Vec::new(); width],
+            codes: Vec::with_capacity(bars_right.len() * width),
+            bars: Vec::with_capacity(bars_right.len()),
+            signals_update_ns: 0,
+            keys,
+        };
+        let mut dict_index: Vec<HashMap<String, u32>> = vec![HashMap::new(); width];
+
+        for bar in bars_right {
+            let t_signals = Instant::now();
+            signals
+                .update_signals(bar, &plan.signals_config)
+                .map_err(|e| format!("update_signals 失败 (dt={}): {e}", bar.dt))?;
+            stream.signals_update_ns += t_signals.elapsed().as_nanos();
+
+            for (k, key) in stream.keys.iter().enumerate() {
+                let code = match signals.signal_map.get(key.as_str()) {
+                    Some(v) => match dict_index[k].get(v.as_str()) {
+                        Some(code) => *code,
+                        None => {
+                            let code = stream.dict[k].len() as u32;
+                            stream.dict[k].push(v.clone());
+                            dict_index[k].insert(v.clone(), code);
+                            code
+                        }
+                    },
+                    None => MISSING_SIGNAL_CODE,
+                };
+                stream.codes.push(code);
+            }
+            stream.bars.push(LiteBar {
+                id: bar.id,
+                dt: bar.dt.into(),
+                price: bar.close,
+            });
+        }
+        Ok(stream)
+    }
+}
+
+const MISSING_SIGNAL_CODE: u32 = u32::MAX;
+
+/// 逐 bar 的共享信号快照（字典编码），由
+/// [`UnifiedExecEngine::build_shared_signal_stream`] 产出。
+///
+/// `codes` 按 bar 行优先存放，每行 `keys.len()` 个取值编码；
+/// `MISSING_SIGNAL_CODE` 表示该 bar 未产出对应 key 的信号。
+pub struct SharedSignalStream {
+    keys: Vec<String>,
+    dict: Vec<Vec<String>>,
+    codes: Vec<u32>,
+    bars: Vec<LiteBar>,
+    signals_update_ns: u128,
+}
+
+impl SharedSignalStream {
+    /// 右侧正式运行区的 bar 数量。
+    pub fn bars_count(&self) -> usize {
+        self.bars.len()
+    }
+
+    /// 构建信号流时累计的信号计算耗时（纳秒）。
+    pub fn signals_update_ns(&self) -> u128 {
+        self.signals_update_ns
+    }
+
+    /// 把第 `i` 根 bar 的快照增量写入 `signal_map`，只改动取值变化的 key。
+    fn apply_row(&self, i: usize, current: &mut [u32], signal_map: &mut HashMap<String, String>) {
+        let width = self.keys.len();
+        let row = &self.codes[i * width..(i + 1) * width];
+        for (k, (&code, cur)) in row.iter().zip(current.iter_mut()).enumerate() {
+            if code == *cur {
+                continue;
+            }
+            *cur = code;
+            if code == MISSING_SIGNAL_CODE {
+                signal_map.remove(self.keys[k].as_str());
+            } else {
+                signal_map.insert(self.keys[k].clone(), self.dict[k][code as usize].clone());
+            }
+        }
+    }
+
+    /// 用共享信号快照驱动一组 Position，返回推进后的 Position 与 profile。
+    ///
+    /// 结果与把同一组 Position 放进 `UnifiedExecEngine::run` 完全一致
+    /// （前提是计划中不含 trader 级信号）。
+    pub fn replay_positions(
+        &self,
+        mut positions: Vec<Position>,
+        enable_profile: bool,
+    ) -> (Vec<Position>, Option<CoreLoopProfileV2>) {
+        let mut current = vec![MISSING_SIGNAL_CODE; self.keys.len()];
+        let mut signal_map: HashMap<String, String> = HashMap::with_capacity(self.keys.len());
+        let mut profile = CoreLoopProfileV2::default();
+        let price_tape = PriceTape::shared();
+        for pos in &mut positions {
+            pos.attach_price_tape(&price_tape);
+        }
+
+        for (i, lite_bar) in self.bars.iter().enumerate() {
+            self.apply_row(i, &mut current, &mut signal_map);
+            PriceTape::push_shared(&price_tape, lite_bar.dt, lite_bar.price);
+
+            let t_pos = Instant::now();
+            for pos in &mut positions {
+                let p = pos.update_profiled_with_signal_map(*lite_bar, None, Some(&signal_map));
+                if enable_profile {
+                    profile.pos_event_match_ns += p.event_match_ns;
+                    profile.pos_fsm_ns += p.fsm_ns;
+                    profile.pos_risk_ns += p.risk_ns;
+                    profile.pos_holds_ns += p.holds_ns;
+                }
+            }
+            if enable_profile {
+                profile.bars += 1;
+                profile.position_update_ns += t_pos.elapsed().as_nanos();
+            }
+        }
+
+        (positions, enable_profile.then_some(profile))
+    }
 }
 
 fn collect_freqs(
@@ -359,9 +701,15 @@ fn parse_sdt_utc(s: &str) -> Option<DateTime<Utc>> {
 
 #[cfg(test)]
 mod tests {
-    use super::{collect_freqs, infer_effective_market};
+    use super::{
+        MISSING_SIGNAL_CODE, SharedSignalStream, UnifiedExecEngine, collect_freqs,
+        infer_effective_market,
+    };
+    use crate::engine_v2::{ExecutionPlan, ExecutionPlanInput};
     use crate::sig_parse::SignalConfig;
-    use chrono::{NaiveDateTime, TimeZone, Utc};
+    use chrono::{Duration, NaiveDateTime, TimeZone, Utc};
+    use czsc_core::objects::bar::RawBar;
+    use czsc_core::objects::position::Position;
     use czsc_core::objects::{bar::RawBarBuilder, freq::Freq, market::Market};
     use serde_json::json;
     use std::collections::HashMap;
@@ -449,4 +797,136 @@ mod tests {
             Market::Default
         );
     }
+
+    #[test]
+    fn test_shared_signal_stream_apply_row_tracks_changes() {
+        let dt = Utc.from_utc_datetime(
+            &NaiveDateTime::parse_from_str("2024-01-02 10:00:00", "%Y-%m-%d %H:%M:%S").unwrap(),
+        );
+        let lite = czsc_core::objects::position::LiteBar {
+            id: 0,
+            dt: dt.into(),
+            price: 1.0,
+        };
+        let stream = SharedSignalStream {
+            keys: vec!["15分钟_D1_A".to_string(), "15分钟_D1_B".to_string()],
+            dict: vec![
+                vec![
+                    "看多_任意_任意_0".to_string(),
+                    "看空_任意_任意_0".to_string(),
+                ],
+                vec!["向上_任意_任意_0".to_string()],
+            ],
+            codes: vec![0, 0, 1, MISSING_SIGNAL_CODE],
+            bars: vec![lite, lite],
+            signals_update_ns: 0,
+        };
+        let mut current = vec![MISSING_SIGNAL_CODE; 2];
+        let mut map = HashMap::new();
+
+        stream.apply_row(0, &mut current, &mut map);
+        assert_eq!(
+            map.get("15分钟_D1_A").map(String::as_str),
+            Some("看多_任意_任意_0")
+        );
+        assert_eq!(
+            map.get("15分钟_D1_B").map(String::as_str),
+            Some("向上_任意_任意_0")
+        );
+
+        stream.apply_row(1, &mut current, &mut map);
+        assert_eq!(
+            map.get("15分钟_D1_A").map(String::as_str),
+            Some("看空_任意_任意_0")
+        );
+        assert!(!map.contains_key("15分钟_D1_B"));
+    }
+
+    fn mock_bars(n: usize) -> Vec<RawBar> {
+        let t0 = Utc.with_ymd_and_hms(2020, 1, 2, 0, 0, 0).unwrap();
+        (0..n)
+            .map(|i| {
+                let x = i as f64;
+                let mid = 100.0 + 10.0 * (x / 37.0).sin() + 3.0 * (x / 7.0).cos();
+                RawBarBuilder::default()
+                    .symbol("AAA".to_string())
+                    .id(i as i32)
+                    .dt(t0 + Duration::minutes(30 * i as i64))
+                    .freq(Freq::F30)
+                    .open(mid - 0.5)
+                    .close(mid + 0.5)
+                    .high(mid + 1.0)
+                    .low(mid - 1.0)
+                    .vol(1000.0)
+                    .amount(100_000.0)
+                    .build()
+                    .unwrap()
+            })
+            .collect()
+    }
+
+    fn position(name: &str, open: &str, exit: &str, up: &str, down: &str) -> Position {
+        serde_json::from_value(json!({
+            "name": name,
+            "symbol": "AAA",
+            "opens": [{"operate": open, "signals_all": [format!("30分钟_D1_表里关系V230101_{up}_任意_任意_0")]}],
+            "exits": [{"operate": exit, "signals_all": [format!("30分钟_D1_表里关系V230101_{down}_任意_任意_0")]}],
+            "interval": 0,
+            "timeout": 20,
+            "stop_loss": 300.0,
+            "T0": false
+        }))
+        .unwrap()
+    }
+
+    #[test]
+    fn test_shared_stream_replay_matches_run() {
+        let positions = vec![
+            position("表里多头", "开多", "平多", "向上", "向下"),
+            position("表里空头", "开空", "平空", "向下", "向上"),
+        ];
+        let plan = ExecutionPlan::compile(ExecutionPlanInput {
+            symbol: "AAA".to_string(),
+            base_freq: "30分钟".to_string(),
+            signals_config: vec![SignalConfig {
+                name: "cxt_bi_status_V230101".to_string(),
+                freq: Some("30分钟".to_string()),
+                params: HashMap::new(),
+            }],
+            positions,
+            market: None,
+            bg_max_count: None,
+            sdt: Some("20200110".to_string()),
+            include_sdt_bar: None,
+        })
+        .unwrap();
+        let bars = mock_bars(1500);
+
+        let expected = UnifiedExecEngine::run(&plan, bars.clone(), None, false, false).unwrap();
+        let stream = UnifiedExecEngine::build_shared_signal_stream(&plan, &bars, None).unwrap();
+        assert_eq!(stream.bars_count(), expected.bars_count);
+        // 分成两个 chunk 分别回放，与优化链路的用法一致
+        let mut replayed = Vec::new();
+        for chunk in plan.positions.chunks(1) {
+            replayed.extend(stream.replay_positions(chunk.to_vec(), false).0);
+        }
+
+        assert_eq!(replayed.len(), expected.positions.len());
+        for (got, want) in replayed.iter().zip(&expected.positions) {
+            let (pairs, want_pairs) = (got.pairs().unwrap(), want.pairs().unwrap());
+            assert!(want_pairs.height() > 0, "{} 应有交易", want.name);
+            assert!(
+                pairs.equals_missing(&want_pairs),
+                "{} pairs 不一致",
+                want.name
+            );
+            let (holds, want_holds) = (got.holds().unwrap(), want.holds().unwrap());
+            assert_eq!(holds.height(), expected.bars_count);
+            assert!(
+                holds.equals_missing(&want_holds),
+                "{} holds 不一致",
+                want.name
+            );
+        }
+    }
 }
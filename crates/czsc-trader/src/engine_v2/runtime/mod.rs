@@ -1,3 +1,7 @@
 mod executor;
+mod signal_columns;
 
-pub use executor::{CoreLoopProfileV2, RunOutput, UnifiedExecEngine};
+pub use executor::{
+    CoreLoopProfileV2, RunOptions, RunOutput, SharedSignalStream, UnifiedExecEngine,
+};
+pub use signal_columns::{SignalColumns, SignalSpill};
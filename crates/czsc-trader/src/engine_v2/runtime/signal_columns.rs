@@ -0,0 +1,524 @@
+//! `emit_signals` 的列式信号明细。
+//!
+//! 原先主循环每根 bar 把完整的 `signals.s`（`HashMap<String, String>`）clone 进
+//! `signal_rows`，结束后再行转列；多年分钟数据会累积数 GB 字符串。这里改为逐 bar
+//! 直接写列：基础字段为强类型列，信号列按列做字典编码（行内只存 `u32` 编码）。
+//!
+//! 落盘场景可配合 [`SignalSpill`] 每累积 N 根 bar 就把已有行作为一个 record batch
+//! 写入 parquet 并清空缓冲，内存占用与历史长度无关。
+//!
+//! parquet 文件只有一个 schema，而信号 key 可能在首次落盘之后才出现（指标数据不足时
+//! 信号函数返回空、高周期 key 晚于基础周期产出）。落盘前先用 [`SignalColumns::declare`]
+//! 预登记已知的 key；仍有新 key 出现时，[`SignalSpill`] 另起一个列更宽的分段文件，
+//! 结束时按最终列集合流式合并为单个文件，结果与整表在内存中构建一致。
+
+use czsc_core::objects::bar::RawBar;
+use polars::prelude::*;
+use std::collections::{BTreeMap, BTreeSet, HashMap};
+use std::fs;
+use std::path::{Path, PathBuf};
+
+/// `signals.s` 中由 bar 本身提供的基础字段，列式输出时改用 bar 上的强类型值。
+const BASE_FIELDS: [&str; 10] = [
+    "symbol", "dt", "freq", "id", "open", "close", "high", "low", "vol", "amount",
+];
+
+/// 单个字符串列：按出现顺序为取值分配编码，行内只存编码。
+#[derive(Debug, Default)]
+struct DictColumn {
+    index: HashMap<String, u32>,
+    values: Vec<String>,
+    codes: Vec<Option<u32>>,
+    /// 是否出现过取值；仅预登记、从未产出的列在合并落盘文件时去掉
+    seen: bool,
+}
+
+impl DictColumn {
+    fn with_nulls(n: usize) -> Self {
+        Self {
+            codes: vec![None; n],
+            ..Default::default()
+        }
+    }
+
+    fn push(&mut self, value: &str) {
+        let code = match self.index.get(value) {
+            Some(&code) => code,
+            None => {
+                let code = self.values.len() as u32;
+                self.index.insert(value.to_string(), code);
+                self.values.push(value.to_string());
+                code
+            }
+        };
+        self.codes.push(Some(code));
+        self.seen = true;
+    }
+
+    /// 取出当前行为字符串列，并清空编码与字典。
+    fn take_column(&mut self, name: &str) -> Column {
+        let ca: StringChunked = self
+            .codes
+            .iter()
+            .map(|c| c.map(|i| self.values[i as usize].as_str()))
+            .collect();
+        self.index.clear();
+        self.values.clear();
+        self.codes.clear();
+        ca.into_series().with_name(name.into()).into_column()
+    }
+}
+
+/// 按列累积 `UnifiedExecEngine` 逐 bar 的信号明细。
+///
+/// 输出与旧的“逐行字典 → 行转列 → 类型转换”结果一致：列按名称排序并包含恒为 `"{}"`
+/// 的 `cache` 列；`dt` 为无时区 datetime（UTC），`id` 为 int64，OHLCV 为 float64，
+/// 其余列为字符串，未产出的信号为 null。
+#[derive(Debug)]
+pub struct SignalColumns {
+    symbol: String,
+    dt: Vec<i64>,
+    id: Vec<i64>,
+    freq: DictColumn,
+    open: Vec<f64>,
+    close: Vec<f64>,
+    high: Vec<f64>,
+    low: Vec<f64>,
+    vol: Vec<f64>,
+    amount: Vec<f64>,
+    signals: BTreeMap<String, DictColumn>,
+    /// 已落盘过：没有行时也按完整列集合输出空批次
+    frozen: bool,
+    rows: usize,
+    total_rows: usize,
+}
+
+impl SignalColumns {
+    pub fn new(symbol: &str, capacity: usize) -> Self {
+        Self {
+            symbol: symbol.to_string(),
+            dt: Vec::with_capacity(capacity),
+            id: Vec::with_capacity(capacity),
+            freq: DictColumn::default(),
+            open: Vec::with_capacity(capacity),
+            close: Vec::with_capacity(capacity),
+            high: Vec::with_capacity(capacity),
+            low: Vec::with_capacity(capacity),
+            vol: Vec::with_capacity(capacity),
+            amount: Vec::with_capacity(capacity),
+            signals: BTreeMap::new(),
+            frozen: false,
+            rows: 0,
+            total_rows: 0,
+        }
+    }
+
+    /// 当前缓冲中的行数。
+    pub fn len(&self) -> usize {
+        self.rows
+    }
+
+    pub fn is_empty(&self) -> bool {
+        self.rows == 0
+    }
+
+    /// 累计写入的总行数（含已落盘部分）。
+    pub fn total_rows(&self) -> usize {
+        self.total_rows
+    }
+
+    /// 预登记信号列（已有行补空），使首次落盘的 schema 尽量完整。
+    ///
+    /// 从未产出取值的预登记列不会出现在最终落盘文件中，见 [`Self::unseen_columns`]。
+    pub fn declare<'a>(&mut self, keys: impl IntoIterator<Item = &'a str>) {
+        for k in keys {
+            if BASE_FIELDS.contains(&k) || self.signals.contains_key(k) {
+                continue;
+            }
+            self.signals
+                .insert(k.to_string(), DictColumn::with_nulls(self.rows));
+        }
+    }
+
+    /// 预登记后从未产出取值的信号列。
+    pub fn unseen_columns(&self) -> BTreeSet<String> {
+        self.signals
+            .iter()
+            .filter(|(_, col)| !col.seen)
+            .map(|(name, _)| name.clone())
+            .collect()
+    }
+
+    /// 写入一根 bar 的信号明细；`s` 为 `CzscSignals::s`。
+    pub fn push(&mut self, bar: &RawBar, s: &HashMap<String, String>) {
+        self.dt
+            .push(bar.dt.timestamp_nanos_opt().unwrap_or_default());
+        self.id.push(bar.id as i64);
+        self.freq.push(bar.freq.as_ref());
+        self.open.push(bar.open);
+        self.close.push(bar.close);
+        self.high.push(bar.high);
+        self.low.push(bar.low);
+        self.vol.push(bar.vol);
+        self.amount.push(bar.amount);
+
+        let row = self.rows;
+        for (k, v) in s {
+            if BASE_FIELDS.contains(&k.as_str()) {
+                continue;
+            }
+            if let Some(col) = self.signals.get_mut(k.as_str()) {
+                col.push(v);
+            } else {
+                let mut col = DictColumn::with_nulls(row);
+                col.push(v);
+                self.signals.insert(k.clone(), col);
+            }
+        }
+        self.rows += 1;
+        self.total_rows += 1;
+        // 本行未出现的信号列补空
+        for col in self.signals.values_mut() {
+            if col.codes.len() < self.rows {
+                col.codes.push(None);
+            }
+        }
+    }
+
+    /// 取出缓冲中的全部行为 DataFrame 并清空缓冲，列集合保持不变。
+    pub fn take_frame(&mut self) -> PolarsResult<DataFrame> {
+        let n = self.rows;
+        if n == 0 && self.signals.is_empty() && !self.frozen {
+            // 与旧实现一致：没有任何行时只有 cache 列
+            return DataFrame::new(vec![Column::new("cache".into(), Vec::<String>::new())]);
+        }
+
+        let mut cols: BTreeMap<&str, Column> = BTreeMap::new();
+        cols.insert(
+            "symbol",
+            Column::new("symbol".into(), vec![self.symbol.as_str(); n]),
+        );
+        cols.insert(
+            "dt",
+            Column::new("dt".into(), std::mem::take(&mut self.dt))
+                .cast(&DataType::Datetime(TimeUnit::Nanoseconds, None))?,
+        );
+        cols.insert("id", Column::new("id".into(), std::mem::take(&mut self.id)));
+        cols.insert("freq", self.freq.take_column("freq"));
+        for (name, values) in [
+            ("open", &mut self.open),
+            ("close", &mut self.close),
+            ("high", &mut self.high),
+            ("low", &mut self.low),
+            ("vol", &mut self.vol),
+            ("amount", &mut self.amount),
+        ] {
+            cols.insert(name, Column::new(name.into(), std::mem::take(values)));
+        }
+        cols.insert("cache", Column::new("cache".into(), vec!["{}"; n]));
+        for (name, col) in self.signals.iter_mut() {
+            cols.insert(name.as_str(), col.take_column(name));
+        }
+        self.rows = 0;
+        DataFrame::new(cols.into_values().collect())
+    }
+}
+
+/// 把信号明细分批写入单个 parquet 文件，首批数据到达时才开始写。
+///
+/// 批次先写入 `<文件名>.part<i>` 分段文件；某一批出现新的信号列时结束当前分段、
+/// 按新的列集合另起一段。`finish` 时只有一段且无需去列则直接改名为目标文件，
+/// 否则逐段按 `flush_bars` 行切片读回、补齐缺失列后合并写入目标文件，内存占用
+/// 仍与历史长度无关。
+pub struct SignalSpill {
+    path: PathBuf,
+    flush_bars: usize,
+    writer: Option<BatchedWriter<fs::File>>,
+    /// 当前分段的列名（schema 变化时换段）
+    names: Vec<String>,
+    /// 已开始的分段：(路径, 列名, 行数)
+    parts: Vec<(PathBuf, Vec<String>, usize)>,
+}
+
+impl SignalSpill {
+    /// `flush_bars` 为每个 record batch 的 bar 数，至少为 1。
+    pub fn new(path: &Path, flush_bars: usize) -> Self {
+        Self {
+            path: path.to_path_buf(),
+            flush_bars: flush_bars.max(1),
+            writer: None,
+            names: Vec::new(),
+            parts: Vec::new(),
+        }
+    }
+
+    pub fn path(&self) -> &Path {
+        &self.path
+    }
+
+    pub fn flush_bars(&self) -> usize {
+        self.flush_bars
+    }
+
+    /// 缓冲达到 `flush_bars` 时写出一批。
+    pub fn maybe_flush(&mut self, columns: &mut SignalColumns) -> Result<(), String> {
+        if columns.len() >= self.flush_bars {
+            self.flush(columns)?;
+        }
+        Ok(())
+    }
+
+    fn part_path(&self, i: usize) -> PathBuf {
+        let name = self
+            .path
+            .file_name()
+            .map(|x| x.to_string_lossy().to_string())
+            .unwrap_or_default();
+        self.path.with_file_name(format!("{name}.part{i}"))
+    }
+
+    fn finish_writer(&mut self) -> Result<(), String> {
+        if let Some(mut writer) = self.writer.take() {
+            writer
+                .finish()
+                .map_err(|e| format!("完成 signals 分段文件失败: {e}"))?;
+        }
+        Ok(())
+    }
+
+    fn flush(&mut self, columns: &mut SignalColumns) -> Result<(), String> {
+        if columns.is_empty() && self.writer.is_some() {
+            return Ok(());
+        }
+        let batch = columns
+            .take_frame()
+            .map_err(|e| format!("构建 signals 批次失败: {e}"))?;
+        columns.frozen = true;
+        let names: Vec<String> = batch
+            .get_column_names()
+            .iter()
+            .map(|c| c.to_string())
+            .collect();
+        if self.writer.is_some() && names != self.names {
+            // 出现了新的信号列：结束当前分段，按新的列集合另起一段
+            self.finish_writer()?;
+        }
+        if self.writer.is_none() {
+            let part = self.part_path(self.parts.len());
+            let file = fs::File::create(&part)
+                .map_err(|e| format!("创建 signals 文件失败 {}: {e}", part.display()))?;
+            let schema = batch.schema().clone();
+            self.writer = Some(
+                ParquetWriter::new(file)
+                    .batched(&schema)
+                    .map_err(|e| format!("初始化 signals 写入失败: {e}"))?,
+            );
+            self.parts.push((part, names.clone(), 0));
+            self.names = names;
+        }
+        if let (Some(writer), Some(part)) = (self.writer.as_mut(), self.parts.last_mut()) {
+            writer
+                .write_batch(&batch)
+                .map_err(|e| format!("写入 signals 批次失败 {}: {e}", part.0.display()))?;
+            part.2 += batch.height();
+        }
+        Ok(())
+    }
+
+    /// 写出剩余行，合并分段并补齐文件尾部元数据。
+    pub fn finish(mut self, columns: &mut SignalColumns) -> Result<(), String> {
+        self.flush(columns)?;
+        self.finish_writer()?;
+
+        let unseen = columns.unseen_columns();
+        let keep: BTreeSet<String> = self
+            .parts
+            .iter()
+            .flat_map(|(_, names, _)| names.iter())
+            .filter(|name| !unseen.contains(*name))
+            .cloned()
+            .collect();
+        let result = match self.parts.as_slice() {
+            [(part, names, _)] if names.len() == keep.len() => fs::rename(part, &self.path)
+                .map_err(|e| format!("写入 signals 文件失败 {}: {e}", self.path.display())),
+            _ => self.merge_parts(&keep),
+        };
+        for (part, _, _) in &self.parts {
+            fs::remove_file(part).ok();
+        }
+        result
+    }
+
+    /// 逐段切片读回分段文件，补齐缺失的信号列（null）后按 `keep` 的列集合写入目标文件。
+    fn merge_parts(&self, keep: &BTreeSet<String>) -> Result<(), String> {
+        let err = |e: PolarsError| format!("合并 signals 分段失败 {}: {e}", self.path.display());
+        let mut writer: Option<BatchedWriter<fs::File>> = None;
+        for (part, _, rows) in &self.parts {
+            let mut offset = 0;
+            loop {
+                let batch = LazyFrame::scan_parquet(
+                    PlPath::new(&part.to_string_lossy()),
+                    ScanArgsParquet::default(),
+                )
+                .and_then(|lf| {
+                    lf.slice(offset as i64, self.flush_bars as IdxSize)
+                        .collect()
+                })
+                .map_err(err)?;
+                let height = batch.height();
+                let cols: Vec<Column> = keep
+                    .iter()
+                    .map(|name| match batch.column(name) {
+                        Ok(col) => col.clone(),
+                        Err(_) => {
+                            Column::full_null(name.as_str().into(), height, &DataType::String)
+                        }
+                    })
+                    .collect();
+                let batch = DataFrame::new(cols).map_err(err)?;
+                if writer.is_none() {
+                    let file = fs::File::create(&self.path).map_err(|e| {
+                        format!("创建 signals 文件失败 {}: {e}", self.path.display())
+                    })?;
+                    let schema = batch.schema().clone();
+                    writer = Some(ParquetWriter::new(file).batched(&schema).map_err(err)?);
+                }
+                if let Some(w) = writer.as_mut() {
+                    w.write_batch(&batch).map_err(err)?;
+                }
+                offset += self.flush_bars;
+                if offset >= *rows {
+                    break;
+                }
+            }
+        }
+        if let Some(mut w) = writer {
+            w.finish().map_err(err)?;
+        }
+        Ok(())
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use chrono::{Duration, TimeZone, Utc};
+    use czsc_core::objects::bar::RawBarBuilder;
+    use czsc_core::objects::freq::Freq;
+
+    fn bar(i: i32) -> RawBar {
+        let t0 = Utc.with_ymd_and_hms(2020, 1, 2, 0, 0, 0).unwrap();
+        RawBarBuilder::default()
+            .symbol("AAA".to_string())
+            .dt(t0 + Duration::minutes(30 * i as i64))
+            .freq(Freq::F30)
+            .id(i)
+            .open(10.0)
+            .close(10.5 + i as f64)
+            .high(11.0)
+            .low(9.5)
+            .vol(1000.0)
+            .amount(100_000.0)
+            .build()
+            .unwrap()
+    }
+
+    fn row(i: i32) -> HashMap<String, String> {
+        let mut s = HashMap::new();
+        s.insert("symbol".to_string(), "AAA".to_string());
+        s.insert("dt".to_string(), "ignored".to_string());
+        s.insert("30分钟_D1_A".to_string(), format!("v{}_任意_任意_0", i % 2));
+        if i >= 2 {
+            s.insert("30分钟_D1_B".to_string(), "看多_任意_任意_0".to_string());
+        }
+        s
+    }
+
+    #[test]
+    fn test_take_frame_schema_and_nulls() {
+        let mut cols = SignalColumns::new("AAA", 4);
+        for i in 0..4 {
+            cols.push(&bar(i), &row(i));
+        }
+        let df = cols.take_frame().unwrap();
+        let names: Vec<&str> = df.get_column_names().iter().map(|c| c.as_str()).collect();
+        let mut sorted = names.clone();
+        sorted.sort();
+        assert_eq!(names, sorted);
+        assert!(names.contains(&"cache") && names.contains(&"30分钟_D1_B"));
+        assert_eq!(df.height(), 4);
+        assert_eq!(
+            df.column("dt").unwrap().dtype(),
+            &DataType::Datetime(TimeUnit::Nanoseconds, None)
+        );
+        assert_eq!(df.column("id").unwrap().dtype(), &DataType::Int64);
+        assert_eq!(df.column("30分钟_D1_B").unwrap().null_count(), 2);
+        assert_eq!(
+            df.column("30分钟_D1_A").unwrap().str().unwrap().get(1),
+            Some("v1_任意_任意_0")
+        );
+        assert!(cols.is_empty());
+
+        let empty = SignalColumns::new("AAA", 0).take_frame().unwrap();
+        assert_eq!(empty.get_column_names().len(), 1);
+    }
+
+    fn spill_dir(name: &str) -> PathBuf {
+        let dir = std::env::temp_dir().join(format!("czsc_{name}_{}", std::process::id()));
+        fs::create_dir_all(&dir).unwrap();
+        dir
+    }
+
+    fn read_parquet(path: &Path) -> DataFrame {
+        ParquetReader::new(fs::File::open(path).unwrap())
+            .finish()
+            .unwrap()
+    }
+
+    /// 逐 bar 写入并按 `flush_bars` 落盘，返回落盘文件内容与整表在内存中构建的结果。
+    fn spill_and_memory(
+        dir: &Path,
+        flush_bars: usize,
+        declared: &[&str],
+    ) -> (DataFrame, DataFrame) {
+        let path = dir.join("signals.parquet");
+        let mut memory = SignalColumns::new("AAA", 10);
+        let mut spilled = SignalColumns::new("AAA", flush_bars);
+        spilled.declare(declared.iter().copied());
+        let mut spill = SignalSpill::new(&path, flush_bars);
+        for i in 0..10 {
+            memory.push(&bar(i), &row(i));
+            spilled.push(&bar(i), &row(i));
+            spill.maybe_flush(&mut spilled).unwrap();
+            assert!(spilled.len() < flush_bars);
+        }
+        spill.finish(&mut spilled).unwrap();
+        assert_eq!(spilled.total_rows(), 10);
+        let names: Vec<String> = fs::read_dir(dir)
+            .unwrap()
+            .map(|e| e.unwrap().file_name().to_string_lossy().to_string())
+            .collect();
+        assert_eq!(names, ["signals.parquet"], "分段文件应已合并并删除");
+        (read_parquet(&path), memory.take_frame().unwrap())
+    }
+
+    #[test]
+    fn test_spill_matches_in_memory_frame() {
+        // 首批（前两根 bar）写出后才出现的 30分钟_D1_B 另起分段，合并后不丢列
+        let dir = spill_dir("signal_spill");
+        let (got, expected) = spill_and_memory(&dir, 2, &[]);
+        assert!(got.column("30分钟_D1_B").is_ok());
+        assert!(got.equals_missing(&expected));
+        fs::remove_dir_all(&dir).ok();
+    }
+
+    #[test]
+    fn test_spill_with_declared_columns() {
+        // 预登记的列直接进入首批 schema；从未产出的预登记列不出现在结果中
+        let dir = spill_dir("signal_spill_declared");
+        let (got, expected) = spill_and_memory(&dir, 3, &["30分钟_D1_B", "30分钟_D1_Z", "dt"]);
+        assert!(got.column("30分钟_D1_Z").is_err());
+        assert!(got.equals_missing(&expected));
+        fs::remove_dir_all(&dir).ok();
+    }
+}
@@ -3,6 +3,7 @@ use crate::engine_v2::compiler::optimize::build_candidate_chunks;
 use crate::engine_v2::runtime::{RunOutput, UnifiedExecEngine};
 use czsc_core::objects::bar::RawBar;
 use czsc_core::objects::position::Position;
+use log::warn;
 use rayon::prelude::*;
 
 pub struct SymbolTask {
@@ -28,6 +29,67 @@ pub fn run_symbol_parallel(tasks: Vec<SymbolTask>, emit_signals: bool) -> Vec<Sy
     out
 }
 
+/// 共享执行计划下的单标的输入。
+pub struct SymbolBars {
+    pub symbol: String,
+    pub bars: Vec<RawBar>,
+}
+
+/// 同一份已编译 `plan` 并行跑多个标的，逐标的结果交给 `finish` 就地加工。
+///
+/// - 计划只编译一次，各标的通过 [`UnifiedExecEngine::run_symbol`] 复用；
+/// - `finish` 在 rayon 工作线程内执行，调用方可把结果转表 / 编码等后处理
+///   一并并行化，避免主线程串行收尾；
+/// - `n_threads > 0` 时使用独立线程池，否则使用 rayon 全局线程池；
+/// - 返回值按 `symbol` 排序。
+pub fn run_symbols_shared<R, F>(
+    plan: &ExecutionPlan,
+    tasks: Vec<SymbolBars>,
+    sdt_override: Option<&str>,
+    emit_signals: bool,
+    n_threads: usize,
+    finish: F,
+) -> Vec<(String, R)>
+where
+    R: Send,
+    F: Fn(&str, Result<RunOutput, String>) -> R + Sync,
+{
+    let run = || {
+        tasks
+            .into_par_iter()
+            .map(|task| {
+                let output = UnifiedExecEngine::run_symbol(
+                    plan,
+                    &task.symbol,
+                    task.bars,
+                    sdt_override,
+                    emit_signals,
+                    false,
+                );
+                let res = finish(&task.symbol, output);
+                (task.symbol, res)
+            })
+            .collect::<Vec<_>>()
+    };
+
+    let mut out = if n_threads > 0 {
+        match rayon::ThreadPoolBuilder::new()
+            .num_threads(n_threads)
+            .build()
+        {
+            Ok(pool) => pool.install(run),
+            Err(err) => {
+                warn!("构建 rayon 线程池失败，回退默认线程池: {err}");
+                run()
+            }
+        }
+    } else {
+        run()
+    };
+    out.sort_by(|a, b| a.0.cmp(&b.0));
+    out
+}
+
 pub fn split_positions_into_chunks(
     positions: &[Position],
     chunk_size: usize,
@@ -38,3 +100,107 @@ pub fn split_positions_into_chunks(
         .map(|c| positions[c.start..c.end].to_vec())
         .collect()
 }
+
+#[cfg(test)]
+mod tests {
+    use super::{SymbolBars, run_symbols_shared};
+    use crate::engine_v2::{ExecutionPlan, ExecutionPlanInput, UnifiedExecEngine};
+    use crate::sig_parse::SignalConfig;
+    use chrono::{Duration, TimeZone, Utc};
+    use czsc_core::objects::bar::{RawBar, RawBarBuilder};
+    use czsc_core::objects::freq::Freq;
+    use czsc_core::objects::position::Position;
+    use std::collections::HashMap;
+
+    fn mock_bars(symbol: &str, n: usize, phase: f64) -> Vec<RawBar> {
+        let t0 = Utc.with_ymd_and_hms(2020, 1, 2, 0, 0, 0).unwrap();
+        (0..n)
+            .map(|i| {
+                let x = i as f64;
+                let mid = 100.0 + 10.0 * (x / 37.0 + phase).sin() + 3.0 * (x / 7.0).cos();
+                RawBarBuilder::default()
+                    .symbol(symbol.to_string())
+                    .id(i as i32)
+                    .dt(t0 + Duration::minutes(30 * i as i64))
+                    .freq(Freq::F30)
+                    .open(mid - 0.5)
+                    .close(mid + 0.5)
+                    .high(mid + 1.0)
+                    .low(mid - 1.0)
+                    .vol(1000.0)
+                    .amount(100_000.0)
+                    .build()
+                    .unwrap()
+            })
+            .collect()
+    }
+
+    fn plan_for(symbol: &str) -> ExecutionPlan {
+        let pos: Position = serde_json::from_value(serde_json::json!({
+            "name": "表里多头",
+            "symbol": "PLACEHOLDER",
+            "opens": [{"operate": "开多", "signals_all": ["30分钟_D1_表里关系V230101_向上_任意_任意_0"]}],
+            "exits": [{"operate": "平多", "signals_all": ["30分钟_D1_表里关系V230101_向下_任意_任意_0"]}],
+            "interval": 0,
+            "timeout": 20,
+            "stop_loss": 300.0,
+            "T0": false
+        }))
+        .unwrap();
+        ExecutionPlan::compile(ExecutionPlanInput {
+            symbol: symbol.to_string(),
+            base_freq: "30分钟".to_string(),
+            signals_config: vec![SignalConfig {
+                name: "cxt_bi_status_V230101".to_string(),
+                freq: Some("30分钟".to_string()),
+                params: HashMap::new(),
+            }],
+            positions: vec![pos],
+            market: None,
+            bg_max_count: None,
+            sdt: Some("20200110".to_string()),
+            include_sdt_bar: None,
+        })
+        .unwrap()
+    }
+
+    #[test]
+    fn shared_plan_matches_per_symbol_plan() {
+        let symbols = ["BBB", "AAA"];
+        let shared = plan_for(symbols[0]);
+        let tasks = symbols
+            .iter()
+            .enumerate()
+            .map(|(i, s)| SymbolBars {
+                symbol: s.to_string(),
+                bars: mock_bars(s, 1500, i as f64),
+            })
+            .collect();
+
+        let out = run_symbols_shared(&shared, tasks, None, true, 2, |symbol, output| {
+            let mut output = output.unwrap();
+            assert!(output.positions.iter().all(|p| p.symbol == symbol));
+            (
+                output.signals.take_frame().unwrap(),
+                output.positions[0].pairs().unwrap(),
+            )
+        });
+        assert_eq!(
+            out.iter().map(|(s, _)| s.as_str()).collect::<Vec<_>>(),
+            vec!["AAA", "BBB"]
+        );
+
+        for (i, s) in symbols.iter().enumerate() {
+            let own = plan_for(s);
+            let mut expected =
+                UnifiedExecEngine::run(&own, mock_bars(s, 1500, i as f64), None, true, false)
+                    .unwrap();
+            expected.positions[0].symbol = s.to_string();
+            let (rows, pairs) = &out.iter().find(|(sym, _)| sym == s).unwrap().1;
+            let expected_signals = expected.signals.take_frame().unwrap();
+            assert!(rows.height() > 0);
+            assert!(rows.equals_missing(&expected_signals));
+            assert!(pairs.equals_missing(&expected.positions[0].pairs().unwrap()));
+        }
+    }
+}
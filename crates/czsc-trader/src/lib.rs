@@ -6,10 +6,13 @@
 //! Rust workspace 负责信号编译、trader 状态机，以及支撑 Python
 //! `run_backtest` / `run_optimize` 调用的 v2 执行引擎。
 
+pub mod bar_source;
 pub mod czsc_signals;
 pub mod engine_v2;
+pub mod optim_output;
 pub mod optimize;
 pub mod sig_parse;
+pub mod signal_profile;
 pub mod strategy;
 pub mod trader;
 
@@ -0,0 +1,607 @@
+//! 优化跑批 pairs / holds 的落盘方式。
+//!
+//! 旧布局（[`PerFileOutput`]）按 `{symbol}/{position}.pairs|holds.parquet` 每个标的、
+//! 每个候选仓位各写两个小文件，300 个候选 × 3000 个标的就是近两百万个文件，
+//! 文件系统元数据与打开 / 关闭开销占了大头。[`PartitionedOutput`] 按仓位名哈希分到
+//! 固定数量的分区，每个分区只有一个 pairs 文件和一个 holds 文件，rayon worker 共享
+//! 写入器、攒够一批后按仓位名排序写成一个 row group；报表阶段用 [`read_partitioned`]
+//! 按仓位名做谓词下推，只解码相关 row group。[`AggregateOutput`] 则完全不写逐 bar
+//! 明细，只在内存中累加报表所需的统计量。
+
+use anyhow::{Context, Result};
+use chrono::{NaiveDate, NaiveDateTime};
+use czsc_core::objects::position::Position;
+use polars::prelude::*;
+use std::collections::{BTreeMap, HashMap, HashSet};
+use std::fs;
+use std::path::{Path, PathBuf};
+use std::sync::Mutex;
+
+/// 分区布局下区分候选仓位的列名。
+pub const POSITION_COLUMN: &str = "position";
+
+/// 分区布局的默认分区数。
+pub const DEFAULT_PARTITIONS: usize = 16;
+
+/// 单个分区攒够该行数后落一个 row group。
+const FLUSH_ROWS: usize = 64 * 1024;
+
+/// 优化结果的落盘目标，需可跨 rayon worker 共享。
+pub trait OptimOutput: Sync {
+    /// 写出单个标的一组候选仓位的 pairs / holds。
+    fn write(&self, symbol: &str, positions: &[Position]) -> Result<()>;
+
+    /// 跑批结束后调用，刷出缓冲并写入文件尾。
+    fn finish(&self) -> Result<()> {
+        Ok(())
+    }
+}
+
+/// 旧布局：`{out_dir}/{symbol}/{position}.pairs.parquet` 与 `.holds.parquet`。
+pub struct PerFileOutput {
+    out_dir: PathBuf,
+}
+
+impl PerFileOutput {
+    pub fn new(out_dir: impl Into<PathBuf>) -> Self {
+        Self {
+            out_dir: out_dir.into(),
+        }
+    }
+}
+
+impl OptimOutput for PerFileOutput {
+    fn write(&self, symbol: &str, positions: &[Position]) -> Result<()> {
+        let symbol_dir = self.out_dir.join(symbol);
+        fs::create_dir_all(&symbol_dir)?;
+        for pos in positions {
+            let (pairs, holds) = position_frames(symbol, pos)?;
+            if let Some(mut df) = pairs {
+                let path = symbol_dir.join(format!("{}.pairs.parquet", pos.name));
+                ParquetWriter::new(fs::File::create(&path)?).finish(&mut df)?;
+            }
+            if let Some(mut df) = holds {
+                let path = symbol_dir.join(format!("{}.holds.parquet", pos.name));
+                ParquetWriter::new(fs::File::create(&path)?).finish(&mut df)?;
+            }
+        }
+        Ok(())
+    }
+}
+
+/// 分区布局中的表类型。
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+pub enum OutputKind {
+    Pairs,
+    Holds,
+}
+
+impl OutputKind {
+    fn dir_name(self) -> &'static str {
+        match self {
+            OutputKind::Pairs => "pairs",
+            OutputKind::Holds => "holds",
+        }
+    }
+}
+
+/// 单个仓位落盘用的 pairs / holds；取不到的表返回 None。
+///
+/// holds 对齐 Python：n1b 最后一行 NaN/Null 填充为 0.0，并补充 `symbol` 列。
+fn position_frames(symbol: &str, pos: &Position) -> Result<(Option<DataFrame>, Option<DataFrame>)> {
+    let pairs = pos.pairs().ok();
+    let holds = match pos.holds() {
+        Ok(mut df) => {
+            if df.height() > 0 {
+                if let Ok(n1b_col) = df.column("n1b") {
+                    let n1b = n1b_col.cast(&DataType::Float64)?;
+                    let n1b = n1b.fill_null(FillNullStrategy::Zero)?;
+                    let _ = df.with_column(n1b);
+                }
+                let s_sym = Series::new("symbol".into(), vec![symbol; df.height()]);
+                let _ = df.with_column(s_sym);
+            }
+            Some(df)
+        }
+        Err(_) => None,
+    };
+    Ok((pairs, holds))
+}
+
+/// 仓位名到分区下标的映射；用 md5 保证跨进程、跨版本稳定。
+pub fn partition_of(position: &str, n_partitions: usize) -> usize {
+    let digest = md5::compute(position.as_bytes());
+    let mut head = [0u8; 8];
+    head.copy_from_slice(&digest[..8]);
+    (u64::from_le_bytes(head) % n_partitions.max(1) as u64) as usize
+}
+
+/// 分区文件路径：`{dir}/{pairs|holds}/part-{idx:03}.parquet`。
+pub fn partition_path(dir: &Path, kind: OutputKind, idx: usize) -> PathBuf {
+    dir.join(kind.dir_name())
+        .join(format!("part-{idx:03}.parquet"))
+}
+
+/// 单个分区文件的缓冲与批量写入器，首批数据到达时才创建文件。
+struct Shard {
+    path: PathBuf,
+    pending: Vec<DataFrame>,
+    pending_rows: usize,
+    writer: Option<BatchedWriter<fs::File>>,
+}
+
+impl Shard {
+    fn new(path: PathBuf) -> Self {
+        Self {
+            path,
+            pending: Vec::new(),
+            pending_rows: 0,
+            writer: None,
+        }
+    }
+
+    fn push(&mut self, df: DataFrame) -> Result<()> {
+        self.pending_rows += df.height();
+        self.pending.push(df);
+        if self.pending_rows >= FLUSH_ROWS {
+            self.flush()?;
+        }
+        Ok(())
+    }
+
+    /// 把缓冲合并、按仓位名排序后写成一个 row group，使 row group 统计量可用于下推。
+    fn flush(&mut self) -> Result<()> {
+        let mut frames = std::mem::take(&mut self.pending).into_iter();
+        self.pending_rows = 0;
+        let Some(mut batch) = frames.next() else {
+            return Ok(());
+        };
+        for df in frames {
+            batch
+                .vstack_mut(&df)
+                .with_context(|| format!("合并分区缓冲失败 {}", self.path.display()))?;
+        }
+        let batch = batch.sort([POSITION_COLUMN], SortMultipleOptions::default())?;
+
+        if self.writer.is_none() {
+            let file = fs::File::create(&self.path)
+                .with_context(|| format!("创建分区文件失败 {}", self.path.display()))?;
+            let schema = batch.schema().clone();
+            self.writer = Some(ParquetWriter::new(file).batched(&schema)?);
+        }
+        if let Some(writer) = self.writer.as_mut() {
+            writer
+                .write_batch(&batch)
+                .with_context(|| format!("写入分区文件失败 {}", self.path.display()))?;
+        }
+        Ok(())
+    }
+
+    fn finish(&mut self) -> Result<()> {
+        self.flush()?;
+        if let Some(mut writer) = self.writer.take() {
+            writer.finish()?;
+        }
+        Ok(())
+    }
+}
+
+/// 分区布局：所有标的、所有候选仓位的 pairs / holds 写入少量大文件。
+///
+/// 每行多一列 [`POSITION_COLUMN`] 记录仓位名；空表不落盘。必须在跑批结束后调用
+/// [`OptimOutput::finish`]，否则文件缺少尾部元数据无法读取。
+pub struct PartitionedOutput {
+    shards: Vec<(Mutex<Shard>, Mutex<Shard>)>,
+}
+
+impl PartitionedOutput {
+    pub fn new(dir: &Path, n_partitions: usize) -> Result<Self> {
+        for kind in [OutputKind::Pairs, OutputKind::Holds] {
+            fs::create_dir_all(dir.join(kind.dir_name()))?;
+        }
+        let shards = (0..n_partitions.max(1))
+            .map(|idx| {
+                (
+                    Mutex::new(Shard::new(partition_path(dir, OutputKind::Pairs, idx))),
+                    Mutex::new(Shard::new(partition_path(dir, OutputKind::Holds, idx))),
+                )
+            })
+            .collect();
+        Ok(Self { shards })
+    }
+}
+
+fn tag_position(mut df: DataFrame, position: &str) -> Result<DataFrame> {
+    let tag = Series::new(POSITION_COLUMN.into(), vec![position; df.height()]);
+    df.with_column(tag)?;
+    Ok(df)
+}
+
+impl OptimOutput for PartitionedOutput {
+    fn write(&self, symbol: &str, positions: &[Position]) -> Result<()> {
+        for pos in positions {
+            let (pairs, holds) = position_frames(symbol, pos)?;
+            let (pairs_shard, holds_shard) =
+                &self.shards[partition_of(&pos.name, self.shards.len())];
+            if let Some(df) = pairs.filter(|df| df.height() > 0) {
+                let df = tag_position(df, &pos.name)?;
+                pairs_shard.lock().expect("分区写入锁中毒").push(df)?;
+            }
+            if let Some(df) = holds.filter(|df| df.height() > 0) {
+                let df = tag_position(df, &pos.name)?;
+                holds_shard.lock().expect("分区写入锁中毒").push(df)?;
+            }
+        }
+        Ok(())
+    }
+
+    fn finish(&self) -> Result<()> {
+        for (pairs, holds) in &self.shards {
+            pairs.lock().expect("分区写入锁中毒").finish()?;
+            holds.lock().expect("分区写入锁中毒").finish()?;
+        }
+        Ok(())
+    }
+}
+
+/// 从分区布局读取单个候选仓位的全部行（已去掉 [`POSITION_COLUMN`]）。
+///
+/// 只打开该仓位所在的分区文件，并以仓位名过滤做谓词下推；分区文件不存在
+/// 或没有匹配行时返回 `Ok(None)`。
+pub fn read_partitioned(
+    dir: &Path,
+    kind: OutputKind,
+    position: &str,
+    n_partitions: usize,
+) -> Result<Option<DataFrame>> {
+    let path = partition_path(dir, kind, partition_of(position, n_partitions));
+    if !path.is_file() {
+        return Ok(None);
+    }
+    let df = LazyFrame::scan_parquet(
+        PlPath::new(&path.to_string_lossy()),
+        ScanArgsParquet::default(),
+    )?
+    .filter(col(POSITION_COLUMN).eq(lit(position)))
+    .collect()
+    .with_context(|| format!("读取分区文件失败 {}", path.display()))?;
+    if df.height() == 0 {
+        return Ok(None);
+    }
+    Ok(Some(df.drop(POSITION_COLUMN)?))
+}
+
+/// 单个候选仓位跨全部标的的汇总统计（聚合模式）。
+///
+/// 字段与报表阶段从 pairs / holds 文件读出的量一一对应：逐笔盈亏比例（BP）、
+/// 持仓天数 / K 线数、按开仓日分组的盈亏，以及按 dt 累加的截面收益。
+/// 内存占用与交易笔数、不同 dt 数成正比，与标的数无关。
+#[derive(Debug, Clone, Default)]
+pub struct PositionAggregate {
+    pub profits: Vec<f64>,
+    pub hold_days: Vec<f64>,
+    pub hold_bars: Vec<f64>,
+    pub open_day_profit: HashMap<NaiveDate, Vec<f64>>,
+    pub first_open: Option<NaiveDateTime>,
+    pub last_close: Option<NaiveDateTime>,
+    pub symbols: HashSet<String>,
+    pub trades: usize,
+    pub hold_rows: usize,
+    /// dt -> (Σ n1b·pos, 非零持仓数, 行数)
+    cross: BTreeMap<NaiveDateTime, (f64, u32, u32)>,
+}
+
+/// 单个 (symbol, position) 的摘要，聚合模式下写入 `summary.parquet`。
+struct SummaryRow {
+    symbol: String,
+    position: String,
+    trades: u32,
+    wins: u32,
+    profit_sum: f64,
+    hold_bars: u32,
+    hold_return: f64,
+}
+
+impl PositionAggregate {
+    /// 累加一个标的上的交易与持仓，返回该标的的摘要行。
+    fn add(&mut self, symbol: &str, pos: &Position) -> SummaryRow {
+        let pairs = pos.trade_pairs();
+        for i in 0..pairs.open_dt.len() {
+            let (open_dt, close_dt) = (pairs.open_dt[i], pairs.close_dt[i]);
+            self.first_open = Some(self.first_open.map_or(open_dt, |x| x.min(open_dt)));
+            self.last_close = Some(self.last_close.map_or(close_dt, |x| x.max(close_dt)));
+            self.hold_days.push(pairs.holding_day[i]);
+            self.hold_bars.push(pairs.holding_bar[i] as f64);
+            if let Some(p) = pairs.yield_profit_ratio[i] {
+                self.profits.push(p);
+                self.open_day_profit
+                    .entry(open_dt.date())
+                    .or_default()
+                    .push(p);
+            }
+        }
+        let n_pairs = pairs.open_dt.len();
+        if n_pairs > 0 {
+            self.symbols.insert(symbol.to_string());
+        }
+        self.trades += n_pairs;
+
+        // 对齐文件模式：n1b 缺失按 0.0 计
+        let mut hold_bars = 0u32;
+        let mut hold_return = 0.0;
+        pos.for_each_hold(|dt, hold_pos, _, n1b| {
+            let p = hold_pos.to_f64();
+            let ret = n1b.unwrap_or(0.0) * p;
+            let slot = self.cross.entry(dt.naive_local()).or_default();
+            slot.0 += ret;
+            slot.1 += u32::from(p != 0.0);
+            slot.2 += 1;
+            hold_bars += u32::from(p != 0.0);
+            hold_return += ret;
+        });
+        self.hold_rows += pos.hold_count();
+
+        let profits = pairs.yield_profit_ratio.iter().flatten();
+        SummaryRow {
+            symbol: symbol.to_string(),
+            position: pos.name.clone(),
+            trades: n_pairs as u32,
+            wins: profits.clone().filter(|p| **p > 0.0).count() as u32,
+            profit_sum: profits.sum(),
+            hold_bars,
+            hold_return,
+        }
+    }
+
+    /// 截面等权收益、截面品种等权收益（与报表的 group_by(dt) 口径一致）。
+    pub fn cross_returns(&self) -> (f64, f64) {
+        self.cross
+            .values()
+            .fold((0.0, 0.0), |(cross, cross1), &(sum, nonzero, rows)| {
+                (
+                    cross + sum / (nonzero as f64 + 1.0),
+                    cross1 + sum / rows as f64,
+                )
+            })
+    }
+}
+
+/// 聚合模式：不落盘逐 bar 的 pairs / holds，只累加报表所需统计量。
+///
+/// 每个候选仓位一把锁，不同 worker 写不同仓位时互不阻塞；[`OptimOutput::finish`]
+/// 把逐 (symbol, position) 的摘要写入 `{dir}/summary.parquet`，汇总统计经
+/// [`AggregateOutput::into_aggregates`] 取出直接生成报表。
+pub struct AggregateOutput {
+    summary_path: PathBuf,
+    aggregates: HashMap<String, Mutex<PositionAggregate>>,
+    summary: Mutex<Vec<SummaryRow>>,
+}
+
+impl AggregateOutput {
+    pub fn new(dir: &Path, positions: &[Position]) -> Result<Self> {
+        fs::create_dir_all(dir)?;
+        let aggregates = positions
+            .iter()
+            .map(|p| (p.name.clone(), Mutex::new(PositionAggregate::default())))
+            .collect();
+        Ok(Self {
+            summary_path: dir.join("summary.parquet"),
+            aggregates,
+            summary: Mutex::new(Vec::new()),
+        })
+    }
+
+    /// 取出各候选仓位的汇总统计，键为仓位名。
+    pub fn into_aggregates(self) -> HashMap<String, PositionAggregate> {
+        self.aggregates
+            .into_iter()
+            .map(|(name, agg)| (name, agg.into_inner().expect("聚合统计锁中毒")))
+            .collect()
+    }
+}
+
+impl OptimOutput for AggregateOutput {
+    fn write(&self, symbol: &str, positions: &[Position]) -> Result<()> {
+        let mut rows = Vec::with_capacity(positions.len());
+        for pos in positions {
+            let agg = self
+                .aggregates
+                .get(&pos.name)
+                .with_context(|| format!("未登记的候选仓位: {}", pos.name))?;
+            rows.push(agg.lock().expect("聚合统计锁中毒").add(symbol, pos));
+        }
+        self.summary.lock().expect("摘要写入锁中毒").extend(rows);
+        Ok(())
+    }
+
+    fn finish(&self) -> Result<()> {
+        let rows = std::mem::take(&mut *self.summary.lock().expect("摘要写入锁中毒"));
+        let mut df = df!(
+            "symbol" => rows.iter().map(|r| r.symbol.as_str()).collect::<Vec<_>>(),
+            POSITION_COLUMN => rows.iter().map(|r| r.position.as_str()).collect::<Vec<_>>(),
+            "交易次数" => rows.iter().map(|r| r.trades as i64).collect::<Vec<_>>(),
+            "盈利次数" => rows.iter().map(|r| r.wins as i64).collect::<Vec<_>>(),
+            "累计盈亏比例" => rows.iter().map(|r| r.profit_sum).collect::<Vec<_>>(),
+            "持仓K线数" => rows.iter().map(|r| r.hold_bars as i64).collect::<Vec<_>>(),
+            "持仓收益" => rows.iter().map(|r| r.hold_return).collect::<Vec<_>>(),
+        )?;
+        let file = fs::File::create(&self.summary_path)
+            .with_context(|| format!("创建摘要文件失败 {}", self.summary_path.display()))?;
+        ParquetWriter::new(file).finish(&mut df)?;
+        Ok(())
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn frame(position: &str, rows: usize) -> DataFrame {
+        df!(
+            "标的代码" => vec!["AAA"; rows],
+            "盈亏比例" => (0..rows).map(|i| i as f64).collect::<Vec<_>>(),
+        )
+        .map(|df| tag_position(df, position).unwrap())
+        .unwrap()
+    }
+
+    #[test]
+    fn partitioned_round_trip_filters_by_position() {
+        let dir = tempfile::tempdir().unwrap();
+        let n = 3;
+        let names: Vec<String> = (0..8).map(|i| format!("候选{i}")).collect();
+        {
+            let out = PartitionedOutput::new(dir.path(), n).unwrap();
+            for (i, name) in names.iter().enumerate() {
+                let (shard, _) = &out.shards[partition_of(name, n)];
+                shard.lock().unwrap().push(frame(name, i + 1)).unwrap();
+            }
+            out.finish().unwrap();
+        }
+
+        let files = fs::read_dir(dir.path().join("pairs")).unwrap().count();
+        assert!(files <= n);
+        for (i, name) in names.iter().enumerate() {
+            let df = read_partitioned(dir.path(), OutputKind::Pairs, name, n)
+                .unwrap()
+                .expect("仓位应有数据");
+            assert_eq!(df.height(), i + 1);
+            assert!(df.column(POSITION_COLUMN).is_err());
+        }
+        assert!(
+            read_partitioned(dir.path(), OutputKind::Pairs, "不存在", n)
+                .unwrap()
+                .is_none()
+        );
+        assert!(
+            read_partitioned(dir.path(), OutputKind::Holds, &names[0], n)
+                .unwrap()
+                .is_none()
+        );
+    }
+
+    fn mock_bars(symbol: &str, n: usize, phase: f64) -> Vec<czsc_core::objects::bar::RawBar> {
+        use chrono::{Duration, TimeZone, Utc};
+        use czsc_core::objects::bar::RawBarBuilder;
+        let t0 = Utc.with_ymd_and_hms(2020, 1, 2, 0, 0, 0).unwrap();
+        (0..n)
+            .map(|i| {
+                let x = i as f64;
+                let mid = 100.0 + 10.0 * (x / 37.0 + phase).sin() + 3.0 * (x / 7.0).cos();
+                RawBarBuilder::default()
+                    .symbol(symbol.to_string())
+                    .id(i as i32)
+                    .dt(t0 + Duration::minutes(30 * i as i64))
+                    .freq(czsc_core::objects::freq::Freq::F30)
+                    .open(mid - 0.5)
+                    .close(mid + 0.5)
+                    .high(mid + 1.0)
+                    .low(mid - 1.0)
+                    .vol(1000.0)
+                    .amount(100_000.0)
+                    .build()
+                    .unwrap()
+            })
+            .collect()
+    }
+
+    #[test]
+    fn aggregate_matches_file_outputs() {
+        let pos: Position = serde_json::from_value(serde_json::json!({
+            "name": "表里多头",
+            "symbol": "PLACEHOLDER",
+            "opens": [{"operate": "开多", "signals_all": ["30分钟_D1_表里关系V230101_向上_任意_任意_0"]}],
+            "exits": [{"operate": "平多", "signals_all": ["30分钟_D1_表里关系V230101_向下_任意_任意_0"]}],
+            "interval": 0,
+            "timeout": 20,
+            "stop_loss": 300.0,
+            "T0": false
+        }))
+        .unwrap();
+        let symbols = vec!["AAA".to_string(), "BBB".to_string()];
+        let bars: HashMap<String, Vec<_>> = symbols
+            .iter()
+            .enumerate()
+            .map(|(i, s)| (s.clone(), mock_bars(s, 1500, i as f64)))
+            .collect();
+
+        let dir = tempfile::tempdir().unwrap();
+        let run = |output: &dyn OptimOutput| {
+            crate::optimize::symbols_optim_parallel(
+                symbols.clone(),
+                &bars,
+                vec![pos.clone()],
+                output,
+                "30分钟",
+                None,
+                None,
+                None,
+                1,
+            )
+            .unwrap()
+        };
+        run(&PerFileOutput::new(dir.path().join("files")));
+        let agg_out = AggregateOutput::new(&dir.path().join("agg"), &[pos.clone()]).unwrap();
+        run(&agg_out);
+        let agg = agg_out.into_aggregates().remove("表里多头").unwrap();
+
+        let read = |sym: &str, kind: &str| {
+            let path = dir
+                .path()
+                .join("files")
+                .join(sym)
+                .join(format!("表里多头.{kind}.parquet"));
+            ParquetReader::new(fs::File::open(path).unwrap())
+                .finish()
+                .unwrap()
+                .lazy()
+        };
+        let pairs = concat(
+            symbols.iter().map(|s| read(s, "pairs")).collect::<Vec<_>>(),
+            UnionArgs::default(),
+        )
+        .unwrap()
+        .collect()
+        .unwrap();
+        let holds = concat(
+            symbols.iter().map(|s| read(s, "holds")).collect::<Vec<_>>(),
+            UnionArgs::default(),
+        )
+        .unwrap()
+        .collect()
+        .unwrap();
+
+        assert!(agg.trades > 0);
+        assert_eq!(agg.trades, pairs.height());
+        assert_eq!(agg.hold_rows, holds.height());
+        let profit_sum: f64 = pairs
+            .column("盈亏比例")
+            .unwrap()
+            .f64()
+            .unwrap()
+            .into_iter()
+            .flatten()
+            .sum();
+        assert!((agg.profits.iter().sum::<f64>() - profit_sum).abs() < 1e-6);
+
+        let cross = holds
+            .lazy()
+            .group_by([col("dt")])
+            .agg([
+                ((col("n1b") * col("pos").cast(DataType::Float64)).sum()
+                    / (col("pos").neq(lit(0)).cast(DataType::Float64).sum() + lit(1.0)))
+                .alias("cross"),
+                (col("n1b") * col("pos").cast(DataType::Float64))
+                    .mean()
+                    .alias("cross1"),
+            ])
+            .select([col("cross").sum(), col("cross1").sum()])
+            .collect()
+            .unwrap();
+        let expect = |c: &str| cross.column(c).unwrap().f64().unwrap().get(0).unwrap();
+        let (got, got1) = agg.cross_returns();
+        assert!((got - expect("cross")).abs() < 1e-6);
+        assert!((got1 - expect("cross1")).abs() < 1e-6);
+        assert!(dir.path().join("agg").join("summary.parquet").is_file());
+    }
+}
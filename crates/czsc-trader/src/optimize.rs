@@ -1,5 +1,8 @@
-use crate::engine_v2::scheduler::split_positions_into_chunks;
+use crate::bar_source::BarSource;
+use crate::engine_v2::catalog::SignalCategory;
+use crate::engine_v2::compiler::optimize::{CandidateChunk, build_candidate_chunks};
 use crate::engine_v2::{ExecutionPlan, ExecutionPlanInput, UnifiedExecEngine};
+use crate::optim_output::OptimOutput;
 use crate::sig_parse::{SignalConfig, get_signals_config};
 use anyhow::{Context, Result};
 use czsc_core::objects::bar::RawBar;
@@ -9,12 +12,10 @@ use czsc_core::objects::position::{Position, load_position};
 use czsc_core::objects::signal::Signal;
 use log::{info, warn};
 use md5;
-use polars::prelude::*;
 use rayon::prelude::*;
 use sha2::{Digest, Sha256};
-use std::collections::{HashMap, HashSet};
-use std::fs;
-use std::path::{Path, PathBuf};
+use std::collections::HashSet;
+use std::path::PathBuf;
 
 /// 获取一根信号配置的哈希值前8位（对齐 Python MD5 算法）
 fn hash_str(val: &str) -> String {
@@ -215,21 +216,21 @@ fn extract_signals_config(positions: &[Position]) -> Vec<SignalConfig> {
     get_signals_config(&sigs)
 }
 
+/// 优化时每个 chunk 包含的候选仓位数量
+const OPTIM_CHUNK_SIZE: usize = 16;
+
 /// 针对单个标的运行批量并行策略优化
 #[allow(clippy::too_many_arguments)]
 pub fn one_symbol_optim(
     symbol: &str,
     bars: &[RawBar],
     positions: Vec<Position>,
-    out_dir: &Path,
+    output: &dyn OptimOutput,
     base_freq: &str,
     market: Option<&str>,
     bg_max_count: Option<usize>,
     sdt_cutoff: Option<chrono::DateTime<chrono::FixedOffset>>,
 ) -> Result<()> {
-    let symbol_dir = out_dir.join(symbol);
-    fs::create_dir_all(&symbol_dir)?;
-
     if bars.len() < 100 {
         warn!("{} K线数量不足，无法跑批", symbol);
         return Ok(());
@@ -250,35 +251,97 @@ pub fn one_symbol_optim(
         include_sdt_bar: None,
     })
     .map_err(anyhow::Error::msg)?;
-    let output =
+    let result =
         UnifiedExecEngine::run(&plan, bars.to_vec(), sdt_override.as_deref(), false, false)
             .map_err(anyhow::Error::msg)?;
-    let optimized_positions = output.positions;
 
     // 落盘
-    for pos in &optimized_positions {
-        let name = &pos.name;
-        if let Ok(mut df) = pos.pairs() {
-            let file_path = symbol_dir.join(format!("{}.pairs.parquet", name));
-            let mut file = fs::File::create(&file_path)?;
-            ParquetWriter::new(&mut file).finish(&mut df)?;
-        }
-        if let Ok(mut df) = pos.holds() {
-            if df.height() > 0 {
-                // 对齐 Python: n1b 最后一行 NaN/Null 填充为 0.0
-                if let Ok(n1b_col) = df.column("n1b") {
-                    let n1b = n1b_col.cast(&DataType::Float64)?;
-                    let n1b = n1b.fill_null(FillNullStrategy::Zero)?;
-                    let _ = df.with_column(n1b);
-                }
-                let s_sym = Series::new("symbol".into(), vec![symbol; df.height()]);
-                let _ = df.with_column(s_sym);
-            }
+    output.write(symbol, &result.positions)?;
 
-            let file_path = symbol_dir.join(format!("{}.holds.parquet", name));
-            let mut file = fs::File::create(&file_path)?;
-            ParquetWriter::new(&mut file).finish(&mut df)?;
-        }
+    info!("{} 跑批完成，耗时 {:?}", symbol, start_time.elapsed());
+
+    Ok(())
+}
+
+/// 共享信号模式下的单标的优化：一次预热 + 信号计算，供所有 chunk 复用。
+///
+/// 与逐 chunk 调用 [`one_symbol_optim`] 相比，BarGenerator / CZSC / 信号计算
+/// 每个标的只做一次，优化耗时随仓位数量而不是 chunk 数量增长。各 chunk 的
+/// Position 状态机由 [`crate::engine_v2::SharedSignalStream`] 驱动，`parallel`
+/// 为 true 时 chunk 之间用 rayon 并行。
+///
+/// 计划中含 trader 级信号时（信号依赖仓位状态，不能预先计算），回退到逐 chunk
+/// 完整回放，结果与旧链路一致。
+#[allow(clippy::too_many_arguments)]
+pub fn one_symbol_optim_shared(
+    symbol: &str,
+    bars: &[RawBar],
+    positions: &[Position],
+    chunk_size: usize,
+    parallel: bool,
+    output: &dyn OptimOutput,
+    base_freq: &str,
+    market: Option<&str>,
+    bg_max_count: Option<usize>,
+    sdt_cutoff: Option<chrono::DateTime<chrono::FixedOffset>>,
+) -> Result<()> {
+    if bars.len() < 100 {
+        warn!("{} K线数量不足，无法跑批", symbol);
+        return Ok(());
+    }
+
+    let start_time = std::time::Instant::now();
+    let sdt_override = sdt_cutoff.map(|x| x.to_rfc3339());
+    let plan = ExecutionPlan::compile(ExecutionPlanInput {
+        symbol: symbol.to_string(),
+        base_freq: base_freq.to_string(),
+        signals_config: extract_signals_config(positions),
+        positions: positions.to_vec(),
+        market: market.map(|x| x.to_string()),
+        bg_max_count,
+        sdt: sdt_override.clone(),
+        include_sdt_bar: None,
+    })
+    .map_err(anyhow::Error::msg)?;
+    let chunks = build_candidate_chunks(plan.positions.len(), chunk_size);
+
+    let has_trader_ops = plan
+        .signal_plan
+        .ops
+        .iter()
+        .any(|op| matches!(op.category, SignalCategory::Trader));
+    if has_trader_ops {
+        let run_chunk = |c: &CandidateChunk| {
+            one_symbol_optim(
+                symbol,
+                bars,
+                positions[c.start..c.end].to_vec(),
+                output,
+                base_freq,
+                market,
+                bg_max_count,
+                sdt_cutoff,
+            )
+        };
+        return if parallel {
+            chunks.par_iter().try_for_each(run_chunk)
+        } else {
+            chunks.iter().try_for_each(run_chunk)
+        };
+    }
+
+    let stream =
+        UnifiedExecEngine::build_shared_signal_stream(&plan, bars, sdt_override.as_deref())
+            .map_err(anyhow::Error::msg)?;
+    let run_chunk = |c: &CandidateChunk| {
+        let (chunk_positions, _) =
+            stream.replay_positions(plan.positions[c.start..c.end].to_vec(), false);
+        output.write(symbol, &chunk_positions)
+    };
+    if parallel {
+        chunks.par_iter().try_for_each(run_chunk)?;
+    } else {
+        chunks.iter().try_for_each(run_chunk)?;
     }
 
     info!("{} 跑批完成，耗时 {:?}", symbol, start_time.elapsed());
@@ -287,98 +350,65 @@ pub fn one_symbol_optim(
 }
 
 /// 并行计算所有 symbol
+///
+/// 每个 symbol 只计算一次信号流（见 [`one_symbol_optim_shared`]），
+/// 候选仓位按 16 个一组在共享信号流上回放。K 线在 worker 内经 `source`
+/// 按标的取出，[`crate::bar_source::DirBarSource`] 这类按需读取的来源在
+/// 该标的跑完后即释放，峰值内存只与并发线程数相关。
+///
+/// 单个标的的跑批失败只记 warn；K 线读取失败视为输入错误，直接返回 Err。
+/// 全部标的跑完后调用 [`OptimOutput::finish`] 刷出 `output` 的缓冲。
 #[allow(clippy::too_many_arguments)]
-pub fn symbols_optim_parallel(
+pub fn symbols_optim_parallel<S: BarSource>(
     symbols: Vec<String>,
-    bars_map: HashMap<String, Vec<RawBar>>, // memory 传入全量 K线 (或者传入回调自己读取)
+    source: S,
     positions: Vec<Position>,
-    out_dir: &Path,
+    output: &dyn OptimOutput,
     base_freq: &str,
     market: Option<&str>,
     bg_max_count: Option<usize>,
     sdt_cutoff: Option<chrono::DateTime<chrono::FixedOffset>>,
     n_threads: usize,
-) {
-    let chunks = split_positions_into_chunks(&positions, 16);
-
-    // 单线程下避免 rayon 嵌套并行，防止在某些环境出现卡住
-    if n_threads == 1 {
-        for sym in symbols {
-            if let Some(bars) = bars_map.get(&sym) {
-                if chunks.len() <= 1 {
-                    let _ = one_symbol_optim(
-                        &sym,
-                        bars.as_slice(),
-                        positions.clone(),
-                        out_dir,
-                        base_freq,
-                        market,
-                        bg_max_count,
-                        sdt_cutoff,
-                    );
-                } else {
-                    for chunk_pos in &chunks {
-                        let _ = one_symbol_optim(
-                            &sym,
-                            bars.as_slice(),
-                            chunk_pos.clone(),
-                            out_dir,
-                            base_freq,
-                            market,
-                            bg_max_count,
-                            sdt_cutoff,
-                        );
-                    }
-                }
-            }
+) -> Result<()> {
+    let run_symbol = |sym: &str, parallel: bool| -> Result<()> {
+        let Some(bars) = source.load(sym)? else {
+            return Ok(());
+        };
+        if let Err(e) = one_symbol_optim_shared(
+            sym,
+            &bars,
+            &positions,
+            OPTIM_CHUNK_SIZE,
+            parallel,
+            output,
+            base_freq,
+            market,
+            bg_max_count,
+            sdt_cutoff,
+        ) {
+            warn!("{sym} 跑批失败: {e:#}");
         }
-        return;
-    }
-
-    let run = || {
-        symbols.into_par_iter().for_each(|sym| {
-            if let Some(bars) = bars_map.get(&sym) {
-                if chunks.len() <= 1 {
-                    let _ = one_symbol_optim(
-                        &sym,
-                        bars.as_slice(),
-                        positions.clone(),
-                        out_dir,
-                        base_freq,
-                        market,
-                        bg_max_count,
-                        sdt_cutoff,
-                    );
-                } else {
-                    chunks.par_iter().for_each(|chunk_pos| {
-                        let _ = one_symbol_optim(
-                            &sym,
-                            bars.as_slice(),
-                            chunk_pos.clone(),
-                            out_dir,
-                            base_freq,
-                            market,
-                            bg_max_count,
-                            sdt_cutoff,
-                        );
-                    });
-                }
-            }
-        })
+        Ok(())
     };
 
-    if n_threads > 0 {
+    let run = || symbols.par_iter().try_for_each(|sym| run_symbol(sym, true));
+
+    // 单线程下避免 rayon 嵌套并行，防止在某些环境出现卡住
+    if n_threads == 1 {
+        symbols.iter().try_for_each(|sym| run_symbol(sym, false))?;
+    } else if n_threads > 0 {
         match rayon::ThreadPoolBuilder::new()
             .num_threads(n_threads)
             .build()
         {
-            Ok(pool) => pool.install(run),
+            Ok(pool) => pool.install(run)?,
             Err(err) => {
                 warn!("构建 rayon 线程池失败，回退默认线程池: {err}");
-                run();
+                run()?
             }
         }
     } else {
-        run();
+        run()?;
     }
+    output.finish()
 }
@@ -0,0 +1,266 @@
+//! 信号函数级别的耗时剖析。
+//!
+//! `CoreLoopProfileV2` 只给出信号计算、trader 信号、仓位更新几个粗粒度桶，
+//! 策略变慢时无从判断是哪个信号函数拖慢了整体。开启剖析后，每个 K 线信号函数、
+//! 每个周期的信号组、每个周期的 CZSC 增量更新以及每个 trader 信号函数各记一行：
+//! 调用次数、总耗时与 p99 耗时。
+//!
+//! p99 由对数分桶直方图估算（每个 2 的幂区间再等分 8 桶，相对误差不超过 12.5%），
+//! 内存与调用次数无关。
+
+use polars::prelude::*;
+
+/// 剖析条目的类别。
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+pub enum SignalProfileKind {
+    /// 单个 K 线信号函数（`CompiledKlineFreqGroup` 中的一个 op）
+    Kline,
+    /// 单个周期的全部 K 线信号函数（仅统计该周期末根 bar 变化、需要重算的 bar）
+    Freq,
+    /// 单个周期的 CZSC 增量更新
+    Czsc,
+    /// 单个 trader 级信号函数
+    Trader,
+}
+
+impl SignalProfileKind {
+    pub fn as_str(&self) -> &'static str {
+        match self {
+            SignalProfileKind::Kline => "kline",
+            SignalProfileKind::Freq => "freq",
+            SignalProfileKind::Czsc => "czsc",
+            SignalProfileKind::Trader => "trader",
+        }
+    }
+}
+
+/// 每个 2 的幂区间的分桶数取 `2^SUB_BITS`
+const SUB_BITS: u32 = 3;
+const SUB_COUNT: usize = 1 << SUB_BITS;
+const BUCKETS: usize = (64 - SUB_BITS as usize + 1) * SUB_COUNT;
+
+#[inline]
+fn bucket_of(ns: u64) -> usize {
+    if ns < SUB_COUNT as u64 {
+        return ns as usize;
+    }
+    let exp = 63 - ns.leading_zeros();
+    let sub = (ns >> (exp - SUB_BITS)) as usize & (SUB_COUNT - 1);
+    (exp - SUB_BITS + 1) as usize * SUB_COUNT + sub
+}
+
+/// 分桶的取值上界（含）。
+fn bucket_upper(idx: usize) -> u64 {
+    if idx < SUB_COUNT {
+        return idx as u64;
+    }
+    let exp = (idx / SUB_COUNT) as u32 + SUB_BITS - 1;
+    let sub = (idx % SUB_COUNT) as u64;
+    let width = 1u64 << (exp - SUB_BITS);
+    ((SUB_COUNT as u64 + sub) << (exp - SUB_BITS)).saturating_add(width - 1)
+}
+
+/// 单个条目的耗时统计。
+#[derive(Debug, Clone)]
+pub struct LatencyStats {
+    calls: u64,
+    total_ns: u64,
+    max_ns: u64,
+    buckets: Vec<u64>,
+}
+
+impl Default for LatencyStats {
+    fn default() -> Self {
+        Self {
+            calls: 0,
+            total_ns: 0,
+            max_ns: 0,
+            buckets: vec![0; BUCKETS],
+        }
+    }
+}
+
+impl LatencyStats {
+    #[inline]
+    pub fn record(&mut self, ns: u64) {
+        self.calls += 1;
+        self.total_ns = self.total_ns.saturating_add(ns);
+        self.max_ns = self.max_ns.max(ns);
+        self.buckets[bucket_of(ns)] += 1;
+    }
+
+    pub fn calls(&self) -> u64 {
+        self.calls
+    }
+
+    pub fn total_ns(&self) -> u64 {
+        self.total_ns
+    }
+
+    pub fn max_ns(&self) -> u64 {
+        self.max_ns
+    }
+
+    /// 分位数估计：返回第 `ceil(q * calls)` 个样本所在分桶的上界，不超过最大值。
+    pub fn quantile_ns(&self, q: f64) -> u64 {
+        if self.calls == 0 {
+            return 0;
+        }
+        let rank = ((q.clamp(0.0, 1.0) * self.calls as f64).ceil() as u64).max(1);
+        let mut seen = 0u64;
+        for (idx, &n) in self.buckets.iter().enumerate() {
+            seen += n;
+            if seen >= rank {
+                return bucket_upper(idx).min(self.max_ns);
+            }
+        }
+        self.max_ns
+    }
+}
+
+/// 剖析表中的一行。
+#[derive(Debug, Clone)]
+pub struct SignalProfileEntry {
+    pub kind: SignalProfileKind,
+    /// 信号函数名；`freq` / `czsc` 条目为空
+    pub name: String,
+    /// 周期；trader 信号为空
+    pub freq: String,
+    /// 信号参数（JSON），区分同一函数的不同参数组合
+    pub params: String,
+    pub stats: LatencyStats,
+}
+
+/// 一次运行的信号剖析结果，条目按登记顺序排列。
+#[derive(Debug, Clone, Default)]
+pub struct SignalProfile {
+    entries: Vec<SignalProfileEntry>,
+}
+
+impl SignalProfile {
+    /// 登记一个条目，返回后续 [`Self::record`] 使用的下标。
+    pub fn register(
+        &mut self,
+        kind: SignalProfileKind,
+        name: &str,
+        freq: &str,
+        params: &str,
+    ) -> usize {
+        self.entries.push(SignalProfileEntry {
+            kind,
+            name: name.to_string(),
+            freq: freq.to_string(),
+            params: params.to_string(),
+            stats: LatencyStats::default(),
+        });
+        self.entries.len() - 1
+    }
+
+    #[inline]
+    pub fn record(&mut self, slot: usize, ns: u64) {
+        self.entries[slot].stats.record(ns);
+    }
+
+    pub fn entries(&self) -> &[SignalProfileEntry] {
+        &self.entries
+    }
+
+    pub fn is_empty(&self) -> bool {
+        self.entries.is_empty()
+    }
+
+    /// 把另一份剖析结果的条目追加到末尾。
+    pub fn append(&mut self, other: SignalProfile) {
+        self.entries.extend(other.entries);
+    }
+
+    /// 转成 DataFrame：`kind / name / freq / params / calls / total_ns / mean_ns / p99_ns / max_ns`。
+    pub fn to_frame(&self) -> PolarsResult<DataFrame> {
+        let e = &self.entries;
+        let str_col = |name: &str, f: fn(&SignalProfileEntry) -> &str| {
+            Column::new(name.into(), e.iter().map(f).collect::<Vec<_>>())
+        };
+        let u64_col = |name: &str, f: &dyn Fn(&LatencyStats) -> u64| {
+            Column::new(
+                name.into(),
+                e.iter().map(|x| f(&x.stats)).collect::<Vec<u64>>(),
+            )
+        };
+        let mean_ns: Vec<f64> = e
+            .iter()
+            .map(|x| match x.stats.calls {
+                0 => 0.0,
+                n => x.stats.total_ns as f64 / n as f64,
+            })
+            .collect();
+        DataFrame::new(vec![
+            str_col("kind", |x| x.kind.as_str()),
+            str_col("name", |x| x.name.as_str()),
+            str_col("freq", |x| x.freq.as_str()),
+            str_col("params", |x| x.params.as_str()),
+            u64_col("calls", &|s| s.calls),
+            u64_col("total_ns", &|s| s.total_ns),
+            Column::new("mean_ns".into(), mean_ns),
+            u64_col("p99_ns", &|s| s.quantile_ns(0.99)),
+            u64_col("max_ns", &|s| s.max_ns),
+        ])
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_bucket_bounds_cover_values() {
+        for ns in (0..5000u64).chain([u64::MAX / 3, u64::MAX]) {
+            let idx = bucket_of(ns);
+            assert!(idx < BUCKETS);
+            assert!(bucket_upper(idx) >= ns, "ns={ns}");
+            if idx > 0 {
+                assert!(bucket_upper(idx - 1) < ns, "ns={ns}");
+            }
+        }
+    }
+
+    #[test]
+    fn test_quantile_within_bucket_error() {
+        let mut stats = LatencyStats::default();
+        for ns in 1..=1000u64 {
+            stats.record(ns * 100);
+        }
+        assert_eq!(stats.calls(), 1000);
+        assert_eq!(stats.total_ns(), 100 * 1000 * 1001 / 2);
+        let p99 = stats.quantile_ns(0.99) as f64;
+        assert!((99_000.0..=99_000.0 * 1.125).contains(&p99), "p99={p99}");
+        assert_eq!(stats.quantile_ns(1.0), 100_000);
+        assert_eq!(LatencyStats::default().quantile_ns(0.99), 0);
+    }
+
+    #[test]
+    fn test_profile_frame() {
+        let mut profile = SignalProfile::default();
+        let a = profile.register(SignalProfileKind::Kline, "sig_a", "日线", "{}");
+        let mut trader = SignalProfile::default();
+        let b = trader.register(SignalProfileKind::Trader, "sig_b", "", "{\"n\":1}");
+        profile.record(a, 10);
+        profile.record(a, 30);
+        trader.record(b, 7);
+        profile.append(trader);
+
+        let df = profile.to_frame().unwrap();
+        assert_eq!(df.height(), 2);
+        let kinds: Vec<&str> = df
+            .column("kind")
+            .unwrap()
+            .str()
+            .unwrap()
+            .into_no_null_iter()
+            .collect();
+        assert_eq!(kinds, ["kline", "trader"]);
+        let mean = df.column("mean_ns").unwrap().f64().unwrap().get(0);
+        assert_eq!(mean, Some(20.0));
+        let p99 = df.column("p99_ns").unwrap().u64().unwrap().get(0);
+        assert_eq!(p99, Some(30));
+    }
+}
@@ -152,10 +152,7 @@ impl CzscTrader {
 
         let t_pos = Instant::now();
         for sig in trader_sigs {
-            let (k, v) = (sig.key(), sig.value());
-            self.signals.s.insert(k.clone(), v.clone());
-            self.signals.signal_map.insert(k, v);
-            self.signals.sigs.insert(sig);
+            self.signals.insert_signal(sig);
         }
 
         // 2. 构建需要输入给 position 的上下文
@@ -10,12 +10,14 @@
 pub mod bar_generator;
 pub mod errors;
 pub mod freq_data;
+pub mod ic;
 pub mod monotonicity;
 pub mod resample;
 pub mod trading_time;
 
+pub use ic::{IcMethod, cross_sectional_ic};
 pub use monotonicity::monotonicity;
-pub use resample::resample_bars;
+pub use resample::{resample_bars, resample_df};
 pub use trading_time::is_trading_time;
 
 #[cfg(feature = "python")]
@@ -1,9 +1,15 @@
 //! czsc-utils 的 PyO3 binding。通过 `python` feature 来开关，
 //! 这样下游 Rust 消费者就不会传递性地引入 pyo3。
 
+use std::io::Cursor;
+
 use chrono::{DateTime, Utc};
+use czsc_core::analyze::utils::raw_bars_to_df;
 use czsc_core::objects::{bar::RawBar, freq::Freq, market::Market};
+use polars::frame::DataFrame;
+use polars::prelude::{IpcReader, IpcWriter, SerReader, SerWriter};
 use pyo3::prelude::*;
+use pyo3::types::PyBytes;
 use pyo3_stub_gen::derive::gen_stub_pyfunction;
 
 use crate::bar_generator::BarGenerator;
@@ -41,13 +47,39 @@ fn monotonicity(sequence: Vec<f64>) -> f64 {
     crate::monotonicity::monotonicity(&sequence)
 }
 
+/// 解析 `Freq` 枚举或中文周期字符串（如 "5分钟"），与 `BarGenerator.__new__` 的
+/// dual-input 约定一致。这里的 str→Freq 解析属于 PyO3 类型系统无法直接桥接的边界胶水。
+fn extract_freq(py: Python<'_>, freq: &Py<PyAny>, name: &str) -> PyResult<Freq> {
+    use std::str::FromStr;
+
+    if let Ok(py_str) = freq.cast_bound::<pyo3::types::PyString>(py) {
+        let s = py_str.to_string();
+        Freq::from_str(&s)
+            .map_err(|e| pyo3::exceptions::PyValueError::new_err(format!("解析 {name} 失败: {e}")))
+    } else if let Ok(f) = freq.extract::<Freq>(py) {
+        Ok(f)
+    } else {
+        Err(pyo3::exceptions::PyValueError::new_err(format!(
+            "{name} 必须是 Freq 枚举或中文周期字符串"
+        )))
+    }
+}
+
+/// 将 DataFrame 写为 Arrow IPC 字节流。
+fn df_to_ipc_bytes(py: Python<'_>, df: &mut DataFrame) -> PyResult<Py<PyBytes>> {
+    let mut buf = Cursor::new(Vec::new());
+    IpcWriter::new(&mut buf).finish(df).map_err(|e| {
+        pyo3::exceptions::PyValueError::new_err(format!("DataFrame 转 Arrow bytes 失败: {e}"))
+    })?;
+    Ok(PyBytes::new(py, buf.get_ref()).unbind())
+}
+
 /// `czsc._native.resample_bars(bars, target_freq, drop_unfinished=True)` → list[RawBar]。
 ///
 /// 纯透传，逻辑由 [`crate::resample::resample_bars`] 实现。
 /// DataFrame 入参由 Python 端 wrapper 经 `format_standard_kline` 转 `List[RawBar]` 后再调用本函数。
 ///
-/// `target_freq` 接受 `Freq` 枚举或中文周期字符串（如 "5分钟"），与 `BarGenerator.__new__`
-/// 的 dual-input 约定一致。这里的 str→Freq 解析属于 PyO3 类型系统无法直接桥接的边界胶水。
+/// `target_freq` 接受 `Freq` 枚举或中文周期字符串（如 "5分钟"）。
 #[pyfunction]
 #[pyo3(signature = (bars, target_freq, drop_unfinished=true))]
 fn resample_bars(
@@ -56,25 +88,84 @@ fn resample_bars(
     target_freq: Py<PyAny>,
     drop_unfinished: bool,
 ) -> PyResult<Vec<RawBar>> {
-    use std::str::FromStr;
-
-    let target_freq = if let Ok(py_str) = target_freq.cast_bound::<pyo3::types::PyString>(py) {
-        let s = py_str.to_string();
-        Freq::from_str(&s).map_err(|e| {
-            pyo3::exceptions::PyValueError::new_err(format!("解析 target_freq 失败: {e}"))
-        })?
-    } else if let Ok(f) = target_freq.extract::<Freq>(py) {
-        f
-    } else {
-        return Err(pyo3::exceptions::PyValueError::new_err(
-            "target_freq 必须是 Freq 枚举或中文周期字符串",
-        ));
-    };
-
+    let target_freq = extract_freq(py, &target_freq, "target_freq")?;
     crate::resample::resample_bars(&bars, target_freq, drop_unfinished)
         .map_err(|e| pyo3::exceptions::PyValueError::new_err(e.to_string()))
 }
 
+/// `czsc._native.resample_bars_arrow(bars, target_freq, drop_unfinished=True)` → bytes。
+///
+/// 同 [`resample_bars`]，但结果按标准 8 列布局以 Arrow IPC 字节流返回，
+/// Python 端无需逐根读取 RawBar 属性即可得到 DataFrame。
+#[pyfunction]
+#[pyo3(signature = (bars, target_freq, drop_unfinished=true))]
+fn resample_bars_arrow(
+    py: Python<'_>,
+    bars: Vec<RawBar>,
+    target_freq: Py<PyAny>,
+    drop_unfinished: bool,
+) -> PyResult<Py<PyBytes>> {
+    let target_freq = extract_freq(py, &target_freq, "target_freq")?;
+    let out = crate::resample::resample_bars(&bars, target_freq, drop_unfinished)
+        .map_err(|e| pyo3::exceptions::PyValueError::new_err(e.to_string()))?;
+    let mut df =
+        raw_bars_to_df(&out).map_err(|e| pyo3::exceptions::PyValueError::new_err(e.to_string()))?;
+    df_to_ipc_bytes(py, &mut df)
+}
+
+/// `czsc._native.resample_df_arrow(df_bytes, base_freq, target_freq, drop_unfinished=True)` → bytes。
+///
+/// DataFrame → DataFrame 的列式入口：输入与输出都是标准 8 列布局的 Arrow IPC
+/// 字节流，全程不创建逐根的 Python 对象。逻辑由 [`crate::resample::resample_df`] 实现。
+#[pyfunction]
+#[pyo3(signature = (df_bytes, base_freq, target_freq, drop_unfinished=true))]
+fn resample_df_arrow(
+    py: Python<'_>,
+    df_bytes: &[u8],
+    base_freq: Py<PyAny>,
+    target_freq: Py<PyAny>,
+    drop_unfinished: bool,
+) -> PyResult<Py<PyBytes>> {
+    let base_freq = extract_freq(py, &base_freq, "base_freq")?;
+    let target_freq = extract_freq(py, &target_freq, "target_freq")?;
+    let df = IpcReader::new(Cursor::new(df_bytes))
+        .finish()
+        .map_err(|e| {
+            pyo3::exceptions::PyValueError::new_err(format!("Arrow bytes 转 DataFrame 失败: {e}"))
+        })?;
+    let mut out = crate::resample::resample_df(df, base_freq, target_freq, drop_unfinished)
+        .map_err(|e| pyo3::exceptions::PyValueError::new_err(e.to_string()))?;
+    df_to_ipc_bytes(py, &mut out)
+}
+
+/// `czsc._native.cross_sectional_ic_arrow(df_bytes, key_col, x_cols, y_col, method="spearman")` → bytes。
+///
+/// 输入为 Arrow IPC 字节流，须已按 `key_col`（整数分组键，通常为 dt 的排序编码）升序排列；
+/// 输出每个截面一行，包含 `key_col` 与 `x_cols` 同名的 IC 列。逻辑由
+/// [`crate::ic::cross_sectional_ic_df`] 实现，计算期间释放 GIL。
+#[pyfunction]
+#[pyo3(signature = (df_bytes, key_col, x_cols, y_col, method="spearman"))]
+fn cross_sectional_ic_arrow(
+    py: Python<'_>,
+    df_bytes: &[u8],
+    key_col: &str,
+    x_cols: Vec<String>,
+    y_col: &str,
+    method: &str,
+) -> PyResult<Py<PyBytes>> {
+    use std::str::FromStr;
+
+    let method = crate::ic::IcMethod::from_str(method)
+        .map_err(|e| pyo3::exceptions::PyValueError::new_err(e.to_string()))?;
+    let mut out = py
+        .detach(|| {
+            let df = IpcReader::new(Cursor::new(df_bytes)).finish()?;
+            crate::ic::cross_sectional_ic_df(&df, key_col, &x_cols, y_col, method)
+        })
+        .map_err(|e| pyo3::exceptions::PyValueError::new_err(e.to_string()))?;
+    df_to_ipc_bytes(py, &mut out)
+}
+
 /// 在父 `_native` 模块上注册 utils 子模块。Phase H 把它变成
 /// `czsc.is_trading_time`、`czsc.freq_end_time` 和 `czsc.BarGenerator` 的规范入口。
 pub fn register(py: Python<'_>, parent: &Bound<'_, PyModule>) -> PyResult<()> {
@@ -83,6 +174,9 @@ pub fn register(py: Python<'_>, parent: &Bound<'_, PyModule>) -> PyResult<()> {
     utils.add_function(wrap_pyfunction!(freq_end_time, &utils)?)?;
     utils.add_function(wrap_pyfunction!(monotonicity, &utils)?)?;
     utils.add_function(wrap_pyfunction!(resample_bars, &utils)?)?;
+    utils.add_function(wrap_pyfunction!(resample_bars_arrow, &utils)?)?;
+    utils.add_function(wrap_pyfunction!(resample_df_arrow, &utils)?)?;
+    utils.add_function(wrap_pyfunction!(cross_sectional_ic_arrow, &utils)?)?;
     utils.add_class::<BarGenerator>()?;
     parent.add_submodule(&utils)?;
 
@@ -92,6 +186,9 @@ pub fn register(py: Python<'_>, parent: &Bound<'_, PyModule>) -> PyResult<()> {
     parent.add_function(wrap_pyfunction!(freq_end_time, parent)?)?;
     parent.add_function(wrap_pyfunction!(monotonicity, parent)?)?;
     parent.add_function(wrap_pyfunction!(resample_bars, parent)?)?;
+    parent.add_function(wrap_pyfunction!(resample_bars_arrow, parent)?)?;
+    parent.add_function(wrap_pyfunction!(resample_df_arrow, parent)?)?;
+    parent.add_function(wrap_pyfunction!(cross_sectional_ic_arrow, parent)?)?;
     parent.add_class::<BarGenerator>()?;
     Ok(())
 }
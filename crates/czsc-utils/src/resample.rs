@@ -26,7 +26,9 @@
 //!   返回市场收盘时间）的行为不一致；要改正需重设计 [`freq_end_time`] 对非分钟
 //!   target 的返回口径，影响面外溢，暂作为已知限制留待单独 PR 处理。
 
+use czsc_core::analyze::utils::{format_standard_kline, raw_bars_to_df};
 use czsc_core::objects::{bar::RawBar, freq::Freq};
+use polars::frame::DataFrame;
 
 use crate::bar_generator::{BarGenerator, nan_ohlcv_field};
 use crate::errors::UtilsError;
@@ -87,6 +89,24 @@ pub fn resample_bars(
     Ok(out)
 }
 
+/// DataFrame → DataFrame 的批量重采样：列布局与 `format_standard_kline` 一致。
+///
+/// 输入按 `base_freq` 解析为 RawBar，重采样结果再按同一 8 列布局组装，
+/// 全程不经过 Python 对象，供 Python 端 `resample_bars(df, raw_bars=False)`
+/// 直接以 Arrow 列交换。校验与 [`resample_bars`] 完全相同。
+pub fn resample_df(
+    df: DataFrame,
+    base_freq: Freq,
+    target_freq: Freq,
+    drop_unfinished: bool,
+) -> Result<DataFrame, UtilsError> {
+    let bars = format_standard_kline(df, base_freq)
+        .map_err(|e| UtilsError::Unexpected(anyhow::anyhow!("K线标准化格式错误: {e}")))?;
+    let out = resample_bars(&bars, target_freq, drop_unfinished)?;
+    raw_bars_to_df(&out)
+        .map_err(|e| UtilsError::Unexpected(anyhow::anyhow!("重采样结果转 DataFrame 失败: {e}")))
+}
+
 /// batch 模式必须的输入不变量：单 symbol、单 freq、dt 严格递增。
 ///
 /// 故意做成一次 O(n) 扫描而不是分摊到 BarGenerator 里，原因是 BarGenerator 的
@@ -352,6 +372,36 @@ mod tests {
         }
     }
 
+    /// DataFrame 入口与 RawBar 入口逐值一致，且输出保持标准 8 列布局。
+    #[test]
+    fn resample_df_matches_resample_bars() {
+        let bars = build_ashare_1min_bars(23);
+        let df = raw_bars_to_df(&bars).unwrap();
+        let out_df = resample_df(df, Freq::F1, Freq::F5, true).unwrap();
+        let expect = resample_bars(&bars, Freq::F5, true).unwrap();
+
+        assert_eq!(
+            out_df
+                .get_column_names()
+                .iter()
+                .map(|c| c.as_str())
+                .collect::<Vec<_>>(),
+            vec![
+                "symbol", "dt", "open", "close", "high", "low", "vol", "amount"
+            ]
+        );
+        let got = format_standard_kline(out_df, Freq::F5).unwrap();
+        assert_eq!(got.len(), expect.len());
+        for (g, e) in got.iter().zip(&expect) {
+            assert_eq!(g.symbol, e.symbol);
+            assert_eq!(g.dt, e.dt);
+            assert_eq!(
+                (g.open, g.close, g.high, g.low, g.vol, g.amount),
+                (e.open, e.close, e.high, e.low, e.vol, e.amount)
+            );
+        }
+    }
+
     /// bars[0] 本身就含 NaN 也要 fail-loud（之前的循环从 idx=1 起，需特别覆盖）。
     #[test]
     fn nan_at_first_bar_returns_err() {
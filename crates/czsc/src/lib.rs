@@ -80,7 +80,7 @@ pub use czsc_core::objects::{
     mark::Mark,
     market::Market,
     operate::Operate,
-    position::{OperateRecord, Position, PositionUpdateProfile},
+    position::{OperateRecord, Position, PositionUpdateProfile, SignalFrame, SignalSymbolTable},
     zs::ZS,
 };
 
@@ -1,6 +1,10 @@
 """CZSC（缠中说禅）量化分析框架——顶层包入口。
 
-按 spec §3.1，所有公共 API 在导入期一次性 import；不再使用 PEP 562 lazy loading。
+按 spec §3.1，所有公共 API 在导入期一次性 import；默认不使用 PEP 562 lazy loading。
+短生命周期的 worker 进程可设置 ``CZSC_FAST_IMPORT=1`` 进入快速启动模式：只加载
+``czsc._native`` 核心类型、``research`` / ``strategies`` 与 K 线格式化入口，其余子包
+与 wbt 等重型依赖在首次访问对应属性时才导入（见 ``czsc.envs.get_fast_import``）。
+
 - ``czsc._native``：Rust 扩展（PyO3），提供缠论核心类型、信号、交易器、TA 算子。
 - ``czsc.{connectors,traders,utils,fsa,aphorism,mock,envs}``：Python 子包。
 - ``czsc.{ema,sma,...,ultimate_smoother,...}``：Rust TA 算子的顶层别名。
@@ -13,31 +17,12 @@
 # 顶层包的 import 顺序经过手工设计以处理子包间的循环依赖，
 # 不要让 isort/ruff 重排——会触发 partially-initialized module 错误。
 
-# 第一批：纯薄壳子包（不会回头 import czsc 顶层符号）。
-# fsa/aphorism/mock 中含 ``from czsc import top_drawdowns`` 等回环 import，
-# 必须放到 wbt / .traders / .utils 之后再加载，避免循环 import。
+# 第零批：核心类型、研究/策略入口。只依赖 czsc._native 与 pandas/pyarrow，
+# 不回头 import 任何子包，快速启动模式下也总是加载。
+from . import envs
 from . import _native as _native  # noqa: F401  # 通过 czsc._native.* 暴露
-from . import connectors, envs, traders, utils
 
 # === 缠论核心数据类型与算法（来自 Rust 扩展 czsc._native）===
-# === wbt（硬依赖，提供回测/绩效组件）===
-from wbt import WeightBacktest, daily_performance, top_drawdowns
-
-# format_standard_kline: Python 适配层，把 DataFrame -> List[RawBar]（详见模块 docstring）
-from czsc._format_standard_kline import format_standard_kline
-
-# resample_bars: Python 适配层，把 DataFrame / list[RawBar] 重采样为目标周期（详见模块 docstring）
-from czsc._resample_bars import resample_bars
-
-# === 之前的 lazy 属性，改为静态 import（spec §3.1 移除 lazy loading）===
-from czsc.utils.kline_quality import check_kline_quality
-from czsc.utils.log import log_strategy_info
-from czsc.utils.trade import adjust_holding_weights
-from czsc.utils.warning_capture import capture_warnings, execute_with_warning_capture
-
-# 第二批：会回头 import czsc 顶层符号（如 ``from czsc import top_drawdowns``）的重型子包。
-# 必须放在所有顶层符号都已经绑定之后，否则会触发 partially-initialized module 循环 import。
-from . import aphorism, fsa, mock
 from ._native import (
     BI,
     CZSC,
@@ -75,12 +60,14 @@ from ._native import (
     ultimate_smoother,
 )
 
-# === EDA 工具 ===
-# 2026-05-17 PR-B：``mark_cta_periods`` / ``mark_volatility`` 已迁到 czsc.utils 独立文件。
 # 2026-05-17 PR-D：``monotonicity`` 已改为 Rust 实现（czsc._native），与 scipy.stats.spearmanr 等价。
 from ._native import monotonicity
-from .utils.mark_cta_periods import mark_cta_periods
-from .utils.mark_volatility import mark_volatility
+
+# format_standard_kline: Python 适配层，把 DataFrame -> List[RawBar]（详见模块 docstring）
+from czsc._format_standard_kline import format_standard_kline
+
+# resample_bars: Python 适配层，把 DataFrame / list[RawBar] 重采样为目标周期（详见模块 docstring）
+from czsc._resample_bars import resample_bars
 
 # === 研究/优化入口（czsc.research，Rust 后端）===
 from .research import (
@@ -89,53 +76,153 @@ from .research import (
     run_optimize_batch,
     run_replay,
     run_research,
+    run_research_batch,
 )
 
 # === 策略门面（czsc.strategies；Python 层对 Rust Trader 的薄封装）===
 from .strategies import CzscJsonStrategy, CzscStrategyBase
 
-# === 交易器与信号管理 API（czsc.traders）===
-from .traders import (
-    CzscSignals,
-    CzscTrader,
-    derive_signals_config,
-    derive_signals_freqs,
-    generate_czsc_signals,
-    get_signals_config,
-    get_signals_freqs,
-    get_unique_signals,
-)
+if not envs.get_fast_import():
+    # 第一批：纯薄壳子包（不会回头 import czsc 顶层符号）。
+    # fsa/aphorism/mock 中含 ``from czsc import top_drawdowns`` 等回环 import，
+    # 必须放到 wbt / .traders / .utils 之后再加载，避免循环 import。
+    from . import connectors, traders, utils
+
+    # === wbt（硬依赖，提供回测/绩效组件）===
+    from wbt import WeightBacktest, daily_performance, top_drawdowns
+
+    # === 之前的 lazy 属性，改为静态 import（spec §3.1 移除 lazy loading）===
+    from czsc.utils.kline_quality import check_kline_quality
+    from czsc.utils.log import log_strategy_info
+    from czsc.utils.trade import adjust_holding_weights
+    from czsc.utils.warning_capture import capture_warnings, execute_with_warning_capture
+
+    # 第二批：会回头 import czsc 顶层符号（如 ``from czsc import top_drawdowns``）的重型子包。
+    # 必须放在所有顶层符号都已经绑定之后，否则会触发 partially-initialized module 循环 import。
+    from . import aphorism, fsa, mock
+
+    # === EDA 工具 ===
+    # 2026-05-17 PR-B：``mark_cta_periods`` / ``mark_volatility`` 已迁到 czsc.utils 独立文件。
+    from .utils.mark_cta_periods import mark_cta_periods
+    from .utils.mark_volatility import mark_volatility
+
+    # === 交易器与信号管理 API（czsc.traders）===
+    from .traders import (
+        CzscSignals,
+        CzscTrader,
+        derive_signals_config,
+        derive_signals_freqs,
+        generate_czsc_signals,
+        get_signals_config,
+        get_signals_freqs,
+        get_unique_signals,
+    )
+
+    # === 通用工具函数（czsc.utils）===
+    from .utils import (
+        DataClient,
+        DiskCache,
+        clear_cache,
+        clear_expired_cache,
+        code_namespace,
+        cross_sectional_ic,
+        dill_dump,
+        dill_load,
+        disk_cache,
+        empty_cache_path,
+        freqs_sorted,
+        get_dir_size,
+        get_py_namespace,
+        get_url_token,
+        home_path,
+        import_by_name,
+        index_composition,
+        print_df_sample,
+        read_json,
+        resample_to_daily,
+        risk_free_returns,
+        save_json,
+        set_url_token,
+        to_arrow,
+        update_bbars,
+        update_nxb,
+        update_tbars,
+    )
+else:
+    # 快速启动模式（CZSC_FAST_IMPORT=1）：其余公共名称按 PEP 562 在首次访问时导入。
+    # 值为 (模块名, 属性名)；属性名为 None 表示名称本身就是子包。
+    _LAZY_ATTRS: dict[str, tuple[str, str | None]] = {
+        **{name: (f"czsc.{name}", None) for name in ["connectors", "traders", "utils", "fsa", "aphorism", "mock"]},
+        **{name: ("wbt", name) for name in ["WeightBacktest", "daily_performance", "top_drawdowns"]},
+        "check_kline_quality": ("czsc.utils.kline_quality", "check_kline_quality"),
+        "log_strategy_info": ("czsc.utils.log", "log_strategy_info"),
+        "adjust_holding_weights": ("czsc.utils.trade", "adjust_holding_weights"),
+        "capture_warnings": ("czsc.utils.warning_capture", "capture_warnings"),
+        "execute_with_warning_capture": ("czsc.utils.warning_capture", "execute_with_warning_capture"),
+        "mark_cta_periods": ("czsc.utils.mark_cta_periods", "mark_cta_periods"),
+        "mark_volatility": ("czsc.utils.mark_volatility", "mark_volatility"),
+        **{
+            name: ("czsc.traders", name)
+            for name in [
+                "CzscSignals",
+                "CzscTrader",
+                "derive_signals_config",
+                "derive_signals_freqs",
+                "generate_czsc_signals",
+                "get_signals_config",
+                "get_signals_freqs",
+                "get_unique_signals",
+            ]
+        },
+        **{
+            name: ("czsc.utils", name)
+            for name in [
+                "DataClient",
+                "DiskCache",
+                "clear_cache",
+                "clear_expired_cache",
+                "code_namespace",
+                "cross_sectional_ic",
+                "dill_dump",
+                "dill_load",
+                "disk_cache",
+                "empty_cache_path",
+                "freqs_sorted",
+                "get_dir_size",
+                "get_py_namespace",
+                "get_url_token",
+                "home_path",
+                "import_by_name",
+                "index_composition",
+                "print_df_sample",
+                "read_json",
+                "resample_to_daily",
+                "risk_free_returns",
+                "save_json",
+                "set_url_token",
+                "to_arrow",
+                "update_bbars",
+                "update_nxb",
+                "update_tbars",
+            ]
+        },
+    }
+
+    def __getattr__(name: str):
+        target = _LAZY_ATTRS.get(name)
+        if target is None:
+            raise AttributeError(f"module 'czsc' has no attribute {name!r}")
+        import importlib
+
+        module_name, attr = target
+        module = importlib.import_module(module_name)
+        value = module if attr is None else getattr(module, attr)
+        globals()[name] = value
+        return value
+
+    def __dir__():
+        return sorted(set(globals()) | set(_LAZY_ATTRS))
 
-# === 通用工具函数（czsc.utils）===
-from .utils import (
-    DataClient,
-    DiskCache,
-    clear_cache,
-    clear_expired_cache,
-    code_namespace,
-    cross_sectional_ic,
-    dill_dump,
-    dill_load,
-    disk_cache,
-    empty_cache_path,
-    freqs_sorted,
-    get_dir_size,
-    get_py_namespace,
-    get_url_token,
-    home_path,
-    import_by_name,
-    index_composition,
-    print_df_sample,
-    read_json,
-    resample_to_daily,
-    risk_free_returns,
-    save_json,
-    set_url_token,
-    to_arrow,
-    update_bbars,
-    update_nxb,
-    update_tbars,
-)
 
 # === 包元信息 ===
 # 版本号唯一来源是 Cargo.toml [workspace.package].version；maturin 在打 wheel
@@ -198,7 +285,7 @@ __all__ = [
     "WeightBacktest",
     "daily_performance",
     "top_drawdowns",
-    # 始终预加载的子包
+    # 子包（快速启动模式下首次访问时加载）
     "connectors",
     "envs",
     "traders",
@@ -224,6 +311,7 @@ __all__ = [
     "run_optimize_batch",
     "run_replay",
     "run_research",
+    "run_research_batch",
     # 通用工具
     "DataClient",
     "DiskCache",
@@ -273,9 +361,16 @@ __all__ = [
 
 def welcome():
     """打印 CZSC 版本号、随机格言与缓存目录提示，用于 CLI/交互式环境。"""
+    # 显式导入：快速启动模式下这些名称不在模块全局命名空间中
+    from . import aphorism
+    from .utils import get_dir_size, home_path
+
     print(f"欢迎使用CZSC！当前版本标识为 {__version__}@{__date__}\n")
     aphorism.print_one()
     print(f"CZSC环境变量：czsc_min_bi_len = {envs.get_min_bi_len()}; czsc_max_bi_num = {envs.get_max_bi_num()}; ")
     # 1 GiB 阈值：超出即提示用户主动清理，避免缓存目录无限膨胀。
     if get_dir_size(home_path) > pow(1024, 3):
-        print(f"{home_path} 目录缓存超过1GB，请适当清理。调用 czsc.empty_cache_path() 可以直接清空缓存")
+        print(
+            f"{home_path} 目录缓存超过1GB，请适当清理。调用 czsc.empty_cache_path() 可以直接清空缓存；"
+            "设置环境变量 CZSC_DISK_CACHE_MAX_BYTES 可让 DiskCache 按 LRU 自动淘汰"
+        )
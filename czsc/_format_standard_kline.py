@@ -2,24 +2,26 @@
 公开 API ``format_standard_kline`` 的 Python 包装实现
 
 功能定位：
-    将标准列布局的 K 线 DataFrame 逐行转换为 ``list[RawBar]``，签名与
+    将标准列布局的 K 线表转换为 ``list[RawBar]``，签名与
     rs-czsc 提供的 ``format_standard_kline(df, freq) -> list[RawBar]``
     完全对齐，是 Python 端调用 Rust 缠论分析的"输入预处理"环节。
 
 实现取舍：
-    - 不走 Rust 端的 pyarrow 字节流捷径（``format_standard_kline_bytes``），
-      原因是 pyarrow 桥接代码尚未迁移到 czsc-python，引入会扩大依赖面
-    - 直接遍历 DataFrame 并按行调用 PyO3 暴露的 ``RawBar`` 构造器，
-      在 1 万根 K 线规模的测试输入下耗时可忽略（< 100 ms）
-    - 若未来出现热路径性能问题，可再考虑把 ``format_standard_kline_bytes``
-      迁移过来，本函数保持调用接口不变即可
+    - 默认走 Arrow IPC 字节流快路径：只取八个标准列序列化一次，
+      由 ``czsc._native.format_standard_kline_bytes`` 在 Rust 端按列批量构造
+      RawBar，同一标的共享一个 symbol 字符串，避免逐行跨 PyO3 边界
+    - 支持 pandas / polars DataFrame 与 pyarrow Table 三种输入
+    - dt 列为 tz-aware 时回退到逐行构造，由 ``RawBar`` 构造器统一给出
+      "tz-naive" 报错，与其它入口的时区约定保持一致
 """
 
 from __future__ import annotations
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
 
-from czsc._native import Freq, RawBar
+from czsc._native import Freq, RawBar, format_standard_kline_bytes
 
 # 仅暴露公开函数，避免 ``from ... import *`` 时把 _FREQ_MAP 等内部对象带出去
 __all__ = ["format_standard_kline"]
@@ -53,13 +55,81 @@ _FREQ_MAP: dict[str, Freq] = {
     "年线": Freq.Y,
 }
 
+# 标准 K 线的八个必需列
+_REQUIRED = ("dt", "symbol", "open", "close", "high", "low", "vol", "amount")
+
+
+def _to_arrow_table(df) -> pa.Table | None:
+    """把 pandas / polars / pyarrow 输入裁剪为八个标准列的 Arrow Table。
+
+    dt 为 tz-aware 时返回 ``None``，由调用方回退到逐行构造路径。
+    """
+    if isinstance(df, pd.DataFrame):
+        # 仅在 dt 列类型不匹配时做一次浅拷贝并转换，避免污染调用方的原始 DataFrame
+        if df["dt"].dtype != "datetime64[ns]":
+            df = df.copy()
+            df["dt"] = pd.to_datetime(df["dt"])
+        if getattr(df["dt"].dt, "tz", None) is not None:
+            return None
+        sub = df[list(_REQUIRED)]
+        if not pd.api.types.is_string_dtype(sub["symbol"]):
+            sub = sub.assign(symbol=sub["symbol"].astype(str))
+        table = pa.Table.from_pandas(sub, preserve_index=False)
+    elif isinstance(df, pa.Table):
+        table = df.select(list(_REQUIRED))
+    else:
+        table = df.select(list(_REQUIRED)).to_arrow()
+
+    dt_type = table.schema.field("dt").type
+    if pa.types.is_timestamp(dt_type) and dt_type.tz is not None:
+        return None
+    if pa.types.is_date(dt_type):
+        dt_idx = table.schema.get_field_index("dt")
+        table = table.set_column(dt_idx, "dt", table.column("dt").cast(pa.timestamp("ns")))
+    sym_idx = table.schema.get_field_index("symbol")
+    if table.schema.field("symbol").type != pa.string():
+        table = table.set_column(sym_idx, "symbol", table.column("symbol").cast(pa.string()))
+    return table
+
+
+def _standard_kline_ipc_bytes(df) -> bytes | None:
+    """把标准 K 线表序列化为 Arrow IPC 字节流；dt 为 tz-aware 时返回 ``None``。"""
+    table = _to_arrow_table(df)
+    if table is None:
+        return None
+    sink = pa.BufferOutputStream()
+    with ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def _format_rows(df: pd.DataFrame, freq: Freq) -> list[RawBar]:
+    """逐行构造 RawBar，仅用于 tz-aware dt 的回退路径。"""
+    bars: list[RawBar] = []
+    for row in df[list(_REQUIRED)].itertuples(index=False):
+        bars.append(
+            RawBar(
+                symbol=str(row.symbol),
+                dt=row.dt,
+                freq=freq,
+                open=float(row.open),
+                close=float(row.close),
+                high=float(row.high),
+                low=float(row.low),
+                vol=float(row.vol),
+                amount=float(row.amount),
+            )
+        )
+    return bars
+
 
 def format_standard_kline(df: pd.DataFrame, freq: Freq | str = Freq.F5) -> list[RawBar]:
     """
     将标准 K 线 DataFrame 转换为 RawBar 对象列表
 
     参数:
-        df:  标准 K 线布局，必须包含以下八列（缺一即报错）：
+        df:  标准 K 线布局（pandas / polars DataFrame 或 pyarrow Table），
+             必须包含以下八列（缺一即报错）：
              ``dt``     - 时间戳（``datetime64[ns]`` 或可被 ``pd.to_datetime`` 解析）
              ``symbol`` - 标的代码（任意可被 ``str()`` 表示的对象）
              ``open``   - 开盘价
@@ -73,47 +143,27 @@ def format_standard_kline(df: pd.DataFrame, freq: Freq | str = Freq.F5) -> list[
               默认值 ``Freq.F5`` 仅作占位，生产环境务必显式传入正确周期。
 
     返回:
-        与输入 DataFrame 行序一致的 RawBar 列表
+        与输入行序一致的 RawBar 列表；``id`` 为从 0 开始的行号
 
     异常:
-        ValueError: DataFrame 缺少必需列
+        ValueError: 缺少必需列、数值列含空值，或 dt 为 tz-aware
         KeyError:   freq 是字符串但未登记于 ``_FREQ_MAP``
 
     备注:
         - 函数对入参 df 不做原地修改：仅在 dt 列类型不匹配时才会做一次浅拷贝
-        - 价格 / 成交量 / 成交额一律强制 ``float`` 化，与 RawBar 构造器签名匹配，
-          避免 numpy 类型在 PyO3 边界产生隐式转换告警
+        - 价格 / 成交量 / 成交额在 Rust 端统一转为 ``f64``
     """
     # 字符串 freq 走查表；未登记的字符串会立即触发 KeyError，便于尽早暴露拼写错误
     if isinstance(freq, str):
         freq = _FREQ_MAP[freq]
 
-    # 严格列校验：八个字段缺一即拒绝处理，避免后续 itertuples 报出难懂的 AttributeError
-    required = ("dt", "symbol", "open", "close", "high", "low", "vol", "amount")
-    for col in required:
-        if col not in df.columns:
+    # 严格列校验：八个字段缺一即拒绝处理，避免后续报出难懂的 Arrow / Polars 错误
+    columns = df.column_names if isinstance(df, pa.Table) else df.columns
+    for col in _REQUIRED:
+        if col not in columns:
             raise ValueError(f"format_standard_kline: missing column {col!r}")
 
-    # 仅在 dt 列类型不匹配时做一次浅拷贝并转换，避免污染调用方的原始 DataFrame
-    if df["dt"].dtype != "datetime64[ns]":
-        df = df.copy()
-        df["dt"] = pd.to_datetime(df["dt"])
-
-    # 使用 itertuples(index=False) 而非 iterrows，可显著减少每行的属性访问开销
-    # （itertuples 返回 namedtuple，字段访问是 C 层实现）
-    bars: list[RawBar] = []
-    for row in df[list(required)].itertuples(index=False):
-        bars.append(
-            RawBar(
-                symbol=str(row.symbol),
-                dt=row.dt,
-                freq=freq,
-                open=float(row.open),
-                close=float(row.close),
-                high=float(row.high),
-                low=float(row.low),
-                vol=float(row.vol),
-                amount=float(row.amount),
-            )
-        )
-    return bars
+    data = _standard_kline_ipc_bytes(df)
+    if data is None:
+        return _format_rows(df if isinstance(df, pd.DataFrame) else df.to_pandas(), freq)
+    return format_standard_kline_bytes(data, freq)
@@ -35,6 +35,7 @@ __all__ = [
     "chip_distribution_triangle",
     "create_fake_bis",
     "format_standard_kline",
+    "format_standard_kline_bytes",
     "get_zs_seq",
     "is_bis_down",
     "is_bis_up",
@@ -1395,6 +1396,12 @@ def format_standard_kline(bars: typing.Sequence[RawBar]) -> builtins.list[RawBar
     完整的 DataFrame 入口会等到 Phase E/F 接入 polars Python 桥时再添加（详见 design doc §2.3）。
     """
 
+def format_standard_kline_bytes(df_bytes: bytes, freq: Freq) -> builtins.list[RawBar]:
+    r"""
+    从 Arrow IPC 字节流批量构造 RawBar 列表，是 Python 端 `format_standard_kline` 的快路径。
+    列约定与 `CZSC.from_dataframe` 一致；同一标的的 bar 共享一个 symbol，id 按行号递增。
+    """
+
 def get_zs_seq(bis: typing.Sequence[BI]) -> builtins.list[ZS]:
     r"""
     将连续笔划分为中枢序列。
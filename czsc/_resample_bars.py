@@ -8,11 +8,11 @@
     由 ``czsc._native.resample_bars`` 透传过来。
 
 实现取舍：
-    - DataFrame 输入：复用同仓库的 ``format_standard_kline``，与
-      ``CZSC`` / ``CzscTrader`` 等入口保持一致的列约定与类型容忍度。
-    - DataFrame 输出：``raw_bars=False`` 时把 ``list[RawBar]`` 拆回
-      标准列布局；空结果保留 8 列空 schema（避免 ``pd.DataFrame([])``
-      退化成 0 列产生的下游 KeyError）。
+    - DataFrame 输入：复用同仓库 ``format_standard_kline`` 的列约定与类型容忍度；
+      ``raw_bars=False`` 时整张表以 Arrow IPC 交给 ``resample_df_arrow``，
+      DataFrame → DataFrame 全程不创建逐根的 Python 对象。
+    - DataFrame 输出：Rust 端直接返回标准 8 列的 Arrow 列；空结果保留
+      8 列空 schema（避免 ``pd.DataFrame([])`` 退化成 0 列产生的下游 KeyError）。
     - ``target_freq`` 的 ``str | Freq`` dual-input：解析在 Rust 端
       （与 ``BarGenerator`` 一致），Python 端不再额外做参数归一化。
 
@@ -35,9 +35,12 @@ from __future__ import annotations
 
 import pandas as pd
 
-from czsc._format_standard_kline import format_standard_kline
+from czsc._format_standard_kline import _standard_kline_ipc_bytes, format_standard_kline
 from czsc._native import Freq, RawBar
 from czsc._native import resample_bars as _resample_bars_native
+from czsc._native import resample_bars_arrow as _resample_bars_arrow_native
+from czsc._native import resample_df_arrow as _resample_df_arrow_native
+from czsc._utils._df_convert import arrow_bytes_to_pd_df
 
 __all__ = ["resample_bars"]
 
@@ -95,6 +98,12 @@ def resample_bars(
     # polars / numpy / pd.Series 等"也实现了 __iter__"的容器会被显式拒绝，
     # 避免它们落入 list(_) 路径产生 PyO3 端晦涩的类型抽取错误。
     if isinstance(df_or_bars, pd.DataFrame):
+        if not raw_bars:
+            data = _standard_kline_ipc_bytes(_check_columns(df_or_bars))
+            # data 为 None 表示 dt 为 tz-aware：走 RawBar 构造路径，由其给出 tz-naive 报错
+            if data is not None:
+                out_bytes = _resample_df_arrow_native(data, base_freq, target_freq, drop_unfinished)
+                return _to_output_dataframe(out_bytes)
         bars = format_standard_kline(df_or_bars, freq=base_freq)
     elif isinstance(df_or_bars, (list, tuple)):
         bars = list(df_or_bars)
@@ -104,31 +113,26 @@ def resample_bars(
             "请传 pandas.DataFrame 或 list[RawBar]（polars/numpy/Series 请先转换）"
         )
 
-    out = _resample_bars_native(bars, target_freq, drop_unfinished)
-
     if raw_bars:
-        return out
+        return _resample_bars_native(bars, target_freq, drop_unfinished)
+    return _to_output_dataframe(_resample_bars_arrow_native(bars, target_freq, drop_unfinished))
+
+
+def _check_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """与 ``format_standard_kline`` 相同的必需列校验。"""
+    for col in _OUTPUT_COLUMNS:
+        if col not in df.columns:
+            raise ValueError(f"format_standard_kline: missing column {col!r}")
+    return df
 
-    if not out:
+
+def _to_output_dataframe(out_bytes: bytes) -> pd.DataFrame:
+    """把 Rust 端返回的 8 列 Arrow IPC 字节流还原为 pandas DataFrame。"""
+    df = arrow_bytes_to_pd_df(out_bytes)
+    if df.empty:
         # 空结果：保留 8 列 + 与非空路径一致的 dtype，避免：
         # 1. ``pd.DataFrame([])`` 退化成 0 列引发下游 df["dt"] KeyError；
         # 2. dtype 全 object 让 ``df["dt"].dt.year`` 抛 AttributeError，或
         #    ``pd.concat([empty, full])`` 把 OHLCV 列降级成 object。
         return pd.DataFrame({col: pd.Series(dtype=dt) for col, dt in _OUTPUT_DTYPES.items()})
-
-    return pd.DataFrame(
-        [
-            {
-                "symbol": b.symbol,
-                "dt": b.dt,
-                "open": b.open,
-                "close": b.close,
-                "high": b.high,
-                "low": b.low,
-                "vol": b.vol,
-                "amount": b.amount,
-            }
-            for b in out
-        ],
-        columns=list(_OUTPUT_COLUMNS),
-    )
+    return df.astype(_OUTPUT_DTYPES, copy=False)[list(_OUTPUT_COLUMNS)]
@@ -21,7 +21,7 @@ app.add_typer(data.app, name="data", help="造数与质量校验")
 app.add_typer(plot.app, name="plot", help="缠论 / 信号 HTML 可视化")
 app.command("analyze", help="对一段 K 线跑缠论，输出分型 + 笔")(analyze.analyze)
 app.command("backtest", help="传入 Position 对象 + 数据源，产出回测结果")(backtest.backtest)
-app.command("bench", help="CZSC 吞吐量基准")(bench.bench)
+app.command("bench", help="引擎级基准矩阵：吞吐量 / 峰值 RSS / 基线回退对比")(bench.bench)
 app.command("schema", help="吐出全部命令/参数 schema 供 LLM 自发现")(schema.schema)
 
 
@@ -1,54 +1,429 @@
-"""bench 命令：CZSC 吞吐量基准（沿用 examples/17 逻辑）。"""
+"""bench 命令：引擎级基准矩阵（沿用 examples/17 逻辑并扩展到主要执行链路）。
+
+每个用例输出耗时、吞吐量（bars/s）、用例执行期间的峰值 RSS 与分阶段耗时；
+``--save-baseline`` 保存本次结果（连同运行参数 ``params``），``--baseline`` 与保存的结果对比，
+吞吐量下降或峰值 RSS 上升超过 ``--threshold`` 的用例记为回退，命令以非零状态退出；
+运行参数与基线不一致时拒绝对比。
+"""
 
 from __future__ import annotations
 
+import json
+import os
+import sys
+import tempfile
+import threading
 import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
 
 import typer
 
 from czsc.cli import _io
 
+CASES = ("czsc", "bar_generator", "signals", "research", "optimize", "resample")
+
+
+class _PeakRss:
+    """用例执行期间的峰值常驻内存（MB）。
+
+    Linux 下后台线程按固定间隔采样 ``/proc/self/statm``，得到本用例区间内的峰值；
+    其他平台退化为进程级历史峰值 ``ru_maxrss``；都不可用时为 None。
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.peak_mb: float | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @staticmethod
+    def _current_mb() -> float | None:
+        try:
+            with open("/proc/self/statm", encoding="ascii") as fh:
+                pages = int(fh.read().split()[1])
+            return pages * os.sysconf("SC_PAGE_SIZE") / 1024**2
+        except (OSError, ValueError, IndexError, AttributeError):
+            return None
+
+    @staticmethod
+    def _max_rss_mb() -> float | None:
+        try:
+            import resource
+        except ImportError:
+            return None
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS 单位为字节，Linux 为 KB
+        return rss / 1024**2 if sys.platform == "darwin" else rss / 1024
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._update(self._current_mb())
+
+    def _update(self, mb: float | None) -> None:
+        if mb is not None and (self.peak_mb is None or mb > self.peak_mb):
+            self.peak_mb = mb
+
+    def __enter__(self) -> _PeakRss:
+        mb = self._current_mb()
+        if mb is not None:
+            self._update(mb)
+            self._thread = threading.Thread(target=self._sample, daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self._thread is None:
+            self._update(self._max_rss_mb())
+            return
+        self._stop.set()
+        self._thread.join()
+        self._update(self._current_mb())
+
+
+@dataclass
+class _BenchContext:
+    symbol: str
+    freq: str
+    sdt: str
+    edt: str
+    df: Any
+    bars: list
+    signals: list[str]
+    signals_config: list[dict]
+    freqs: list[str]
+    n_positions: int
+    n_symbols: int
+    n_threads: int
+
+
+def _timed(stages: dict[str, float], name: str, fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    out = fn(*args, **kwargs)
+    stages[name] = time.perf_counter() - t0
+    return out
+
+
+def _result(bars: int, stages: dict[str, float], rss: _PeakRss, **extra) -> dict[str, Any]:
+    """单个用例的结果；``sec`` 为各阶段耗时之和，吞吐量按 ``bars`` 计算。"""
+    sec = sum(stages.values())
+    return {
+        "sec": round(sec, 4),
+        "bars": bars,
+        "bars_per_sec": round(bars / sec) if sec > 0 else 0,
+        "peak_rss_mb": round(rss.peak_mb, 1) if rss.peak_mb is not None else None,
+        "stages": {k: round(v, 4) for k, v in stages.items()},
+        **extra,
+    }
+
+
+def _float_ohlcv(df):
+    df = df.copy()
+    for col in ["open", "close", "high", "low", "vol", "amount"]:
+        df[col] = df[col].astype("float64")
+    return df
+
+
+def _positions(ctx: _BenchContext, n: int, symbol: str) -> list:
+    """构造 n 个互不相同的仓位：开平仓信号在信号集合中轮换。"""
+    from czsc import Event, Position
+
+    k = len(ctx.signals)
+    out = []
+    for i in range(n):
+        oe = Event.load({"operate": "开多", "signals_all": [ctx.signals[i % k]]})
+        xe = Event.load({"operate": "平多", "signals_all": [ctx.signals[(i + 1) % k]]})
+        out.append(
+            Position(
+                symbol=symbol,
+                name=f"bench_{i:03d}",
+                opens=[oe],
+                exits=[xe],
+                interval=0,
+                timeout=20 + i,
+                stop_loss=300,
+            )
+        )
+    return out
+
+
+def _bench_czsc(ctx: _BenchContext) -> dict[str, dict]:
+    from czsc import CZSC
+
+    n = len(ctx.bars)
+    stages: dict[str, float] = {}
+    with _PeakRss() as rss:
+        _timed(stages, "construct", CZSC, ctx.bars)
+    construct = _result(n, stages, rss)
+
+    def update():
+        c = CZSC(ctx.bars[:1])
+        for bar in ctx.bars[1:]:
+            c.update(bar)
+
+    stages = {}
+    with _PeakRss() as rss:
+        _timed(stages, "update", update)
+    return {"czsc_construct": construct, "czsc_update": _result(n, stages, rss)}
+
+
+def _bench_bar_generator(ctx: _BenchContext) -> dict[str, dict]:
+    from czsc import BarGenerator
+
+    def update(bg):
+        for bar in ctx.bars:
+            bg.update(bar)
+
+    stages: dict[str, float] = {}
+    with _PeakRss() as rss:
+        bg = _timed(stages, "init", BarGenerator, base_freq=ctx.freq, freqs=ctx.freqs, max_count=5000)
+        _timed(stages, "update", update, bg)
+    return {"bar_generator": _result(len(ctx.bars), stages, rss, freqs=ctx.freqs)}
+
+
+def _bench_signals(ctx: _BenchContext) -> dict[str, dict]:
+    from czsc import generate_czsc_signals
+    from czsc._utils._df_convert import arrow_bytes_to_pd_df
+
+    stages: dict[str, float] = {}
+    with _PeakRss() as rss:
+        raw = _timed(stages, "compute", generate_czsc_signals, ctx.bars, ctx.signals_config, sdt=ctx.sdt, arrow=True)
+        dfs = _timed(stages, "decode", arrow_bytes_to_pd_df, raw)
+    return {"signals": _result(len(ctx.bars), stages, rss, signals=len(ctx.signals_config), rows=len(dfs))}
+
+
+def _bench_research(ctx: _BenchContext) -> dict[str, dict]:
+    import czsc
+    from czsc._utils._df_convert import pandas_to_arrow_bytes
+
+    strategy = {
+        "symbol": ctx.symbol,
+        "base_freq": ctx.freq,
+        "positions": [p.dump() for p in _positions(ctx, ctx.n_positions, ctx.symbol)],
+        "signals_config": ctx.signals_config,
+    }
+    stages: dict[str, float] = {}
+    with _PeakRss() as rss:
+        raw = _timed(stages, "encode", pandas_to_arrow_bytes, _float_ohlcv(ctx.df))
+        res = _timed(stages, "engine", czsc.run_research, raw, strategy, opts={"profile": "core"})
+
+        def decode():
+            res.pairs_df()
+            res.holds_df()
+            res.signals_df()
+
+        _timed(stages, "decode", decode)
+    profile = res.meta.get("profile") or {}
+    engine = {
+        k: round(profile[f"{k}_ms"] / 1000, 4)
+        for k in ("signals_update", "trader_signals", "position_update")
+        if f"{k}_ms" in profile
+    }
+    return {"research": _result(len(ctx.bars), stages, rss, positions=ctx.n_positions, engine_stages=engine)}
+
+
+def _bench_optimize(ctx: _BenchContext) -> dict[str, dict]:
+    import czsc
+    from czsc.mock import generate_symbol_kines
+
+    symbols = [f"{i:06d}" for i in range(1, ctx.n_symbols + 1)]
+    with tempfile.TemporaryDirectory(prefix="czsc_bench_") as tmp:
+        root = Path(tmp)
+        bars_dir = root / "bars"
+        bars_dir.mkdir()
+        n = 0
+        for i, symbol in enumerate(symbols):
+            df = _float_ohlcv(generate_symbol_kines(symbol, ctx.freq, ctx.sdt, ctx.edt, seed=i))
+            df.to_parquet(bars_dir / f"{symbol}.parquet", index=False)
+            n += len(df)
+        pos = _positions(ctx, 1, "symbol")[0]
+        file_pos = root / f"{pos.name}.json"
+        file_pos.write_text(json.dumps(pos.dump(with_data=False), ensure_ascii=False), encoding="utf-8")
+        cfg = {
+            "optim_type": "open",
+            "task_name": "bench",
+            "base_freq": ctx.freq,
+            "symbols": symbols,
+            "files_position": [str(file_pos)],
+            "candidate_signals": ctx.signals,
+        }
+
+        stages: dict[str, float] = {}
+        with _PeakRss() as rss:
+            _timed(stages, "engine", czsc.run_optimize_batch, bars_dir, cfg, root / "res", n_threads=ctx.n_threads)
+    return {
+        "optimize": _result(n, stages, rss, symbols=ctx.n_symbols, candidates=len(ctx.signals), threads=ctx.n_threads)
+    }
+
+
+def _bench_resample(ctx: _BenchContext) -> dict[str, dict]:
+    from czsc import resample_bars
+
+    target = "周线" if ctx.freq == "日线" else "日线"
+    stages: dict[str, float] = {}
+    with _PeakRss() as rss:
+        _timed(stages, "dataframe", resample_bars, ctx.df, target, raw_bars=False, base_freq=ctx.freq)
+        _timed(stages, "raw_bars", resample_bars, ctx.bars, target)
+    # 两个阶段各处理一遍全部 bars
+    return {"resample": _result(2 * len(ctx.bars), stages, rss, target=target)}
+
+
+_RUNNERS = {
+    "czsc": _bench_czsc,
+    "bar_generator": _bench_bar_generator,
+    "signals": _bench_signals,
+    "research": _bench_research,
+    "optimize": _bench_optimize,
+    "resample": _bench_resample,
+}
+
+
+def _parse_cases(cases: str) -> list[str]:
+    names = [c.strip() for c in cases.split(",") if c.strip()]
+    if not names or names == ["all"]:
+        return list(CASES)
+    unknown = [c for c in names if c not in CASES]
+    if unknown:
+        raise ValueError(f"未知的基准用例: {unknown}；可选 {list(CASES)} 或 all")
+    return names
+
+
+def _default_signals(freq: str) -> list[str]:
+    return [
+        f"{freq}_D1_表里关系V230101_向上_任意_任意_0",
+        f"{freq}_D1_表里关系V230101_向下_任意_任意_0",
+        "日线_D1_表里关系V230101_向上_任意_任意_0",
+    ]
+
+
+def baseline_mismatch(current: dict[str, Any], baseline: dict[str, Any]) -> list[str]:
+    """返回本次与基线运行参数（``params``）不一致的键；基线缺少 ``params`` 时返回 ``["params"]``。
+
+    峰值 RSS 按进程统计，用例的执行顺序会影响后续用例的结果，因此 ``cases`` 按顺序比较。
+    """
+    base = baseline.get("params")
+    if not isinstance(base, dict):
+        return ["params"]
+    cur = current["params"]
+    return [k for k in cur if cur[k] != base.get(k)]
+
+
+def compare_baseline(current: dict[str, Any], baseline: dict[str, Any], threshold: float) -> list[dict[str, Any]]:
+    """对比两次基准结果，返回回退列表。
+
+    吞吐量低于基线 ``1 - threshold`` 倍、或峰值 RSS 高于基线 ``1 + threshold`` 倍记为回退；
+    只比较两边都有的用例与指标。
+    """
+    regressions = []
+    for case, cur in current.items():
+        base = baseline.get(case)
+        if not isinstance(cur, dict) or not isinstance(base, dict):
+            continue
+        checks = [
+            ("bars_per_sec", lambda c, b: c < b * (1 - threshold)),
+            ("peak_rss_mb", lambda c, b: c > b * (1 + threshold)),
+        ]
+        for metric, worse in checks:
+            c, b = cur.get(metric), base.get(metric)
+            if c is None or b is None or not b:
+                continue
+            if worse(c, b):
+                regressions.append(
+                    {"case": case, "metric": metric, "baseline": b, "current": c, "change": round(c / b - 1, 4)}
+                )
+    return regressions
+
 
 def bench(
     years: int = typer.Option(20, "--years", help="模拟数据年数"),
     freq: str = typer.Option("5分钟", "--freq", help="频率"),
     symbol: str = typer.Option("000001", "--symbol", help="标的"),
+    cases: str = typer.Option("all", "--cases", help=f"逗号分隔的用例：{','.join(CASES)} 或 all"),
+    signals: list[str] = typer.Option(None, "--signal", help="信号字符串，可重复；默认表里关系信号组"),
+    positions: int = typer.Option(10, "--positions", help="research 用例的仓位数"),
+    symbols: int = typer.Option(4, "--symbols", help="optimize 用例的模拟标的数"),
+    threads: int = typer.Option(1, "--threads", help="optimize 用例的线程数"),
+    baseline: str = typer.Option(None, "--baseline", help="基线 JSON，对比并标记回退"),
+    save_baseline: str = typer.Option(None, "--save-baseline", help="把本次结果保存为基线 JSON"),
+    threshold: float = typer.Option(0.1, "--threshold", help="回退判定阈值（相对变化）"),
     json_out: bool = typer.Option(False, "--json", help="JSON 输出"),
 ) -> None:
-    """本地复现 CZSC 单周期吞吐量（bars/s）。"""
+    """引擎级基准矩阵：吞吐量（bars/s）、峰值 RSS 与分阶段耗时。"""
     with _io.error_boundary(json_out):
-        from czsc import CZSC, format_standard_kline
+        from czsc import format_standard_kline, get_signals_config, get_signals_freqs
         from czsc.mock import generate_symbol_kines
 
+        names = _parse_cases(cases)
         end_year = 2024
         sdt = f"{end_year - years:04d}0101"
         edt = f"{end_year:04d}0101"
         cn = _io.freq_to_cn(freq)
         df = generate_symbol_kines(symbol, cn, sdt, edt)
         bars = format_standard_kline(df, cn)
-        n = len(bars)
-
-        t0 = time.perf_counter()
-        CZSC(bars)
-        construct_sec = time.perf_counter() - t0
-
-        t1 = time.perf_counter()
-        c2 = CZSC(bars[:1])
-        for bar in bars[1:]:
-            c2.update(bar)
-        update_sec = time.perf_counter() - t1
+        sigs = list(signals) if signals else _default_signals(cn)
+        signals_config = get_signals_config(sigs)
+        freqs = [cn, *sorted(set(get_signals_freqs(signals_config)) - {cn})]
+        ctx = _BenchContext(
+            symbol=symbol,
+            freq=cn,
+            sdt=sdt,
+            edt=edt,
+            df=df,
+            bars=bars,
+            signals=sigs,
+            signals_config=signals_config,
+            freqs=freqs,
+            n_positions=positions,
+            n_symbols=symbols,
+            n_threads=threads,
+        )
 
-        out = {
-            "symbol": symbol,
+        params = {
+            "years": years,
             "freq": cn,
-            "bars": n,
-            "czsc_construct": {"sec": round(construct_sec, 4), "bars_per_sec": round(n / construct_sec)},
-            "czsc_update": {"sec": round(update_sec, 4), "bars_per_sec": round(n / update_sec)},
+            "symbol": symbol,
+            "bars": len(bars),
+            "cases": names,
+            "signals": sigs,
+            "positions": positions,
+            "symbols": symbols,
+            "threads": threads,
         }
+        out: dict[str, Any] = {"symbol": symbol, "freq": cn, "bars": len(bars), "params": params}
+        base = None
+        if baseline:
+            base = json.loads(Path(baseline).read_text(encoding="utf-8"))
+            diff = baseline_mismatch(out, base)
+            if diff:
+                raise ValueError(f"本次运行参数与基线 {baseline} 不一致: {diff}；请用相同参数重新 --save-baseline")
+
+        for name in names:
+            out.update(_RUNNERS[name](ctx))
+
+        if save_baseline:
+            Path(save_baseline).write_text(json.dumps(out, ensure_ascii=False, indent=2), encoding="utf-8")
+        regressions: list[dict[str, Any]] = []
+        if base is not None:
+            regressions = compare_baseline(out, base, threshold)
+            out["baseline"] = baseline
+            out["regressions"] = regressions
 
         def human(d):
             typer.echo(f"{d['symbol']} {d['freq']}  bars={d['bars']}")
-            typer.echo(f"  构造:    {d['czsc_construct']['bars_per_sec']:>12,} bars/s")
-            typer.echo(f"  增量推进: {d['czsc_update']['bars_per_sec']:>12,} bars/s")
+            for key, r in d.items():
+                if not isinstance(r, dict) or "bars_per_sec" not in r:
+                    continue
+                rss = f"{r['peak_rss_mb']:,.1f} MB" if r["peak_rss_mb"] is not None else "n/a"
+                typer.echo(f"  {key:<16} {r['bars_per_sec']:>12,} bars/s  {r['sec']:>8.3f} s  峰值RSS {rss}")
+                stages = "  ".join(f"{k}={v:.3f}s" for k, v in r["stages"].items())
+                typer.echo(f"  {'':<16} {stages}")
+            for x in d.get("regressions", []):
+                typer.secho(
+                    f"  回退 {x['case']}.{x['metric']}: {x['baseline']} → {x['current']} ({x['change']:+.1%})",
+                    fg=typer.colors.RED,
+                )
 
         _io.emit(out, json_out=json_out, human=human)
+        if regressions:
+            raise typer.Exit(1)
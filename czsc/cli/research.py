@@ -37,6 +37,7 @@ def run(
     strategy: str = typer.Argument(..., help="strategy.json（含 symbol/positions/signals_config）"),
     sdt: str = typer.Option(None, "--sdt", help="起始时间覆盖"),
     output: str = typer.Option(None, "-o", "--output", help="holds 结果 CSV 落盘路径"),
+    profile: bool = typer.Option(False, "--profile", help="逐信号函数剖析，按总耗时降序输出"),
     json_out: bool = typer.Option(False, "--json", help="JSON 输出"),
 ) -> None:
     """内存研究（czsc.run_research）。"""
@@ -46,12 +47,23 @@ def run(
         df = _io.load_bars_df(bars)
         with open(strategy, encoding="utf-8") as fh:
             strat = json.loads(fh.read())
-        res = czsc.run_research(df, strat, sdt=sdt)
+        opts = {"profile": "signals"} if profile else None
+        res = czsc.run_research(df, strat, sdt=sdt, opts=opts)
         out: dict[str, Any] = {"meta": res.meta}
         if output:
             res.holds_df().to_csv(output, index=False)
             out["holds_csv"] = output
-        _io.emit(out, json_out=json_out, human=lambda d: typer.echo(json.dumps(d, ensure_ascii=False, indent=2)))
+        dfp = res.profile_df() if profile else None
+        if dfp is not None:
+            dfp = dfp.sort_values("total_ns", ascending=False, kind="stable")
+            out["signal_profile"] = dfp.to_dict("records")
+
+        def _human(d: dict[str, Any]) -> None:
+            typer.echo(json.dumps({k: v for k, v in d.items() if k != "signal_profile"}, ensure_ascii=False, indent=2))
+            if dfp is not None:
+                typer.echo(dfp.to_string(index=False))
+
+        _io.emit(out, json_out=json_out, human=_human)
 
 
 @app.command("replay")
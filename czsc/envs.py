@@ -1,10 +1,11 @@
 """czsc.envs —— 极简环境变量适配层（spec §3.4）。
 
-迁移到 Rust 后端后仅保留三项运行时参数：
+迁移到 Rust 后端后仅保留以下运行时参数：
 
 - ``CZSC_VERBOSE``     —— 是否打印详细日志（True/False）
 - ``CZSC_MIN_BI_LEN``  —— 笔的最小长度（去包含后的 K 线根数；默认 6）
 - ``CZSC_MAX_BI_NUM``  —— 单个 CZSC 实例保留的最大笔数（默认 50）
+- ``CZSC_FAST_IMPORT`` —— 快速启动模式：``import czsc`` 只加载核心类型与研究入口（默认关闭）
 
 约定：环境变量名同时接受全大写与全小写写法（大写优先），函数参数显式传值时
 优先级最高（覆盖环境变量）。
@@ -47,3 +48,12 @@ def get_max_bi_num(v: int | None = None) -> int:
     """返回单个 CZSC 实例的最大笔数（``CZSC_MAX_BI_NUM``；默认 50）。"""
     raw = v if v is not None else _env("czsc_max_bi_num", 50)
     return int(float(raw))
+
+
+def get_fast_import(v=None) -> bool:
+    """返回是否启用快速启动模式（``CZSC_FAST_IMPORT``；显式参数优先）。
+
+    开启后 ``import czsc`` 只加载 ``czsc._native`` 核心类型、``research`` / ``strategies``
+    与 K 线格式化入口，其余子包与 wbt 等重型依赖在首次访问对应属性时才导入。
+    """
+    return _to_bool(v if v is not None else _env("czsc_fast_import"))
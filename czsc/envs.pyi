@@ -1,3 +1,4 @@
 def get_verbose(verbose: bool | None = ...) -> bool: ...
 def get_min_bi_len(v: int | None = ...) -> int: ...
 def get_max_bi_num(v: int | None = ...) -> int: ...
+def get_fast_import(v: bool | None = ...) -> bool: ...
@@ -13,7 +13,9 @@ Python 端策略研究流程的数据模型定义
 
 from __future__ import annotations
 
+import json
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Any, TypedDict
 
 from czsc._utils._df_convert import arrow_bytes_to_pd_df
@@ -70,6 +72,7 @@ class ResearchResult:
         signals_path  - 信号表对应的本地路径（可选）
         pairs_path    - 成对交易表对应的本地路径（可选）
         holds_path    - 持仓表对应的本地路径（可选）
+        profile_arrow - 逐信号函数剖析表的 Arrow 字节流（``opts={"profile": "signals"}`` 时才有）
     """
 
     meta: dict[str, Any]
@@ -79,9 +82,17 @@ class ResearchResult:
     signals_path: str | None = None
     pairs_path: str | None = None
     holds_path: str | None = None
+    profile_arrow: bytes = b""
 
     def signals_df(self):
-        """将 ``signals_arrow`` 反序列化为 Pandas DataFrame（按需调用，避免无谓开销）"""
+        """将 ``signals_arrow`` 反序列化为 Pandas DataFrame（按需调用，避免无谓开销）
+
+        信号明细已分批落盘（``signals_arrow`` 为空）时从 ``signals_path`` 读取。
+        """
+        if not self.signals_arrow and self.signals_path:
+            import pandas as pd
+
+            return pd.read_parquet(self.signals_path)
         return arrow_bytes_to_pd_df(self.signals_arrow)
 
     def pairs_df(self):
@@ -92,6 +103,16 @@ class ResearchResult:
         """将 ``holds_arrow`` 反序列化为 Pandas DataFrame"""
         return arrow_bytes_to_pd_df(self.holds_arrow)
 
+    def profile_df(self):
+        """将 ``profile_arrow`` 反序列化为 Pandas DataFrame；未开启信号剖析时返回 None
+
+        列：``kind``（kline / freq / czsc / trader）、``name``、``freq``、``params``、
+        ``calls``、``total_ns``、``mean_ns``、``p99_ns``、``max_ns``。
+        """
+        if not self.profile_arrow:
+            return None
+        return arrow_bytes_to_pd_df(self.profile_arrow)
+
 
 @dataclass
 class ReplayResult(ResearchResult):
@@ -111,9 +132,19 @@ class OptimizeResult:
     """
     参数优化运行的元信息容器
 
-    当前仅持有一个 ``message`` 字段，用于承载 Rust 端返回的简要状态描述
-    （成功概要 / 警告 / 错误信息）。后续若需要扩展更结构化的优化指标
-    （如最优参数、得分排序等），可在此追加字段，保持向后兼容。
+    ``message`` 承载 Rust 端返回的简要状态描述（成功概要 / 警告 / 错误信息）；
+    ``task_dir`` 为本次任务的结果目录（无法解析时为 None），:meth:`report`
+    读取其中按截面等权收益降序排列的报表行。
     """
 
     message: str
+    task_dir: str | None = None
+
+    def report(self) -> list[dict[str, Any]]:
+        """读取任务目录下的 ``report.json``；没有报表时返回空列表。"""
+        if self.task_dir is None:
+            return []
+        path = Path(self.task_dir) / "report.json"
+        if not path.exists():
+            return []
+        return json.loads(path.read_text(encoding="utf-8"))
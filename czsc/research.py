@@ -21,6 +21,7 @@ from tempfile import NamedTemporaryFile
 from typing import Any
 
 import pandas as pd
+from loguru import logger
 
 # 直接调用 PyO3 暴露的 Rust 实现（带下划线别名表示"不要在调用方代码中再展开"）
 from czsc._native import (
@@ -41,6 +42,9 @@ from czsc._native import (
 from czsc._native import (
     run_research as _run_research,
 )
+from czsc._native import (
+    run_research_batch as _run_research_batch,
+)
 
 # Rust/Python 运行时适配层：candidate events 归一仍由 Python 处理；
 # signal config 与 Position dump 的归一逻辑已在 PR-2 / PR-4 下沉到 Rust，
@@ -96,6 +100,7 @@ def _to_research_result(payload: dict[str, Any], cls=ResearchResult):
         signals_path=payload.get("signals_path"),
         pairs_path=payload.get("pairs_path"),
         holds_path=payload.get("holds_path"),
+        profile_arrow=bytes(payload.get("profile_arrow", b"")),
     )
 
 
@@ -121,7 +126,10 @@ def run_research(
         sdt:
             可选的起始时间覆盖；不传则使用 strategy 内默认设置。
         opts:
-            可选的执行参数开关，例如 ``{"emit_signals": False}`` 用于禁用信号产物输出。
+            可选的执行参数开关，例如 ``{"emit_signals": False}`` 用于禁用信号产物输出；
+            ``{"profile": "signals"}`` 额外记录每个信号函数 / 周期 / trader 信号的调用次数、
+            总耗时与 p99 耗时，结果见 :meth:`ResearchResult.profile_df`（``"core"`` 只在
+            ``meta["profile"]`` 中给出粗粒度分段耗时）。
 
     返回:
         :class:`ResearchResult`，含元数据与三份 Arrow 字节流（信号 / 成对交易 / 持仓）
@@ -147,6 +155,84 @@ def run_research(
     return _to_research_result(payload, ResearchResult)
 
 
+def _ensure_batch_arrow_bytes(bars: dict[str, pd.DataFrame] | BarsLike) -> bytes:
+    """
+    将多标的 bars 入参统一规范为含 ``symbol`` 列的 Arrow IPC 字节流
+
+    支持的输入:
+        - ``dict[symbol, DataFrame]`` —— 按 key 覆盖 ``symbol`` 列后纵向拼接
+        - 含 ``symbol`` 列的 DataFrame / Arrow 字节 —— 同 :func:`_ensure_arrow_bytes`
+    """
+    if isinstance(bars, dict):
+        if not bars:
+            raise ValueError("bars 不能为空")
+        frames = [df.assign(symbol=symbol) for symbol, df in bars.items()]
+        bars = pd.concat(frames, ignore_index=True)
+    if isinstance(bars, pd.DataFrame) and "symbol" not in bars.columns:
+        raise ValueError("bars 缺少 symbol 列，无法按标的拆分")
+    return _ensure_arrow_bytes(bars)
+
+
+def run_research_batch(
+    bars: dict[str, pd.DataFrame] | BarsLike,
+    strategy: dict[str, Any],
+    *,
+    n_threads: int = 0,
+    sdt: str | None = None,
+    opts: dict[str, Any] | None = None,
+    concat: bool = False,
+    skip_errors: bool = False,
+) -> dict[str, ResearchResult] | ResearchResult:
+    """
+    多标的并行执行同一策略的内存研究
+
+    执行计划只编译一次，各标的在 Rust 线程池中并行执行并完成 Arrow 编码，
+    无需 Python 多进程及其 pickle 开销。单标的语义与 :func:`run_research` 一致。
+
+    参数:
+        bars:
+            ``{symbol: DataFrame}``，或含 ``symbol`` 列的多标的 DataFrame / Arrow 字节
+        strategy:
+            策略 dict，格式同 :func:`run_research`；``symbol`` 可省略，
+            pairs / holds 按各标的自身代码输出
+        n_threads:
+            Rust 端并行线程数；0 表示使用全部 CPU
+        sdt / opts:
+            同 :func:`run_research`
+        concat:
+            False 返回 ``{symbol: ResearchResult}``；True 把全部标的的
+            signals / pairs / holds 纵向拼接为单个 ResearchResult，
+            ``meta["symbols"]`` 为成功执行的标的列表
+        skip_errors:
+            False（默认）时任一标的失败即抛 RuntimeError；True 时跳过失败标的，
+            错误信息记录在日志中
+
+    返回:
+        ``dict[str, ResearchResult]`` 或 :class:`ResearchResult`（``concat=True``）
+    """
+    opts_json = json.dumps(opts, ensure_ascii=False) if opts else None
+    payload = _run_research_batch(
+        _ensure_batch_arrow_bytes(bars),
+        json.dumps(dict(strategy), ensure_ascii=False),
+        sdt,
+        opts_json,
+        n_threads,
+        concat,
+    )
+
+    errors: dict[str, str] = payload["errors"]
+    if errors:
+        if not skip_errors:
+            detail = "; ".join(f"{k}: {v}" for k, v in list(errors.items())[:5])
+            raise RuntimeError(f"run_research_batch 有 {len(errors)} 个标的执行失败: {detail}")
+        for symbol, msg in errors.items():
+            logger.warning(f"run_research_batch 跳过 {symbol}: {msg}")
+
+    if concat:
+        return _to_research_result(payload["result"], ResearchResult)
+    return {symbol: _to_research_result(item, ResearchResult) for symbol, item in payload["results"].items()}
+
+
 def run_replay(
     bars: BarsLike,
     strategy: dict[str, Any],
@@ -168,7 +254,9 @@ def run_replay(
         strategy:  策略 dict，会自动归一化 positions/signals_config
         res_path:  结果落盘根目录；None 表示不落盘
         sdt:       可选起始时间覆盖
-        opts:      可选执行参数开关
+        opts:      可选执行参数开关；``{"signals_flush_bars": 50000}`` 配合 ``res_path``
+                   使用时，信号明细每累积 N 根 bar 写入一次 ``signals.parquet``，
+                   不在内存中整表保留，返回结果的 ``signals_arrow`` 为空
 
     返回:
         :class:`ReplayResult`（结构同 ResearchResult，仅类型语义不同）
@@ -201,12 +289,21 @@ def run_optimize_batch(
 
     参数:
         bars_dir:
-            含多个标的 K 线 parquet 文件的目录（每个标的一份文件）。
-            Rust 端会按 ``optimize_cfg["symbols"]`` 顺序加载对应文件。
+            含多个标的 K 线文件的目录（每个标的一份 ``.parquet`` 或 Arrow IPC
+            ``.arrow`` / ``.feather`` 文件，IPC 文件以内存映射方式读取）。
+            Rust 端按 ``optimize_cfg["symbols"]`` 在 worker 内逐个加载。
         optimize_cfg:
             用户层格式的优化配置 dict。必须包含 ``symbols`` 字段，否则报错。
             若为平仓优化（``optim_type == "exit"``），函数会先把
             ``candidate_events`` 字段转换为 Rust 运行时格式，调用方无需手工归一化。
+            可选 ``bars_mode``：``"lazy"``（默认，按标的读取、跑完即释放，峰值内存
+            只与线程数相关）或 ``"preload"``（开跑前一次性读入全部标的）。
+            可选 ``output_layout``：``"files"``（默认，每个标的、每个候选各写一对
+            parquet）或 ``"partitioned"``（按候选名哈希写入 ``poss/pairs``、
+            ``poss/holds`` 下的少量分区文件，带 ``position`` 列，适合大规模跑批）或
+            ``"aggregate"``（跑批中只累加报表统计量，逐标的摘要写入
+            ``poss/summary.parquet``，仅为报表排名前 ``top_k``（默认 10）的候选
+            补写逐 bar 明细）。
         res_path:
             优化结果输出根目录，Rust 端会在其中创建子目录写入参数组合产物。
         n_threads:
@@ -214,7 +311,8 @@ def run_optimize_batch(
             可适当调大以加速。
 
     返回:
-        :class:`OptimizeResult`，仅含一段简短的运行状态消息（成功/警告/错误概要）
+        :class:`OptimizeResult`：运行状态消息（成功/警告/错误概要）与任务目录，
+        ``result.report()`` 读取该任务的报表行
 
     异常:
         TypeError:  optimize_cfg 不是 dict
@@ -236,7 +334,16 @@ def run_optimize_batch(
         str(res_path),
         n_threads,
     )
-    return OptimizeResult(message=msg)
+    return OptimizeResult(message=msg, task_dir=_parse_task_dir(msg))
+
+
+def _parse_task_dir(msg: str) -> str | None:
+    """从 Rust 端返回的 ``跑批完成: task_dir=..., report=...`` 中取出任务目录。"""
+    prefix = "跑批完成: task_dir="
+    if not msg.startswith(prefix):
+        return None
+    task_dir, sep, _ = msg[len(prefix) :].rpartition(", report=")
+    return task_dir if sep else None
 
 
 def build_open_optim_positions(
@@ -308,4 +415,4 @@ def run_optimize_batch_legacy(
         json.dump(optimize_cfg, f, ensure_ascii=False)
         config_path = f.name
     msg = run_optimize(str(bars_dir), config_path, str(res_path), n_threads)
-    return OptimizeResult(message=msg)
+    return OptimizeResult(message=msg, task_dir=_parse_task_dir(msg))
@@ -65,6 +65,7 @@ from .optimize import (
     CzscOpenOptimStrategy,
     ExitsOptimize,
     OpensOptimize,
+    run_successive_halving,
 )
 
 # 交易/重采样相关工具
@@ -100,6 +101,7 @@ __all__ = [
     "ExitsOptimize",
     "CzscOpenOptimStrategy",
     "CzscExitOptimStrategy",
+    "run_successive_halving",
     # io
     "dill_dump",
     "dill_load",
@@ -56,6 +56,9 @@ from .optimize import (
 from .optimize import (
     OpensOptimize as OpensOptimize,
 )
+from .optimize import (
+    run_successive_halving as run_successive_halving,
+)
 from .trade import (
     resample_to_daily as resample_to_daily,
 )
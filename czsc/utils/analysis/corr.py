@@ -16,27 +16,80 @@ References:
 import numpy as np
 import pandas as pd
 
+# 原生内核输入中分组键列的列名，避免与用户列重名
+_KEY_COL = "__czsc_ic_key__"
+
+
+def _native_ic(df, dt_col, x_cols, y_col, method) -> pd.DataFrame:
+    """原生分组内核：按 dt 排序编码后一次性计算所有截面、所有 x 列的 IC
+
+    :return: DataFrame，列为 ``[dt_col, *x_cols]``，每个截面一行，无法计算时为 NaN
+    """
+    from czsc._native import cross_sectional_ic_arrow
+    from czsc._utils._df_convert import arrow_bytes_to_pd_df, pandas_to_arrow_bytes
+
+    # factorize(sort=True) 的编码与 groupby(dt_col) 的分组顺序一致；dt 为空的行（编码 -1）丢弃
+    codes, uniques = pd.factorize(df[dt_col], sort=True)
+    valid = codes >= 0
+    order = np.argsort(codes[valid], kind="stable")
+    data = {_KEY_COL: codes[valid][order]}
+    for col in [*x_cols, y_col]:
+        data[col] = df[col].to_numpy(dtype=np.float64, na_value=np.nan)[valid][order]
+
+    data_bytes = pandas_to_arrow_bytes(pd.DataFrame(data))
+    out = arrow_bytes_to_pd_df(cross_sectional_ic_arrow(data_bytes, _KEY_COL, list(x_cols), y_col, method))
+    out.insert(0, dt_col, uniques.take(out.pop(_KEY_COL).to_numpy()))
+    return out
+
 
 def cross_sectional_ic(df, x_col="open", y_col="n1b", method="spearman", **kwargs):
     """分析 df 中 x_col 和 y_col 列的截面相关性（IC）
 
+    pearson / spearman 由原生分组内核（czsc._native，rayon 并行）一次算完所有截面；
+    kendall 与自定义 callable 仍按 dt 分组逐截面调用 ``Series.corr``。
+
     :param df：数据，DateFrame格式
-    :param x_col：X列
+    :param x_col：X列；传入列名列表时一次计算多个因子列的 IC
     :param y_col：Y列，一般采用下期收益，也就是 n1b
     :param method：{'pearson', 'kendall', 'spearman'} or callable
             * pearson : standard correlation coefficient
             * kendall : Kendall Tau correlation coefficient
             * spearman : Spearman rank correlation
             * callable: callable with input two 1d ndarrays and returning a float
-    :return：df，res: 前者是每日相关系数结果，后者是每日相关系数的统计结果
-    """
-    from tqdm import tqdm
+    :param kwargs:
 
+        - dt_col: str, 截面时间列，默认 dt
+
+    :return：df，res: 前者是每日相关系数结果，后者是每日相关系数的统计结果；
+        x_col 为列表时，前者为 ``[dt_col, *x_col]`` 宽表，后者为 ``{x: 统计结果}``
+    """
     dt_col = kwargs.pop("dt_col", "dt")
-    tqdm.pandas(desc="cross_section_ic")
-    s = df.groupby(dt_col).progress_apply(lambda row: row[x_col].corr(row[y_col], method=method))
-    df = pd.DataFrame(s, columns=["ic"]).reset_index(inplace=False)
+    x_cols = [x_col] if isinstance(x_col, str) else list(x_col)
+
+    if df.empty:
+        dfi = pd.DataFrame(columns=[dt_col, *x_cols])
+    elif isinstance(method, str) and method in ("pearson", "spearman"):
+        dfi = _native_ic(df, dt_col, x_cols, y_col, method)
+    else:
+        from tqdm import tqdm
+
+        tqdm.pandas(desc="cross_section_ic")
+        groups = df.groupby(dt_col)
+        dfi = pd.DataFrame(
+            {x: groups.progress_apply(lambda row, x=x: row[x].corr(row[y_col], method=method)) for x in x_cols}
+        ).reset_index(inplace=False)
+
+    if isinstance(x_col, str):
+        return _ic_stats(dfi.rename(columns={x_col: "ic"}), x_col, y_col, method, dt_col)
+
+    stats = {}
+    for x in x_cols:
+        _, stats[x] = _ic_stats(dfi[[dt_col, x]].rename(columns={x: "ic"}), x, y_col, method, dt_col)
+    return dfi, stats
+
 
+def _ic_stats(df, x_col, y_col, method, dt_col="dt"):
+    """单个因子列的 IC 序列统计；df 包含 dt_col 与 ic 两列"""
     res = {
         "x_col": x_col,
         "y_col": y_col,
@@ -91,12 +144,12 @@ def cross_sectional_ic(df, x_col="open", y_col="n1b", method="spearman", **kwarg
             res["累计IC回归R2"] = round(r2, 4)
             res["累计IC回归斜率"] = round(slope, 4)
 
-    monthly_ic = df.groupby(df["dt"].dt.strftime("%Y年%m月"))["ic"].mean().to_dict()
+    monthly_ic = df.groupby(df[dt_col].dt.strftime("%Y年%m月"))["ic"].mean().to_dict()
     monthly_win_rate = len([1 for x in monthly_ic.values() if np.sign(x) == np.sign(res["IC均值"])]) / len(monthly_ic)
     res["月胜率"] = round(monthly_win_rate, 4)
     res["月均值"] = round(np.mean(list(monthly_ic.values())), 4)
 
-    yearly_ic = df.groupby(df["dt"].dt.strftime("%Y年"))["ic"].mean().to_dict()
+    yearly_ic = df.groupby(df[dt_col].dt.strftime("%Y年"))["ic"].mean().to_dict()
     yearly_win_rate = len([1 for x in yearly_ic.values() if np.sign(x) == np.sign(res["IC均值"])]) / len(yearly_ic)
     res["年胜率"] = round(yearly_win_rate, 4)
     res["年均值"] = round(np.mean(list(yearly_ic.values())), 4)
@@ -1 +1 @@
-def cross_sectional_ic(df, x_col: str = "open", y_col: str = "n1b", method: str = "spearman", **kwargs): ...
+def cross_sectional_ic(df, x_col: str | list[str] = "open", y_col: str = "n1b", method: str = "spearman", **kwargs): ...
@@ -4,11 +4,14 @@ email: zeng_bin8888@163.com
 create_dt: 2021/7/16 11:51
 """
 
+import functools
 import hashlib
 import inspect
 import json
 import os
 import shutil
+import sqlite3
+import threading
 import time
 from pathlib import Path
 from typing import Any, AnyStr
@@ -44,53 +47,142 @@ def empty_cache_path():
     print(f"已清空缓存文件夹：{home_path}")
 
 
+def _env_max_bytes() -> int | None:
+    """读取环境变量 CZSC_DISK_CACHE_MAX_BYTES 作为 DiskCache 的默认容量上限，未设置时不限"""
+    value = os.environ.get("CZSC_DISK_CACHE_MAX_BYTES")
+    return int(value) if value else None
+
+
 class DiskCache:
-    def __init__(self, path=None):
+    """磁盘缓存，每个 key 一个文件
+
+    目录下维护一个 sqlite 索引（``.czsc_cache_index.sqlite``），记录每个缓存文件的
+    大小、写入时间、最近访问时间与 TTL：
+
+    - 命中判断查索引，只对已登记的文件做一次 stat，确认未被外部删除；
+    - 写入先落临时文件再原子替换，读方不会看到写了一半的文件；
+    - 设置 ``max_bytes`` 后，每次写入按最近访问时间淘汰（LRU），使目录总大小不超过上限。
+
+    索引建立前已存在的缓存文件在首次访问时自动登记；在索引之外被删除的文件
+    （手动删除、``clear_expired_cache`` 等）在命中判断、统计大小与淘汰时从索引中移除。
+    """
+
+    INDEX_NAME = ".czsc_cache_index.sqlite"
+
+    def __init__(self, path=None, max_bytes: int | None = None):
+        """
+        :param path: 缓存目录，默认为 home_path/disk_cache
+        :param max_bytes: 缓存目录容量上限，单位：Bytes；默认读取环境变量 CZSC_DISK_CACHE_MAX_BYTES，未设置时不限
+        """
         self.path = home_path / "disk_cache" if path is None else Path(path)
         if self.path.is_file():
             raise Exception("path must be a directory, not a file")
 
         self.path.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = _env_max_bytes() if max_bytes is None else int(max_bytes)
+        self._lock = threading.Lock()
+        self._conn = None
+        self._conn_pid = None
 
     def __str__(self) -> str:
         return "DiskCache: " + str(self.path)
 
+    def __getstate__(self) -> dict:
+        # 锁与 sqlite 连接不可 pickle，反序列化后重新创建
+        state = self.__dict__.copy()
+        for key in ("_lock", "_conn", "_conn_pid"):
+            state.pop(key, None)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self._conn = None
+        self._conn_pid = None
+
+    def _db(self) -> sqlite3.Connection:
+        """索引连接；按进程懒加载，fork 出的子进程或缓存目录被整体清空后会重新打开"""
+        file_index = self.path / self.INDEX_NAME
+        if self._conn is None or self._conn_pid != os.getpid() or not file_index.exists():
+            if self._conn is not None and self._conn_pid == os.getpid():
+                self._conn.close()
+            self.path.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(file_index, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "name TEXT PRIMARY KEY, size INTEGER NOT NULL, ctime REAL NOT NULL, "
+                "atime REAL NOT NULL, ttl REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_atime ON entries (atime)")
+            conn.commit()
+            self._conn, self._conn_pid = conn, os.getpid()
+        return self._conn
+
+    def _register(self, name: str, ttl: float = -1) -> tuple | None:
+        """把目录中已存在但未登记的缓存文件写入索引，文件不存在时返回 None"""
+        file = self.path / name
+        try:
+            st = file.stat()
+        except FileNotFoundError:
+            return None
+        row = (name, st.st_size, st.st_mtime, time.time(), ttl)
+        self._db().execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)", row)
+        return row
+
+    def _drop(self, name: str) -> None:
+        self._db().execute("DELETE FROM entries WHERE name = ?", (name,))
+        (self.path / name).unlink(missing_ok=True)
+
+    def _prune_missing(self) -> None:
+        """移除索引中文件已不存在的条目"""
+        db = self._db()
+        names = [name for (name,) in db.execute("SELECT name FROM entries").fetchall()]
+        missing = [(name,) for name in names if not (self.path / name).exists()]
+        if missing:
+            db.executemany("DELETE FROM entries WHERE name = ?", missing)
+            db.commit()
+
     def is_found(self, k: str, suffix: str = "pkl", ttl=-1) -> bool:
         """判断缓存文件是否存在
 
         :param k: 缓存文件名
         :param suffix: 缓存文件后缀，支持 pkl, json, txt, csv, xlsx, feather, parquet
-        :param ttl: 缓存文件有效期，单位：秒，-1 表示永久有效
+        :param ttl: 缓存文件有效期，单位：秒，-1 表示使用写入时设置的有效期（默认永久有效）
         :return: bool
         """
-        file = self.path / f"{k}.{suffix}"
-        if not file.exists():
-            _get_logger().info(f"缓存文件不存在, {file}")
-            return False
-
-        if ttl > 0:
-            create_time = file.stat().st_mtime
-            if (time.time() - create_time) > ttl:
-                _get_logger().info(f"缓存文件已过期, {file}")
-                os.remove(file)
+        name = f"{k}.{suffix}"
+        with self._lock:
+            db = self._db()
+            row = db.execute("SELECT * FROM entries WHERE name = ?", (name,)).fetchone()
+            if row is None:
+                row = self._register(name)
+                db.commit()
+                if row is None:
+                    return False
+            elif not (self.path / name).exists():
+                # 文件在索引之外被删除
+                db.execute("DELETE FROM entries WHERE name = ?", (name,))
+                db.commit()
                 return False
 
-        _get_logger().info(f"缓存文件已找到, {file}")
-        return True
-
-    def get(self, k: str, suffix: str = "pkl") -> Any:
-        """读取缓存文件
+            _, _, ctime, atime, ttl0 = row
+            ttl = ttl if ttl > 0 else ttl0
+            now = time.time()
+            if ttl > 0 and now - ctime > ttl:
+                _get_logger().info(f"缓存文件已过期, {self.path / name}")
+                self._drop(name)
+                db.commit()
+                return False
 
-        :param k: 缓存文件名
-        :param suffix: 缓存文件后缀，支持 pkl, json, txt, csv, xlsx, feather, parquet
-        :return: 缓存文件内容
-        """
-        file = self.path / f"{k}.{suffix}"
-        _get_logger().info(f"正在读取缓存记录，地址：{file}")
-        if not file.exists():
-            _get_logger().warning(f"文件不存在, {file}")
-            return None
+            # LRU 只需秒级精度，1 秒内的重复命中不再写索引
+            if now - atime > 1:
+                db.execute("UPDATE entries SET atime = ? WHERE name = ?", (now, name))
+                db.commit()
+        return True
 
+    def _load(self, file: Path, suffix: str) -> Any:
         if suffix == "pkl":
             import dill
 
@@ -113,17 +205,24 @@ class DiskCache:
             raise ValueError(f"suffix {suffix} not supported")
         return res
 
-    def set(self, k: str, v: Any, suffix: str = "pkl"):
-        """写入缓存文件
+    def get(self, k: str, suffix: str = "pkl") -> Any:
+        """读取缓存文件
 
         :param k: 缓存文件名
-        :param v: 缓存文件内容
         :param suffix: 缓存文件后缀，支持 pkl, json, txt, csv, xlsx, feather, parquet
+        :return: 缓存文件内容
         """
         file = self.path / f"{k}.{suffix}"
-        if file.exists():
-            _get_logger().info(f"缓存文件 {file} 将被覆盖")
+        try:
+            return self._load(file, suffix)
+        except FileNotFoundError:
+            _get_logger().warning(f"文件不存在, {file}")
+            with self._lock:
+                self._db().execute("DELETE FROM entries WHERE name = ?", (file.name,))
+                self._db().commit()
+            return None
 
+    def _dump(self, file: Path, v: Any, suffix: str) -> None:
         if suffix == "pkl":
             import dill
 
@@ -131,80 +230,156 @@ class DiskCache:
                 dill.dump(v, _f)
 
         elif suffix == "json":
-            if not isinstance(v, dict):
-                raise ValueError("suffix json only support dict")
             with open(file, "w", encoding="utf-8") as _f:
                 json.dump(v, _f, ensure_ascii=False, indent=4)
 
         elif suffix == "txt":
-            if not isinstance(v, str):
-                raise ValueError("suffix txt only support str")
             file.write_text(v, encoding="utf-8")
 
         elif suffix == "csv":
-            if not isinstance(v, pd.DataFrame):
-                raise ValueError("suffix csv only support pd.DataFrame")
             v.to_csv(file, index=False, encoding="utf-8")
 
         elif suffix == "xlsx":
-            if not isinstance(v, pd.DataFrame):
-                raise ValueError("suffix xlsx only support pd.DataFrame")
             v.to_excel(file, index=False)
 
         elif suffix == "feather":
-            if not isinstance(v, pd.DataFrame):
-                raise ValueError("suffix feather only support pd.DataFrame")
             v.to_feather(file)
 
         elif suffix == "parquet":
-            if not isinstance(v, pd.DataFrame):
-                raise ValueError("suffix parquet only support pd.DataFrame")
             v.to_parquet(file)
 
-        else:
+    def set(self, k: str, v: Any, suffix: str = "pkl", ttl=-1):
+        """写入缓存文件
+
+        :param k: 缓存文件名
+        :param v: 缓存文件内容
+        :param suffix: 缓存文件后缀，支持 pkl, json, txt, csv, xlsx, feather, parquet
+        :param ttl: 缓存文件有效期，单位：秒，-1 表示永久有效
+        """
+        if suffix not in _SUFFIX_TYPES:
             raise ValueError(f"suffix {suffix} not supported")
+        expected = _SUFFIX_TYPES[suffix]
+        if expected is not None and not isinstance(v, expected[0]):
+            raise ValueError(f"suffix {suffix} only support {expected[1]}")
 
-        _get_logger().info(f"已写入缓存文件：{file}")
+        file = self.path / f"{k}.{suffix}"
+        # 临时文件保留原后缀，to_excel 等按扩展名选择写入引擎
+        file_tmp = self.path / f".{k}.{os.getpid()}.{threading.get_ident()}.tmp.{suffix}"
+        try:
+            self._dump(file_tmp, v, suffix)
+            os.replace(file_tmp, file)
+        finally:
+            file_tmp.unlink(missing_ok=True)
+
+        with self._lock:
+            self._register(file.name, ttl)
+            self._db().commit()
+            if self.max_bytes is not None:
+                self._evict(self.max_bytes, keep=file.name)
+        _get_logger().debug(f"已写入缓存文件：{file}")
 
     def remove(self, k: str, suffix: str = "pkl"):
         file = self.path / f"{k}.{suffix}"
         _get_logger().info(f"准备删除缓存文件：{file}")
-        Path.unlink(file) if Path.exists(file) else None
+        with self._lock:
+            self._drop(file.name)
+            self._db().commit()
 
+    def size(self) -> int:
+        """索引中登记的缓存文件总大小，单位：Bytes"""
+        with self._lock:
+            self._prune_missing()
+            return self._db().execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
 
-def disk_cache(path: AnyStr | Path = home_path, suffix: str = "pkl", ttl: int = -1):
+    def evict(self, max_bytes: int | None = None) -> int:
+        """清理过期缓存，并按最近访问时间淘汰至总大小不超过 max_bytes
+
+        :param max_bytes: 容量上限，默认使用实例的 max_bytes；均为 None 时只清理过期缓存
+        :return: 释放的字节数
+        """
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        with self._lock:
+            return self._evict(max_bytes)
+
+    def _evict(self, max_bytes: int | None, keep: str | None = None) -> int:
+        db = self._db()
+        now = time.time()
+        freed = 0
+        expired = db.execute("SELECT name, size FROM entries WHERE ttl > 0 AND ctime + ttl < ?", (now,)).fetchall()
+        for name, size in expired:
+            self._drop(name)
+            freed += size
+
+        if max_bytes is not None:
+            total = db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            if total > max_bytes:
+                # 超限时才核对文件是否仍在，避免为已被外部删除的条目淘汰有效缓存
+                self._prune_missing()
+                total = db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            if total > max_bytes:
+                for name, size in db.execute("SELECT name, size FROM entries ORDER BY atime").fetchall():
+                    if total <= max_bytes:
+                        break
+                    if name == keep:
+                        continue
+                    self._drop(name)
+                    total -= size
+                    freed += size
+        db.commit()
+        if freed:
+            _get_logger().info(f"{self} 淘汰缓存 {freed / 1024 / 1024:.2f} MB")
+        return freed
+
+
+_SUFFIX_TYPES: dict[str, tuple[type, str] | None] = {
+    "pkl": None,
+    "json": (dict, "dict"),
+    "txt": (str, "str"),
+    "csv": (pd.DataFrame, "pd.DataFrame"),
+    "xlsx": (pd.DataFrame, "pd.DataFrame"),
+    "feather": (pd.DataFrame, "pd.DataFrame"),
+    "parquet": (pd.DataFrame, "pd.DataFrame"),
+}
+
+
+def disk_cache(path: AnyStr | Path = home_path, suffix: str = "pkl", ttl: int = -1, max_bytes: int | None = None):
     """缓存装饰器，支持多种数据格式
 
     :param path: 缓存文件夹父路径，默认为 home_path，每个函数的缓存文件夹为 path/func_name
     :param suffix: 缓存文件后缀，支持 pkl, json, txt, csv, xlsx, feather, parquet
     :param ttl: 缓存文件有效期，单位：秒
+    :param max_bytes: 该函数缓存文件夹的容量上限，单位：Bytes，超出后按 LRU 淘汰
     """
 
     def decorator(func):
-        _c = DiskCache(path=Path(path) / func.__name__)
+        _c = DiskCache(path=Path(path) / func.__name__, max_bytes=max_bytes)
+
+        # 函数源码只在装饰时读取一次；缓存 key 仍为 md5(源码 + 调用参数)，与旧版缓存文件兼容
+        try:
+            code_str = inspect.getsource(func)
+        except OSError:
+            code_str = func.__name__
+        code_md5 = hashlib.md5(code_str.encode("utf-8"))
 
+        @functools.wraps(func)
         def cached_func(*args, **kwargs):
             # 如果函数有 ttl 参数，则使用函数的 ttl 参数
             ttl1 = kwargs.pop("ttl", ttl)
 
             hash_str = f"{func.__name__}{args}{kwargs}"
-
-            try:
-                code_str = inspect.getsource(func)
-            except OSError:
-                code_str = func.__name__
-
-            k = hashlib.md5((code_str + hash_str).encode("utf-8")).hexdigest().upper()[:8]
-            k = f"{k}_{func.__name__}"
+            h = code_md5.copy()
+            h.update(hash_str.encode("utf-8"))
+            k = f"{h.hexdigest().upper()[:8]}_{func.__name__}"
 
             if _c.is_found(k, suffix=suffix, ttl=ttl1):
-                output = _c.get(k, suffix=suffix)
-                return output
+                try:
+                    return _c._load(_c.path / f"{k}.{suffix}", suffix)
+                except FileNotFoundError:
+                    pass
 
-            else:
-                output = func(*args, **kwargs)
-                _c.set(k, output, suffix=suffix)
-                return output
+            output = func(*args, **kwargs)
+            _c.set(k, output, suffix=suffix, ttl=ttl1)
+            return output
 
         return cached_func
 
@@ -219,13 +394,25 @@ def clear_expired_cache(path, max_age: int = 3600 * 24 * 30):
     """
     _get_logger().info(f"开始清理缓存文件夹：{path}, max_age={max_age} 秒")
     path = Path(path)
+    removed = []
     for file in path.glob("*.pkl"):
         # 使用修改时间而不是创建时间，因为在Windows上创建时间不能轻易修改
         file_stat = file.stat()
         if (time.time() - file_stat.st_mtime) > max_age:
             file.unlink()
+            removed.append((file.name,))
             _get_logger().info(f"已删除过期缓存文件：{file}, 修改时间：{file_stat.st_mtime}，当前时间：{time.time()}")
 
+    # 同步 DiskCache 索引，避免 is_found 命中已删除的文件
+    file_index = path / DiskCache.INDEX_NAME
+    if removed and file_index.exists():
+        conn = sqlite3.connect(file_index, timeout=30)
+        try:
+            conn.executemany("DELETE FROM entries WHERE name = ?", removed)
+            conn.commit()
+        finally:
+            conn.close()
+
 
 def clear_cache(path: AnyStr | Path = home_path, subs=None, recreate=False):
     """清空缓存文件夹
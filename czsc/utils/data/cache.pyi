@@ -9,13 +9,17 @@ def get_dir_size(path): ...
 def empty_cache_path() -> None: ...
 
 class DiskCache:
+    INDEX_NAME: str
     path: Incomplete
-    def __init__(self, path=None) -> None: ...
+    max_bytes: int | None
+    def __init__(self, path=None, max_bytes: int | None = None) -> None: ...
     def is_found(self, k: str, suffix: str = "pkl", ttl: int = -1) -> bool: ...
     def get(self, k: str, suffix: str = "pkl") -> Any: ...
-    def set(self, k: str, v: Any, suffix: str = "pkl"): ...
+    def set(self, k: str, v: Any, suffix: str = "pkl", ttl: int = -1): ...
     def remove(self, k: str, suffix: str = "pkl"): ...
+    def size(self) -> int: ...
+    def evict(self, max_bytes: int | None = None) -> int: ...
 
-def disk_cache(path: AnyStr | Path = ..., suffix: str = "pkl", ttl: int = -1): ...
+def disk_cache(path: AnyStr | Path = ..., suffix: str = "pkl", ttl: int = -1, max_bytes: int | None = None): ...
 def clear_expired_cache(path, max_age: int = ...): ...
 def clear_cache(path: AnyStr | Path = ..., subs=None, recreate: bool = False): ...
@@ -3,11 +3,13 @@ import os
 import shutil
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache, partial
 from pathlib import Path
 from typing import Any
 
 import pandas as pd
+import pyarrow as pa
 
 
 def set_url_token(token, url, **kwargs):
@@ -49,10 +51,16 @@ class DataClient:
     """
     数据接口客户端，支持本地缓存，兼容Tushare数据接口。
     支持多线程/多进程安全，详细日志，异常处理。
+
+    - 复用连接池（``requests.Session``），避免每次请求重新建立 TCP 连接；
+    - 缓存按 key 加锁，不同参数的请求读写缓存互不阻塞；
+    - 缓存文件为 parquet，读取时内存映射；兼容读取旧版 ``.pkl`` 缓存。
     """
 
-    __version__ = "V250719"
-    _cache_lock = threading.Lock()  # 进程内线程锁，防止并发冲突
+    __version__ = "V261017"
+    _cache_lock = threading.Lock()  # 清空整个缓存目录时持有
+    # 按缓存 key 哈希分条的固定锁池：锁的数量不随请求种类增长，长时间运行也不会泄漏
+    _key_locks: tuple[threading.Lock, ...] = tuple(threading.Lock() for _ in range(64))
 
     @staticmethod
     @lru_cache(maxsize=128)
@@ -74,7 +82,9 @@ class DataClient:
         :param url: str, API接口地址
         :param timeout: int, 请求超时时间
         :param verbose: bool, 是否开启详细日志模式，显示请求细节
-        :param kwargs: 其他参数（clear_cache, cache_path, logger）
+        :param kwargs: 其他参数（clear_cache, cache_path, logger, pool_maxsize）
+
+            - pool_maxsize: int, 连接池大小，默认 16；并发请求数超过该值时多余的连接用完即关闭
         """
         import loguru
 
@@ -90,6 +100,7 @@ class DataClient:
         self.cache_path = Path(kwargs.get("cache_path", os.path.expanduser("~/.quant_data_cache")))
         self.cache_path.mkdir(exist_ok=True, parents=True)
         self.verbose = verbose
+        self.__session = self._create_session(int(kwargs.get("pool_maxsize", 16)))
         if self.verbose:
             self.logger.info(
                 f"数据URL: {url} 数据缓存路径：{self.cache_path} 占用磁盘空间：{get_dir_size(self.cache_path) / 1024 / 1024:.2f} MB"
@@ -97,25 +108,69 @@ class DataClient:
         if kwargs.get("clear_cache", False):
             self.clear_cache()
 
+    @staticmethod
+    def _create_session(pool_maxsize: int):
+        """创建带连接池的 HTTP 会话，客户端生命周期内复用"""
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    @classmethod
+    def _lock_for(cls, file_cache: Path) -> threading.Lock:
+        """获取单个缓存文件的锁；同一缓存 key 的读写串行，不同 key 大概率落在不同的锁上"""
+        return cls._key_locks[hash(str(file_cache)) % len(cls._key_locks)]
+
+    @staticmethod
+    def _find_cache(file_cache: Path) -> Path | None:
+        """定位缓存文件：优先 parquet，其次旧版 pickle"""
+        if file_cache.exists():
+            return file_cache
+        file_pkl = file_cache.with_suffix(".pkl")
+        if file_pkl.exists():
+            return file_pkl
+        return None
+
     def _get_cache(self, file_cache: Path, api_name: str, kwargs: dict[str, Any], logger) -> pd.DataFrame | None:
         """读取缓存"""
-        if file_cache.exists():
-            with self._cache_lock:
-                try:
+        with self._lock_for(file_cache):
+            try:
+                if file_cache.suffix == ".pkl":
                     df = pd.read_pickle(file_cache)
-                    if self.verbose:
-                        logger.info(f"缓存命中 | API：{api_name}；参数：{kwargs}；数据量：{df.shape}")
-                    return df
-                except Exception as e:
-                    logger.warning(f"读取缓存文件失败: {file_cache}, 错误: {e}")
+                else:
+                    df = pd.read_parquet(file_cache, memory_map=True)
+                if self.verbose:
+                    logger.info(f"缓存命中 | API：{api_name}；参数：{kwargs}；数据量：{df.shape}")
+                return df
+            except Exception as e:
+                logger.warning(f"读取缓存文件失败: {file_cache}, 错误: {e}")
         return None
 
     def _set_cache(self, file_cache: Path, df: pd.DataFrame, logger) -> None:
-        """写入缓存"""
-        with self._cache_lock:
+        """写入缓存：先写临时文件再原子替换，读方不会看到写了一半的文件
+
+        parquet 按 pandas 默认方式保存索引（非 RangeIndex 写为列，读取时还原）；
+        混合类型等 Arrow 无法表示的列退回 pickle 格式缓存。
+        """
+        file_tmp = file_cache.with_name(f"{file_cache.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        file_pkl = file_cache.with_suffix(".pkl")
+        with self._lock_for(file_cache):
             try:
-                df.to_pickle(file_cache)
+                try:
+                    df.to_parquet(file_tmp)
+                    os.replace(file_tmp, file_cache)
+                    file_pkl.unlink(missing_ok=True)
+                except (ValueError, TypeError, ImportError, pa.ArrowException) as e:
+                    logger.debug(f"parquet 缓存写入失败，改用 pickle: {file_cache}, 错误: {e}")
+                    df.to_pickle(file_tmp)
+                    os.replace(file_tmp, file_pkl)
+                    file_cache.unlink(missing_ok=True)
             except Exception as e:
+                file_tmp.unlink(missing_ok=True)
                 logger.warning(f"写入缓存文件失败: {file_cache}, 错误: {e}")
 
     def _request_api(
@@ -126,7 +181,7 @@ class DataClient:
 
         for attempt in range(retries):
             try:
-                res = requests.post(self.__http_url, json=req_params, timeout=self.__timeout)
+                res = self.__session.post(self.__http_url, json=req_params, timeout=self.__timeout)
                 if res.status_code == 200:
                     return res
                 else:
@@ -222,9 +277,9 @@ class DataClient:
         """
         path = self.cache_path / f"{self.__url_hash}_{api_name}"
         if path.exists() and expiration > 0:
-            with self._cache_lock:
-                for file in path.glob("*"):
-                    if time.time() - file.stat().st_mtime > expiration:
+            for file in path.glob("*"):
+                if time.time() - file.stat().st_mtime > expiration:
+                    with self._lock_for(file):
                         try:
                             file.unlink()
                             if self.verbose:
@@ -253,11 +308,12 @@ class DataClient:
         path = self.cache_path / f"{self.__url_hash}_{api_name}"
         path.mkdir(exist_ok=True, parents=True)
         cache_key = self._get_cache_key(str(req_params))
-        file_cache = path / f"{cache_key}.pkl"
+        file_cache = path / f"{cache_key}.parquet"
 
         # 读取缓存
-        if file_cache.exists() and (ttl == -1 or time.time() - file_cache.stat().st_mtime < ttl):
-            df = self._get_cache(file_cache, api_name, kwargs, logger)
+        file_hit = self._find_cache(file_cache)
+        if file_hit is not None and (ttl == -1 or time.time() - file_hit.stat().st_mtime < ttl):
+            df = self._get_cache(file_hit, api_name, kwargs, logger)
             if df is not None:
                 return df
 
@@ -285,6 +341,31 @@ class DataClient:
             )
         return df
 
+    def post_requests_many(
+        self, api_name: str, params_list: list[dict[str, Any]], fields: str = "", max_workers: int = 8
+    ) -> list[pd.DataFrame]:
+        """
+        并发执行同一 API 的多组参数查询，结果顺序与 ``params_list`` 一致。
+
+        各组参数独立走缓存；并发度受 ``max_workers`` 限制，避免压垮数据接口。
+
+        :param api_name: str, API 名称
+        :param params_list: list[dict], 每组查询参数，等价于 ``post_request(api_name, fields, **params)``
+        :param fields: str, 返回字段
+        :param max_workers: int, 最大并发请求数
+        :return: list[pd.DataFrame]
+        """
+        if max_workers < 1:
+            raise ValueError(f"max_workers 必须为正整数，当前为 {max_workers}")
+        if not params_list:
+            return []
+
+        def _fetch(params: dict[str, Any]) -> pd.DataFrame:
+            return self.post_request(api_name, fields, **params)
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(params_list))) as pool:
+            return list(pool.map(_fetch, params_list))
+
     def __getattr__(self, name):
         """
         动态API方法调用，等价于 self.post_request(name, ...)
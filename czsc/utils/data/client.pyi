@@ -1,3 +1,5 @@
+from typing import Any
+
 import pandas as pd
 from _typeshed import Incomplete
 
@@ -20,4 +22,7 @@ class DataClient:
     def clear_cache(self, **kwargs) -> None: ...
     def clear_api_cache(self, api_name: str, expiration: int = -1) -> None: ...
     def post_request(self, api_name: str, fields: str = "", **kwargs) -> pd.DataFrame: ...
+    def post_requests_many(
+        self, api_name: str, params_list: list[dict[str, Any]], fields: str = "", max_workers: int = 8
+    ) -> list[pd.DataFrame]: ...
     def __getattr__(self, name): ...
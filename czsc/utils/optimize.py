@@ -11,7 +11,7 @@ Python 侧的主要职责：
 1. **配置归一化**：将候选信号、候选事件等多种灵活输入形式归一到 Rust 侧
    接受的稳定结构。
 2. **物化数据**：将原始 K 线和持仓配置序列化到磁盘 parquet/JSON 文件，
-   作为 Rust 引擎读取的数据源。
+   作为 Rust 引擎读取的数据源；K 线按内容哈希缓存，多个任务共用一份。
 3. **任务命名/哈希**：基于候选输入与品种集合生成唯一任务哈希，便于结果
    目录隔离与任务复用。
 4. **结果转发**：保留 Rust 引擎的执行结果对象，并在实例上记录 ``message``
@@ -24,9 +24,17 @@ Python 侧的主要职责：
 
 from __future__ import annotations
 
+import datetime
+import functools
 import hashlib
+import inspect
 import json
+import math
+import os
+import threading
+import types
 from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
@@ -40,7 +48,8 @@ from czsc._runtime_adapters import (
     normalize_candidate_event,
     normalize_candidate_events,
 )
-from czsc.research import run_optimize_batch
+from czsc.models import OptimizeResult
+from czsc.research import build_exit_optim_positions, build_open_optim_positions, run_optimize_batch
 from czsc.strategies import CzscStrategyBase
 
 
@@ -147,6 +156,153 @@ def _read_bars(read_bars: Callable, symbol: str, base_freq: str, bar_sdt: str, b
         return read_bars(symbol, base_freq, bar_sdt, bar_edt)
 
 
+# 可直接用 repr 作稳定标识的捕获值类型
+_STATE_SCALARS = (str, bytes, int, float, bool, type(None), Path, datetime.date, datetime.time, datetime.timedelta)
+# 递归展开捕获状态的最大深度；超过即视为无法识别
+_STATE_MAX_DEPTH = 8
+
+
+def _code_digest(code: types.CodeType) -> str:
+    """字节码摘要：字节码 + 引用的全局名 + 常量，嵌套函数的代码对象递归展开。
+
+    ``repr(code)`` 含内存地址，直接拼进常量会让摘要跨进程漂移，因此单独处理。
+    """
+    consts = [_code_digest(c) if isinstance(c, types.CodeType) else repr(c) for c in code.co_consts]
+    payload = code.co_code + repr((code.co_names, consts)).encode("utf-8")
+    return hashlib.md5(payload).hexdigest()[:8]
+
+
+def _state_token(value: Any, depth: int = 0) -> str | None:
+    """把读取函数捕获的状态（闭包变量、默认参数、实例属性等）转成稳定字符串。
+
+    只识别标量、容器、类型、模块与可调用对象；其余对象（连接、锁、任意类实例）
+    无法判断两次取值是否等价，返回 ``None``。
+    """
+    if depth > _STATE_MAX_DEPTH:
+        return None
+    if isinstance(value, _STATE_SCALARS):
+        return repr(value)
+    if isinstance(value, (type, types.ModuleType)):
+        return f"<{getattr(value, '__module__', '')}.{getattr(value, '__qualname__', value.__name__)}>"
+    if isinstance(value, (list, tuple)):
+        items = [_state_token(v, depth + 1) for v in value]
+        return None if None in items else f"{type(value).__name__}({','.join(items)})"
+    if isinstance(value, (set, frozenset)):
+        items = [_state_token(v, depth + 1) for v in value]
+        return None if None in items else f"set({','.join(sorted(items))})"
+    if isinstance(value, dict):
+        items = [(_state_token(k, depth + 1), _state_token(v, depth + 1)) for k, v in value.items()]
+        if any(k is None or v is None for k, v in items):
+            return None
+        return "{" + ",".join(sorted(f"{k}:{v}" for k, v in items)) + "}"
+    if callable(value):
+        return _reader_identity(value, depth + 1)
+    return None
+
+
+def _instance_token(obj: Any, depth: int) -> str | None:
+    """实例状态标识：类型 + ``__dict__``；没有 ``__dict__`` 的对象无法识别。"""
+    state = getattr(obj, "__dict__", None)
+    token = _state_token(state, depth + 1) if isinstance(state, dict) else None
+    if token is None:
+        return None
+    return f"{type(obj).__module__}.{type(obj).__qualname__}{token}"
+
+
+def _reader_identity(read_bars: Callable, depth: int = 0) -> str | None:
+    """``read_bars`` 的身份标识，用作 K 线物化缓存键；无法可靠识别时返回 ``None``。
+
+    函数取模块 + 限定名 + 字节码摘要，并带上默认参数与闭包变量的取值；
+    ``functools.partial`` 带上绑定参数，绑定方法带上 ``self`` 的状态，可调用实例取
+    类的 ``__call__`` 加实例状态。因此改动实现、或同一工厂函数捕获不同数据源 / 复权
+    方式时标识都会变化。捕获了无法识别的状态（如数据库连接）时返回 ``None``，
+    由调用方跳过缓存。
+    """
+    if depth > _STATE_MAX_DEPTH:
+        return None
+    if isinstance(read_bars, functools.partial):
+        inner = _reader_identity(read_bars.func, depth + 1)
+        bound = _state_token((read_bars.args, read_bars.keywords), depth + 1)
+        return None if inner is None or bound is None else f"{inner}{bound}"
+    if inspect.ismethod(read_bars):
+        inner = _reader_identity(read_bars.__func__, depth + 1)
+        owner = _instance_token(read_bars.__self__, depth)
+        return None if inner is None or owner is None else f"{inner}@{owner}"
+
+    func = read_bars
+    code = getattr(func, "__code__", None)
+    if code is None:
+        if hasattr(func, "__wrapped__"):
+            # functools.lru_cache 等 C 实现的包装器：按被包装函数识别
+            return _reader_identity(inspect.unwrap(func), depth + 1)
+        # 可调用实例：静态查找类上定义的 __call__，不触发描述符绑定
+        call = inspect.getattr_static(type(func), "__call__", None)
+        if not inspect.isfunction(call):
+            return None
+        inner = _reader_identity(call, depth + 1)
+        owner = _instance_token(func, depth)
+        return None if inner is None or owner is None else f"{inner}@{owner}"
+
+    try:
+        cells = [c.cell_contents for c in func.__closure__ or ()]
+    except ValueError:
+        # 闭包变量尚未赋值
+        return None
+    state = _state_token((getattr(func, "__defaults__", None), getattr(func, "__kwdefaults__", None), cells), depth + 1)
+    if state is None:
+        return None
+    name = getattr(func, "__qualname__", type(func).__qualname__)
+    return f"{getattr(func, '__module__', '')}.{name}:{_code_digest(code)}{state}"
+
+
+def _materialize_bars(
+    read_bars: Callable,
+    symbols: list[str],
+    base_freq: str,
+    bar_sdt: str,
+    bar_edt: str,
+    cache_root: Path,
+    *,
+    uncached_dir: Path,
+    cache_key: str | None = None,
+    max_workers: int = 8,
+    refresh: bool = False,
+) -> Path:
+    """把各标的 K 线物化到按内容寻址的共享目录，已存在的文件直接复用。
+
+    目录名由 ``(base_freq, bar_sdt, bar_edt, 缓存键)`` 的哈希决定，文件名为
+    ``<symbol>.parquet``，因此同一股票池上的多次优化任务共用一份物化结果。缓存键取
+    ``cache_key``，未提供时由 :func:`_reader_identity` 推导；推导不出（读取函数捕获了
+    无法识别的状态）时不走共享缓存，全部标的重新读取到任务私有的 ``uncached_dir``。
+    缺失的标的用线程池并发读取；每个文件先写临时文件再原子替换，中断或多进程并发时
+    不会留下半截文件。
+
+    Returns:
+        包含 ``<symbol>.parquet`` 文件的目录路径，供 Rust 引擎扫描读取。
+    """
+    identity = cache_key if cache_key is not None else _reader_identity(read_bars)
+    if identity is None:
+        bars_dir, refresh = Path(uncached_dir), True
+    else:
+        key = _md5_upper8(json.dumps([base_freq, bar_sdt, bar_edt, identity], ensure_ascii=False))
+        bars_dir = Path(cache_root) / f"{base_freq}_{bar_sdt}_{bar_edt}_{key}"
+    bars_dir.mkdir(parents=True, exist_ok=True)
+    missing = [s for s in symbols if refresh or not (bars_dir / f"{s}.parquet").exists()]
+
+    def _load(symbol: str) -> None:
+        bars = _read_bars(read_bars, symbol, base_freq, bar_sdt, bar_edt)
+        tmp = bars_dir / f".{symbol}.{os.getpid()}.{threading.get_ident()}.tmp"
+        # parquet 不写 index，Rust 端按列名读取，避免歧义。
+        bars_to_dataframe(bars, symbol=symbol).to_parquet(tmp, index=False)
+        os.replace(tmp, bars_dir / f"{symbol}.parquet")
+
+    if missing:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(missing)))) as pool:
+            # list() 触发迭代，使任一标的的读取异常在此处抛出
+            list(pool.map(_load, missing))
+    return bars_dir
+
+
 class CzscOpenOptimStrategy(CzscStrategyBase):
     """开仓参数优化所使用的兼容策略类。
 
@@ -309,7 +465,11 @@ class OpensOptimize:
             **kwargs: 任务配置；至少需要包含 ``symbols``、``files_position``、
                 ``candidate_signals``、``results_path`` 等键；可选项包括
                 ``task_name``、``base_freq``、``bar_sdt``、``bar_edt``、
-                ``market``、``bg_max_count`` 等。
+                ``market``、``bg_max_count``、``bars_cache_dir``、``bars_cache_key``、
+                ``read_bars_workers``、``refresh_bars``（K 线物化缓存，见 :func:`_materialize_bars`）、``output_layout``
+                （``"files"`` / ``"partitioned"`` / ``"aggregate"``）与 ``top_k``
+                （见 :func:`czsc.run_optimize_batch`）、``halving``（传给
+                :func:`run_successive_halving` 的关键字参数 dict，启用逐轮减半）等。
 
         Notes:
             未显式提供 ``base_freq`` 时，会临时构造一个 :class:`CzscOpenOptimStrategy`
@@ -352,7 +512,7 @@ class OpensOptimize:
             Rust 引擎返回的结果对象；同时该对象的 ``message`` 字段会被
             缓存到 ``self.message`` 上，便于调用方事后查阅。
         """
-        # 把所有标的的 K 线写入 parquet，作为 Rust 引擎读取的原料。
+        # 把所有标的的 K 线物化到共享缓存（未变化的标的直接复用），作为 Rust 引擎读取的原料。
         bars_dir = self._materialize_bars_dir()
         # 把基准持仓 JSON 转换为 Rust 期望的 runtime 格式后落盘。
         files_position = self._materialize_position_files()
@@ -370,27 +530,43 @@ class OpensOptimize:
         if self.kwargs.get("sdt"):
             # 仅当用户显式指定 sdt 时才下发，避免覆盖 Rust 端的默认值。
             cfg["sdt"] = self.kwargs["sdt"]
-        result = run_optimize_batch(bars_dir, cfg, self.results_root, n_threads=n_jobs)
+        for key in ("output_layout", "top_k"):
+            if self.kwargs.get(key) is not None:
+                cfg[key] = self.kwargs[key]
+        if self.kwargs.get("halving"):
+            # 逐轮减半：先在标的子样本上淘汰大部分候选，只在全量数据上复跑存活者。
+            result = run_successive_halving(
+                bars_dir, cfg, self.results_root, n_threads=n_jobs, **self.kwargs["halving"]
+            )
+        else:
+            result = run_optimize_batch(bars_dir, cfg, self.results_root, n_threads=n_jobs)
         # 暴露 Rust 端返回的执行信息，方便上层日志记录或失败诊断。
         self.message = result.message
         return result
 
     def _materialize_bars_dir(self):
-        """将所有标的的 K 线序列写入 parquet 文件并返回所在目录。
+        """将所有标的的 K 线序列物化到共享缓存目录并返回该目录。
+
+        缓存位于 ``bars_cache_dir``（默认 ``results_path`` 根目录下的 ``bars_cache``），
+        详见 :func:`_materialize_bars`；``refresh_bars=True`` 强制重新读取，``bars_cache_key``
+        显式指定缓存键（读取函数无法自动识别时用它启用缓存）。
 
         Returns:
             包含 ``<symbol>.parquet`` 文件的目录路径，供 Rust 引擎扫描读取。
         """
-        bars_dir = Path(self.results_path) / "bars"
-        bars_dir.mkdir(parents=True, exist_ok=True)
         # 默认时间范围与历史版本保持一致；用户可通过 kwargs 自定义覆盖。
-        bar_sdt = self.kwargs.get("bar_sdt", "20150101")
-        bar_edt = self.kwargs.get("bar_edt", "20220101")
-        for symbol in self.symbols:
-            bars = _read_bars(self.read_bars, symbol, self.base_freq, bar_sdt, bar_edt)
-            # parquet 不写 index，Rust 端按列名读取，避免歧义。
-            bars_to_dataframe(bars, symbol=symbol).to_parquet(bars_dir / f"{symbol}.parquet", index=False)
-        return bars_dir
+        return _materialize_bars(
+            self.read_bars,
+            self.symbols,
+            self.base_freq,
+            self.kwargs.get("bar_sdt", "20150101"),
+            self.kwargs.get("bar_edt", "20220101"),
+            Path(self.kwargs.get("bars_cache_dir") or self.results_root / "bars_cache"),
+            uncached_dir=Path(self.results_path) / "bars",
+            cache_key=self.kwargs.get("bars_cache_key"),
+            max_workers=self.kwargs.get("read_bars_workers", 8),
+            refresh=self.kwargs.get("refresh_bars", False),
+        )
 
     def _materialize_position_files(self):
         """把每份基准仓位 JSON 转换为 runtime 格式后写入磁盘。
@@ -502,24 +678,40 @@ class ExitsOptimize:
         }
         if self.kwargs.get("sdt"):
             cfg["sdt"] = self.kwargs["sdt"]
-        result = run_optimize_batch(bars_dir, cfg, self.results_root, n_threads=n_jobs)
+        for key in ("output_layout", "top_k"):
+            if self.kwargs.get(key) is not None:
+                cfg[key] = self.kwargs[key]
+        if self.kwargs.get("halving"):
+            result = run_successive_halving(
+                bars_dir, cfg, self.results_root, n_threads=n_jobs, **self.kwargs["halving"]
+            )
+        else:
+            result = run_optimize_batch(bars_dir, cfg, self.results_root, n_threads=n_jobs)
         self.message = result.message
         return result
 
     def _materialize_bars_dir(self):
-        """将所有标的的 K 线序列写入 parquet 文件并返回所在目录。
+        """将所有标的的 K 线序列物化到共享缓存目录并返回该目录。
+
+        缓存位于 ``bars_cache_dir``（默认 ``results_path`` 根目录下的 ``bars_cache``），
+        详见 :func:`_materialize_bars`；``refresh_bars=True`` 强制重新读取，``bars_cache_key``
+        显式指定缓存键（读取函数无法自动识别时用它启用缓存）。
 
         Returns:
             包含 ``<symbol>.parquet`` 文件的目录路径，供 Rust 引擎扫描读取。
         """
-        bars_dir = Path(self.results_path) / "bars"
-        bars_dir.mkdir(parents=True, exist_ok=True)
-        bar_sdt = self.kwargs.get("bar_sdt", "20150101")
-        bar_edt = self.kwargs.get("bar_edt", "20220101")
-        for symbol in self.symbols:
-            bars = _read_bars(self.read_bars, symbol, self.base_freq, bar_sdt, bar_edt)
-            bars_to_dataframe(bars, symbol=symbol).to_parquet(bars_dir / f"{symbol}.parquet", index=False)
-        return bars_dir
+        return _materialize_bars(
+            self.read_bars,
+            self.symbols,
+            self.base_freq,
+            self.kwargs.get("bar_sdt", "20150101"),
+            self.kwargs.get("bar_edt", "20220101"),
+            Path(self.kwargs.get("bars_cache_dir") or self.results_root / "bars_cache"),
+            uncached_dir=Path(self.results_path) / "bars",
+            cache_key=self.kwargs.get("bars_cache_key"),
+            max_workers=self.kwargs.get("read_bars_workers", 8),
+            refresh=self.kwargs.get("refresh_bars", False),
+        )
 
     def _materialize_position_files(self):
         """把每份基准仓位 JSON 转换为 runtime 格式后写入磁盘。
@@ -542,3 +734,179 @@ class ExitsOptimize:
             out_path.write_text(json.dumps(runtime, ensure_ascii=False), encoding="utf-8")
             files.append(str(out_path))
         return files
+
+
+# ----------------------------------------------------------------------------
+# 逐轮减半（successive halving）：先在标的子样本上评估全部候选，逐轮淘汰
+# ----------------------------------------------------------------------------
+def _candidate_key(candidate: Any) -> str:
+    """候选的稳定文本键：信号字符串原样返回，事件字典按键排序后 JSON 序列化。"""
+    if isinstance(candidate, str):
+        return candidate
+    return json.dumps(candidate, ensure_ascii=False, sort_keys=True)
+
+
+def _candidate_pos_names(optim_type: str, files_position: list[str], candidates: list[Any]) -> dict[str, set[str]]:
+    """候选键 -> 该候选派生出的仓位名集合（不含基准仓位），用于把报表行归属回候选。"""
+    build = build_open_optim_positions if optim_type == "open" else build_exit_optim_positions
+    betas = {d["name"] for d in build(files_position, [])}
+    return {_candidate_key(c): {d["name"] for d in build(files_position, [c])} - betas for c in candidates}
+
+
+def _halving_schedule(n_rungs: int, eta: float, symbol_fractions) -> list[float]:
+    """每轮使用的标的比例；默认为 ``eta^-(n_rungs-1), ..., eta^-1, 1``。"""
+    if symbol_fractions is None:
+        return [eta ** -(n_rungs - 1 - i) for i in range(n_rungs)]
+    fractions = [float(x) for x in symbol_fractions]
+    if not fractions or any(not 0 < x <= 1 for x in fractions):
+        raise ValueError("symbol_fractions 必须是 (0, 1] 区间内的非空序列")
+    if fractions != sorted(fractions):
+        raise ValueError("symbol_fractions 必须单调不减")
+    return fractions
+
+
+def _write_json_atomic(path: Path, payload: Any) -> None:
+    """先写临时文件再替换，避免中断时留下半截状态文件。"""
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    tmp.replace(path)
+
+
+def run_successive_halving(
+    bars_dir: str | Path,
+    optimize_cfg: dict[str, Any],
+    res_path: str | Path,
+    *,
+    n_threads: int = 1,
+    eta: float = 3,
+    n_rungs: int = 3,
+    symbol_fractions: list[float] | None = None,
+    rung_sdts: list[str | None] | None = None,
+    metric: str = "截面等权收益",
+    maximize: bool = True,
+    min_survivors: int = 1,
+    seed: int = 0,
+    rung_output_layout: str = "aggregate",
+):
+    """在 :func:`czsc.research.run_optimize_batch` 之上逐轮减半筛选候选。
+
+    第 ``r`` 轮只在 ``symbol_fractions[r]`` 比例的标的子样本（可选再配合
+    ``rung_sdts[r]`` 缩短回测区间）上评估当前存活的候选，按报表中的 ``metric``
+    保留前 ``1/eta``，最后一轮不再淘汰。候选得分取其派生仓位（例如平仓优化的
+    替换 / 追加两个变体）中的最优值，没有交易记录的候选排在最后。
+
+    子样本按 ``md5(seed + symbol)`` 排序后取前缀，相邻轮次的标的集合相互嵌套；
+    同分候选按候选键排序，结果完全确定。每轮结束后把标的、候选与得分写入
+    ``res_path/{task_name}_halving.json``，中断后以相同参数重跑会跳过已完成的轮次；
+    参数变化时拒绝复用旧状态。
+
+    Args:
+        bars_dir: 同 :func:`czsc.research.run_optimize_batch`。
+        optimize_cfg: 同 :func:`czsc.research.run_optimize_batch`；候选取自
+            ``candidate_signals``（开仓）或 ``candidate_events``（平仓）。
+        res_path: 结果根目录；第 ``r`` 轮的任务名为 ``{task_name}_R{r}``。
+        n_threads: 传给 Rust 引擎的线程数。
+        eta: 每轮保留前 ``1/eta`` 的候选。
+        n_rungs: 轮数；提供 ``symbol_fractions`` 时以其长度为准。
+        symbol_fractions: 各轮使用的标的比例，须单调不减。
+        rung_sdts: 各轮的 ``sdt``（None 表示沿用 ``optimize_cfg``）。
+        metric: 排序使用的报表列，默认 ``截面等权收益``。
+        maximize: metric 是否越大越好。
+        min_survivors: 每轮至少保留的候选数。
+        seed: 标的子样本的哈希种子。
+        rung_output_layout: 非最后一轮使用的 ``output_layout``，默认只做聚合统计。
+
+    Returns:
+        最后一轮的 :class:`czsc.models.OptimizeResult`。
+    """
+    cfg = dict(optimize_cfg)
+    optim_type = cfg.get("optim_type", "open")
+    cand_field = "candidate_signals" if optim_type == "open" else "candidate_events"
+    candidates = list(cfg.get(cand_field) or [])
+    if optim_type == "exit":
+        candidates = normalize_candidate_events(candidates)
+    by_key = {_candidate_key(c): c for c in candidates}
+    fractions = _halving_schedule(n_rungs, eta, symbol_fractions)
+    if rung_sdts is not None and len(rung_sdts) != len(fractions):
+        raise ValueError("rung_sdts 的长度必须与轮数一致")
+
+    symbols = sorted(cfg["symbols"], key=lambda s: (_md5_upper8(f"{seed}{s}"), s))
+    task_name = cfg.get("task_name", "入场优化" if optim_type == "open" else "出场优化")
+    files_position = [str(x) for x in cfg.get("files_position", [])]
+    fingerprint = _md5_upper8(
+        json.dumps(
+            {
+                "cfg": {k: v for k, v in cfg.items() if k != cand_field},
+                "candidates": sorted(by_key),
+                "fractions": fractions,
+                "rung_sdts": rung_sdts,
+                "metric": metric,
+                "maximize": maximize,
+                "eta": eta,
+                "min_survivors": min_survivors,
+                "seed": seed,
+            },
+            ensure_ascii=False,
+            sort_keys=True,
+            default=str,
+        )
+    )
+
+    state_path = Path(res_path) / f"{task_name}_halving.json"
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    state = {"fingerprint": fingerprint, "rungs": []}
+    if state_path.exists():
+        state = json.loads(state_path.read_text(encoding="utf-8"))
+        if state.get("fingerprint") != fingerprint:
+            raise ValueError(f"{state_path} 记录的是另一组参数的减半进度，请删除该文件或更换 res_path")
+
+    pos_names = _candidate_pos_names(optim_type, files_position, candidates)
+    survivors = sorted(by_key)
+    result = None
+    for rung, fraction in enumerate(fractions):
+        is_last = rung == len(fractions) - 1
+        rung_symbols = symbols[: max(1, round(len(symbols) * fraction))]
+        done = state["rungs"][rung] if rung < len(state["rungs"]) else None
+
+        if done is not None and done["candidates"] == survivors and done["symbols"] == rung_symbols:
+            scores = done["scores"]
+            result = OptimizeResult(message=done["message"], task_dir=done["task_dir"])
+        else:
+            rung_cfg = dict(cfg, symbols=rung_symbols, task_name=f"{task_name}_R{rung}")
+            rung_cfg[cand_field] = [by_key[k] for k in survivors]
+            if rung_sdts is not None and rung_sdts[rung] is not None:
+                rung_cfg["sdt"] = rung_sdts[rung]
+            if not is_last:
+                rung_cfg["output_layout"] = rung_output_layout
+                rung_cfg["top_k"] = 0
+            result = run_optimize_batch(bars_dir, rung_cfg, res_path, n_threads=n_threads)
+
+            metric_by_pos = {row["pos_name"]: row.get(metric) for row in result.report() if row.get(metric) is not None}
+            scores = {}
+            for key in survivors:
+                vals = [float(metric_by_pos[n]) for n in pos_names[key] if n in metric_by_pos]
+                vals = [v if maximize else -v for v in vals if v == v]
+                scores[key] = max(vals) if vals else None
+            del state["rungs"][rung:]
+            state["rungs"].append(
+                {
+                    "rung": rung,
+                    "symbols": rung_symbols,
+                    "sdt": rung_cfg.get("sdt"),
+                    "candidates": survivors,
+                    "scores": scores,
+                    "message": result.message,
+                    "task_dir": result.task_dir,
+                }
+            )
+            _write_json_atomic(state_path, state)
+
+        if is_last:
+            break
+        n_keep = max(min_survivors, math.ceil(len(survivors) / eta))
+        ranked = sorted(
+            survivors,
+            key=lambda k: (scores[k] is None, -(scores[k] or 0.0), k),
+        )
+        survivors = sorted(ranked[:n_keep])
+    return result
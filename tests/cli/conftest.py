@@ -1,3 +1,5 @@
+import json
+
 import pytest
 
 from czsc import Event, Position
@@ -12,3 +14,18 @@ def position_file(tmp_path):
     p = tmp_path / "pos.json"
     p.write_text(pos.to_json())
     return p
+
+
+@pytest.fixture
+def strategy_file(tmp_path, position_file):
+    """以 position_file 中的 Position 构造 ``research run`` 可用的策略 JSON 文件，返回路径。"""
+    pos = Position.from_json(position_file.read_text())
+    strategy = {
+        "symbol": "000001",
+        "base_freq": "30分钟",
+        "positions": [pos.dump()],
+        "signals_config": [{"name": "cxt_bi_status_V230101", "freq": "30分钟"}],
+    }
+    p = tmp_path / "strategy.json"
+    p.write_text(json.dumps(strategy, ensure_ascii=False), encoding="utf-8")
+    return p
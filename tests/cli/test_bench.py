@@ -14,3 +14,66 @@ def test_bench_json_reports_throughput():
     assert r.exit_code == 0, r.output
     data = json.loads(r.stdout)
     assert data["czsc_construct"]["bars_per_sec"] > 0
+
+
+def test_compare_baseline_flags_throughput_and_rss():
+    from czsc.cli.bench import compare_baseline
+
+    base = {"bars": 100, "research": {"bars_per_sec": 1000, "peak_rss_mb": 100.0}, "resample": {"bars_per_sec": 10}}
+    cur = {"bars": 100, "research": {"bars_per_sec": 850, "peak_rss_mb": 105.0}, "resample": {"bars_per_sec": 9.5}}
+    regs = compare_baseline(cur, base, threshold=0.1)
+    assert regs == [
+        {"case": "research", "metric": "bars_per_sec", "baseline": 1000, "current": 850, "change": -0.15},
+    ]
+    assert compare_baseline(cur, base, threshold=0.2) == []
+
+
+def test_baseline_mismatch_checks_run_params():
+    from czsc.cli.bench import baseline_mismatch
+
+    params = {"years": 1, "freq": "30分钟", "cases": ["czsc", "resample"], "threads": 1}
+    cur = {"params": params}
+    assert baseline_mismatch(cur, {"params": dict(params)}) == []
+    assert baseline_mismatch(cur, {"params": {**params, "threads": 4}}) == ["threads"]
+    # 用例顺序不同，峰值 RSS 不可比
+    assert baseline_mismatch(cur, {"params": {**params, "cases": ["resample", "czsc"]}}) == ["cases"]
+    assert baseline_mismatch(cur, {"czsc_construct": {"bars_per_sec": 1}}) == ["params"]
+
+
+def test_bench_refuses_mismatched_baseline(tmp_path):
+    saved = tmp_path / "baseline.json"
+    saved.write_text(json.dumps({"params": {"years": 2}, "resample": {"bars_per_sec": 1}}), encoding="utf-8")
+    r = runner.invoke(
+        app, ["bench", "--years", "1", "--freq", "30分钟", "--cases", "resample", "--baseline", str(saved)]
+    )
+    assert r.exit_code != 0
+    assert "years" in r.output
+
+
+def test_bench_rejects_unknown_case():
+    r = runner.invoke(app, ["bench", "--years", "1", "--cases", "czsc,nope", "--json"])
+    assert r.exit_code != 0
+    assert "nope" in r.output
+
+
+@pytest.mark.slow
+def test_bench_cases_save_and_compare_baseline(tmp_path):
+    saved = tmp_path / "baseline.json"
+    args = ["bench", "--years", "1", "--freq", "30分钟", "--cases", "bar_generator,resample", "--json"]
+    r = runner.invoke(app, [*args, "--save-baseline", str(saved)])
+    assert r.exit_code == 0, r.output
+    data = json.loads(r.stdout)
+    assert "czsc_construct" not in data
+    assert data["params"]["cases"] == ["bar_generator", "resample"]
+    for case in ["bar_generator", "resample"]:
+        assert data[case]["bars_per_sec"] > 0 and data[case]["stages"]
+    assert json.loads(saved.read_text(encoding="utf-8"))["bar_generator"] == data["bar_generator"]
+
+    # 基线吞吐量放大 10 倍，本次结果必然判定为回退
+    base = json.loads(saved.read_text(encoding="utf-8"))
+    base["resample"]["bars_per_sec"] *= 10
+    saved.write_text(json.dumps(base), encoding="utf-8")
+    r = runner.invoke(app, [*args, "--baseline", str(saved)])
+    assert r.exit_code == 1
+    regs = json.loads(r.stdout)["regressions"]
+    assert [(x["case"], x["metric"]) for x in regs if x["metric"] == "bars_per_sec"] == [("resample", "bars_per_sec")]
@@ -13,3 +13,16 @@ def test_research_config_derives():
     data = json.loads(r.stdout)
     assert "signals_config" in data and "freqs" in data
     assert data["freqs"] == ["30分钟"]
+
+
+def test_research_run_profile(tmp_path, strategy_file):
+    csv = tmp_path / "k.csv"
+    args = ["data", "mock", "--symbol", "000001", "--freq", "30分钟", "--sdt", "20200101", "--edt", "20220101"]
+    assert runner.invoke(app, [*args, "-o", str(csv)]).exit_code == 0
+
+    r = runner.invoke(app, ["research", "run", str(csv), str(strategy_file), "--profile", "--json"])
+    assert r.exit_code == 0, r.output
+    data = json.loads(r.stdout)
+    rows = data["signal_profile"]
+    assert rows and {"kind", "name", "calls", "total_ns", "p99_ns"} <= set(rows[0])
+    assert [x["total_ns"] for x in rows] == sorted((x["total_ns"] for x in rows), reverse=True)
@@ -2,9 +2,11 @@
 导入性能测试
 
 验证 czsc 库的导入速度在合理范围内，确保不因新增依赖或错误的模块级导入
-而导致导入速度显著下降，影响用户体验。
+而导致导入速度显著下降，影响用户体验；快速启动模式（``CZSC_FAST_IMPORT=1``）
+以 ``python -X importtime`` 度量，并断言重型依赖不在导入链上。
 """
 
+import os
 import subprocess
 import sys
 
@@ -14,6 +16,24 @@ import pytest
 # 主要用于检测灾难性的回归（如在模块级误引入 Streamlit / scipy 等重型依赖）。
 MAX_IMPORT_TIME_SECONDS = 10.0
 
+# 快速启动模式下 ``import czsc`` 的累计耗时上限（秒），只含 _native / pandas / pyarrow
+MAX_FAST_IMPORT_SECONDS = 3.0
+
+# 快速启动模式下不应出现在 ``import czsc`` 导入链上的模块
+FAST_IMPORT_EXCLUDED = [
+    "wbt",
+    "requests",
+    "requests_toolbelt",
+    "plotly",
+    "scipy",
+    "statsmodels",
+    "czsc.connectors",
+    "czsc.traders",
+    "czsc.utils",
+    "czsc.fsa",
+    "czsc.mock",
+]
+
 
 def _measure_import_time(module_name: str) -> float:
     """在独立子进程中测量模块导入耗时（秒）"""
@@ -39,3 +59,64 @@ def test_czsc_import_time():
         f"czsc 导入耗时 {elapsed:.2f}s，超过了阈值 {MAX_IMPORT_TIME_SECONDS}s。"
         f"请检查是否在模块级引入了重型依赖（如 streamlit、scipy、statsmodels、scikit-learn 等）。"
     )
+
+
+def _importtime(module_name: str, **env) -> dict[str, int]:
+    """以 ``python -X importtime`` 在独立子进程中导入模块，返回 {模块名: 累计耗时（微秒）}"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module_name}"],
+        capture_output=True,
+        text=True,
+        timeout=60,
+        env={**os.environ, **env},
+    )
+    assert result.returncode == 0, f"导入 {module_name} 失败:\n{result.stderr}"
+
+    # 每行格式：import time: self [us] | cumulative | imported package
+    cost = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        cost[name.strip()] = int(cumulative)
+    return cost
+
+
+@pytest.mark.slow
+def test_fast_import_time_is_bounded():
+    """快速启动模式只加载核心模块，累计耗时有上限且低于默认模式"""
+    fast = _importtime("czsc", CZSC_FAST_IMPORT="1")
+    loaded = [name for name in FAST_IMPORT_EXCLUDED if name in fast]
+    assert not loaded, f"快速启动模式下不应加载：{loaded}"
+
+    elapsed = fast["czsc"] / 1e6
+    assert elapsed < MAX_FAST_IMPORT_SECONDS, f"快速启动模式导入耗时 {elapsed:.2f}s，超过 {MAX_FAST_IMPORT_SECONDS}s"
+
+    eager = _importtime("czsc", CZSC_FAST_IMPORT="0")
+    assert fast["czsc"] < eager["czsc"], f"快速启动 {fast['czsc']}us 不快于默认模式 {eager['czsc']}us"
+
+
+def test_fast_import_resolves_public_names_lazily():
+    """快速启动模式下公共名称在首次访问时导入，且与默认模式为同一对象"""
+    code = "\n".join(
+        [
+            "import sys, czsc",
+            "assert 'wbt' not in sys.modules and 'czsc.utils' not in sys.modules",
+            "import wbt",
+            "assert czsc.WeightBacktest is wbt.WeightBacktest",
+            "from czsc import DataClient",
+            "assert DataClient is czsc.utils.DataClient",
+            "assert czsc.CzscTrader is czsc.traders.CzscTrader",
+            "missing = [n for n in czsc.__all__ if not hasattr(czsc, n)]",
+            "assert not missing, missing",
+            "assert set(czsc.__all__) <= set(dir(czsc))",
+        ]
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        timeout=60,
+        env={**os.environ, "CZSC_FAST_IMPORT": "1"},
+    )
+    assert result.returncode == 0, result.stderr
@@ -251,13 +251,13 @@ def test_disk_cache_decorator():
     result = run_parquet(9)
     assert isinstance(result, pd.DataFrame)
 
-    # 检查缓存文件是否存在
-    files = os.listdir(os.path.join(temp_path, "run_func_x"))
+    # 检查缓存文件是否存在（以 . 开头的是 DiskCache 索引文件）
+    files = [x for x in os.listdir(os.path.join(temp_path, "run_func_x")) if not x.startswith(".")]
     assert len(files) == 1
 
     # 调用不同参数的函数
     result = run_func_y(5)
-    files = os.listdir(os.path.join(temp_path, "run_func_y"))
+    files = [x for x in os.listdir(os.path.join(temp_path, "run_func_y")) if not x.startswith(".")]
     assert len(files) == 1
     file_xlsx = [x for x in files if x.endswith("xlsx")][0]
     df = pd.read_excel(os.path.join(temp_path, f"run_func_y/{file_xlsx}"))
@@ -406,3 +406,98 @@ def test_disk_cache_get_nonexistent():
 
     result = cache.get("nonexistent_key")
     assert result is None
+
+
+def test_disk_cache_lru_eviction(tmp_path):
+    """测试 DiskCache 按最近访问时间淘汰至容量上限"""
+    cache = DiskCache(tmp_path, max_bytes=2500)
+    cache.set("k0", "x" * 1000, suffix="txt")
+    cache.set("k1", "x" * 1000, suffix="txt")
+
+    # 让 k0 成为最近访问的条目
+    time.sleep(1.1)
+    assert cache.is_found("k0", suffix="txt")
+
+    cache.set("k2", "x" * 1000, suffix="txt")
+    assert cache.size() <= 2500
+    assert cache.is_found("k0", suffix="txt")
+    assert not cache.is_found("k1", suffix="txt")
+    assert not (tmp_path / "k1.txt").exists()
+
+    assert cache.evict(max_bytes=1000) == 1000
+    assert [x.name for x in tmp_path.glob("k*.txt")] == ["k2.txt"]
+
+
+def test_disk_cache_index_ttl_and_legacy_files(tmp_path):
+    """测试写入时设置的 TTL 记录在索引中，以及索引建立前的缓存文件自动登记"""
+    (tmp_path / "legacy.txt").write_text("old", encoding="utf-8")
+    cache = DiskCache(tmp_path)
+    assert cache.is_found("legacy", suffix="txt")
+    assert cache.get("legacy", suffix="txt") == "old"
+    assert cache.size() == 3
+
+    cache.set("short", "v", suffix="txt", ttl=0.01)
+    time.sleep(0.05)
+    assert not cache.is_found("short", suffix="txt")
+    assert not (tmp_path / "short.txt").exists()
+    assert not list(tmp_path.glob("*.tmp.*"))
+
+
+def test_disk_cache_decorator_reads_source_once(tmp_path, monkeypatch):
+    """测试 disk_cache 只在装饰时读取一次函数源码"""
+    import inspect
+
+    calls = []
+
+    @disk_cache(path=tmp_path, suffix="pkl")
+    def double(x):
+        calls.append(x)
+        return x * 2
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("命中缓存时不应读取函数源码")
+
+    monkeypatch.setattr(inspect, "getsource", _fail)
+    assert [double(3) for _ in range(3)] == [6, 6, 6]
+    assert calls == [3]
+    assert double.__name__ == "double"
+
+
+def test_disk_cache_files_removed_outside_index(tmp_path):
+    """测试索引之外删除的缓存文件不再命中，也不计入容量"""
+    cache = DiskCache(tmp_path)
+    cache.set("a", "x" * 100, suffix="txt")
+    cache.set("b", "x" * 200, suffix="txt")
+    assert cache.is_found("a", suffix="txt")
+
+    (tmp_path / "a.txt").unlink()
+    assert not cache.is_found("a", suffix="txt")
+    assert cache.size() == 200
+
+    (tmp_path / "b.txt").unlink()
+    assert cache.size() == 0
+
+
+def test_clear_expired_cache_updates_index(tmp_path):
+    """测试 clear_expired_cache 删除文件时同步 DiskCache 索引"""
+    cache = DiskCache(tmp_path)
+    cache.set("old", {"v": 1}, suffix="pkl")
+    old_time = time.time() - 3600 * 24 * 31
+    os.utime(tmp_path / "old.pkl", (old_time, old_time))
+
+    clear_expired_cache(tmp_path, max_age=3600 * 24 * 30)
+    assert not (tmp_path / "old.pkl").exists()
+    assert cache.size() == 0
+    assert not cache.is_found("old", suffix="pkl")
+
+
+def test_disk_cache_pickle(tmp_path):
+    """测试 DiskCache 可以 pickle（如传给多进程 worker）"""
+    import pickle
+
+    cache = DiskCache(tmp_path, max_bytes=10_000)
+    cache.set("k", "v", suffix="txt")
+    clone = pickle.loads(pickle.dumps(cache))
+    assert clone.path == cache.path and clone.max_bytes == 10_000
+    assert clone.is_found("k", suffix="txt")
+    assert clone.get("k", suffix="txt") == "v"
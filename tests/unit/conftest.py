@@ -0,0 +1,69 @@
+"""tests/unit 共享夹具：模拟 K 线与“表里关系”单仓位策略。
+
+研究 / 优化类测试共用同一套输入：30 分钟模拟 K 线（OHLCV 转 float64，与 Rust 端
+schema 对齐），以及按 ``表里关系V230101`` 向上开多、向下平多的 ``表里多头`` 仓位。
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from czsc import Event, Position
+from czsc.mock import generate_symbol_kines
+
+SIGNALS_CONFIG = [{"name": "cxt_bi_status_V230101", "freq": "30分钟"}]
+
+
+def _bars_df(symbol: str, sdt: str = "20200101", edt: str = "20220101", seed: int = 7):
+    df = generate_symbol_kines(symbol, "30分钟", sdt, edt, seed=seed)
+    for col in ["open", "close", "high", "low", "vol", "amount"]:
+        df[col] = df[col].astype("float64")
+    return df
+
+
+def _position(symbol: str = "000001") -> Position:
+    oe = Event.load({"operate": "开多", "signals_all": ["30分钟_D1_表里关系V230101_向上_任意_任意_0"]})
+    xe = Event.load({"operate": "平多", "signals_all": ["30分钟_D1_表里关系V230101_向下_任意_任意_0"]})
+    return Position(symbol=symbol, name="表里多头", opens=[oe], exits=[xe], interval=0, timeout=20, stop_loss=300)
+
+
+def _strategy(symbol: str | None = "000001") -> dict:
+    """``run_research`` 策略 dict；``symbol=None`` 时不带 ``symbol`` 键（多标的批量场景）。"""
+    strategy = {
+        "base_freq": "30分钟",
+        "positions": [_position(symbol or "ANY").dump()],
+        "signals_config": SIGNALS_CONFIG,
+    }
+    if symbol is not None:
+        strategy["symbol"] = symbol
+    return strategy
+
+
+@pytest.fixture(scope="session")
+def make_bars():
+    """K 线工厂：``make_bars(symbol, sdt="20200101", edt="20220101", seed=7)``。"""
+    return _bars_df
+
+
+@pytest.fixture(scope="session")
+def make_position():
+    """``表里多头`` 仓位工厂：``make_position(symbol="000001")``。"""
+    return _position
+
+
+@pytest.fixture(scope="session")
+def make_strategy():
+    """策略 dict 工厂：``make_strategy(symbol="000001")``。"""
+    return _strategy
+
+
+@pytest.fixture(scope="module")
+def bars(make_bars):
+    """000001 的 30 分钟模拟 K 线（2020-2022）。"""
+    return make_bars("000001")
+
+
+@pytest.fixture
+def strategy(make_strategy):
+    """000001 的 ``表里多头`` 单仓位策略 dict。"""
+    return make_strategy("000001")
@@ -0,0 +1,171 @@
+"""``czsc.utils.DataClient`` 连接复用、缓存与并发请求单元测试。
+
+测试以本地 ``ThreadingHTTPServer`` 模拟数据接口，覆盖：
+    - 顺序请求复用同一条 keep-alive 连接；
+    - 响应缓存为 parquet，再次请求直接命中缓存，不再访问接口；
+    - 兼容读取旧版 ``.pkl`` 缓存；
+    - 缓存读写保留索引，Arrow 无法表示的列退回 pickle；
+    - ``post_requests_many`` 结果顺序与参数一致，并发度不超过 ``max_workers``。
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from loguru import logger
+
+from czsc.utils.data.client import DataClient
+
+
+class _StubServer:
+    """记录请求次数、客户端端口与峰值并发的模拟数据接口"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = 0
+        self.ports: set[int] = set()
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                req = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with stub.lock:
+                    stub.calls += 1
+                    stub.ports.add(self.client_address[1])
+                    stub.active += 1
+                    stub.peak = max(stub.peak, stub.active)
+                time.sleep(stub.delay)
+                with stub.lock:
+                    stub.active -= 1
+
+                n = int(req["params"].get("n", 1))
+                body = {
+                    "code": 0,
+                    "data": {"fields": ["api", "i"], "items": [[req["api_name"], i] for i in range(n)]},
+                    "message": "success",
+                }
+                payload = json.dumps(body).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def server():
+    stub = _StubServer(delay=0.05)
+    yield stub
+    stub.close()
+
+
+def _client(server, tmp_path) -> DataClient:
+    return DataClient(token="test", url=server.url, timeout=10, cache_path=tmp_path)
+
+
+def test_sequential_requests_reuse_one_connection(server, tmp_path):
+    dc = _client(server, tmp_path)
+    for n in range(1, 5):
+        assert len(dc.post_request("daily", n=n)) == n
+    assert server.calls == 4
+    assert len(server.ports) == 1
+
+
+def test_response_cached_as_parquet(server, tmp_path):
+    dc = _client(server, tmp_path)
+    first = dc.post_request("daily", n=3)
+    again = dc.post_request("daily", n=3)
+    assert server.calls == 1
+    pd.testing.assert_frame_equal(first, again)
+
+    files = list(tmp_path.rglob("*.*"))
+    assert [f.suffix for f in files] == [".parquet"]
+
+
+def test_legacy_pickle_cache_is_read(server, tmp_path):
+    dc = _client(server, tmp_path)
+    df = dc.post_request("daily", n=2)
+    file_parquet = next(tmp_path.rglob("*.parquet"))
+    legacy = pd.DataFrame({"api": ["legacy"], "i": [0]})
+    legacy.to_pickle(file_parquet.with_suffix(".pkl"))
+    file_parquet.unlink()
+
+    got = dc.post_request("daily", n=2)
+    assert server.calls == 1
+    pd.testing.assert_frame_equal(got, legacy)
+    assert not got.equals(df)
+
+
+def test_post_requests_many_bounded_and_ordered(server, tmp_path):
+    dc = _client(server, tmp_path)
+    params_list = [{"n": n} for n in range(1, 9)]
+    dfs = dc.post_requests_many("daily", params_list, max_workers=3)
+
+    assert [len(df) for df in dfs] == list(range(1, 9))
+    assert server.calls == 8
+    assert 1 < server.peak <= 3
+
+    # 全部命中缓存
+    dc.post_requests_many("daily", params_list, max_workers=3)
+    assert server.calls == 8
+
+
+def test_post_requests_many_rejects_bad_workers(server, tmp_path):
+    dc = _client(server, tmp_path)
+    assert dc.post_requests_many("daily", []) == []
+    with pytest.raises(ValueError, match="max_workers"):
+        dc.post_requests_many("daily", [{"n": 1}], max_workers=0)
+
+
+def test_key_locks_are_a_fixed_pool(server, tmp_path):
+    dc = _client(server, tmp_path)
+    n_locks = len(DataClient._key_locks)
+    for n in range(1, 20):
+        dc.post_request("daily", n=n)
+    assert len(DataClient._key_locks) == n_locks
+    file = next(tmp_path.rglob("*.parquet"))
+    assert DataClient._lock_for(file) is DataClient._lock_for(Path(str(file)))
+
+
+@pytest.mark.parametrize(
+    "df, suffix",
+    [
+        (
+            pd.DataFrame({"close": [1.0, 2.0, 3.0]}, index=pd.date_range("2024-01-01", periods=3, name="dt")),
+            ".parquet",
+        ),
+        (pd.DataFrame({"x": [1, "a", 2.5]}), ".pkl"),
+    ],
+    ids=["datetime_index", "mixed_object"],
+)
+def test_set_cache_round_trip(server, tmp_path, df, suffix):
+    dc = _client(server, tmp_path)
+    dc._set_cache(tmp_path / "k.parquet", df, logger)
+    file = DataClient._find_cache(tmp_path / "k.parquet")
+    assert file is not None and file.suffix == suffix
+    # parquet 不保存 DatetimeIndex 的 freq
+    pd.testing.assert_frame_equal(dc._get_cache(file, "daily", {}, logger), df, check_freq=False)
@@ -0,0 +1,57 @@
+"""验证 format_standard_kline 的 Arrow 快路径与逐行构造结果一致。"""
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from czsc import Freq, RawBar, format_standard_kline
+from czsc.mock import generate_symbol_kines
+
+
+def _fields(bar: RawBar) -> tuple:
+    return (bar.symbol, bar.dt, bar.freq, bar.open, bar.close, bar.high, bar.low, bar.vol, bar.amount)
+
+
+@pytest.fixture(scope="module")
+def kline_df() -> pd.DataFrame:
+    return generate_symbol_kines("000001", "30分钟", "20240101", "20240201", seed=42)
+
+
+def test_fast_path_matches_row_construction(kline_df):
+    """快路径产出的每根 RawBar 与逐行调用 RawBar 构造器的结果逐字段一致，id 为行号。"""
+    bars = format_standard_kline(kline_df, freq=Freq.F30)
+    expect = [
+        RawBar(
+            symbol=str(row.symbol),
+            dt=row.dt,
+            freq=Freq.F30,
+            open=float(row.open),
+            close=float(row.close),
+            high=float(row.high),
+            low=float(row.low),
+            vol=float(row.vol),
+            amount=float(row.amount),
+        )
+        for row in kline_df.itertuples(index=False)
+    ]
+    assert [_fields(b) for b in bars] == [_fields(b) for b in expect]
+    assert [b.id for b in bars] == list(range(len(bars)))
+
+
+def test_accepts_arrow_table_and_integer_volume(kline_df):
+    """pyarrow Table 输入、整型成交量列与 pandas 输入结果一致。"""
+    df = kline_df.assign(vol=kline_df["vol"].round().astype("int64"))
+    from_pandas = format_standard_kline(df, freq="30分钟")
+    from_arrow = format_standard_kline(pa.Table.from_pandas(df, preserve_index=False), freq="30分钟")
+    assert [_fields(b) for b in from_arrow] == [_fields(b) for b in from_pandas]
+
+
+def test_missing_column_raises(kline_df):
+    with pytest.raises(ValueError, match="missing column 'amount'"):
+        format_standard_kline(kline_df.drop(columns=["amount"]), freq=Freq.F30)
+
+
+def test_tz_aware_dt_raises(kline_df):
+    df = kline_df.head(3).assign(dt=kline_df["dt"].head(3).dt.tz_localize("Asia/Shanghai"))
+    with pytest.raises(ValueError, match="tz-naive"):
+        format_standard_kline(df, freq=Freq.F30)
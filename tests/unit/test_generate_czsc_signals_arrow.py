@@ -0,0 +1,63 @@
+"""``generate_czsc_signals(arrow=True)`` 列式输出单元测试。
+
+测试覆盖：
+    - 返回 Arrow IPC 字节流，列序固定为 10 个基础列 + 按名称排序的信号列；
+    - 基础列为强类型（dt 无时区 datetime、OHLCV float64），信号列字典编码；
+    - 与 ``df=True`` 行数、dt、信号取值逐值一致。
+"""
+
+from __future__ import annotations
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from czsc import Freq, format_standard_kline
+from czsc._utils._df_convert import arrow_bytes_to_pd_df
+from czsc.mock import generate_symbol_kines
+from czsc.traders import generate_czsc_signals
+
+SIGNALS_CONFIG = [
+    {"name": "cxt_bi_status_V230101", "freq": "30分钟"},
+    {"name": "cxt_bi_status_V230101", "freq": "日线"},
+]
+
+BASE_COLUMNS = ["symbol", "dt", "freq", "id", "open", "close", "high", "low", "vol", "amount"]
+
+
+@pytest.fixture(scope="module")
+def bars():
+    df = generate_symbol_kines("000001", "30分钟", "20230101", "20230601", seed=42)
+    return format_standard_kline(df, freq=Freq.F30)
+
+
+def test_arrow_schema_is_typed_and_ordered(bars):
+    data = generate_czsc_signals(bars, SIGNALS_CONFIG, sdt="20230301", init_n=100, arrow=True)
+    assert isinstance(data, bytes)
+
+    table = pa.ipc.open_file(pa.py_buffer(data)).read_all()
+    names = table.column_names
+    assert names[: len(BASE_COLUMNS)] == BASE_COLUMNS
+    signal_names = names[len(BASE_COLUMNS) :]
+    assert signal_names == sorted(signal_names)
+    assert len(signal_names) > 0
+
+    schema = table.schema
+    assert pa.types.is_timestamp(schema.field("dt").type)
+    assert schema.field("dt").type.tz is None
+    for col in ["open", "close", "high", "low", "vol", "amount"]:
+        assert pa.types.is_float64(schema.field(col).type)
+    for col in signal_names:
+        assert pa.types.is_dictionary(schema.field(col).type)
+
+
+def test_arrow_matches_dataframe_output(bars):
+    expected = generate_czsc_signals(bars, SIGNALS_CONFIG, sdt="20230301", init_n=100, df=True)
+    got = arrow_bytes_to_pd_df(generate_czsc_signals(bars, SIGNALS_CONFIG, sdt="20230301", init_n=100, arrow=True))
+
+    assert len(got) == len(expected)
+    assert list(pd.to_datetime(got["dt"])) == list(pd.to_datetime(expected["dt"]).dt.tz_localize(None))
+    signal_names = [c for c in got.columns if c not in BASE_COLUMNS]
+    assert set(signal_names) <= set(expected.columns)
+    for col in signal_names:
+        assert got[col].astype(str).tolist() == expected[col].astype(str).tolist(), col
@@ -0,0 +1,80 @@
+"""原生长耗时入口释放 GIL 的并发测试。
+
+业务背景：
+    ``run_research`` / ``run_replay`` / ``generate_czsc_signals`` / ``CZSC(...)`` 等
+    原生入口在参数提取完成后都以 ``py.detach`` 执行纯 Rust 计算。Python 侧用
+    ``ThreadPoolExecutor`` 按标的并发编排时应当真正跑满多核，而不是被 GIL 串行化。
+
+测试覆盖：
+    - 4 个 Python 线程并发 ``czsc.run_research`` 与串行执行结果逐字节一致；
+    - 4 线程墙钟耗时相对串行接近线性加速（阈值留足 CI 抖动余量）；
+    - ``CZSC(...)`` 与 ``generate_czsc_signals`` 在多线程下结果与单线程一致。
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import czsc
+from czsc import CZSC, Freq, format_standard_kline
+from czsc.traders import generate_czsc_signals
+
+N_THREADS = 4
+SYMBOLS = ["000001", "000002", "000003", "000004"]
+
+
+@pytest.fixture(scope="module")
+def research_inputs(make_bars, make_strategy):
+    return [(make_bars(s, "20180101", "20230101", seed=42), make_strategy(s)) for s in SYMBOLS]
+
+
+def _run_one(item):
+    bars, strategy = item
+    res = czsc.run_research(bars, strategy)
+    return res.pairs_arrow, res.holds_arrow
+
+
+def test_threaded_run_research_matches_serial(research_inputs):
+    serial = [_run_one(x) for x in research_inputs]
+    with ThreadPoolExecutor(max_workers=N_THREADS) as pool:
+        threaded = list(pool.map(_run_one, research_inputs))
+    assert threaded == serial
+
+
+@pytest.mark.slow
+@pytest.mark.skipif((os.cpu_count() or 1) < N_THREADS, reason="需要至少 4 个 CPU 核")
+def test_threaded_run_research_scales_near_linearly(research_inputs):
+    # 预热一次，排除首次调用的注册表 / 懒加载开销
+    _run_one(research_inputs[0])
+
+    t0 = time.perf_counter()
+    for item in research_inputs:
+        _run_one(item)
+    serial = time.perf_counter() - t0
+
+    with ThreadPoolExecutor(max_workers=N_THREADS) as pool:
+        t0 = time.perf_counter()
+        list(pool.map(_run_one, research_inputs))
+        threaded = time.perf_counter() - t0
+
+    speedup = serial / threaded
+    # 理想值为 4；持有 GIL 时约为 1。阈值 2.5 兼顾 CI 噪声与回归检出
+    assert speedup >= 2.5, f"4 线程加速比仅 {speedup:.2f}x（串行 {serial:.2f}s / 并发 {threaded:.2f}s）"
+
+
+def test_threaded_czsc_and_generate_signals_match_serial(make_bars, strategy):
+    bars = format_standard_kline(make_bars("000001", "20180101", "20230101", seed=42), freq=Freq.F30)
+
+    def work(_):
+        c = CZSC(bars)
+        sigs = generate_czsc_signals(bars, strategy["signals_config"], sdt="20200101", init_n=300, df=False)
+        return len(c.bi_list), [s["30分钟_D1_表里关系V230101"] for s in sigs if "30分钟_D1_表里关系V230101" in s]
+
+    expected = work(0)
+    with ThreadPoolExecutor(max_workers=N_THREADS) as pool:
+        results = list(pool.map(work, range(N_THREADS)))
+    assert all(r == expected for r in results)
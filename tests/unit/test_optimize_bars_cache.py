@@ -0,0 +1,150 @@
+"""优化任务 K 线物化缓存单元测试。
+
+测试覆盖：
+    - 同一股票池、同一读取参数的不同优化任务共用一份物化目录，第二次不再调用 ``read_bars``；
+    - 只为缺失的标的调用 ``read_bars``；
+    - 时间范围或读取函数变化时使用新的缓存目录，``refresh_bars=True`` 强制重读；
+    - 闭包变量、可调用实例 / 绑定方法的状态、默认参数参与缓存键；
+    - 读取函数捕获了无法识别的状态时跳过共享缓存，``bars_cache_key`` 可显式启用缓存。
+"""
+
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from czsc import Freq, format_standard_kline
+from czsc.utils import OpensOptimize
+
+SYMBOLS = ["000001", "000002", "000003"]
+
+
+# 记录 read_bars 的调用；模块级全局变量不参与读取函数的身份标识
+CALLS: list[str] = []
+BARS: dict[str, list] = {}
+
+
+@pytest.fixture(autouse=True)
+def _mock_source(make_bars):
+    CALLS.clear()
+    for symbol in SYMBOLS:
+        if symbol not in BARS:
+            BARS[symbol] = format_standard_kline(make_bars(symbol, "20210101", "20210301", seed=1), freq=Freq.F30)
+
+
+def _mock_bars(symbol, freq):
+    CALLS.append(symbol)
+    return BARS[symbol]
+
+
+def reader(symbol, freq, sdt, edt, fq="后复权", raw_bar=True):
+    return _mock_bars(symbol, freq)
+
+
+def make_reader(source):
+    def read(symbol, freq, sdt, edt):
+        assert source
+        return _mock_bars(symbol, freq)
+
+    return read
+
+
+class Reader:
+    def __init__(self, fq):
+        self.fq = fq
+
+    def __call__(self, symbol, freq, sdt, edt):
+        return _mock_bars(symbol, freq)
+
+    def read(self, symbol, freq, sdt, edt):
+        return _mock_bars(symbol, freq)
+
+
+def _optim(read_bars, tmp_path, **kwargs):
+    params = {
+        "symbols": SYMBOLS,
+        "files_position": [],
+        "candidate_signals": ["30分钟_D1_表里关系V230101_向上_任意_任意_0"],
+        "results_path": str(tmp_path),
+        "base_freq": "30分钟",
+    }
+    params.update(kwargs)
+    return OpensOptimize(read_bars, **params)
+
+
+def test_tasks_share_materialized_bars(tmp_path):
+    first = _optim(reader, tmp_path)._materialize_bars_dir()
+    assert sorted(CALLS) == SYMBOLS
+    assert sorted(p.stem for p in first.glob("*.parquet")) == SYMBOLS
+    assert len(pd.read_parquet(first / "000001.parquet")) > 0
+
+    # 候选不同 -> task_hash 不同，但物化目录相同且不再读取
+    other = _optim(reader, tmp_path, candidate_signals=["日线_D1_表里关系V230101_向上_任意_任意_0"])
+    assert other.results_path != _optim(reader, tmp_path).results_path
+    assert other._materialize_bars_dir() == first
+    assert len(CALLS) == len(SYMBOLS)
+
+
+def test_only_missing_symbols_are_read(tmp_path):
+    bars_dir = _optim(reader, tmp_path)._materialize_bars_dir()
+    (bars_dir / "000002.parquet").unlink()
+    CALLS.clear()
+    _optim(reader, tmp_path)._materialize_bars_dir()
+    assert CALLS == ["000002"]
+
+
+def test_cache_key_follows_range_reader_and_refresh(tmp_path):
+    base = _optim(reader, tmp_path)._materialize_bars_dir()
+    assert _optim(reader, tmp_path, bar_edt="20230101")._materialize_bars_dir() != base
+
+    def another_reader(symbol, freq, sdt, edt):
+        return reader(symbol, freq, sdt, edt)
+
+    assert _optim(another_reader, tmp_path)._materialize_bars_dir() != base
+
+    CALLS.clear()
+    _optim(reader, tmp_path, refresh_bars=True)._materialize_bars_dir()
+    assert sorted(CALLS) == SYMBOLS
+
+
+def test_cache_key_follows_captured_state(tmp_path):
+    def bars_dir(read_bars):
+        return _optim(read_bars, tmp_path)._materialize_bars_dir()
+
+    assert bars_dir(make_reader("db_a")) != bars_dir(make_reader("db_b"))
+    assert bars_dir(make_reader("db_a")) == bars_dir(make_reader("db_a"))
+    assert bars_dir(Reader("前复权")) != bars_dir(Reader("后复权"))
+    assert bars_dir(Reader("前复权").read) != bars_dir(Reader("后复权").read)
+    assert bars_dir(Reader("前复权")) != bars_dir(Reader("前复权").read)
+
+    def with_default(symbol, freq, sdt, edt, fq="前复权"):
+        return _mock_bars(symbol, freq)
+
+    with_default_hfq = with_default
+    base = bars_dir(with_default)
+    with_default_hfq.__defaults__ = ("后复权",)
+    assert bars_dir(with_default_hfq) != base
+
+
+def test_unidentifiable_reader_skips_cache(tmp_path):
+    lock = threading.Lock()
+
+    def locked_reader(symbol, freq, sdt, edt):
+        with lock:
+            return _mock_bars(symbol, freq)
+
+    optim = _optim(locked_reader, tmp_path)
+    bars_dir = optim._materialize_bars_dir()
+    assert bars_dir == Path(optim.results_path) / "bars"
+    optim._materialize_bars_dir()
+    assert sorted(CALLS) == sorted(SYMBOLS * 2)
+
+    # 显式缓存键：按该键共享物化目录
+    CALLS.clear()
+    shared = _optim(locked_reader, tmp_path, bars_cache_key="mock-v1")._materialize_bars_dir()
+    assert shared.parent == tmp_path / "bars_cache"
+    assert _optim(locked_reader, tmp_path, bars_cache_key="mock-v1")._materialize_bars_dir() == shared
+    assert sorted(CALLS) == SYMBOLS
@@ -9,6 +9,7 @@
     - 顶层 ``czsc.resample_bars`` 是 Python wrapper（区别于 ``czsc._native.resample_bars``）；
     - DataFrame 输入 / list[RawBar] 输入两条路径在等价输入下产生相同输出；
     - ``raw_bars=False`` 返回 DataFrame，列序对齐标准 8 列；空结果保留 8 列 schema；
+      DataFrame → DataFrame 列式路径与 list[RawBar] 路径逐值一致；
     - 1min→5min OHLCV 聚合数值与历史 Python 公式（first/last/max/min/sum/sum）一致；
     - 1min→日线 把同一交易日所有 1 分钟 bar 聚合成 1 根日线，并显式记录
       drop_unfinished 对非分钟 target 的 no-op 已知限制；
@@ -188,6 +189,23 @@ def test_raw_bars_false_returns_dataframe_with_standard_columns():
     assert len(out) == 2  # 09:35 + 09:40 两个桶
 
 
+def test_raw_bars_false_dataframe_path_matches_bars_path():
+    """DataFrame → DataFrame 的列式路径与 list[RawBar] 路径逐值一致，dtype 对齐标准布局。"""
+    bars = _make_ashare_1min_bars(23)
+    df = _bars_to_df(bars)
+
+    from_df = resample_bars(df, Freq.F5, raw_bars=False, base_freq=Freq.F1, drop_unfinished=False)
+    from_list = resample_bars(bars, Freq.F5, raw_bars=False, drop_unfinished=False)
+    expect = resample_bars(bars, Freq.F5, drop_unfinished=False)
+
+    pd.testing.assert_frame_equal(from_df, from_list)
+    assert str(from_df["dt"].dtype) == "datetime64[ns]"
+    assert list(from_df["dt"]) == [b.dt for b in expect]
+    assert list(from_df["close"]) == [b.close for b in expect]
+    assert list(from_df["vol"]) == [b.vol for b in expect]
+    assert set(from_df["symbol"]) == {"000001.XSHG"}
+
+
 def test_raw_bars_false_empty_input_preserves_schema():
     """空结果 + raw_bars=False 必须返回 8 列 + 与非空一致 dtype 的空 DataFrame。
 
@@ -0,0 +1,67 @@
+"""``czsc.run_research_batch`` 多标的并行研究单元测试。
+
+测试覆盖：
+    - ``{symbol: DataFrame}`` 输入逐标的结果与单标的 ``run_research`` 一致，
+      pairs ``标的代码`` / holds ``symbol`` 使用各标的自身代码；
+    - 含 ``symbol`` 列的长表输入与 dict 输入结果一致；
+    - ``concat=True`` 返回单个结果，三张表按标的纵向拼接；
+    - 缺少 ``symbol`` 列时显式报错。
+"""
+
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+
+import czsc
+
+SYMBOLS = ["000001", "000002", "000003"]
+
+
+@pytest.fixture(scope="module")
+def bars_by_symbol(make_bars):
+    return {s: make_bars(s) for s in SYMBOLS}
+
+
+def test_batch_matches_single_symbol_runs(bars_by_symbol, make_strategy):
+    results = czsc.run_research_batch(bars_by_symbol, make_strategy(None), n_threads=2)
+    assert list(results) == SYMBOLS
+
+    for symbol, df in bars_by_symbol.items():
+        single = czsc.run_research(df, make_strategy(symbol))
+        got = results[symbol]
+        assert got.meta["symbol"] == symbol
+        assert got.meta["bars_count"] == single.meta["bars_count"]
+        pd.testing.assert_frame_equal(got.signals_df(), single.signals_df())
+
+        pairs = got.pairs_df()
+        if len(pairs):
+            assert set(pairs["标的代码"]) == {symbol}
+        holds = got.holds_df()
+        if len(holds):
+            assert set(holds["symbol"]) == {symbol}
+
+
+def test_long_table_input_matches_dict_input(bars_by_symbol, make_strategy):
+    long_df = pd.concat(bars_by_symbol.values(), ignore_index=True).sample(frac=1.0, random_state=0)
+    from_dict = czsc.run_research_batch(bars_by_symbol, make_strategy(None))
+    from_long = czsc.run_research_batch(long_df, make_strategy(None))
+    for symbol in SYMBOLS:
+        pd.testing.assert_frame_equal(from_long[symbol].pairs_df(), from_dict[symbol].pairs_df())
+
+
+def test_concat_output_stacks_all_symbols(bars_by_symbol, make_strategy):
+    per_symbol = czsc.run_research_batch(bars_by_symbol, make_strategy(None))
+    res = czsc.run_research_batch(bars_by_symbol, make_strategy(None), concat=True)
+
+    assert res.meta["symbols"] == SYMBOLS
+    assert res.meta["bars_count"] == sum(r.meta["bars_count"] for r in per_symbol.values())
+    signals = res.signals_df()
+    assert list(signals["symbol"].drop_duplicates()) == SYMBOLS
+    assert len(res.pairs_df()) == sum(len(r.pairs_df()) for r in per_symbol.values())
+
+
+def test_missing_symbol_column_raises(bars_by_symbol, make_strategy):
+    df = bars_by_symbol[SYMBOLS[0]].drop(columns=["symbol"])
+    with pytest.raises(ValueError, match="symbol"):
+        czsc.run_research_batch(df, make_strategy(None))
@@ -0,0 +1,42 @@
+"""``run_research(opts={"profile": ...})`` 信号剖析单元测试。
+
+测试覆盖：
+    - ``"signals"`` 模式返回逐信号函数剖析表，K 线信号与所属周期逐 bar 计数；
+    - ``"core"`` 模式只给出 ``meta["profile"]``，不返回剖析表；
+    - 非法取值显式报错。
+"""
+
+from __future__ import annotations
+
+import pytest
+
+import czsc
+
+
+def test_signals_profile_table(bars, strategy):
+    res = czsc.run_research(bars, strategy, opts={"profile": "signals"})
+    dfp = res.profile_df()
+    assert list(dfp.columns) == ["kind", "name", "freq", "params", "calls", "total_ns", "mean_ns", "p99_ns", "max_ns"]
+    assert {"kline", "freq", "czsc"} <= set(dfp["kind"])
+
+    op = dfp[(dfp["kind"] == "kline") & (dfp["name"] == "cxt_bi_status_V230101")]
+    assert len(op) == 1
+    row = op.iloc[0]
+    assert row["freq"] == "30分钟"
+    assert row["calls"] == res.meta["bars_count"]
+    assert 0 < row["p99_ns"] <= row["max_ns"]
+    assert "bars" in res.meta["profile"]
+
+    # 信号剖析不影响回测结果
+    plain = czsc.run_research(bars, strategy)
+    assert plain.profile_df() is None
+    assert res.pairs_df().equals(plain.pairs_df())
+
+
+def test_core_profile_and_invalid_mode(bars, strategy):
+    res = czsc.run_research(bars, strategy, opts={"profile": "core"})
+    assert res.meta["profile"]["bars"] == res.meta["bars_count"]
+    assert res.profile_df() is None
+
+    with pytest.raises(ValueError, match="opts.profile"):
+        czsc.run_research(bars, strategy, opts={"profile": "slow"})
@@ -0,0 +1,84 @@
+"""``czsc.utils.run_successive_halving`` 逐轮减半优化单元测试。
+
+测试覆盖：
+    - 每轮按 ``1/eta`` 淘汰候选，标的子样本逐轮扩大且相互嵌套，最后一轮使用全部标的；
+    - 每轮写入减半状态文件，以相同参数重跑时直接复用已完成轮次，不再调用引擎；
+    - 参数变化时拒绝复用旧的减半状态。
+"""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+import czsc.utils.optimize as optimize_mod
+from czsc.utils import run_successive_halving
+
+SYMBOLS = [f"{i:06d}" for i in range(1, 7)]
+CANDIDATES = [
+    f"{freq}_D1_表里关系V230101_{v1}_任意_任意_0"
+    for freq in ["30分钟", "60分钟", "日线"]
+    for v1 in ["向上", "向下", "任意"]
+]
+
+
+@pytest.fixture(scope="module")
+def optim_inputs(tmp_path_factory, make_bars, make_position):
+    root = tmp_path_factory.mktemp("halving")
+    bars_dir = root / "bars"
+    bars_dir.mkdir()
+    for i, symbol in enumerate(SYMBOLS):
+        make_bars(symbol, seed=i).to_parquet(bars_dir / f"{symbol}.parquet", index=False)
+
+    file_pos = root / "表里多头.json"
+    pos = make_position("symbol").dump(with_data=False)
+    file_pos.write_text(json.dumps(pos, ensure_ascii=False), encoding="utf-8")
+
+    cfg = {
+        "optim_type": "open",
+        "task_name": "减半测试",
+        "base_freq": "30分钟",
+        "symbols": SYMBOLS,
+        "files_position": [str(file_pos)],
+        "candidate_signals": CANDIDATES,
+    }
+    return bars_dir, cfg
+
+
+def _state(res_path):
+    return json.loads((res_path / "减半测试_halving.json").read_text(encoding="utf-8"))
+
+
+def test_rungs_prune_by_eta_on_nested_subsamples(optim_inputs, tmp_path):
+    bars_dir, cfg = optim_inputs
+    res = run_successive_halving(bars_dir, cfg, tmp_path, eta=3, n_rungs=3)
+
+    rungs = _state(tmp_path)["rungs"]
+    assert [len(r["candidates"]) for r in rungs] == [9, 3, 1]
+    assert [len(r["symbols"]) for r in rungs] == [1, 2, 6]
+    assert rungs[1]["symbols"][:1] == rungs[0]["symbols"]
+    assert sorted(rungs[2]["symbols"]) == sorted(SYMBOLS)
+    for prev, cur in zip(rungs, rungs[1:], strict=False):
+        assert set(cur["candidates"]) <= set(prev["candidates"])
+    assert res.task_dir == rungs[-1]["task_dir"]
+
+
+def test_rerun_resumes_from_state_without_engine(optim_inputs, tmp_path, monkeypatch):
+    bars_dir, cfg = optim_inputs
+    first = run_successive_halving(bars_dir, cfg, tmp_path, eta=3, n_rungs=3)
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("已完成的轮次不应重新跑批")
+
+    monkeypatch.setattr(optimize_mod, "run_optimize_batch", _fail)
+    again = run_successive_halving(bars_dir, cfg, tmp_path, eta=3, n_rungs=3)
+    assert again.task_dir == first.task_dir
+    assert again.report() == first.report()
+
+
+def test_changed_params_refuse_stale_state(optim_inputs, tmp_path):
+    bars_dir, cfg = optim_inputs
+    run_successive_halving(bars_dir, cfg, tmp_path, eta=3, n_rungs=2)
+    with pytest.raises(ValueError, match="减半进度"):
+        run_successive_halving(bars_dir, cfg, tmp_path, eta=2, n_rungs=2)